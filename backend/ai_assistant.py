@@ -2,7 +2,7 @@
 AI Assistant for Candidate Querying
 
 This module handles:
-- Weaviate vector database operations
+- Vector database operations (Weaviate Cloud or the local index)
 - Candidate data synchronization
 - Natural language querying of candidates
 - Auto-sync with compatibility analysis results
@@ -10,27 +10,48 @@ This module handles:
 
 import json
 import os
-from typing import Dict, List, Any, Optional
+import hashlib
+import base64
+import threading
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
-import weaviate
-import weaviate.classes as wvc
-from weaviate.classes.config import Configure, Property, DataType
+from weaviate.util import generate_uuid5
 from dotenv import load_dotenv
 import logging
-from mistralai import Mistral
+from key_pool import get_shared_key_pool
+from llm_scheduler import get_llm_scheduler, INTERACTIVE, BULK
+from vector_store import create_vector_store, LOCAL_SCHEME
+from query_planner import plan_query, build_filters, QueryPlan
+from query_cache import QueryCache, normalize_query
+from lexical_index import LexicalIndex, reciprocal_rank_fusion
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Properties excluded from the content hash (they change on every sync)
+UNHASHED_PROPERTIES = {"created_at", "content_hash"}
+
 
 class AIAssistant:
     """
-    AI Assistant for querying candidate information using Weaviate vector database.
+    AI Assistant for querying candidate information using a vector database.
+    
+    WEAVIATE_URL selects the backend: a Weaviate Cloud cluster URL, or
+    local://<directory> for the embedded index (works offline, and without a
+    Mistral key the LLM re-ranking step is skipped).
+    
+    One instance is shared by the API request threads and the background
+    sync (see get_shared_assistant). Queries, stats and connection checks are
+    safe to call concurrently; syncs and collection setup are serialized by
+    an internal lock, so a query during a sync sees the collection either
+    before or after each upsert/delete batch and its cached result is keyed
+    by the collection version it started with.
     """
     
     def __init__(self):
-        """Initialize the AI Assistant with Weaviate configuration."""
+        """Initialize the AI Assistant with vector store configuration."""
         load_dotenv()
         
         # Weaviate configuration
@@ -42,12 +63,31 @@ class AIAssistant:
         # AI configuration
         self.max_results = int(os.getenv("AI_ASSISTANT_MAX_RESULTS", "5"))
         self.ai_model = os.getenv("AI_ASSISTANT_MODEL", "mistral-small-latest")
+        self.structured_queries = os.getenv("AI_ASSISTANT_STRUCTURED_QUERIES", "true").lower() == "true"
+        # Candidates retrieved per requested result for LLM re-ranking
+        self.retrieval_multiplier = int(os.getenv("AI_ASSISTANT_RETRIEVAL_MULTIPLIER", "3"))
+        # Upper bound on candidates sent to the LLM per request (never below the page size)
+        self.max_retrieval = int(os.getenv("AI_ASSISTANT_MAX_RETRIEVAL", "10"))
         
-        # Mistral client for RAG analysis
-        mistral_api_key = os.getenv("MISTRAL_API_KEY")
-        if not mistral_api_key:
+        # Mistral client for RAG analysis (optional with the local index)
+        is_local = bool(self.weaviate_url) and self.weaviate_url.startswith(LOCAL_SCHEME)
+        # Shares the analyzer's key pool and scheduler: search queries queue ahead of bulk
+        # analysis, while document embeddings during sync are bulk work themselves
+        key_pool = get_shared_key_pool()
+        llm_scheduler = get_llm_scheduler()
+        self.mistral_query_client = None
+        if key_pool:
+            self.mistral_client = (llm_scheduler.client(BULK, source="embeddings", target=key_pool)
+                                   if llm_scheduler else key_pool)
+            self.mistral_query_client = (llm_scheduler.client(INTERACTIVE, source="query-embeddings", target=key_pool)
+                                         if llm_scheduler else key_pool)
+        elif is_local:
+            logger.warning("⚠️ No Mistral API key, results will be ranked by vector similarity only")
+            self.mistral_client = None
+        else:
             raise ValueError("Mistral API key is required for RAG functionality. Check your .env file.")
-        self.mistral_client = Mistral(api_key=mistral_api_key)
+        # Re-ranking can use any configured LLM provider (embeddings stay on Mistral)
+        self.llm_client = llm_scheduler.client(INTERACTIVE, source="assistant") if llm_scheduler else None
         
         # Data file path - check if running in Docker or use env var
         data_file_path = os.getenv("COMPATIBILITY_SCORES_FILE")
@@ -58,156 +98,324 @@ class AIAssistant:
         else:  # Local development path
             self.compatibility_file = "data/compatibility_scores.json"
         
-        if not self.weaviate_url or not self.weaviate_api_key:
-            raise ValueError("Weaviate URL and API key are required. Check your .env file.")
+        # Outcome of the last incremental sync
+        self.last_sync_result = None
+        
+        # BM25 index over candidate text, kept in step with the collection
+        self.lexical_index = LexicalIndex()
+        
+        # Candidate stats, materialized at sync time (None until first computed)
+        self._stats: Optional[Dict[str, Any]] = None
+        
+        # Query results are cached per collection version (bumped whenever a sync changes data)
+        self.collection_version = 0
+        self.query_cache = QueryCache(
+            max_entries=int(os.getenv("AI_ASSISTANT_CACHE_SIZE", "256")),
+            ttl_seconds=float(os.getenv("AI_ASSISTANT_CACHE_TTL_SECONDS", "300"))
+        )
+        
+        # Initialize the vector store (Weaviate Cloud or local index)
+        self.vector_store = create_vector_store(
+            self.weaviate_url, self.weaviate_api_key, self.collection_name, mistral_client=self.mistral_client,
+            mistral_query_client=self.mistral_query_client
+        )
         
-        # Initialize Weaviate client
-        self.client = None
-        self._connect_to_weaviate()
+        # Connection health, updated by the background monitor (see start_health_monitor)
+        self.health_check_interval = float(os.getenv("VECTOR_STORE_HEALTH_CHECK_SECONDS", "30"))
+        self._connection_lock = threading.Lock()
+        self._healthy = True
+        self.last_health_check: Optional[str] = None
+        self.last_connection_error: Optional[str] = None
+        self.reconnects = 0
+        self._monitor_stop = threading.Event()
+        self._monitor_thread: Optional[threading.Thread] = None
+        
+        # Serializes syncs, collection setup and lexical index builds
+        self._sync_lock = threading.RLock()
     
-    def _connect_to_weaviate(self):
-        """Connect to Weaviate cloud instance."""
-        try:
-            # Connect to Weaviate Cloud with Mistral API key for embeddings
-            self.client = weaviate.connect_to_weaviate_cloud(
-                cluster_url=self.weaviate_url,
-                auth_credentials=weaviate.auth.AuthApiKey(self.weaviate_api_key),
-                headers={
-                    "X-Mistral-Api-Key": os.getenv("MISTRAL_API_KEY", "")
-                }
-            )
-            
-            # Test connection
-            if self.client.is_ready():
-                logger.info("✅ Successfully connected to Weaviate Cloud")
-            else:
-                raise Exception("Weaviate client is not ready")
-                
-        except Exception as e:
-            logger.error(f"❌ Failed to connect to Weaviate: {e}")
-            raise
+    def start_health_monitor(self, interval: Optional[float] = None) -> None:
+        """
+        Check the vector store connection periodically in a daemon thread.
+        
+        Failed checks trigger a reconnect, so requests never pay for a
+        readiness probe and a dropped connection is replaced in the background.
+        
+        Args:
+            interval: Seconds between checks (default: VECTOR_STORE_HEALTH_CHECK_SECONDS or 30)
+        """
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            return
+        
+        interval = interval or self.health_check_interval
+        if interval <= 0:
+            return
+        
+        self._monitor_stop.clear()
+        
+        def monitor():
+            while not self._monitor_stop.wait(interval):
+                self.check_connection()
+        
+        self._monitor_thread = threading.Thread(target=monitor, name="vector-store-health", daemon=True)
+        self._monitor_thread.start()
+        logger.info(f"💓 Vector store health monitor started (every {interval:g}s)")
+    
+    def stop_health_monitor(self) -> None:
+        """Stop the background health monitor."""
+        self._monitor_stop.set()
+        if self._monitor_thread:
+            self._monitor_thread.join(timeout=5)
+            self._monitor_thread = None
+    
+    def check_connection(self) -> bool:
+        """
+        Probe the vector store and reconnect if it is not ready.
+        
+        Returns:
+            bool: Whether the connection is healthy after the check
+        """
+        self.last_health_check = datetime.now().isoformat()
+        if self.vector_store.is_healthy():
+            self._healthy = True
+            return True
+        
+        logger.warning(f"⚠️ {self.vector_store.backend} vector store is not ready, reconnecting")
+        self._healthy = False
+        return self.ensure_connection()
+    
+    def ensure_connection(self) -> bool:
+        """
+        Reconnect the vector store if the last health check failed.
+        
+        Cheap when the connection is healthy (no network round trip).
+        
+        Returns:
+            bool: Whether the connection is usable
+        """
+        if self._healthy:
+            return True
+        
+        with self._connection_lock:
+            if self._healthy:
+                return True
+            try:
+                self.vector_store.reconnect()
+                self._healthy = True
+                self.reconnects += 1
+                self.last_connection_error = None
+            except Exception as e:
+                self.last_connection_error = str(e)
+                logger.error(f"❌ Failed to reconnect vector store: {e}")
+        return self._healthy
+    
+    def connection_status(self) -> Dict[str, Any]:
+        """Connection health summary for the status endpoint."""
+        return {
+            "backend": self.vector_store.backend,
+            "healthy": self._healthy,
+            "last_health_check": self.last_health_check,
+            "reconnects": self.reconnects,
+            "last_error": self.last_connection_error,
+            "monitoring": bool(self._monitor_thread and self._monitor_thread.is_alive())
+        }
     
     def setup_collection(self):
         """Create or recreate the Candidates collection."""
-        try:
-            # Delete existing collection if it exists
-            if self.client.collections.exists(self.collection_name):
-                self.client.collections.delete(self.collection_name)
-                logger.info(f"🗑️ Deleted existing collection: {self.collection_name}")
-            
-            # Create new collection with schema (using Mistral embeddings)
-            collection = self.client.collections.create(
-                name=self.collection_name,
-                description="Candidate profiles for AI-powered querying",
-                vectorizer_config=Configure.Vectorizer.text2vec_mistral(),
-                properties=[
-                    Property(name="name", data_type=DataType.TEXT),
-                    Property(name="position", data_type=DataType.TEXT),
-                    Property(name="candidate_id", data_type=DataType.TEXT),
-                    Property(name="compatibility_score", data_type=DataType.NUMBER),
-                    Property(name="recommendation", data_type=DataType.TEXT),
-                    Property(name="summary", data_type=DataType.TEXT),
-                    Property(name="strengths", data_type=DataType.TEXT_ARRAY),
-                    Property(name="concerns", data_type=DataType.TEXT_ARRAY),
-                    Property(name="openness", data_type=DataType.NUMBER),
-                    Property(name="conscientiousness", data_type=DataType.NUMBER),
-                    Property(name="extraversion", data_type=DataType.NUMBER),
-                    Property(name="agreeableness", data_type=DataType.NUMBER),
-                    Property(name="neuroticism", data_type=DataType.NUMBER),
-                    Property(name="searchable_text", data_type=DataType.TEXT),  # Combined text for vector search
-                    Property(name="created_at", data_type=DataType.DATE),
-                ]
-            )
-            
-            logger.info(f"✅ Created collection: {self.collection_name}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to setup collection: {e}")
-            return False
+        with self._sync_lock:
+            try:
+                return self.vector_store.setup_collection()
+            finally:
+                # Like a sync, invalidate once the collection has changed, so no
+                # query can cache pre-reset results under the new version
+                self._collection_changed()
+                self.lexical_index = LexicalIndex()
+    
+    def ensure_collection(self) -> bool:
+        """
+        Make sure the Candidates collection exists with the current schema.
+        
+        The collection is only (re)created when it is missing or its property
+        set differs from the expected schema; otherwise it is left untouched.
+        
+        Returns:
+            bool: Success status
+        """
+        return self.vector_store.ensure_collection()
     
     def sync_candidates_from_file(self, file_path: Optional[str] = None) -> bool:
         """
-        Synchronize candidates from compatibility_scores.json to Weaviate.
+        Synchronize candidates from compatibility_scores.json to the vector store.
+        
+        Objects use deterministic UUIDs derived from candidate_id and carry a
+        content hash, so only new or changed candidates are upserted and only
+        candidates missing from the file are deleted (all of them when its
+        candidate list is empty). The collection stays queryable for the
+        whole sync.
         
         Args:
             file_path: Path to compatibility scores file (optional)
-            
+        
         Returns:
             bool: Success status
         """
+        with self._sync_lock:
+            return self._sync_candidates(file_path or self.compatibility_file)
+    
+    def _sync_candidates(self, file_path: str) -> bool:
+        """Run one incremental sync (caller holds the sync lock)."""
         try:
-            file_path = file_path or self.compatibility_file
+            if not self.ensure_connection():
+                logger.error("❌ Vector store is unavailable, skipping sync")
+                return False
             
             # Load compatibility scores
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            # Setup collection (this will delete and recreate)
-            if not self.setup_collection():
+            if "candidates_analysis" not in data:
+                logger.warning("⚠️ No candidates_analysis in compatibility scores file, skipping sync")
                 return False
             
-            # Get the collection
-            collection = self.client.collections.get(self.collection_name)
-            
-            # Prepare candidate data
-            candidates_to_insert = []
-            
-            for candidate_analysis in data.get("candidates_analysis", []):
-                candidate_info = candidate_analysis.get("candidate_info", {})
-                ai_analysis = candidate_analysis.get("ai_analysis", {})
-                overall_rec = candidate_analysis.get("overall_recommendation", {})
-                
-                # Extract personality traits
-                traits = candidate_info.get("personality_traits", {})
-                
-                # Create searchable text combining key information
-                searchable_text = self._create_searchable_text(
-                    ai_analysis.get("summary", ""),
-                    ai_analysis.get("strengths", []),
-                    ai_analysis.get("concerns", []),
-                    candidate_info.get("name", ""),
-                    candidate_info.get("position", ""),
-                    traits
-                )
-                
-                # Prepare candidate object
-                candidate_obj = {
-                    "name": candidate_info.get("name", ""),
-                    "position": candidate_info.get("position", ""),
-                    "candidate_id": candidate_info.get("id", ""),
-                    "compatibility_score": overall_rec.get("combined_score", 0),
-                    "recommendation": overall_rec.get("status", ""),
-                    "summary": ai_analysis.get("summary", ""),
-                    "strengths": ai_analysis.get("strengths", []),
-                    "concerns": ai_analysis.get("concerns", []),
-                    "openness": traits.get("openness", 0),
-                    "conscientiousness": traits.get("conscientiousness", 0),
-                    "extraversion": traits.get("extraversion", 0),
-                    "agreeableness": traits.get("agreeableness", 0),
-                    "neuroticism": traits.get("neuroticism", 0),
-                    "searchable_text": searchable_text,
-                    "created_at": datetime.now()
-                }
-                
-                candidates_to_insert.append(candidate_obj)
-            
-            # Batch insert candidates
-            if candidates_to_insert:
-                with collection.batch.dynamic() as batch:
-                    for candidate in candidates_to_insert:
-                        batch.add_object(properties=candidate)
-                
-                logger.info(f"✅ Successfully synced {len(candidates_to_insert)} candidates to Weaviate")
-                return True
-            else:
-                logger.warning("⚠️ No candidates found in compatibility scores file")
+            # An empty list is a valid state: every stored candidate is deleted
+            candidates = self._build_candidate_objects(data)
+            if not candidates:
+                logger.warning("⚠️ No candidates in compatibility scores file, emptying the collection")
+            
+            # Only recreates the collection when the schema actually changed
+            if not self.ensure_collection():
                 return False
-                
+            
+            existing_hashes = self.vector_store.fetch_hashes()
+            
+            to_upsert = {
+                uuid: candidate for uuid, candidate in candidates.items()
+                if existing_hashes.get(uuid) != candidate["content_hash"]
+            }
+            to_delete = [uuid for uuid in existing_hashes if uuid not in candidates]
+            
+            self.vector_store.upsert(to_upsert)
+            self.vector_store.delete(to_delete)
+            
+            # An empty collection was just created or recreated (schema migration), so
+            # the keyword index may still hold candidates the collection no longer has
+            if self.lexical_index.is_built and existing_hashes:
+                self.lexical_index.upsert(to_upsert)
+                self.lexical_index.remove(to_delete)
+            else:
+                self.lexical_index.rebuild(candidates)
+            
+            inserted = len([uuid for uuid in to_upsert if uuid not in existing_hashes])
+            self.last_sync_result = {
+                "inserted": inserted,
+                "updated": len(to_upsert) - inserted,
+                "deleted": len(to_delete),
+                "unchanged": len(candidates) - len(to_upsert),
+                "timestamp": datetime.now().isoformat()
+            }
+            
+            if to_upsert or to_delete:
+                self._collection_changed()
+            
+            # The file is now the collection content, so stats need no aggregation
+            if to_upsert or to_delete or self._stats is None:
+                self._stats = self._compute_stats(
+                    len(candidates),
+                    Counter(candidate["recommendation"] or "Unknown" for candidate in candidates.values())
+                )
+            
+            logger.info(f"✅ Synced {len(candidates)} candidates to {self.vector_store.backend} vector store "
+                        f"({inserted} new, {len(to_upsert) - inserted} updated, "
+                        f"{len(to_delete)} deleted, {len(candidates) - len(to_upsert)} unchanged)")
+            return True
+        
         except Exception as e:
             logger.error(f"❌ Failed to sync candidates: {e}")
+            # The collection may be partially updated - drop derived caches
+            self._collection_changed()
+            self.lexical_index = LexicalIndex()
             return False
     
+    def _collection_changed(self) -> None:
+        """Bump the collection version so cached query results are not reused."""
+        self.collection_version += 1
+        self.query_cache.clear()
+        self._stats = None
+    
+    def _build_candidate_objects(self, data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Convert compatibility results into collection objects keyed by deterministic UUID.
+        
+        Args:
+            data: Parsed compatibility scores file
+        
+        Returns:
+            Dictionary mapping object UUID to candidate properties
+        """
+        created_at = data.get("analysis_metadata", {}).get("timestamp")
+        try:
+            created_at = datetime.fromisoformat(created_at) if created_at else datetime.now()
+        except ValueError:
+            created_at = datetime.now()
+        
+        analyses = data.get("candidates_analysis", [])
+        id_counts = Counter(a.get("candidate_info", {}).get("id", "") for a in analyses)
+        
+        candidates = {}
+        for candidate_analysis in analyses:
+            candidate_info = candidate_analysis.get("candidate_info", {})
+            ai_analysis = candidate_analysis.get("ai_analysis", {})
+            overall_rec = candidate_analysis.get("overall_recommendation", {})
+            
+            # Extract personality traits
+            traits = candidate_info.get("personality_traits", {})
+            
+            # Create searchable text combining key information
+            searchable_text = self._create_searchable_text(
+                ai_analysis.get("summary", ""),
+                ai_analysis.get("strengths", []),
+                ai_analysis.get("concerns", []),
+                candidate_info.get("name", ""),
+                candidate_info.get("position", ""),
+                traits
+            )
+            
+            # Prepare candidate object
+            candidate_obj = {
+                "name": candidate_info.get("name", ""),
+                "position": candidate_info.get("position", ""),
+                "candidate_id": candidate_info.get("id", ""),
+                "compatibility_score": overall_rec.get("combined_score", 0),
+                "recommendation": overall_rec.get("status", ""),
+                "summary": ai_analysis.get("summary", ""),
+                "strengths": ai_analysis.get("strengths", []),
+                "concerns": ai_analysis.get("concerns", []),
+                "openness": traits.get("openness", 0),
+                "conscientiousness": traits.get("conscientiousness", 0),
+                "extraversion": traits.get("extraversion", 0),
+                "agreeableness": traits.get("agreeableness", 0),
+                "neuroticism": traits.get("neuroticism", 0),
+                "searchable_text": searchable_text,
+                "created_at": created_at
+            }
+            candidate_obj["content_hash"] = self._content_hash(candidate_obj)
+            
+            # UUID derives from candidate_id; ids shared by several candidates
+            # (or missing) are disambiguated with the candidate's name
+            uuid_seed = candidate_obj["candidate_id"]
+            if not uuid_seed or id_counts[uuid_seed] > 1:
+                uuid_seed = f"{uuid_seed}|{candidate_obj['name']}|{candidate_obj['position']}"
+            uuid = generate_uuid5(uuid_seed)
+            if uuid in candidates:
+                logger.warning(f"⚠️ Duplicate candidate '{uuid_seed}', keeping the last entry")
+            candidates[uuid] = candidate_obj
+        
+        return candidates
+    
+    def _content_hash(self, candidate_obj: Dict[str, Any]) -> str:
+        """Hash the content of a candidate object for change detection."""
+        hashed = {k: v for k, v in candidate_obj.items() if k not in UNHASHED_PROPERTIES}
+        return hashlib.sha256(json.dumps(hashed, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    
     def _create_searchable_text(self, summary: str, strengths: List[str], concerns: List[str], 
                               name: str, position: str, traits: Dict[str, float]) -> str:
         """Create combined searchable text for vector embeddings."""
@@ -237,23 +445,108 @@ class AIAssistant:
         
         return " ".join(searchable_parts)
     
-    def query_candidates(self, query: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    def query_candidates(self, query: str, limit: Optional[int] = None, filters: Optional[Dict[str, Any]] = None,
+                         cursor: Optional[str] = None) -> Dict[str, Any]:
         """
         Query candidates using RAG (Retrieval-Augmented Generation).
         
+        Trait, score and recommendation questions are answered directly with a
+        sorted property query; only open-ended questions go through vector
+        search and LLM ranking. Results are cached until the collection
+        changes; cached responses carry "cached": True.
+        
+        Filters are applied by the vector store (Weaviate filters or the local
+        index), and "next_cursor" in the response fetches the following page.
+        An empty query with filters browses matches by compatibility score.
+        
         Args:
-            query: Natural language query
+            query: Natural language query (may be empty when filters are given)
             limit: Maximum number of results to return
-            
+            filters: Explicit filters (see query_planner.build_filters)
+            cursor: next_cursor of the previous page
+        
         Returns:
             Dictionary with RAG-processed query results and metadata
+        
+        Raises:
+            ValueError: If the filters or the cursor are invalid
+        """
+        limit = limit or self.max_results
+        conditions = build_filters(filters)
+        fingerprint = self._query_fingerprint(query, conditions)
+        offset, returned = decode_cursor(cursor, fingerprint) if cursor else (0, [])
+        
+        cache_key = self.query_cache.make_key(
+            query, limit, self.collection_version, (offset, tuple(returned), json.dumps(conditions, sort_keys=True))
+        )
+        
+        result = self.query_cache.get(cache_key)
+        if result is not None:
+            result["query"] = query
+            result["cached"] = True
+            logger.info(f"💾 Served query '{query}' from cache")
+            return result
+        
+        self.ensure_connection()
+        result = self._execute_query(query, limit, conditions, offset, returned)
+        if not result.get("error"):
+            next_offset = result.pop("next_offset", None)
+            next_returned = result.pop("next_returned", [])
+            result["next_cursor"] = (encode_cursor(next_offset, fingerprint, next_returned)
+                                     if next_offset is not None else None)
+            self.query_cache.set(cache_key, result)
+        result["cached"] = False
+        return result
+    
+    def _query_fingerprint(self, query: str, conditions: List[Tuple[str, str, Any]]) -> str:
+        """Short hash tying a cursor to its query and filters."""
+        payload = json.dumps([normalize_query(query), conditions], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+    
+    def _execute_query(self, query: str, limit: int, filters: Optional[List[Tuple[str, str, Any]]] = None,
+                       offset: int = 0, returned: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Run a query through the structured fast path or the RAG pipeline.
+        
+        Args:
+            query: Natural language query
+            limit: Maximum number of results to return
+            filters: Property conditions every result must satisfy
+            offset: Position of the page in the result order
+            returned: Retrieval positions past offset already returned on earlier pages (RAG only)
+        
+        Returns:
+            Dictionary with query results and metadata ("next_offset", and for RAG
+            "next_returned", when more results exist)
         """
+        filters = filters or []
         try:
-            limit = limit or self.max_results
-            
-            # Step 1: Retrieval - Get broader candidate pool via vector search
-            retrieval_limit = min(limit * 3, 10)  # Get more candidates for LLM to analyze
-            vector_candidates = self._vector_retrieval(query, retrieval_limit)
+            # Browsing with filters only: best compatibility first
+            if not query.strip():
+                return self._structured_query(query, QueryPlan("score", "compatibility_score", True, filters), limit, offset)
+            
+            plan = plan_query(query) if self.structured_queries else None
+            if plan:
+                plan.filters.extend(filters)
+                return self._structured_query(query, plan, limit, offset)
+            
+            # Exact name and identifier queries and mention lookups are answered by BM25 alone
+            if self._ensure_lexical_index() and self.lexical_index.covers(query):
+                return self._keyword_query(query, limit, filters, offset)
+            
+            # Step 1: Retrieval - Get broader candidate pool via hybrid (vector + BM25) search.
+            # The LLM may pick from anywhere in the pool, so the cursor records which
+            # retrieval positions were returned: those are skipped on later pages, while
+            # candidates it did not pick are offered again.
+            returned = set(returned or [])
+            retrieval_limit = max(limit, min(limit * self.retrieval_multiplier, self.max_retrieval))
+            retrieved = self._hybrid_retrieval(query, len(returned) + retrieval_limit + 1, filters, offset)
+            remaining = [(position, candidate) for position, candidate in enumerate(retrieved, offset)
+                         if position not in returned]
+            vector_candidates = []
+            for position, candidate in remaining[:retrieval_limit]:
+                candidate["_position"] = position
+                vector_candidates.append(candidate)
             
             if not vector_candidates:
                 return {
@@ -266,18 +559,31 @@ class AIAssistant:
             
             # Step 2: LLM Analysis - Intelligent ranking based on actual personality scores
             rag_results = self._llm_analyze_and_rank(query, vector_candidates, limit)
+            returned.update(result.pop("_position") for result in rag_results)
+            for candidate in vector_candidates:
+                candidate.pop("_position", None)
+            
+            # Positions returned without a gap fold into the offset, keeping the cursor small
+            next_offset = offset
+            while next_offset in returned:
+                returned.remove(next_offset)
+                next_offset += 1
+            has_more = bool(rag_results) and len(remaining) > len(rag_results)
             
             response = {
                 "query": query,
                 "results_count": len(rag_results),
                 "candidates": rag_results,
                 "retrieval_count": len(vector_candidates),
+                "strategy": "hybrid",
+                "next_offset": next_offset if has_more else None,
+                "next_returned": sorted(returned),
                 "timestamp": datetime.now().isoformat()
             }
             
             logger.info(f"🧠 RAG Query '{query}' processed {len(vector_candidates)} candidates, returned {len(rag_results)} results")
             return response
-            
+        
         except Exception as e:
             logger.error(f"❌ Failed to process RAG query: {e}")
             return {
@@ -288,55 +594,143 @@ class AIAssistant:
                 "timestamp": datetime.now().isoformat()
             }
     
-    def _vector_retrieval(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    def _hybrid_retrieval(self, query: str, limit: int, filters: Optional[List[Tuple[str, str, Any]]] = None,
+                          offset: int = 0) -> List[Dict[str, Any]]:
         """
-        Perform vector search to retrieve candidate pool.
+        Perform vector and BM25 search and fuse them with reciprocal rank fusion.
         
         Args:
             query: Search query
             limit: Number of candidates to retrieve
-            
+            filters: Property conditions applied by both retrievers
+            offset: Number of best fused candidates to skip
+        
         Returns:
-            List of candidate dictionaries
+            List of candidate dictionaries (vector_relevance_score holds the fused score)
         """
+        # Both rankings must reach past the offset for the fused order to be stable across pages
+        depth = offset + limit
         try:
-            collection = self.client.collections.get(self.collection_name)
-            
-            # Perform vector search using Mistral embeddings
-            results = collection.query.near_text(
-                query=query,
-                limit=limit,
-                return_metadata=wvc.query.MetadataQuery(score=True)
-            )
-            
-            # Format candidates for LLM analysis
-            candidates = []
-            for result in results.objects:
-                candidate = {
-                    "name": result.properties.get("name"),
-                    "position": result.properties.get("position"),
-                    "candidate_id": result.properties.get("candidate_id"),
-                    "compatibility_score": result.properties.get("compatibility_score"),
-                    "recommendation": result.properties.get("recommendation"),
-                    "summary": result.properties.get("summary"),
-                    "strengths": result.properties.get("strengths", []),
-                    "concerns": result.properties.get("concerns", []),
-                    "personality_traits": {
-                        "openness": result.properties.get("openness"),
-                        "conscientiousness": result.properties.get("conscientiousness"),
-                        "extraversion": result.properties.get("extraversion"),
-                        "agreeableness": result.properties.get("agreeableness"),
-                        "neuroticism": result.properties.get("neuroticism")
-                    },
-                    "vector_relevance_score": result.metadata.score if result.metadata else None
-                }
-                candidates.append(candidate)
-            
-            return candidates
-            
+            # Perform vector search (Mistral embeddings or the local embedder)
+            vector_hits = self.vector_store.near_text(query, depth, filters=filters)
         except Exception as e:
             logger.error(f"❌ Vector retrieval failed: {e}")
-            return []
+            vector_hits = []
+        
+        lexical_hits = self.lexical_index.search(query, depth, filters=filters)
+        fused = reciprocal_rank_fusion([vector_hits, lexical_hits], depth)[offset:]
+        
+        # Format candidates for LLM analysis
+        return [self._format_candidate(properties, score) for _, properties, score in fused]
+    
+    def _keyword_query(self, query: str, limit: int, filters: Optional[List[Tuple[str, str, Any]]] = None,
+                       offset: int = 0) -> Dict[str, Any]:
+        """
+        Answer a keyword query from the BM25 index (no embedding or LLM request).
+        
+        Args:
+            query: Search query whose terms all occur in the index
+            limit: Maximum number of results to return
+            filters: Property conditions every result must satisfy
+            offset: Number of best hits to skip
+        
+        Returns:
+            Dictionary with query results and metadata (same shape as RAG results)
+        """
+        hits = self.lexical_index.search(query, limit + 1, filters=filters, offset=offset)
+        
+        candidates = []
+        for rank, (_, properties, score) in enumerate(hits[:limit], offset + 1):
+            candidate = self._format_candidate(properties)
+            candidate["rank"] = rank
+            candidate["relevance_reasoning"] = f"Keyword match for '{query}' (BM25 score {score:.2f})"
+            candidates.append(candidate)
+        
+        logger.info(f"🔎 Keyword query '{query}' returned {len(candidates)} results")
+        return {
+            "query": query,
+            "results_count": len(candidates),
+            "candidates": candidates,
+            "retrieval_count": len(candidates),
+            "strategy": "keyword",
+            "next_offset": offset + limit if len(hits) > limit else None,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _ensure_lexical_index(self) -> bool:
+        """Build the BM25 index from the collection if no sync has filled it yet."""
+        if not self.lexical_index.is_built:
+            with self._sync_lock:
+                if self.lexical_index.is_built:
+                    return True
+                try:
+                    self.lexical_index.rebuild(self.vector_store.fetch_objects())
+                except Exception as e:
+                    logger.error(f"❌ Failed to build lexical index: {e}")
+                    return False
+        return True
+    
+    def _structured_query(self, query: str, plan: QueryPlan, limit: int, offset: int = 0) -> Dict[str, Any]:
+        """
+        Answer a trait, score or recommendation question with a property query.
+        
+        Args:
+            query: Original user query
+            plan: Structured plan for the query
+            limit: Maximum number of results to return
+            offset: Number of matching candidates to skip
+        
+        Returns:
+            Dictionary with query results and metadata (same shape as RAG results)
+        """
+        # "top 3" caps the whole result, across pages
+        if plan.limit is not None:
+            limit = max(0, min(limit, plan.limit - offset))
+        
+        # One extra hit tells whether another page exists
+        hits = self.vector_store.query_properties(plan.filters, plan.sort_by, plan.descending, limit + 1, offset)
+        has_more = len(hits) > limit and (plan.limit is None or offset + limit < plan.limit)
+        
+        candidates = []
+        for rank, (_, properties, _) in enumerate(hits[:limit], offset + 1):
+            candidate = self._format_candidate(properties)
+            candidate["rank"] = rank
+            candidate["relevance_reasoning"] = plan.explain(candidate)
+            candidate["key_traits"] = [plan.sort_by] if plan.intent == "trait" else []
+            candidates.append(candidate)
+        
+        logger.info(f"⚡ Structured query '{query}' ({plan.intent} by {plan.sort_by}) returned {len(candidates)} results")
+        return {
+            "query": query,
+            "results_count": len(candidates),
+            "candidates": candidates,
+            "retrieval_count": len(candidates),
+            "strategy": "structured",
+            "query_plan": plan.describe(),
+            "next_offset": offset + limit if has_more else None,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _format_candidate(self, properties: Dict[str, Any], score: Optional[float] = None) -> Dict[str, Any]:
+        """Convert stored candidate properties into a query result."""
+        return {
+            "name": properties.get("name"),
+            "position": properties.get("position"),
+            "candidate_id": properties.get("candidate_id"),
+            "compatibility_score": properties.get("compatibility_score"),
+            "recommendation": properties.get("recommendation"),
+            "summary": properties.get("summary"),
+            "strengths": properties.get("strengths", []),
+            "concerns": properties.get("concerns", []),
+            "personality_traits": {
+                "openness": properties.get("openness"),
+                "conscientiousness": properties.get("conscientiousness"),
+                "extraversion": properties.get("extraversion"),
+                "agreeableness": properties.get("agreeableness"),
+                "neuroticism": properties.get("neuroticism")
+            },
+            "vector_relevance_score": score
+        }
     
     def _llm_analyze_and_rank(self, query: str, candidates: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
         """
@@ -346,7 +740,7 @@ class AIAssistant:
             query: Original user query
             candidates: List of candidates from vector search
             limit: Number of top candidates to return
-            
+        
         Returns:
             List of ranked candidates with LLM analysis
         """
@@ -356,6 +750,10 @@ class AIAssistant:
                 logger.warning(f"⚠️ No candidates found for query: {query}")
                 return []
             
+            # Without an LLM keep the vector similarity order
+            if self.llm_client is None:
+                return candidates[:limit]
+            
             # Sort candidates deterministically to ensure consistent input order
             candidates_sorted = sorted(candidates, key=lambda x: (x['name'], x['compatibility_score']), reverse=True)
             
@@ -375,7 +773,7 @@ class AIAssistant:
    - Recommendation: {candidate['recommendation']}
    - Summary: {candidate['summary'][:200]}...
 """
-            
+
             # Create LLM prompt for intelligent analysis
             prompt = f"""You are an expert HR analyst tasked with ranking candidates based on a specific query.
 
@@ -407,10 +805,10 @@ RESPONSE FORMAT (JSON):
 
 Focus on NUMERICAL personality trait scores over text descriptions. Be precise and data-driven in your analysis."""
 
-            # Call Mistral LLM
+            # Call the LLM
             messages = [{"role": "user", "content": prompt}]
             
-            response = self.mistral_client.chat.complete(
+            response = self.llm_client.chat.complete(
                 model=self.ai_model,
                 messages=messages,
                 temperature=0.05,  # Even lower temperature for maximum consistency
@@ -452,7 +850,7 @@ Focus on NUMERICAL personality trait scores over text descriptions. Be precise a
             
             logger.info(f"🤖 LLM analyzed {len(candidates_sorted)} candidates, ranked top {len(ranked_results)}")
             return ranked_results[:limit]
-            
+        
         except Exception as e:
             logger.error(f"❌ LLM analysis failed: {e}")
             # Fallback to original vector search results with deterministic sorting
@@ -467,7 +865,7 @@ Focus on NUMERICAL personality trait scores over text descriptions. Be precise a
             llm_content: Raw LLM response text
             candidates: Original candidate list
             limit: Number of candidates to return
-            
+        
         Returns:
             Parsed analysis dict
         """
@@ -488,43 +886,72 @@ Focus on NUMERICAL personality trait scores over text descriptions. Be precise a
         }
     
     def get_candidate_stats(self) -> Dict[str, Any]:
-        """Get statistics about the candidates in the database."""
+        """
+        Get statistics about the candidates in the database.
+        
+        Stats are materialized when a sync changes the collection, so this
+        only queries the vector store once after startup or a reset.
+        """
         try:
-            collection = self.client.collections.get(self.collection_name)
-            
-            # Get total count
-            total_count = collection.aggregate.over_all(total_count=True)
-            
-            # Get recommendation distribution
-            recommendations = collection.aggregate.over_all(
-                group_by="recommendation"
-            )
-            
-            # Convert recommendations groups to dictionary
-            recommendations_dict = {}
-            if hasattr(recommendations, 'groups') and recommendations.groups:
-                for group in recommendations.groups:
-                    if hasattr(group, 'grouped_by') and hasattr(group, 'total_count'):
-                        # grouped_by is an object with properties, not a dict
-                        key = getattr(group.grouped_by, 'recommendation', 'Unknown')
-                        recommendations_dict[key] = group.total_count
-            
-            return {
-                "total_candidates": total_count.total_count,
-                "recommendations_distribution": recommendations_dict,
-                "collection_name": self.collection_name,
-                "timestamp": datetime.now().isoformat()
-            }
-            
+            if self._stats is None:
+                self._stats = self._compute_stats(
+                    self.vector_store.count(),
+                    self.vector_store.group_counts("recommendation")
+                )
+            return dict(self._stats, recommendations_distribution=dict(self._stats["recommendations_distribution"]))
+        
         except Exception as e:
             logger.error(f"❌ Failed to get candidate stats: {e}")
             return {"error": str(e)}
     
+    def _compute_stats(self, total: int, recommendations: Dict[str, int]) -> Dict[str, Any]:
+        """Build the stats payload (timestamp is when the stats were computed)."""
+        return {
+            "total_candidates": total,
+            "recommendations_distribution": dict(recommendations),
+            "collection_name": self.collection_name,
+            "timestamp": datetime.now().isoformat()
+        }
+    
     def close_connection(self):
-        """Close the Weaviate connection."""
-        if self.client:
-            self.client.close()
-            logger.info("🔌 Weaviate connection closed")
+        """Stop health monitoring and close the vector store connection."""
+        self.stop_health_monitor()
+        self.vector_store.close()
+
+
+def encode_cursor(offset: int, fingerprint: str, returned: Optional[List[int]] = None) -> str:
+    """Encode a page position (and positions past it already returned) as an opaque cursor tied to its query."""
+    state = {"offset": offset, "query": fingerprint}
+    if returned:
+        state["returned"] = returned
+    payload = json.dumps(state).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> Tuple[int, List[int]]:
+    """
+    Decode a cursor from encode_cursor.
+    
+    Returns:
+        Tuple of the offset and the sorted positions past it already returned
+    
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another query
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        offset = int(payload["offset"])
+        returned = sorted({int(position) for position in payload.get("returned", [])})
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if payload.get("query") != fingerprint or offset < 0 or any(position <= offset for position in returned):
+        raise ValueError("Cursor does not match this query and filters")
+    return offset, returned
+
+
+# Process-wide assistant shared by the API and background sync jobs
+_shared_assistant: Optional[AIAssistant] = None
+_shared_assistant_lock = threading.Lock()
 
 
 # Convenience functions for API endpoints
@@ -533,13 +960,26 @@ def create_ai_assistant() -> AIAssistant:
     return AIAssistant()
 
 
-def sync_candidates_auto() -> bool:
-    """Auto-sync candidates from compatibility scores file."""
-    try:
-        assistant = create_ai_assistant()
-        success = assistant.sync_candidates_from_file()
-        assistant.close_connection()
-        return success
-    except Exception as e:
-        logger.error(f"❌ Auto-sync failed: {e}")
-        return False 
\ No newline at end of file
+def get_shared_assistant() -> AIAssistant:
+    """
+    Return the process-wide AIAssistant, creating it on first use.
+    
+    The shared instance keeps one vector store connection (and Mistral
+    client) for the life of the process instead of one per caller. It is
+    used from the sync thread and request threads at once; see AIAssistant
+    for which operations are serialized.
+    """
+    global _shared_assistant
+    with _shared_assistant_lock:
+        if _shared_assistant is None:
+            _shared_assistant = create_ai_assistant()
+        return _shared_assistant
+
+
+def close_shared_assistant() -> None:
+    """Close the process-wide AIAssistant, if one was created."""
+    global _shared_assistant
+    with _shared_assistant_lock:
+        if _shared_assistant is not None:
+            _shared_assistant.close_connection()
+            _shared_assistant = None
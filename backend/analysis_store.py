@@ -0,0 +1,334 @@
+"""
+Analysis Store
+
+SQLite system of record for compatibility analyses:
+- runs: one row per analysis run (metadata and team insights)
+- teams: team snapshots, deduplicated by content
+- candidates: latest profile of every analyzed candidate
+- analyses: per-run candidate results, indexed by candidate, score and recommendation
+
+The database runs in WAL mode so the API, the CLI and the dashboard can read
+while a run is being written. compatibility_scores.json is still written as
+an export of the latest run (see export_json).
+"""
+
+import json
+import os
+import sqlite3
+import hashlib
+import uuid
+import logging
+from contextlib import contextmanager
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterator
+
+from serialization import dump_file, dumps, loads
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teams (
+    team_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_hash TEXT NOT NULL UNIQUE,
+    team_size INTEGER,
+    team_summary TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    team_id INTEGER REFERENCES teams(team_id),
+    candidates_count INTEGER NOT NULL,
+    analysis_metadata TEXT NOT NULL,
+    team_insights TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS candidates (
+    candidate_id TEXT PRIMARY KEY,
+    name TEXT,
+    position TEXT,
+    personality_traits TEXT,
+    last_run_id TEXT REFERENCES runs(run_id),
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS analyses (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    ordinal INTEGER NOT NULL,
+    candidate_id TEXT NOT NULL,
+    name TEXT,
+    compatibility_score REAL,
+    recommendation TEXT,
+    analysis TEXT NOT NULL,
+    PRIMARY KEY (run_id, ordinal)
+);
+
+CREATE INDEX IF NOT EXISTS idx_runs_created_at ON runs(created_at);
+CREATE INDEX IF NOT EXISTS idx_analyses_candidate ON analyses(candidate_id);
+CREATE INDEX IF NOT EXISTS idx_analyses_score ON analyses(run_id, compatibility_score DESC);
+CREATE INDEX IF NOT EXISTS idx_analyses_recommendation ON analyses(run_id, recommendation);
+"""
+
+
+def default_db_path() -> str:
+    """Database location: ANALYSIS_DB_FILE, the Docker data volume, or data/ locally."""
+    db_path = os.getenv("ANALYSIS_DB_FILE")
+    if db_path:
+        return db_path
+    if os.path.exists("/app/data/"):  # Docker path
+        return "/app/data/analysis.db"
+    return "data/analysis.db"
+
+
+class AnalysisStore:
+    """
+    Stores analysis runs in SQLite and serves indexed reads.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open (and if needed create) the analysis database.
+        
+        Args:
+            db_path: SQLite file (default: see default_db_path)
+        """
+        self.db_path = db_path or default_db_path()
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection per operation (safe across threads), committed on success."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    # Writes
+    
+    def save_run(self, results: Dict[str, Any], run_id: Optional[str] = None) -> str:
+        """
+        Record an analysis run in one transaction.
+        
+        The run id is also added to results["analysis_metadata"], so exports
+        of these results point back to the run. Saving a run id again replaces
+        the stored run (e.g. a resumed run whose export failed the first time).
+        
+        Args:
+            results: Output of CompatibilityAnalyzer.analyze_team_compatibility
+            run_id: Run identifier (default: analysis_metadata.run_id, else timestamp plus a
+                random suffix, sortable by time)
+        
+        Returns:
+            The run id
+        """
+        created_at = datetime.now()
+        metadata = results.setdefault("analysis_metadata", {})
+        run_id = run_id or metadata.get("run_id") or f"{created_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+        metadata["run_id"] = run_id
+        analyses = results.get("candidates_analysis", [])
+        id_counts = Counter(a.get("candidate_info", {}).get("id", "") for a in analyses)
+        
+        with self._connect() as conn:
+            team_id = self._save_team(conn, results.get("team_summary", {}), metadata.get("team_size"))
+            conn.execute("DELETE FROM analyses WHERE run_id = ?", (run_id,))
+            conn.execute(
+                "INSERT INTO runs (run_id, created_at, team_id, candidates_count, analysis_metadata, team_insights) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(run_id) DO UPDATE SET created_at=excluded.created_at, team_id=excluded.team_id, "
+                "candidates_count=excluded.candidates_count, analysis_metadata=excluded.analysis_metadata, "
+                "team_insights=excluded.team_insights",
+                (run_id, created_at.isoformat(), team_id, len(analyses),
+                 json.dumps(metadata), json.dumps(results.get("team_insights", {})))
+            )
+            
+            for ordinal, analysis in enumerate(analyses):
+                info = analysis.get("candidate_info", {})
+                overall = analysis.get("overall_recommendation", {})
+                # Same key scheme as the vector store: ids shared by several candidates get name and position
+                candidate_id = info.get("id", "")
+                if not candidate_id or id_counts[candidate_id] > 1:
+                    candidate_id = f"{candidate_id}|{info.get('name', '')}|{info.get('position', '')}"
+                
+                conn.execute(
+                    "INSERT INTO analyses (run_id, ordinal, candidate_id, name, compatibility_score, recommendation, analysis) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, ordinal, candidate_id, info.get("name"), overall.get("combined_score"),
+                     overall.get("status"), dumps(analysis, pretty=False).decode("utf-8"))
+                )
+                conn.execute(
+                    "INSERT INTO candidates (candidate_id, name, position, personality_traits, last_run_id, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(candidate_id) DO UPDATE SET name=excluded.name, position=excluded.position, "
+                    "personality_traits=excluded.personality_traits, last_run_id=excluded.last_run_id, "
+                    "updated_at=excluded.updated_at",
+                    (candidate_id, info.get("name"), info.get("position"),
+                     json.dumps(info.get("personality_traits", {})), run_id, created_at.isoformat())
+                )
+        
+        logger.info(f"🗄️ Stored analysis run {run_id} ({len(analyses)} candidates)")
+        return run_id
+    
+    def _save_team(self, conn: sqlite3.Connection, team_summary: Dict[str, Any], team_size: Optional[int]) -> int:
+        """Insert the team snapshot unless an identical one exists; return its id."""
+        content = json.dumps(team_summary, sort_keys=True)
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        
+        row = conn.execute("SELECT team_id FROM teams WHERE content_hash = ?", (content_hash,)).fetchone()
+        if row:
+            return row["team_id"]
+        
+        cursor = conn.execute(
+            "INSERT INTO teams (content_hash, team_size, team_summary, created_at) VALUES (?, ?, ?, ?)",
+            (content_hash, team_size, content, datetime.now().isoformat())
+        )
+        return cursor.lastrowid
+    
+    def delete_run(self, run_id: str) -> None:
+        """Delete a run and its analyses."""
+        with self._connect() as conn:
+            conn.execute("UPDATE candidates SET last_run_id = NULL WHERE last_run_id = ?", (run_id,))
+            conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+    
+    def import_json_if_empty(self, json_file: str) -> Optional[str]:
+        """
+        Seed an empty database from an existing compatibility_scores.json.
+        
+        Returns:
+            The imported run id, or None if the database already has runs or the file is missing
+        """
+        if self.latest_run_id() is not None or not os.path.exists(json_file):
+            return None
+        
+        with open(json_file, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+        return self.save_run(results)
+    
+    # Reads
+    
+    def latest_run_id(self) -> Optional[str]:
+        """Id of the most recent run, or None."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT run_id FROM runs ORDER BY created_at DESC, run_id DESC LIMIT 1").fetchone()
+        return row["run_id"] if row else None
+    
+    def list_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent runs first (without candidate results)."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT run_id, created_at, candidates_count FROM runs ORDER BY created_at DESC, run_id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def load_run(self, run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild the analyzer output of a run (same shape as compatibility_scores.json).
+        
+        Args:
+            run_id: Run to load (default: the latest run)
+        
+        Returns:
+            Results dictionary, or None if there is no such run
+        """
+        run_id = run_id or self.latest_run_id()
+        if run_id is None:
+            return None
+        
+        with self._connect() as conn:
+            run = conn.execute(
+                "SELECT runs.*, teams.team_summary FROM runs LEFT JOIN teams ON teams.team_id = runs.team_id "
+                "WHERE run_id = ?", (run_id,)
+            ).fetchone()
+            if run is None:
+                return None
+            analyses = conn.execute(
+                "SELECT analysis FROM analyses WHERE run_id = ? ORDER BY ordinal", (run_id,)
+            ).fetchall()
+        
+        return {
+            "analysis_metadata": json.loads(run["analysis_metadata"]),
+            "team_summary": json.loads(run["team_summary"]) if run["team_summary"] else {},
+            "candidates_analysis": [loads(row["analysis"]) for row in analyses],
+            "team_insights": json.loads(run["team_insights"])
+        }
+    
+    def query_analyses(self, run_id: Optional[str] = None, recommendation: Optional[str] = None,
+                       min_score: Optional[float] = None, limit: Optional[int] = None,
+                       offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Candidate analyses of a run, best compatibility first.
+        
+        Args:
+            run_id: Run to read (default: the latest run)
+            recommendation: Only this recommendation status
+            min_score: Minimum compatibility score
+            limit: Maximum number of analyses (default: all)
+            offset: Number of analyses to skip
+        
+        Returns:
+            Candidate analysis dictionaries as stored in the run
+        """
+        run_id = run_id or self.latest_run_id()
+        if run_id is None:
+            return []
+        
+        sql = "SELECT analysis FROM analyses WHERE run_id = ?"
+        params: List[Any] = [run_id]
+        if recommendation:
+            sql += " AND recommendation = ?"
+            params.append(recommendation)
+        if min_score is not None:
+            sql += " AND compatibility_score >= ?"
+            params.append(min_score)
+        sql += " ORDER BY compatibility_score DESC, ordinal LIMIT ? OFFSET ?"
+        params.extend([limit if limit is not None else -1, offset])
+        
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [loads(row["analysis"]) for row in rows]
+    
+    def candidate_history(self, candidate_id: str) -> List[Dict[str, Any]]:
+        """Score and recommendation of a candidate across runs, newest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT analyses.run_id, runs.created_at, compatibility_score, recommendation "
+                "FROM analyses JOIN runs ON runs.run_id = analyses.run_id "
+                "WHERE candidate_id = ? ORDER BY runs.created_at DESC",
+                (candidate_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    # Export
+    
+    def export_json(self, output_file: str, run_id: Optional[str] = None) -> bool:
+        """
+        Write a run as compatibility_scores.json (atomically replaced).
+        
+        Args:
+            output_file: Destination path
+            run_id: Run to export (default: the latest run)
+        
+        Returns:
+            bool: Whether a run was exported
+        """
+        results = self.load_run(run_id)
+        if results is None:
+            return False
+        
+        dump_file(results, output_file)
+        return True
@@ -8,9 +8,11 @@ Provides REST API endpoints for:
 """
 import uvicorn
 import os
+import hmac
+import asyncio
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Dict, Any, List
 import logging
@@ -19,11 +21,20 @@ from datetime import datetime
 # Import our existing classes
 from interview_manager import InterviewManager
 from compatibility_analyzer import CompatibilityAnalyzer
-from ai_assistant import AIAssistant, sync_candidates_auto
+from llm_scheduler import INTERACTIVE
+from ai_assistant import get_shared_assistant, close_shared_assistant
+from transcript_ingestion import TranscriptIngestionService
+from sync_service import CandidateSyncService
+from analysis_store import AnalysisStore
+from run_snapshots import RunSnapshotStore
+from interview_index import InterviewStatusIndex
+from serialization import FastJSONResponse
+from checkpoint import RunCheckpoint, list_checkpoints, prune_checkpoints
 
 # Import models from separate file
 from models import (
     CreateInterviewRequest, InterviewResponse, TranscriptResponse,
+    BatchCreateInterviewRequest, BatchInterviewResponse, InterviewHistoryResponse,
     CompatibilityAnalysisRequest, PersonalityExtractionRequest, HealthResponse, StatusResponse,
     CandidateQueryRequest, CandidateQueryResponse, CandidateResult, SyncRequest, SyncResponse, CandidateStatsResponse
 )
@@ -36,19 +47,53 @@ logger = logging.getLogger(__name__)
 interview_manager = None
 compatibility_analyzer = None
 ai_assistant = None
+transcript_ingestion = None
+sync_service = None
+analysis_store = None
+run_snapshots = None
+interview_index = None
+
+def _compatibility_scores_file() -> str:
+    """Path of the compatibility_scores.json export (same resolution as the AI assistant)."""
+    data_file_path = os.getenv("COMPATIBILITY_SCORES_FILE")
+    if data_file_path:
+        return data_file_path
+    if os.path.exists("/app/data/"):  # Docker path
+        return "/app/data/compatibility_scores.json"
+    return "data/compatibility_scores.json"
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
     # Startup
-    global interview_manager, compatibility_analyzer, ai_assistant
+    global interview_manager, compatibility_analyzer, ai_assistant, transcript_ingestion, interview_index, sync_service, analysis_store, run_snapshots
     try:
         interview_manager = InterviewManager()
+        interview_index = InterviewStatusIndex(interview_manager)
         compatibility_analyzer = CompatibilityAnalyzer()
+        # Analysis runs are recorded in SQLite; compatibility_scores.json is an export
+        analysis_store = AnalysisStore()
+        analysis_store.import_json_if_empty(_compatibility_scores_file())
+        # Immutable per-run JSON snapshots with a latest pointer
+        run_snapshots = RunSnapshotStore()
+        # Checkpoints of runs that failed and were never resumed
+        prune_checkpoints()
+        # Background transcript ingestion (detects completed interviews and precomputes traits)
+        if os.getenv("TRANSCRIPT_INGESTION_ENABLED", "true").lower() == "true":
+            transcript_ingestion = TranscriptIngestionService(
+                interview_manager,
+                traits_extractor=compatibility_analyzer.traits_extractor
+            )
+            transcript_ingestion.start()
         # AI assistant initialization is optional (requires Weaviate credentials)
         try:
-            ai_assistant = AIAssistant()
+            ai_assistant = get_shared_assistant()
+            ai_assistant.start_health_monitor()
             logger.info("✅ AI Assistant initialized successfully")
+            # Background auto-sync of the scores file into the vector store
+            if ai_assistant.auto_sync:
+                sync_service = CandidateSyncService(ai_assistant)
+                sync_service.start()
         except Exception as ai_e:
             logger.warning(f"⚠️ AI Assistant initialization failed: {ai_e}")
             ai_assistant = None
@@ -60,8 +105,11 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
-    if ai_assistant:
-        ai_assistant.close_connection()
+    if transcript_ingestion:
+        transcript_ingestion.stop()
+    if sync_service:
+        sync_service.stop()
+    close_shared_assistant()
     logger.info("🔄 API shutting down")
 
 # Initialize FastAPI app with lifespan
@@ -96,8 +144,12 @@ async def get_status():
     """Get API status and configuration."""
     # Get rate limit info safely
     rate_limit_info = {"requests_per_second": "unknown"}
-    if compatibility_analyzer and hasattr(compatibility_analyzer, 'rate_limiter'):
-        rate_limit_info["requests_per_second"] = compatibility_analyzer.rate_limiter.requests_per_second
+    if compatibility_analyzer and hasattr(compatibility_analyzer, 'llm_router'):
+        llm_stats = compatibility_analyzer.llm_router.get_stats()
+        rate_limit_info["requests_per_second"] = llm_stats["requests_per_second_limit"]
+        rate_limit_info["routing_strategy"] = llm_stats["strategy"]
+        rate_limit_info["providers"] = llm_stats["providers"]
+        rate_limit_info["scheduler"] = compatibility_analyzer.llm_scheduler.get_stats()
     
     return StatusResponse(
         status="operational",
@@ -105,7 +157,10 @@ async def get_status():
         interview_manager_available=interview_manager is not None,
         compatibility_analyzer_available=compatibility_analyzer is not None,
         ai_assistant_available=ai_assistant is not None,
-        rate_limit_info=rate_limit_info
+        rate_limit_info=rate_limit_info,
+        transcript_ingestion=transcript_ingestion.get_status() if transcript_ingestion else None,
+        ai_assistant_connection=ai_assistant.connection_status() if ai_assistant else None,
+        candidate_sync=sync_service.get_status() if sync_service else None
     )
 
 # Interview Management Endpoints
@@ -123,15 +178,50 @@ async def create_interview(request: CreateInterviewRequest):
             candidate_email=request.candidate_email or ""
         )
         
+        if interview_index:
+            interview_index.upsert_interviews([
+                interview_manager._build_interview_record(result, request.candidate_email or "")
+            ])
+        
         return InterviewResponse(**result)
         
     except Exception as e:
         logger.error(f"Error creating interview: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to create interview: {str(e)}")
 
+@app.post("/interviews/batch", response_model=BatchInterviewResponse)
+async def create_interviews_batch(request: BatchCreateInterviewRequest):
+    """Create many AI interviews at once, provisioning agents concurrently."""
+    if not interview_manager:
+        raise HTTPException(status_code=503, detail="Interview manager not available")
+    
+    if not request.interviews:
+        raise HTTPException(status_code=400, detail="At least one interview is required")
+    
+    try:
+        # Provisioning blocks on the Beyond Presence API - keep it off the event loop
+        result = await asyncio.to_thread(
+            interview_manager.create_interviews_batch,
+            [interview.model_dump() for interview in request.interviews],
+            request.max_concurrency,
+            request.requests_per_second
+        )
+        
+        if interview_index:
+            created = {item["agent_id"] for item in result["results"] if item["success"]}
+            saved_interviews = interview_manager.get_saved_interviews()
+            interview_index.upsert_interviews([saved_interviews[agent_id] for agent_id in created if agent_id in saved_interviews])
+        
+        return BatchInterviewResponse(**result)
+        
+    except Exception as e:
+        logger.error(f"Error creating interview batch: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to create interviews: {str(e)}")
+
 @app.get("/interviews/{agent_id}/transcript", response_model=TranscriptResponse)
-async def get_transcript(agent_id: str, candidate_name: str = None, role: str = None):
-    """Get interview transcript for an agent."""
+async def get_transcript(agent_id: str, candidate_name: str = None, role: str = None,
+                         since: int = Query(None, ge=0)):
+    """Get interview transcript for an agent (only messages after `since` when given)."""
     if not interview_manager:
         raise HTTPException(status_code=503, detail="Interview manager not available")
     
@@ -139,7 +229,8 @@ async def get_transcript(agent_id: str, candidate_name: str = None, role: str =
         result = interview_manager.get_transcript(
             agent_id=agent_id,
             candidate_name=candidate_name,
-            role=role
+            role=role,
+            since=since
         )
         
         return TranscriptResponse(**result)
@@ -162,14 +253,33 @@ async def list_interviews():
         logger.error(f"Error listing interviews: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to list interviews: {str(e)}")
 
+@app.get("/interviews/history", response_model=InterviewHistoryResponse)
+async def get_interview_history(page: int = 1, page_size: int = 20, status: str = None):
+    """Get interview history with real statuses from the materialized status index."""
+    if not interview_manager or not interview_index:
+        raise HTTPException(status_code=503, detail="Interview manager not available")
+    
+    try:
+        # Pick up status changes from the calls API at most once per refresh interval
+        await asyncio.to_thread(interview_index.refresh_if_stale)
+    except Exception as e:
+        logger.warning(f"⚠️ Interview index refresh failed, serving last known statuses: {e}")
+    
+    try:
+        return InterviewHistoryResponse(**interview_index.get_page(page, page_size, status))
+        
+    except Exception as e:
+        logger.error(f"Error reading interview history: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to read interview history: {str(e)}")
+
 @app.get("/interviews/saved")
-async def get_saved_interviews():
-    """Get all saved interviews from the tracking file."""
+async def get_saved_interviews(full: bool = False):
+    """Get all saved interviews from the tracking file (slim records unless full=true)."""
     if not interview_manager:
         raise HTTPException(status_code=503, detail="Interview manager not available")
     
     try:
-        saved_interviews = interview_manager.get_saved_interviews()
+        saved_interviews = interview_manager.get_saved_interviews(full=full)
         return {
             "saved_interviews": saved_interviews,
             "count": len(saved_interviews)
@@ -179,6 +289,26 @@ async def get_saved_interviews():
         logger.error(f"Error retrieving saved interviews: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve saved interviews: {str(e)}")
 
+@app.get("/interviews/{agent_id}/system-prompt")
+async def get_interview_system_prompt(agent_id: str):
+    """Get the system prompt of a saved interview, rendered from its template reference."""
+    if not interview_manager:
+        raise HTTPException(status_code=503, detail="Interview manager not available")
+    
+    try:
+        system_prompt = interview_manager.get_system_prompt(agent_id)
+    except Exception as e:
+        logger.error(f"Error rendering system prompt: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to render system prompt: {str(e)}")
+    
+    if system_prompt is None:
+        raise HTTPException(status_code=404, detail="No saved interview found for this agent")
+    
+    return {
+        "agent_id": agent_id,
+        "system_prompt": system_prompt
+    }
+
 @app.get("/interviews/{agent_id}/transcript/download")
 async def download_transcript(agent_id: str, filename: str = None):
     """Download transcript as a file."""
@@ -223,6 +353,31 @@ async def download_transcript(agent_id: str, filename: str = None):
         logger.error(f"Error preparing transcript download: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to prepare transcript download: {str(e)}")
 
+@app.post("/webhooks/interviews/call-ended")
+async def interview_call_ended_webhook(payload: Dict[str, Any], x_webhook_secret: str = Header(None)):
+    """Receive a call-ended event and ingest the finished interview's transcript."""
+    secret = os.getenv("INTERVIEW_WEBHOOK_SECRET")
+    if not secret:
+        raise HTTPException(status_code=503, detail="Interview webhook not configured (set INTERVIEW_WEBHOOK_SECRET)")
+    if not x_webhook_secret or not hmac.compare_digest(x_webhook_secret.encode("utf-8"), secret.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid webhook secret")
+    if not transcript_ingestion:
+        raise HTTPException(status_code=503, detail="Transcript ingestion not available")
+    
+    try:
+        candidate_file = await asyncio.to_thread(transcript_ingestion.handle_webhook, payload)
+        return {
+            "success": True,
+            "call_id": payload.get("call_id") or payload.get("id"),
+            "candidate_file": candidate_file
+        }
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error ingesting transcript from webhook: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to ingest transcript: {str(e)}")
+
 # Compatibility Analysis Endpoints
 
 @app.post("/analysis/compatibility")
@@ -231,58 +386,137 @@ async def analyze_compatibility(request: CompatibilityAnalysisRequest):
     if not compatibility_analyzer:
         raise HTTPException(status_code=503, detail="Compatibility analyzer not available")
     
+    # Progress is checkpointed; resume_run_id continues an interrupted run
+    try:
+        checkpoint = RunCheckpoint.resume(request.resume_run_id) if request.resume_run_id else RunCheckpoint()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Convert Pydantic models to dictionaries using model_dump()
+    team_data = request.team_data.model_dump()
+    
+    # A resumed run must analyze the team it was started for
+    try:
+        await asyncio.to_thread(checkpoint.start, team_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
-        # Convert Pydantic models to dictionaries using model_dump()
-        team_data = request.team_data.model_dump()
         candidates_data_list = [{"candidate": candidate.model_dump()} for candidate in request.candidates_data.candidates]
         
-        # Run the analysis directly with JSON data
-        results = compatibility_analyzer.analyze_team_compatibility(
+        # Run the analysis directly with JSON data; its LLM calls wait in the scheduler,
+        # so keep them off the event loop
+        logger.info(f"📍 Checkpointing analysis run {checkpoint.run_id}")
+        results = await asyncio.to_thread(
+            compatibility_analyzer.analyze_team_compatibility,
             team_data=team_data,
-            candidates_data_list=candidates_data_list
+            candidates_data_list=candidates_data_list,
+            checkpoint=checkpoint
         )
         
-        # Save results to file before auto-sync
+        # Record the run, then export it to file before auto-sync
         try:
+            if analysis_store:
+                analysis_store.save_run(results)
+            if run_snapshots:
+                run_snapshots.write(results)
+            
             # Use the same path resolution as AI assistant to ensure consistency
-            data_file_path = os.getenv("COMPATIBILITY_SCORES_FILE")
-            if data_file_path:
-                output_file = data_file_path
-            elif os.path.exists("/app/data/"):  # Docker path
-                output_file = "/app/data/compatibility_scores.json"
-            else:  # Local development path
-                output_file = "data/compatibility_scores.json"
-                # Ensure data directory exists for local development
-                os.makedirs("data", exist_ok=True)
+            output_file = _compatibility_scores_file()
+            if os.path.dirname(output_file):
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
             compatibility_analyzer.save_results(results, output_file)
             logger.info(f"✅ Results saved to {output_file}")
+            checkpoint.delete()
         except Exception as save_e:
             logger.error(f"❌ Error saving results: {save_e}")
             # Continue with auto-sync even if save fails
         
-        # Auto-sync candidates to Weaviate if AI assistant is available and auto-sync is enabled
-        if ai_assistant and ai_assistant.auto_sync:
-            try:
-                logger.info("⏳ Waiting 2 seconds before auto-sync...")
-                import asyncio
-                await asyncio.sleep(2)  # Wait 2 seconds for file to be properly written
-                logger.info("🔄 Auto-syncing candidates to Weaviate...")
-                sync_success = ai_assistant.sync_candidates_from_file()
-                if sync_success:
-                    logger.info("✅ Auto-sync completed successfully")
-                else:
-                    logger.warning("⚠️ Auto-sync failed - check logs")
-            except Exception as sync_e:
-                logger.error(f"❌ Auto-sync error: {sync_e}")
-                # Don't fail the analysis if sync fails
+        # Auto-sync runs in the background sync service (debounced, off the request path)
+        if sync_service:
+            sync_service.notify("compatibility analysis saved")
         
-        return results
+        # Large result sets skip FastAPI's jsonable_encoder
+        return FastJSONResponse(results)
                     
     except Exception as e:
         logger.error(f"Error in compatibility analysis: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to analyze compatibility: {str(e)}")
 
+@app.get("/analysis/checkpoints")
+async def list_analysis_checkpoints():
+    """List interrupted analysis runs that can be resumed with resume_run_id."""
+    try:
+        return {"checkpoints": list_checkpoints()}
+    except Exception as e:
+        logger.error(f"Error listing analysis checkpoints: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to list analysis checkpoints: {str(e)}")
+
+@app.get("/analysis/runs")
+async def list_analysis_runs():
+    """List stored analysis run snapshots, newest first."""
+    if not run_snapshots:
+        raise HTTPException(status_code=503, detail="Run snapshots not available")
+    
+    try:
+        return {"latest": run_snapshots.latest_run_id(), "runs": run_snapshots.list_runs()}
+    except Exception as e:
+        logger.error(f"Error listing analysis runs: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to list analysis runs: {str(e)}")
+
+@app.get("/analysis/runs/{run_id}")
+async def get_analysis_run(run_id: str):
+    """Get the results of one analysis run ("latest" for the most recent run)."""
+    if not run_snapshots:
+        raise HTTPException(status_code=503, detail="Run snapshots not available")
+    
+    results = run_snapshots.load(None if run_id == "latest" else run_id)
+    if results is None:
+        raise HTTPException(status_code=404, detail=f"Analysis run not found: {run_id}")
+    return FastJSONResponse(results)
+
+@app.get("/analysis/results/latest")
+async def get_latest_analysis_results():
+    """Get the latest run from the analysis store (results plus run_id and created_at)."""
+    if not analysis_store:
+        raise HTTPException(status_code=503, detail="Analysis store not available")
+    
+    try:
+        runs = await asyncio.to_thread(analysis_store.list_runs, 1)
+        results = await asyncio.to_thread(analysis_store.load_run, runs[0]["run_id"]) if runs else None
+    except Exception as e:
+        logger.error(f"Error reading the analysis store: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to read analysis results: {str(e)}")
+    
+    if results is None:
+        raise HTTPException(status_code=404, detail="No analysis run stored yet")
+    return FastJSONResponse({"run_id": runs[0]["run_id"], "created_at": runs[0]["created_at"], "results": results})
+
+@app.get("/analysis/results/latest/candidates")
+async def get_latest_candidate_analyses(recommendation: str = None, min_score: float = None,
+                                        limit: int = Query(None, ge=1), offset: int = Query(0, ge=0)):
+    """Get candidate analyses of the latest stored run, best compatibility first."""
+    if not analysis_store:
+        raise HTTPException(status_code=503, detail="Analysis store not available")
+    
+    try:
+        runs = await asyncio.to_thread(analysis_store.list_runs, 1)
+        if not runs:
+            raise HTTPException(status_code=404, detail="No analysis run stored yet")
+        candidates = await asyncio.to_thread(
+            analysis_store.query_analyses, runs[0]["run_id"], recommendation, min_score, limit, offset
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error reading the analysis store: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to read candidate analyses: {str(e)}")
+    
+    return FastJSONResponse({"run_id": runs[0]["run_id"], "created_at": runs[0]["created_at"], "candidates": candidates})
+
 @app.post("/analysis/personality-extract")
 async def extract_personality(request: PersonalityExtractionRequest):
     """Extract personality traits from interview responses."""
@@ -330,6 +564,7 @@ async def sync_candidates(request: SyncRequest = None):
                 success=True,
                 message=f"Successfully synced {candidates_synced} candidates to Weaviate",
                 candidates_synced=candidates_synced,
+                changes=ai_assistant.last_sync_result,
                 timestamp=datetime.now().isoformat()
             )
         else:
@@ -350,7 +585,8 @@ async def query_candidates(request: CandidateQueryRequest):
         raise HTTPException(status_code=503, detail="AI Assistant not available - check Weaviate configuration")
     
     try:
-        result = ai_assistant.query_candidates(request.query, request.limit)
+        filters = request.filters.model_dump(exclude_none=True) if request.filters else None
+        result = ai_assistant.query_candidates(request.query, request.limit, filters=filters, cursor=request.cursor)
         
         # Convert to response model format
         candidates = []
@@ -362,9 +598,14 @@ async def query_candidates(request: CandidateQueryRequest):
             results_count=result["results_count"],
             candidates=candidates,
             timestamp=result["timestamp"],
+            strategy=result.get("strategy"),
+            cached=result.get("cached", False),
+            next_cursor=result.get("next_cursor"),
             error=result.get("error")
         )
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying candidates: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to query candidates: {str(e)}")
@@ -407,14 +648,14 @@ async def ai_chat(request: Dict[str, Any]):
         if is_candidate_query and ai_assistant:
             # Use AI Assistant for candidate-related queries
             try:
-                candidate_results = ai_assistant.query_candidates(latest_message, limit=5)
+                candidate_results = await asyncio.to_thread(ai_assistant.query_candidates, latest_message, limit=5)
                 
                 if candidate_results.get("results_count", 0) > 0:
                     # Format candidate data for conversational response
                     response_text = _format_candidate_response(latest_message, candidate_results)
                 else:
                     # No candidates found, but provide helpful context
-                    stats = ai_assistant.get_candidate_stats()
+                    stats = await asyncio.to_thread(ai_assistant.get_candidate_stats)
                     if stats.get("total_candidates", 0) > 0:
                         response_text = f"I couldn't find candidates matching '{latest_message}' specifically, but I have access to {stats['total_candidates']} candidates in the database. Try asking about specific traits like 'most outgoing', 'best team player', 'highest compatibility', or 'most creative' candidates."
                     else:
@@ -423,7 +664,8 @@ async def ai_chat(request: Dict[str, Any]):
                 return {
                     "response": response_text,
                     "success": True,
-                    "source": "candidate_database"
+                    "source": "candidate_database",
+                    "cached": candidate_results.get("cached", False)
                 }
                 
             except Exception as e:
@@ -435,13 +677,16 @@ async def ai_chat(request: Dict[str, Any]):
             raise HTTPException(status_code=503, detail="AI service not available")
         
         # Enhance the system message for better context
-        enhanced_messages = _enhance_messages_for_context(messages, ai_assistant)
+        enhanced_messages = await asyncio.to_thread(_enhance_messages_for_context, messages, ai_assistant)
         
         # Get the model from environment
         model = os.getenv('MISTRAL_MODEL', 'mistral-small-latest')
         
-        # Make the chat request using the existing AI client
-        response = compatibility_analyzer.client.chat.complete(
+        # Chat is interactive: it is scheduled ahead of queued analysis calls, and waits
+        # for its turn in a worker thread
+        chat_client = compatibility_analyzer.llm_scheduler.client(INTERACTIVE, source="chat")
+        response = await asyncio.to_thread(
+            chat_client.chat.complete,
             model=model,
             messages=enhanced_messages,
             temperature=temperature,
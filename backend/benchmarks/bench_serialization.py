@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark for result serialization
+
+Compares, on a synthetic 10k-candidate analysis result:
+- json.dump(indent=2) (the previous file format) against serialization.dumps
+- FastAPI's jsonable_encoder + JSONResponse against FastJSONResponse
+
+Usage:
+    python benchmarks/bench_serialization.py [--candidates 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import serialization
+from serialization import FastJSONResponse
+
+TRAITS = ["openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism"]
+STATUSES = ["RECOMMENDED", "CONDITIONAL", "NOT RECOMMENDED"]
+
+
+def build_results(count: int) -> dict:
+    """Analyzer-shaped output with `count` candidates."""
+    rng = random.Random(42)
+    candidates = []
+    for i in range(count):
+        score = round(rng.random(), 3)
+        candidates.append({
+            "candidate_info": {
+                "id": f"candidate-{i}",
+                "name": f"Candidate {i}",
+                "position": rng.choice(["Backend Engineer", "Frontend Engineer", "Data Engineer"]),
+                "personality_traits": {trait: round(rng.random(), 2) for trait in TRAITS}
+            },
+            "mathematical_compatibility": {
+                "trait_compatibility": {trait: round(rng.random(), 3) for trait in TRAITS},
+                "overall_score": score
+            },
+            "ai_analysis": {
+                "team_fit_score": score,
+                "strengths": ["Collaborative communication style", "Strong ownership"],
+                "potential_challenges": ["May need support with ambiguity"],
+                "reasoning": "Balanced profile relative to the team averages. " * 4
+            },
+            "overall_recommendation": {
+                "status": rng.choice(STATUSES),
+                "combined_score": score,
+                "confidence": "medium"
+            }
+        })
+    return {
+        "analysis_metadata": {"candidates_count": count, "analysis_timestamp": "2026-01-01T00:00:00"},
+        "team_summary": {"team_size": 8, "average_traits": {trait: 0.5 for trait in TRAITS}},
+        "candidates_analysis": candidates,
+        "team_insights": {"recommended_candidates": count // 3}
+    }
+
+
+def timed(label: str, func, repeat: int) -> float:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func()
+        best = min(best, time.perf_counter() - start)
+        size = len(output)
+    print(f"  {label:<40} {best * 1000:8.1f} ms  {size / 1_000_000:6.2f} MB")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark result serialization")
+    parser.add_argument("--candidates", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    results = build_results(args.candidates)
+    print(f"📊 Serializing {args.candidates} candidates (backend: {serialization.BACKEND}, best of {args.repeat})\n")
+    
+    print("File output:")
+    baseline = timed("json.dumps(indent=2)",
+                     lambda: json.dumps(results, indent=2, ensure_ascii=False).encode("utf-8"), args.repeat)
+    compact = timed("serialization.dumps (compact)", lambda: serialization.dumps(results, pretty=False), args.repeat)
+    timed("serialization.dumps (pretty)", lambda: serialization.dumps(results, pretty=True), args.repeat)
+    
+    print("\nAPI response:")
+    default = timed("jsonable_encoder + JSONResponse",
+                    lambda: JSONResponse(jsonable_encoder(results)).body, args.repeat)
+    fast = timed("FastJSONResponse", lambda: FastJSONResponse(results).body, args.repeat)
+    
+    print(f"\n✅ File output {baseline / compact:.1f}x faster, API response {default / fast:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
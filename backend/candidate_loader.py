@@ -0,0 +1,170 @@
+"""
+Candidate File Loader
+
+This module handles:
+- Loading data/candidate_*.json files for analysis
+- A directory manifest (path, mtime, size, content hash and parsed summary)
+  so unchanged files are not rehashed or summarized again on the next run
+- Parsing new or changed files on a thread pool
+
+The manifest lives next to the candidate files (.candidate_manifest.json) and
+is written atomically. A file is reparsed only when its mtime or size changed
+and its content hash no longer matches; a missing or corrupt manifest just
+means every file is parsed once more. Full documents are not part of the
+manifest: the candidate files themselves are the per-file store, and parsed
+documents are kept in memory by the loader while their hash is unchanged.
+"""
+
+import hashlib
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from serialization import dump_file, load_file, loads
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = ".candidate_manifest.json"
+MANIFEST_VERSION = 2
+
+
+def summarize_candidate(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields the dashboard and CLI need without the full interview responses."""
+    candidate = data.get("candidate", data)
+    return {
+        "id": candidate.get("id"),
+        "name": candidate.get("name"),
+        "position": candidate.get("position"),
+        "responses_count": len(candidate.get("responses", [])),
+        "has_personality_traits": bool(candidate.get("personality_traits"))
+    }
+
+
+def _parse_file(path: str) -> Tuple[str, Dict[str, Any]]:
+    """Read, hash and parse one candidate file (runs on the pool)."""
+    with open(path, 'rb') as f:
+        content = f.read()
+    return hashlib.sha256(content).hexdigest(), loads(content)
+
+
+class CandidateLoader:
+    """
+    Incremental loader for a directory of candidate files.
+    """
+    
+    def __init__(self, directory: str = "data", pattern: str = "candidate_*.json",
+                 manifest_file: Optional[str] = None, max_workers: Optional[int] = None):
+        """
+        Initialize the loader.
+        
+        Args:
+            directory: Directory containing the candidate files
+            pattern: Glob pattern of candidate files
+            manifest_file: Manifest path (default: <directory>/.candidate_manifest.json)
+            max_workers: Parser threads (default: CANDIDATE_LOADER_WORKERS or min(32, cpu_count + 4))
+        """
+        self.directory = directory
+        self.pattern = pattern
+        self.manifest_file = manifest_file or os.path.join(directory, MANIFEST_FILE)
+        workers = max_workers or int(os.getenv("CANDIDATE_LOADER_WORKERS", "0"))
+        self.max_workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self._lock = threading.Lock()
+        # File name -> (content hash, parsed document) of files parsed by this loader
+        self._documents: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self.last_stats: Dict[str, int] = {}
+    
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Load every candidate file, reusing documents this loader already parsed.
+        
+        Returns:
+            Candidate documents (as stored in the files), ordered by file name
+        """
+        entries = self.refresh()
+        with self._lock:
+            missing = [entry["file"] for entry in entries
+                       if self._documents.get(entry["file"], (None,))[0] != entry["sha256"]]
+            if missing:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    paths = [os.path.join(self.directory, name) for name in missing]
+                    for name, parsed in zip(missing, pool.map(_parse_file, paths)):
+                        self._documents[name] = parsed
+            self.last_stats["read"] = len(missing)
+            return [self._documents[entry["file"]][1] for entry in entries]
+    
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Per-file summaries (file name plus summarize_candidate fields), ordered by file name."""
+        return [{"file": entry["file"], **entry["summary"]} for entry in self.refresh()]
+    
+    def refresh(self) -> List[Dict[str, Any]]:
+        """
+        Bring the manifest up to date with the directory.
+        
+        Returns:
+            Manifest entries of all current candidate files, ordered by file name
+        
+        Raises:
+            ValueError: If a candidate file is not valid JSON
+        """
+        with self._lock:
+            cached = self._read_manifest()
+            entries: Dict[str, Dict[str, Any]] = {}
+            to_check: List[Tuple[str, os.stat_result]] = []
+            
+            for path in sorted(Path(self.directory).glob(self.pattern)):
+                stat = path.stat()
+                entry = cached.get(path.name)
+                if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                    entries[path.name] = entry
+                else:
+                    to_check.append((path.name, stat))
+            
+            reparsed = 0
+            if to_check:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    paths = [os.path.join(self.directory, name) for name, _ in to_check]
+                    for (name, stat), (content_hash, data) in zip(to_check, pool.map(_parse_file, paths)):
+                        entry = cached.get(name)
+                        if not entry or entry["sha256"] != content_hash:
+                            entry = {"file": name, "sha256": content_hash, "summary": summarize_candidate(data)}
+                            reparsed += 1
+                        entries[name] = {**entry, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+                        self._documents[name] = (content_hash, data)
+            
+            for name in set(self._documents) - set(entries):
+                del self._documents[name]
+            
+            removed = len(set(cached) - set(entries))
+            if to_check or removed:
+                self._write_manifest(entries)
+            
+            self.last_stats = {
+                "files": len(entries),
+                "cached": len(entries) - len(to_check),
+                "checked": len(to_check),
+                "reparsed": reparsed,
+                "removed": removed
+            }
+            logger.info(f"📂 Loaded {len(entries)} candidate files "
+                        f"({reparsed} parsed, {len(entries) - reparsed} from manifest)")
+            return [entries[name] for name in sorted(entries)]
+    
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            manifest = load_file(self.manifest_file)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return {entry["file"]: entry for entry in manifest.get("files", [])}
+    
+    def _write_manifest(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            dump_file({"version": MANIFEST_VERSION, "files": [entries[name] for name in sorted(entries)]},
+                      self.manifest_file, pretty=False)
+        except OSError as e:
+            # A read-only data directory only costs a reparse next time
+            logger.warning(f"⚠️ Could not write candidate manifest {self.manifest_file}: {e}")
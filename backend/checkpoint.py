@@ -0,0 +1,237 @@
+"""
+Analysis Run Checkpoints
+
+This module handles:
+- Persisting extracted personality traits and completed candidate analyses
+  while a run is in progress
+- Resuming an interrupted run without repeating finished Mistral calls
+- Listing and cleaning up unfinished runs
+
+Each run is an append-only NDJSON log (<directory>/<run_id>.ndjson): a header
+with the team fingerprint, then one record per extracted trait set or
+finished analysis. Records are flushed as they are written, so everything up
+to the last complete line survives a crash. Candidates are keyed by a hash of
+their input document, so edited candidate files are analyzed again. Only the
+log offsets of finished analyses are kept in memory; a resumed run rereads
+each result from the log when it is reused.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+from run_snapshots import RUN_ID_PATTERN
+from serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+def default_checkpoint_directory() -> str:
+    """Checkpoint location: CHECKPOINT_DIR, the Docker data volume, or data/checkpoints locally."""
+    directory = os.getenv("CHECKPOINT_DIR")
+    if directory:
+        return directory
+    if os.path.exists("/app/data/"):  # Docker path
+        return "/app/data/checkpoints"
+    return "data/checkpoints"
+
+
+def fingerprint(data: Any) -> str:
+    """Stable content hash of a JSON-compatible value."""
+    content = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+def candidate_key(candidate_data: Dict[str, Any]) -> str:
+    """Checkpoint key of one candidate input document."""
+    return fingerprint(candidate_data.get("candidate", candidate_data))
+
+
+class RunCheckpoint:
+    """
+    Append-only progress log of one analysis run.
+    """
+    
+    def __init__(self, run_id: Optional[str] = None, directory: Optional[str] = None):
+        """
+        Open (or prepare) the checkpoint of a run.
+        
+        Args:
+            run_id: Run identifier (default: a new timestamp id)
+            directory: Checkpoint directory (default: see default_checkpoint_directory)
+        
+        Raises:
+            ValueError: If the run id is not path-safe
+        """
+        self.run_id = run_id or f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+        if not RUN_ID_PATTERN.match(self.run_id):
+            raise ValueError(f"Invalid run id: {self.run_id}")
+        self.directory = directory or default_checkpoint_directory()
+        self.path = os.path.join(self.directory, f"{self.run_id}.ndjson")
+        self.team_fingerprint: Optional[str] = None
+        self._traits: Dict[str, Dict[str, float]] = {}
+        self._analysis_offsets: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._torn_tail = False
+        if self.exists():
+            self._load()
+    
+    @classmethod
+    def resume(cls, run_id: str, directory: Optional[str] = None) -> "RunCheckpoint":
+        """
+        Open the checkpoint of an interrupted run.
+        
+        Raises:
+            FileNotFoundError: If there is no checkpoint for the run
+        """
+        checkpoint = cls(run_id, directory)
+        if not checkpoint.exists():
+            raise FileNotFoundError(f"No checkpoint found for run {run_id}")
+        logger.info(f"♻️ Resuming run {run_id}: {len(checkpoint._analysis_offsets)} analyses and "
+                    f"{len(checkpoint._traits)} trait extractions already done")
+        return checkpoint
+    
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+    
+    @property
+    def completed_count(self) -> int:
+        return len(self._analysis_offsets)
+    
+    def start(self, team_data: Dict[str, Any]) -> None:
+        """
+        Write the run header, or check that a resumed run analyzes the same team.
+        
+        Raises:
+            ValueError: If the checkpoint was written for a different team
+        """
+        team_fingerprint = fingerprint(team_data)
+        if self.team_fingerprint is not None:
+            if self.team_fingerprint != team_fingerprint:
+                raise ValueError(f"Checkpoint {self.run_id} was created for a different team")
+            return
+        
+        self.team_fingerprint = team_fingerprint
+        os.makedirs(self.directory, exist_ok=True)
+        self._append({"type": "run", "run_id": self.run_id, "team": team_fingerprint,
+                      "created_at": datetime.now().isoformat()})
+    
+    def get_traits(self, key: str) -> Optional[Dict[str, float]]:
+        return self._traits.get(key)
+    
+    def save_traits(self, key: str, traits: Dict[str, float]) -> None:
+        """Record extracted personality traits of a candidate."""
+        self._traits[key] = traits
+        self._append({"type": "traits", "key": key, "data": traits})
+    
+    def get_analysis(self, key: str) -> Optional[Dict[str, Any]]:
+        """Reread the finished analysis of a candidate from the log."""
+        offset = self._analysis_offsets.get(key)
+        if offset is None:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return loads(f.readline())["data"]
+    
+    def save_analysis(self, key: str, candidate_result: Dict[str, Any]) -> None:
+        """Record the finished analysis of a candidate."""
+        self._analysis_offsets[key] = self._append({"type": "analysis", "key": key, "data": candidate_result})
+    
+    def delete(self) -> None:
+        """Remove the checkpoint (called once the run's results are saved)."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+    
+    def _append(self, record: Dict[str, Any]) -> int:
+        """Append a record and return its byte offset in the log."""
+        with self._lock:
+            with open(self.path, 'ab') as f:
+                if self._torn_tail:
+                    # Terminate the partial line left by a crash so this record stays readable
+                    f.write(b"\n")
+                    self._torn_tail = False
+                offset = f.tell()
+                f.write(dumps(record, pretty=False) + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            return offset
+    
+    def _load(self) -> None:
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                line_offset, offset = offset, offset + len(line)
+                self._torn_tail = not line.endswith(b"\n")
+                try:
+                    record = loads(line)
+                except ValueError:
+                    # The process died mid-write; the record is redone
+                    continue
+                if record.get("type") == "run":
+                    self.team_fingerprint = record.get("team")
+                elif record.get("type") == "traits":
+                    self._traits[record["key"]] = record["data"]
+                elif record.get("type") == "analysis":
+                    self._analysis_offsets[record["key"]] = line_offset
+
+
+def list_checkpoints(directory: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Unfinished runs that can be resumed, newest first.
+    
+    Args:
+        directory: Checkpoint directory (default: see default_checkpoint_directory)
+    
+    Returns:
+        List of dicts with run_id, updated_at and completed (analyses done)
+    """
+    directory = directory or default_checkpoint_directory()
+    if not os.path.isdir(directory):
+        return []
+    
+    checkpoints = []
+    for name in os.listdir(directory):
+        if not name.endswith(".ndjson"):
+            continue
+        checkpoint = RunCheckpoint(name[:-len(".ndjson")], directory)
+        checkpoints.append({
+            "run_id": checkpoint.run_id,
+            "updated_at": datetime.fromtimestamp(os.path.getmtime(checkpoint.path)).isoformat(),
+            "completed": checkpoint.completed_count
+        })
+    return sorted(checkpoints, key=lambda item: item["updated_at"], reverse=True)
+
+
+def prune_checkpoints(directory: Optional[str] = None, max_age_days: Optional[float] = None) -> int:
+    """
+    Delete checkpoints of runs abandoned longer than max_age_days.
+    
+    Args:
+        directory: Checkpoint directory (default: see default_checkpoint_directory)
+        max_age_days: Age of the last update after which a run is dropped
+            (default: CHECKPOINT_MAX_AGE_DAYS or 7, 0 keeps all)
+    
+    Returns:
+        Number of checkpoints deleted
+    """
+    if max_age_days is None:
+        max_age_days = float(os.getenv("CHECKPOINT_MAX_AGE_DAYS", "7"))
+    if max_age_days <= 0:
+        return 0
+    
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+    pruned = 0
+    for checkpoint in list_checkpoints(directory):
+        if checkpoint["updated_at"] < cutoff:
+            RunCheckpoint(checkpoint["run_id"], directory).delete()
+            pruned += 1
+    if pruned:
+        logger.info(f"🧹 Deleted {pruned} abandoned analysis checkpoint(s)")
+    return pruned
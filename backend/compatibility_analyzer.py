@@ -17,21 +17,22 @@ Key Features:
 
 import json
 import os
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterable
 import logging
 from pathlib import Path
 import sys
 from datetime import datetime
-import statistics
 import time
 import random
 
 from dotenv import load_dotenv
-from mistralai import Mistral
-# from openai import OpenAI
 
 # Import our custom modules
-from rate_limiter import RateLimiter
+from key_pool import error_status, rotates_keys
+from llm_scheduler import get_llm_scheduler, BULK
+from serialization import dump_file
+from results_writer import ResultsWriter, TeamInsightsAccumulator
+from checkpoint import RunCheckpoint, candidate_key
 from personality_extractor import PersonalityTraitsExtractor
 from utils import print_results_summary
 
@@ -48,25 +49,23 @@ class CompatibilityAnalyzer:
     def __init__(self, requests_per_second: float = 1.0):
         """Initialize the analyzer with API configuration and rate limiting."""
         load_dotenv()
-        self.mistral_api_key = os.getenv('MISTRAL_API_KEY')
-        # self.openai_api_key = os.getenv('OPENAI_API_KEY')
-
-        if not self.mistral_api_key:
-            raise ValueError("MISTRAL_API_KEY environment variable is not set. Please add it to your .env file or set it as an environment variable.")
-        # if not self.openai_api_key:
-        #     raise ValueError("OPENAI_API_KEY environment variable is not set. Please add it to your .env file or set it as an environment variable.")
         try:
-            self.client = Mistral(api_key=self.mistral_api_key)
-            # self.client = OpenAI(api_key=self.openai_api_key, base_url=os.getenv('OPENAI_BASE_URL'))
-            logger.info("Successfully initialized Mistral AI client")
+            # Calls are routed across the providers in LLM_PROVIDERS (Mistral keys are
+            # pooled and rate limited per key) with failover between them, and queue in
+            # the shared scheduler behind interactive calls such as chat
+            self.llm_scheduler = get_llm_scheduler(requests_per_second)
         except Exception as e:
-            raise ValueError(f"Failed to initialize Mistral AI client: {str(e)}")
-        
-        # Initialize rate limiter
-        self.rate_limiter = RateLimiter(requests_per_second)
-        logger.info(f"🚦 Rate limiter initialized: {requests_per_second} requests per second")
+            raise ValueError(f"Failed to initialize LLM providers: {str(e)}")
+        if self.llm_scheduler is None:
+            raise ValueError("MISTRAL_API_KEY environment variable is not set. Please add it to your .env file or set it as an environment variable "
+                             "(or configure another provider in LLM_PROVIDERS).")
+        self.llm_router = self.llm_scheduler.router
+        self.client = self.llm_scheduler.client(BULK, source="analysis")
+        logger.info("Successfully initialized LLM providers: " + ", ".join(p.name for p in self.llm_router.providers))
+        logger.info(f"🚦 Rate limiter initialized: {requests_per_second} requests per second per Mistral key "
+                    f"({self.llm_router.requests_per_second:g} across all providers)")
         
-        self.traits_extractor = PersonalityTraitsExtractor(self.client, self.rate_limiter)
+        self.traits_extractor = PersonalityTraitsExtractor(self.llm_scheduler.client(BULK, source="extraction"))
 
     def load_json_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -185,8 +184,14 @@ class CompatibilityAnalyzer:
         
         return processed_candidates
 
-    def process_candidates_data(self, candidates_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Extract personality traits, handling different formats."""
+    def process_candidates_data(self, candidates_data_list: List[Dict[str, Any]],
+                                checkpoint: Optional[RunCheckpoint] = None) -> List[Dict[str, Any]]:
+        """
+        Extract personality traits, handling different formats.
+        
+        With a checkpoint, extracted traits are recorded as they are produced and
+        traits recorded by an interrupted run are reused instead of re-extracted.
+        """
         processed_candidates = []
         candidates_needing_extraction = []
         
@@ -200,6 +205,8 @@ class CompatibilityAnalyzer:
                 'name': candidate.get('name', 'Unknown'),
                 'position': candidate.get('position', candidate.get('role_applied', 'Unknown'))
             }
+            if checkpoint:
+                candidate_info['checkpoint_key'] = candidate_key(candidate)
             
             # Check for direct personality traits
             traits = candidate.get('big_five', candidate.get('personality_traits'))
@@ -228,7 +235,11 @@ class CompatibilityAnalyzer:
             for i, (candidate_info, original_candidate) in enumerate(candidates_needing_extraction):
                 logger.info(f"🔍 Processing candidate {i+1}/{len(candidates_needing_extraction)}: {candidate_info['name']}")
                 
-                extracted_traits = self.traits_extractor.extract_from_responses(original_candidate)
+                extracted_traits = checkpoint.get_traits(candidate_info['checkpoint_key']) if checkpoint else None
+                if extracted_traits is None:
+                    extracted_traits = self.traits_extractor.extract_from_responses(original_candidate)
+                    if checkpoint:
+                        checkpoint.save_traits(candidate_info['checkpoint_key'], extracted_traits)
                 candidate_info['traits'] = extracted_traits
                 candidate_info['source'] = 'extracted'
                 
@@ -327,12 +338,9 @@ class CompatibilityAnalyzer:
         """
 
         try:
-            # Apply rate limiting before making request
-            self.rate_limiter.wait_if_needed()
-            
+            # Queued in the LLM scheduler; rate limits are applied per key by the key pool
             response = self._make_api_request_with_retry(
                 model=os.getenv('MISTRAL_MODEL', 'mistral-small-latest'),
-                # model=os.getenv('OPENAI_MODEL', 'deepseek-chat'),
                 messages=[
                     {
                         "role": "system", 
@@ -371,11 +379,15 @@ class CompatibilityAnalyzer:
         for attempt in range(max_retries):
             try:
                 response = self.client.chat.complete(**kwargs)
-                # response = self.client.chat.completions.create(**kwargs)
                 return response
             except Exception as e:
-                error_str = str(e).lower()
-                if 'rate limit' in error_str or 'too many requests' in error_str:
+                status = error_status(e)
+                if rotates_keys(self.client) and status in (429, 401) and attempt < max_retries - 1:
+                    # The key was evicted; the pool sends the retry to another key,
+                    # or waits until a rate-limited key cools down
+                    logger.warning(f"API key rejected ({str(e)[:80]}), retrying (attempt {attempt + 1}/{max_retries})")
+                    continue
+                if status == 429:
                     if attempt < max_retries - 1:
                         wait_time = (2 ** attempt) + random.uniform(1, 3)  # Exponential backoff with jitter
                         logger.warning(f"Rate limit hit, retrying in {wait_time:.2f}s (attempt {attempt + 1}/{max_retries})")
@@ -417,28 +429,35 @@ class CompatibilityAnalyzer:
             'risk_factors': []
         }
 
-    def analyze_team_compatibility(self, team_data: Dict[str, Any], candidates_data_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def analyze_team_compatibility(self, team_data: Dict[str, Any], candidates_data_list: List[Dict[str, Any]],
+                                   checkpoint: Optional[RunCheckpoint] = None) -> Dict[str, Any]:
         """
         Analyze compatibility between team and candidates using AI analysis only.
         
         Args:
             team_data: Team data as dictionary
             candidates_data_list: List of candidate data dictionaries
+            checkpoint: Run checkpoint recording progress; work it already holds is skipped (optional)
             
         Returns:
             Dict containing comprehensive compatibility analysis results
+            
+        Raises:
+            ValueError: If the checkpoint belongs to a run for a different team
         """
         analysis_start_time = time.time()
         
         try:
             # Process team and candidates data
             team_members = self.process_team_data(team_data)
-            candidates = self.process_candidates_data(candidates_data_list)
+            if checkpoint:
+                checkpoint.start(team_data)
+            candidates = self.process_candidates_data(candidates_data_list, checkpoint)
             logger.info(f"Processing {len(team_members)} team members and {len(candidates)} candidates")
             
             # Estimate total time based on number of API calls needed
             api_calls_needed = len([c for c in candidates if c.get('source') == 'extracted']) + len(candidates)
-            estimated_time = api_calls_needed * self.rate_limiter.min_interval
+            estimated_time = api_calls_needed * self.llm_router.min_interval
             if estimated_time > 10:  # Only show estimate if it's significant
                 logger.info(f"⏱️  Estimated completion time: {estimated_time:.0f}s ({estimated_time/60:.1f} minutes) due to rate limiting")
             
@@ -450,50 +469,24 @@ class CompatibilityAnalyzer:
                     "analyzer_version": "3.0",
                     "analysis_type": "ai_only",
                     "rate_limit_info": {
-                        "requests_per_second": self.rate_limiter.requests_per_second,
+                        "requests_per_second": self.llm_router.requests_per_second,
                         "estimated_api_calls": api_calls_needed
                     }
                 },
-                "team_summary": {
-                    "members": [
-                        {
-                            "name": member['name'],
-                            "position": member['position'],
-                            "traits_summary": {k: round(v, 2) for k, v in member['traits'].items()}
-                        } for member in team_members
-                    ]
-                },
+                "team_summary": self._summarize_team(team_members),
                 "candidates_analysis": []
             }
+            if checkpoint:
+                results["analysis_metadata"]["run_id"] = checkpoint.run_id
             
             # Analyze each candidate
             for i, candidate in enumerate(candidates):
                 logger.info(f"🤖 AI analysis for candidate {i+1}/{len(candidates)}: {candidate['name']}")
-                
-                # Get AI-powered analysis
-                ai_analysis = self.get_ai_compatibility_analysis(team_members, candidate)
-                
-                # Combine analyses
-                candidate_result = {
-                    "candidate_info": {
-                        "id": candidate['id'],
-                        "name": candidate['name'],
-                        "position": candidate['position'],
-                        "traits_source": candidate.get('source', 'unknown'),
-                        "personality_traits": {k: round(v, 3) for k, v in candidate['traits'].items()}
-                    },
-                    "ai_analysis": ai_analysis,
-                    "overall_recommendation": self._generate_recommendation(
-                        ai_analysis['compatibility_score'],
-                        ai_analysis['confidence_level']
-                    )
-                }
-                
-                results["candidates_analysis"].append(candidate_result)
+                results["candidates_analysis"].append(self._analyze_candidate(team_members, candidate, checkpoint))
             
             # Add team-level insights and rate limiter stats
             results["team_insights"] = self._generate_team_insights(results["candidates_analysis"])
-            results["analysis_metadata"]["rate_limiter_stats"] = self.rate_limiter.get_stats()
+            results["analysis_metadata"]["rate_limiter_stats"] = self.llm_router.get_stats()
             results["analysis_metadata"]["total_analysis_time"] = round(time.time() - analysis_start_time, 2)
             
             return results
@@ -502,6 +495,100 @@ class CompatibilityAnalyzer:
             logger.error(f"Error in compatibility analysis: {str(e)}")
             raise
 
+    def stream_team_compatibility(self, team_data: Dict[str, Any], candidates_data: Iterable[Dict[str, Any]],
+                                  writer: ResultsWriter, checkpoint: Optional[RunCheckpoint] = None) -> Dict[str, Any]:
+        """
+        Analyze candidates one at a time, writing each result as soon as it completes.
+        
+        Candidates are processed in input order (traits are extracted inline), so
+        with a lazy iterable of candidate files peak memory does not depend on the
+        pool size. Team insights come from the writer's running statistics.
+        
+        Args:
+            team_data: Team data as dictionary
+            candidates_data: Iterable of candidate data dictionaries (may be a generator)
+            writer: ResultsWriter receiving the run
+            checkpoint: Run checkpoint recording progress; work it already holds is skipped (optional)
+            
+        Returns:
+            Run summary (analysis_metadata, team_summary, team_insights) without the candidate list
+        """
+        analysis_start_time = time.time()
+        
+        try:
+            team_members = self.process_team_data(team_data)
+            analysis_metadata = {
+                "timestamp": datetime.now().isoformat(),
+                "team_size": len(team_members),
+                "analyzer_version": "3.0",
+                "analysis_type": "ai_only",
+                "output_mode": f"stream:{writer.output_format}",
+                "rate_limit_info": {
+                    "requests_per_second": self.llm_router.requests_per_second
+                }
+            }
+            if checkpoint:
+                checkpoint.start(team_data)
+                analysis_metadata["run_id"] = checkpoint.run_id
+            writer.begin(analysis_metadata, self._summarize_team(team_members))
+            
+            for candidate_data in candidates_data:
+                candidate = self.process_candidates_data([candidate_data], checkpoint)[0]
+                logger.info(f"🤖 AI analysis for candidate {writer.candidates_written + 1}: {candidate['name']}")
+                writer.write_candidate(self._analyze_candidate(team_members, candidate, checkpoint))
+            
+            return writer.finish({
+                "rate_limiter_stats": self.llm_router.get_stats(),
+                "total_analysis_time": round(time.time() - analysis_start_time, 2)
+            })
+            
+        except Exception as e:
+            logger.error(f"Error in streaming compatibility analysis after {writer.candidates_written} candidates: {str(e)}")
+            raise
+
+    def _summarize_team(self, team_members: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """team_summary section of the results."""
+        return {
+            "members": [
+                {
+                    "name": member['name'],
+                    "position": member['position'],
+                    "traits_summary": {k: round(v, 2) for k, v in member['traits'].items()}
+                } for member in team_members
+            ]
+        }
+
+    def _analyze_candidate(self, team_members: List[Dict[str, Any]], candidate: Dict[str, Any],
+                           checkpoint: Optional[RunCheckpoint] = None) -> Dict[str, Any]:
+        """Run the AI analysis for one processed candidate and build its result entry."""
+        if checkpoint:
+            completed = checkpoint.get_analysis(candidate['checkpoint_key'])
+            if completed is not None:
+                logger.info(f"♻️ Reusing checkpointed analysis for {candidate['name']}")
+                return completed
+        
+        # Get AI-powered analysis
+        ai_analysis = self.get_ai_compatibility_analysis(team_members, candidate)
+        
+        # Combine analyses
+        candidate_result = {
+            "candidate_info": {
+                "id": candidate['id'],
+                "name": candidate['name'],
+                "position": candidate['position'],
+                "traits_source": candidate.get('source', 'unknown'),
+                "personality_traits": {k: round(v, 3) for k, v in candidate['traits'].items()}
+            },
+            "ai_analysis": ai_analysis,
+            "overall_recommendation": self._generate_recommendation(
+                ai_analysis['compatibility_score'],
+                ai_analysis['confidence_level']
+            )
+        }
+        if checkpoint:
+            checkpoint.save_analysis(candidate['checkpoint_key'], candidate_result)
+        return candidate_result
+
     def _generate_recommendation(self, ai_score: float, confidence: float) -> Dict[str, Any]:
         """Generate overall recommendation based on scores."""
         combined_score = ai_score
@@ -531,44 +618,26 @@ class CompatibilityAnalyzer:
 
     def _generate_team_insights(self, candidates_analysis: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate insights about the candidate pool relative to the team."""
-        if not candidates_analysis:
-            return {}
-        
-        scores = [c["ai_analysis"]["compatibility_score"] for c in candidates_analysis]
-        
-        return {
-            "candidate_pool_summary": {
-                "average_compatibility": round(statistics.mean(scores), 3),
-                "best_compatibility": round(max(scores), 3),
-                "compatibility_range": round(max(scores) - min(scores), 3),
-                "candidates_above_threshold": len([s for s in scores if s >= 0.7])
-            },
-            "top_candidates": sorted(
-                [
-                    {
-                        "name": c["candidate_info"]["name"],
-                        "compatibility": c["ai_analysis"]["compatibility_score"],
-                        "recommendation": c["overall_recommendation"]["status"]
-                    } for c in candidates_analysis
-                ],
-                key=lambda x: x["compatibility"],
-                reverse=True
-            )[:3]
-        }
+        accumulator = TeamInsightsAccumulator()
+        for candidate_result in candidates_analysis:
+            accumulator.add(candidate_result)
+        return accumulator.insights()
 
     def save_results(self, results: Dict[str, Any], output_file: str) -> None:
         """
-        Save analysis results to a JSON file with proper formatting.
+        Save analysis results to a JSON file.
+        
+        The file is written to a temporary path and renamed into place, so
+        readers (such as the candidate sync service) never see a partial file.
+        Output is compact unless JSON_PRETTY=true.
         
         Args:
             results: Analysis results to save
             output_file: Path to output file
         """
         try:
-            output_path = Path(output_file)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
-            logger.info(f"Results saved to {output_path}")
+            dump_file(results, output_file)
+            logger.info(f"Results saved to {output_file}")
         except Exception as e:
             logger.error(f"Error saving results: {str(e)}")
             raise 
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Client-Side Embeddings
+
+This module handles:
+- Batched Mistral embeddings for candidate text during sync
+- An LRU cache of query embeddings shared by all embedders
+
+Vectors computed here are supplied directly to the vector store, so queries
+reuse cached embeddings and syncs embed many objects per request.
+"""
+
+import os
+import threading
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class Embedder(ABC):
+    """
+    Base class for embedding functions.
+    
+    Subclasses implement embed(); embed_query() adds an LRU cache on top.
+    """
+    
+    name = "base"
+    dimensions = 0
+    
+    def __init__(self, query_cache_size: Optional[int] = None):
+        """
+        Initialize the query embedding cache.
+        
+        Args:
+            query_cache_size: Cached query embeddings (default: QUERY_EMBEDDING_CACHE_SIZE or 512)
+        """
+        if query_cache_size is None:
+            query_cache_size = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "512"))
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts into unit vectors.
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            float32 array of shape (len(texts), dimensions)
+        """
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed a search query, reusing cached embeddings of repeated queries.
+        
+        Args:
+            query: Query text
+        
+        Returns:
+            float32 vector of length dimensions (read-only, it may be shared with later callers)
+        """
+        key = " ".join(query.lower().split())
+        with self._cache_lock:
+            vector = self._query_cache.get(key)
+            if vector is not None:
+                self._query_cache.move_to_end(key)
+                self.cache_hits += 1
+                return vector
+            self.cache_misses += 1
+        
+        vector = self._embed_query(query)
+        vector.flags.writeable = False
+        
+        if self.query_cache_size > 0:
+            with self._cache_lock:
+                self._query_cache[key] = vector
+                while len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+        return vector
+    
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Embed one query on a cache miss."""
+        return self.embed([query])[0]
+
+
+class MistralEmbedder(Embedder):
+    """
+    Mistral embeddings API, called in batches.
+    """
+    
+    def __init__(self, client, model: Optional[str] = None, batch_size: Optional[int] = None,
+                 query_cache_size: Optional[int] = None, query_client=None):
+        """
+        Initialize the Mistral embedder.
+        
+        Args:
+            client: Mistral client for document embeddings (sync)
+            model: Embedding model (default: MISTRAL_EMBEDDING_MODEL or mistral-embed)
+            batch_size: Texts per embeddings request (default: EMBEDDING_BATCH_SIZE or 32)
+            query_cache_size: Cached query embeddings
+            query_client: Mistral client for search queries (default: client), e.g.
+                one scheduled ahead of bulk work
+        """
+        super().__init__(query_cache_size)
+        self.client = client
+        self.query_client = query_client or client
+        self.model = model or os.getenv("MISTRAL_EMBEDDING_MODEL", "mistral-embed")
+        self.batch_size = batch_size or int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+        self.dimensions = int(os.getenv("MISTRAL_EMBEDDING_DIMENSIONS", "1024"))
+        self.name = f"mistral-{self.model}"
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self._embed_with(self.client, texts)
+    
+    def _embed_query(self, query: str) -> np.ndarray:
+        return self._embed_with(self.query_client, [query])[0]
+    
+    def _embed_with(self, client, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            response = client.embeddings.create(model=self.model, inputs=batch)
+            vectors.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index or 0))
+        
+        if len(texts) > self.batch_size:
+            logger.info(f"🧮 Embedded {len(texts)} texts in {-(-len(texts) // self.batch_size)} requests")
+        
+        matrix = np.array(vectors, dtype=np.float32).reshape(len(texts), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
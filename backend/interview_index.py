@@ -0,0 +1,245 @@
+"""
+Interview Status Index
+
+Materialized per-interview status (pending / in-progress / completed), duration,
+transcript availability and contact details, fed by the calls API.
+
+The index is persisted next to interviews.json and refreshed incrementally:
+only entries whose latest call changed are rewritten, and the sort order is
+kept precomputed so history reads are a simple paginated slice.
+"""
+
+import json
+import os
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from interview_manager import is_call_completed
+
+logger = logging.getLogger(__name__)
+
+
+class InterviewStatusIndex:
+    """
+    Materialized status index over all tracked interviews.
+    """
+    
+    def __init__(self, interview_manager, index_file: Optional[str] = None,
+                 refresh_interval: Optional[float] = None):
+        """
+        Initialize the status index.
+        
+        Args:
+            interview_manager: InterviewManager providing saved interviews and the calls API
+            index_file: Path of the index file (default: interview_index.json next to interviews.json)
+            refresh_interval: Minimum seconds between calls API refreshes (default: INTERVIEW_INDEX_REFRESH_SECONDS or 30)
+        """
+        self.interview_manager = interview_manager
+        data_dir = os.path.dirname(interview_manager.interviews_file) or "."
+        self.index_file = index_file or os.path.join(data_dir, "interview_index.json")
+        self.refresh_interval = refresh_interval or float(os.getenv("INTERVIEW_INDEX_REFRESH_SECONDS", "30"))
+        
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+    
+    def refresh_if_stale(self) -> bool:
+        """
+        Refresh from the calls API if the last refresh is older than the refresh interval.
+        
+        Returns:
+            bool: Whether a refresh was performed
+        """
+        last_refreshed = self._index.get("last_refreshed_at")
+        if last_refreshed:
+            age = (datetime.now() - datetime.fromisoformat(last_refreshed)).total_seconds()
+            if age < self.refresh_interval:
+                return False
+        
+        self.refresh()
+        return True
+    
+    def refresh(self) -> int:
+        """
+        Reconcile the index with saved interviews and the calls API.
+        
+        Returns:
+            Number of entries that changed
+        """
+        saved_interviews = self.interview_manager.get_saved_interviews()
+        calls = self.interview_manager._get_all_calls()
+        
+        # Latest call per agent
+        latest_calls = {}
+        for call in calls:
+            agent_id = call.get("agent_id")
+            if agent_id in saved_interviews:
+                current = latest_calls.get(agent_id)
+                if current is None or call.get("started_at", "") > current.get("started_at", ""):
+                    latest_calls[agent_id] = call
+        
+        with self._lock:
+            entries = self._index["entries"]
+            changed = 0
+            
+            # Drop interviews that were removed from interviews.json
+            for agent_id in [agent_id for agent_id in entries if agent_id not in saved_interviews]:
+                del entries[agent_id]
+                changed += 1
+            
+            for agent_id, record in saved_interviews.items():
+                entry = entries.get(agent_id)
+                if entry is None:
+                    entry = self._new_entry(record)
+                    entries[agent_id] = entry
+                    changed += 1
+                
+                call = latest_calls.get(agent_id)
+                if call and self._call_signature(call) != entry.get("call_signature"):
+                    entry.update(self._status_from_call(call))
+                    entry["updated_at"] = datetime.now().isoformat()
+                    changed += 1
+            
+            self._index["last_refreshed_at"] = datetime.now().isoformat()
+            if changed:
+                self._rebuild_order()
+            self._save_index()
+        
+        if changed:
+            logger.info(f"🗂️ Interview index refreshed: {changed} entries changed")
+        return changed
+    
+    def upsert_interviews(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Add newly created interviews to the index without waiting for a refresh.
+        
+        Args:
+            records: Interview records (as saved in interviews.json)
+        """
+        with self._lock:
+            for record in records:
+                if record["agent_id"] not in self._index["entries"]:
+                    self._index["entries"][record["agent_id"]] = self._new_entry(record)
+            self._rebuild_order()
+            self._save_index()
+    
+    def get_page(self, page: int = 1, page_size: int = 20, status: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Read a page of interviews, newest first.
+        
+        Args:
+            page: Page number (1-based)
+            page_size: Interviews per page
+            status: Only include interviews with this status (optional)
+        
+        Returns:
+            Dictionary with interviews, total_count, page and page_size
+        """
+        page = max(1, page)
+        page_size = max(1, page_size)
+        
+        with self._lock:
+            entries = self._index["entries"]
+            order = self._index["order"]
+            if status:
+                order = [agent_id for agent_id in order if entries[agent_id]["status"] == status]
+            
+            start = (page - 1) * page_size
+            interviews = [
+                self._public_entry(entries[agent_id])
+                for agent_id in order[start:start + page_size]
+            ]
+        
+        return {
+            "interviews": interviews,
+            "total_count": len(order),
+            "page": page,
+            "page_size": page_size
+        }
+    
+    def _new_entry(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Create an index entry for an interview without call information yet."""
+        agent_id = record["agent_id"]
+        return {
+            "agent_id": agent_id,
+            "candidate_name": record.get("candidate_name", "Unknown"),
+            "role": record.get("role", "Unknown Role"),
+            "candidate_email": record.get("candidate_email") or None,
+            "interview_link": record.get("interview_link", f"https://bey.chat/{agent_id}"),
+            "created_at": record.get("created_at") or datetime.now().isoformat(),
+            "status": "pending",
+            "duration": "Not started",
+            "duration_seconds": None,
+            "has_transcript": False,
+            "call_id": None,
+            "call_signature": None,
+            "updated_at": datetime.now().isoformat()
+        }
+    
+    def _status_from_call(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        """Derive status fields from the latest call of an interview."""
+        if not is_call_completed(call):
+            return {
+                "status": "in-progress",
+                "duration": "In progress",
+                "duration_seconds": None,
+                "has_transcript": False,
+                "call_id": call.get("id"),
+                "call_signature": self._call_signature(call)
+            }
+        
+        duration_seconds = None
+        try:
+            started = datetime.fromisoformat(call["started_at"].replace('Z', '+00:00'))
+            ended = datetime.fromisoformat(call["ended_at"].replace('Z', '+00:00'))
+            duration_seconds = max(0, int((ended - started).total_seconds()))
+        except (KeyError, TypeError, AttributeError, ValueError):
+            pass
+        
+        if duration_seconds is None:
+            duration = "Unknown"
+        else:
+            minutes = max(1, round(duration_seconds / 60))
+            duration = f"{minutes} minute{'s' if minutes != 1 else ''}"
+        
+        return {
+            "status": "completed",
+            "duration": duration,
+            "duration_seconds": duration_seconds,
+            "has_transcript": True,
+            "call_id": call.get("id"),
+            "call_signature": self._call_signature(call)
+        }
+    
+    def _call_signature(self, call: Dict[str, Any]) -> str:
+        """Fingerprint of the call fields that affect the status."""
+        return f"{call.get('id')}|{call.get('status')}|{call.get('ended_at')}"
+    
+    def _public_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Strip internal bookkeeping fields from an entry."""
+        return {key: value for key, value in entry.items() if key != "call_signature"}
+    
+    def _rebuild_order(self) -> None:
+        """Recompute the newest-first order (caller holds the lock)."""
+        entries = self._index["entries"]
+        self._index["order"] = sorted(entries, key=lambda agent_id: entries[agent_id]["created_at"], reverse=True)
+    
+    def _load_index(self) -> Dict[str, Any]:
+        """Load the index from disk."""
+        index = {"entries": {}, "order": [], "last_refreshed_at": None}
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    index.update(json.load(f))
+        except Exception as e:
+            logger.error(f"❌ Error loading interview index: {e}")
+        return index
+    
+    def _save_index(self) -> None:
+        """Persist the index atomically (caller holds the lock)."""
+        os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.index_file)
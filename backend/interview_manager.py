@@ -8,10 +8,29 @@ import requests
 import os
 import json
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 from datetime import datetime
 
+from rate_limiter import RateLimiter
+
+from interview_prompts import (
+    DEFAULT_TEMPLATE_ID, DEFAULT_TEMPLATE_VERSION, PROMPT_TEMPLATES,
+    build_candidate_information, render_system_prompt
+)
+
+# Call statuses reported by the calls API once an interview is over
+COMPLETED_CALL_STATUSES = {"ended", "completed", "finished"}
+
+
+def is_call_completed(call: Dict[str, Any]) -> bool:
+    """Check whether a call from the calls API has finished."""
+    status = str(call.get("status", "")).lower()
+    return bool(call.get("ended_at")) or status in COMPLETED_CALL_STATUSES
+
 
 class InterviewManager:
     """
@@ -19,7 +38,9 @@ class InterviewManager:
     
     Main methods:
     - create_interview(): Create an interview and get the link
+    - create_interviews_batch(): Create many interviews concurrently
     - get_transcript(): Get the interview transcript
+    - get_system_prompt(): Rebuild the system prompt of a saved interview
     """
     
     def __init__(self, api_key: Optional[str] = None):
@@ -37,15 +58,28 @@ class InterviewManager:
         self.avatar_id = os.getenv("DEFAULT_AVATAR_ID", "b9be11b8-89fb-4227-8f86-4a881393cbdb")
         self.session_length = int(os.getenv("DEFAULT_SESSION_LENGTH_MINUTES", "5"))
         self.language = os.getenv("DEFAULT_LANGUAGE", "en")
-        self.base_url = "https://api.bey.dev/v1"
+        self.base_url = os.getenv("BEYOND_PRESENCE_BASE_URL", "https://api.bey.dev/v1")
         self.chat_url = "https://bey.chat"
         
+        # Batch provisioning limits
+        self.batch_concurrency = int(os.getenv("INTERVIEW_BATCH_CONCURRENCY", "5"))
+        self.agent_requests_per_second = float(os.getenv("BEYOND_PRESENCE_REQUESTS_PER_SECOND", "2.0"))
+        
         # Interview tracking file
         self.interviews_file = "data/interviews.json"
         
         # Store candidate info for transcript formatting
         self._candidate_info = {}
         
+        # Per-call message cursors: already fetched messages and incremental Q&A pairing state
+        # (least recently used calls are evicted beyond TRANSCRIPT_CURSOR_CACHE_SIZE)
+        self._call_cursors: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cursor_cache_size = int(os.getenv("TRANSCRIPT_CURSOR_CACHE_SIZE", "128"))
+        self._cursor_lock = threading.Lock()
+        
+        # Guards read-modify-write cycles on the tracking file
+        self._file_lock = threading.Lock()
+        
         if not self.api_key:
             raise ValueError("API key is required. Provide it or set BEYOND_PRESENCE_API_KEY in .env file")
     
@@ -70,43 +104,126 @@ class InterviewManager:
         
         # Create the agent
         agent = self._create_agent(candidate_name, role, candidate_email)
-        agent_id = agent["id"]
+        result = self._build_interview_result(agent, candidate_name, role, candidate_email)
+        agent_id = result["agent_id"]
         
-        # Store candidate info for later use in transcript formatting
-        self._candidate_info[agent_id] = {
-            "name": candidate_name,
-            "position": role,
-            "email": candidate_email
-        }
+        # Save a slim record (prompt template reference instead of the full prompt)
+        self._save_interview_to_file(agent_id, self._build_interview_record(result, candidate_email))
         
-        # Generate interview link
-        interview_link = f"{self.chat_url}/{agent_id}"
+        print(f"✅ Interview created successfully!")
+        print(f"📧 Send this link to {candidate_name}: {result['interview_link']}")
         
-        result = {
-            "agent_id": agent_id,
-            "interview_link": interview_link,
-            "candidate_name": candidate_name,
-            "role": role,
-            "agent_details": agent,
-            "created_at": datetime.now().isoformat()
-        }
+        return result
+    
+    def create_interviews_batch(
+        self,
+        candidates: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        requests_per_second: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Create many interview agents concurrently.
         
-        # Save interview to tracking file
-        self._save_interview_to_file(agent_id, result)
+        Agents are provisioned on a thread pool under a concurrency cap and a shared
+        rate limiter. All successful interviews are persisted in a single write to the
+        tracking file; failures are reported per item without aborting the batch.
+        If that write fails, every interview it held is reported as failed (with its
+        agent_id, since the agent exists but is not tracked).
         
-        print(f"✅ Interview created successfully!")
-        print(f"📧 Send this link to {candidate_name}: {interview_link}")
+        Args:
+            candidates: List of dicts with candidate_name, role and optional candidate_email
+            max_concurrency: Maximum parallel agent creations (default: INTERVIEW_BATCH_CONCURRENCY)
+            requests_per_second: Agent creation rate cap (default: BEYOND_PRESENCE_REQUESTS_PER_SECOND)
+            
+        Returns:
+            Dictionary with per-item results (in input order) and success/failure counts
+        """
+        max_concurrency = max(1, max_concurrency or self.batch_concurrency)
+        rate_limiter = RateLimiter(requests_per_second or self.agent_requests_per_second)
         
-        return result
+        print(f"🚀 Creating {len(candidates)} interviews (concurrency: {max_concurrency}, "
+              f"rate: {rate_limiter.requests_per_second}/s)")
+        
+        def provision(candidate: Dict[str, Any]) -> Dict[str, Any]:
+            candidate_email = candidate.get("candidate_email") or ""
+            rate_limiter.wait_if_needed()
+            agent = self._create_agent(candidate["candidate_name"], candidate["role"], candidate_email)
+            return self._build_interview_result(agent, candidate["candidate_name"], candidate["role"], candidate_email)
+        
+        items: List[Optional[Dict[str, Any]]] = [None] * len(candidates)
+        records = {}
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = {
+                executor.submit(provision, candidate): index
+                for index, candidate in enumerate(candidates)
+            }
+            
+            for future in as_completed(futures):
+                index = futures[future]
+                candidate = candidates[index]
+                item = {
+                    "index": index,
+                    "candidate_name": candidate.get("candidate_name"),
+                    "role": candidate.get("role")
+                }
+                
+                try:
+                    result = future.result()
+                    item.update({
+                        "success": True,
+                        "agent_id": result["agent_id"],
+                        "interview_link": result["interview_link"],
+                        "created_at": result["created_at"]
+                    })
+                    records[result["agent_id"]] = self._build_interview_record(
+                        result, candidate.get("candidate_email") or ""
+                    )
+                except Exception as e:
+                    print(f"❌ Failed to create interview for {candidate.get('candidate_name')}: {e}")
+                    item.update({"success": False, "error": str(e)})
+                
+                items[index] = item
+        
+        # Persist every successful interview in one write
+        if records:
+            try:
+                self._save_interviews_to_file(records)
+            except Exception as e:
+                for item in items:
+                    if item["success"]:
+                        item.update({"success": False, "error": f"Interview created but not saved: {e}"})
+                records = {}
+        
+        succeeded = len(records)
+        print(f"✅ Batch complete: {succeeded}/{len(candidates)} interviews created")
+        
+        return {
+            "total": len(candidates),
+            "succeeded": succeeded,
+            "failed": len(candidates) - succeeded,
+            "results": items
+        }
     
-    def get_transcript(self, agent_id: str, candidate_name: str = None, role: str = None) -> Dict[str, Any]:
+    def get_transcript(
+        self,
+        agent_id: str,
+        candidate_name: str = None,
+        role: str = None,
+        since: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Get the latest interview transcript for an agent.
         
+        Messages already seen for a call are kept in memory, so repeated calls
+        (e.g. UI polling during a live interview) only merge and pair new messages.
+        
         Args:
             agent_id: The ID of the agent
             candidate_name: Name of the candidate (optional, will try to retrieve from stored info)
             role: Role of the candidate (optional, will try to retrieve from stored info)
+            since: Message cursor from a previous response; only messages after it are returned
+                and counted in new_message_count (optional, non-negative)
             
         Returns:
             Dictionary containing the formatted transcript and metadata
@@ -139,21 +256,29 @@ class InterviewManager:
             latest_call = max(agent_calls, key=lambda x: x.get("started_at", ""))
             call_id = latest_call["id"]
             
-            # Get the transcript
-            messages = self._get_call_messages(call_id)
-            formatted_transcript = self._format_transcript(latest_call, messages, candidate_info)
+            if since is not None and since < 0:
+                raise ValueError("since must be a non-negative message cursor")
+            
+            # Merge new messages into the call cursor and pair only those
+            cursor_state, fetched_count = self._sync_call_messages(call_id)
+            messages = cursor_state["messages"]
+            formatted_transcript = self._build_transcript(candidate_info, cursor_state["responses"])
+            # New to this client: everything after its own cursor
+            client_messages = messages if since is None else messages[since:]
             
             result = {
                 "success": True,
                 "agent_id": agent_id,
                 "call_id": call_id,
                 "call_info": latest_call,
-                "messages": messages,
+                "messages": client_messages,
                 "formatted_transcript": formatted_transcript,
-                "message_count": len(messages)
+                "message_count": len(messages),
+                "new_message_count": len(client_messages),
+                "cursor": len(messages)
             }
             
-            print(f"✅ Retrieved transcript with {len(messages)} messages")
+            print(f"✅ Retrieved transcript with {len(messages)} messages ({fetched_count} fetched since last sync)")
             return result
             
         except Exception as e:
@@ -205,35 +330,205 @@ class InterviewManager:
             print(f"❌ Error listing interviews: {e}")
             return []
     
-    def get_saved_interviews(self) -> Dict[str, Any]:
+    def get_saved_interviews(self, full: bool = False) -> Dict[str, Any]:
         """
         Get all saved interviews from the tracking file.
         
+        Args:
+            full: Include agent details with the rendered system prompt (default: slim records)
+            
         Returns:
             Dictionary with agent_id as keys and interview data as values
         """
-        return self._load_interviews_from_file()
+        interviews = self._load_interviews_from_file()
+        
+        if full:
+            return {
+                agent_id: self._expand_interview_record(record)
+                for agent_id, record in interviews.items()
+            }
+        
+        return {
+            agent_id: self._slim_interview_record(record)
+            for agent_id, record in interviews.items()
+        }
+    
+    def get_system_prompt(self, agent_id: str) -> Optional[str]:
+        """
+        Reconstruct the system prompt used for a saved interview.
+        
+        Args:
+            agent_id: The ID of the agent
+            
+        Returns:
+            The rendered system prompt, or None if the interview is unknown
+        """
+        record = self._load_interviews_from_file().get(agent_id)
+        if not record:
+            return None
+        return self._resolve_system_prompt(record)
+    
+    def _build_interview_result(
+        self,
+        agent: Dict[str, Any],
+        candidate_name: str,
+        role: str,
+        candidate_email: str = ""
+    ) -> Dict[str, Any]:
+        """Build the interview result for a freshly created agent."""
+        agent_id = agent["id"]
+        
+        # Store candidate info for later use in transcript formatting
+        self._candidate_info[agent_id] = {
+            "name": candidate_name,
+            "position": role,
+            "email": candidate_email
+        }
+        
+        return {
+            "agent_id": agent_id,
+            "interview_link": f"{self.chat_url}/{agent_id}",
+            "candidate_name": candidate_name,
+            "role": role,
+            "agent_details": agent,
+            "created_at": datetime.now().isoformat()
+        }
+    
+    def _build_interview_record(self, result: Dict[str, Any], candidate_email: str = "") -> Dict[str, Any]:
+        """Build the persisted interview record, replacing the prompt with a template reference."""
+        agent_details = {
+            key: value for key, value in result.get("agent_details", {}).items()
+            if key != "system_prompt"
+        }
+        
+        return {
+            "agent_id": result["agent_id"],
+            "interview_link": result["interview_link"],
+            "candidate_name": result["candidate_name"],
+            "role": result["role"],
+            "candidate_email": candidate_email,
+            "system_prompt_ref": {
+                "template_id": DEFAULT_TEMPLATE_ID,
+                "template_version": DEFAULT_TEMPLATE_VERSION,
+                "params": {
+                    "candidate_name": result["candidate_name"],
+                    "role": result["role"],
+                    "candidate_email": candidate_email
+                }
+            },
+            "agent_details": agent_details,
+            "created_at": result["created_at"]
+        }
+    
+    def _compact_interview_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace an embedded system prompt (legacy records) with a template reference.
+        
+        The prompt is only dropped when re-rendering the extracted parameters
+        reproduces it exactly, so no information is lost.
+        """
+        agent_details = record.get("agent_details", {})
+        system_prompt = agent_details.get("system_prompt")
+        if not system_prompt or "system_prompt_ref" in record:
+            return record
+        
+        name_match = re.search(r'Candidate Name:\s*(.*)', system_prompt)
+        role_match = re.search(r'Role:\s*(.*)', system_prompt)
+        email_match = re.search(r'Email:\s*([^\s\n]+)', system_prompt)
+        if not name_match or not role_match:
+            return record
+        
+        params = {
+            "candidate_name": name_match.group(1).strip(),
+            "role": role_match.group(1).strip(),
+            "candidate_email": email_match.group(1) if email_match else ""
+        }
+        
+        for (template_id, version) in PROMPT_TEMPLATES:
+            if render_system_prompt(params, template_id, version) == system_prompt:
+                compacted = dict(record)
+                compacted["agent_details"] = {k: v for k, v in agent_details.items() if k != "system_prompt"}
+                compacted["system_prompt_ref"] = {
+                    "template_id": template_id,
+                    "template_version": version,
+                    "params": params
+                }
+                compacted.setdefault("candidate_email", params["candidate_email"])
+                return compacted
+        
+        return record
+    
+    def _resolve_system_prompt(self, record: Dict[str, Any]) -> Optional[str]:
+        """Return the system prompt of a record, rendering it from its template reference if needed."""
+        prompt_ref = record.get("system_prompt_ref")
+        if prompt_ref:
+            return render_system_prompt(
+                prompt_ref.get("params", {}),
+                prompt_ref.get("template_id", DEFAULT_TEMPLATE_ID),
+                prompt_ref.get("template_version", DEFAULT_TEMPLATE_VERSION)
+            )
+        return record.get("agent_details", {}).get("system_prompt")
+    
+    def _slim_interview_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Return an interview record without agent details or prompt text."""
+        record = self._compact_interview_record(record)
+        slim = {key: value for key, value in record.items() if key != "agent_details"}
+        slim.setdefault("candidate_email", "")
+        return slim
+    
+    def _expand_interview_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Return an interview record with the rendered system prompt inside agent details."""
+        expanded = dict(record)
+        agent_details = dict(record.get("agent_details", {}))
+        system_prompt = self._resolve_system_prompt(record)
+        if system_prompt is not None:
+            agent_details["system_prompt"] = system_prompt
+        expanded["agent_details"] = agent_details
+        return expanded
     
     def _save_interview_to_file(self, agent_id: str, interview_data: Dict[str, Any]) -> None:
         """Save interview data to the JSON tracking file."""
         try:
-            # Load existing interviews
-            interviews = self._load_interviews_from_file()
-            
-            # Add new interview
-            interviews[agent_id] = interview_data
-            
-            # Ensure data directory exists
-            os.makedirs(os.path.dirname(self.interviews_file), exist_ok=True)
-            
-            # Save back to file
-            with open(self.interviews_file, 'w', encoding='utf-8') as f:
-                json.dump(interviews, f, indent=2, ensure_ascii=False)
+            self._save_interviews_to_file({agent_id: interview_data})
+        except Exception as e:
+            print(f"❌ Error saving interview to file: {e}")
+    
+    def _save_interviews_to_file(self, new_interviews: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Save several interviews to the JSON tracking file in a single atomic write.
+        
+        Raises:
+            OSError: If the tracking file cannot be written
+        """
+        try:
+            with self._file_lock:
+                self._write_interviews(new_interviews)
             
-            print(f"💾 Interview saved to tracking file: {self.interviews_file}")
+            print(f"💾 {len(new_interviews)} interview(s) saved to tracking file: {self.interviews_file}")
             
         except Exception as e:
-            print(f"❌ Error saving interview to file: {e}")
+            print(f"❌ Error saving {len(new_interviews)} interview(s) to file: {e}")
+            raise
+    
+    def _write_interviews(self, new_interviews: Dict[str, Dict[str, Any]]) -> None:
+        """Merge new interviews into the tracking file (caller holds the file lock)."""
+        # Load existing interviews, migrating legacy records with embedded prompts
+        interviews = {
+            existing_id: self._compact_interview_record(record)
+            for existing_id, record in self._load_interviews_from_file().items()
+        }
+        
+        # Add new interviews
+        interviews.update(new_interviews)
+        
+        # Ensure data directory exists
+        os.makedirs(os.path.dirname(self.interviews_file), exist_ok=True)
+        
+        # Write to a temp file and rename so readers never see a partial file
+        tmp_file = f"{self.interviews_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(interviews, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.interviews_file)
     
     def _load_interviews_from_file(self) -> Dict[str, Any]:
         """Load interviews from the JSON tracking file."""
@@ -250,9 +545,7 @@ class InterviewManager:
     # Private helper methods
     def _create_agent(self, candidate_name: str, role: str, candidate_email: str = "") -> Dict[str, Any]:
         """Create an interview agent via the API."""
-        candidate_info = f"Candidate Name: {candidate_name}\nRole: {role}"
-        if candidate_email:
-            candidate_info += f"\nEmail: {candidate_email}"
+        candidate_info = build_candidate_information(candidate_name, role, candidate_email)
         
         system_prompt = self._generate_system_prompt(candidate_info)
         
@@ -297,25 +590,88 @@ class InterviewManager:
         response.raise_for_status()
         return response.json()
     
-    def _format_transcript(self, call_info: Dict[str, Any], messages: List[Dict[str, Any]], candidate_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Format the transcript into JSON structure."""
+    def _sync_call_messages(self, call_id: str) -> tuple:
+        """
+        Fetch the messages of a call and merge them into its cursor.
         
-        # Parse messages into question-answer pairs
-        responses = []
-        current_question = None
+        Only messages past the cursor are paired into Q&A responses. If the fetched
+        history no longer extends the cached one, the cursor is rebuilt from scratch.
+        Safe to call from several threads (request handlers and transcript ingestion).
+        
+        Returns:
+            Tuple of (snapshot of the cursor's messages and responses, number of
+            messages added to the cursor by this call)
+        """
+        fetched = self._get_call_messages(call_id)
+        
+        with self._cursor_lock:
+            state = self._call_cursors.get(call_id)
+            if state is None or not self._extends_history(state["messages"], fetched):
+                state = {"messages": [], "responses": [], "current_question": None}
+            
+            new_messages = fetched[len(state["messages"]):]
+            self._pair_messages(new_messages, state)
+            state["messages"].extend(new_messages)
+            self._call_cursors[call_id] = state
+            self._call_cursors.move_to_end(call_id)
+            while len(self._call_cursors) > self._cursor_cache_size:
+                self._call_cursors.popitem(last=False)
+            
+            snapshot = {"messages": list(state["messages"]), "responses": list(state["responses"])}
+        
+        return snapshot, len(new_messages)
+    
+    def _extends_history(self, known: List[Dict[str, Any]], fetched: List[Dict[str, Any]]) -> bool:
+        """Check that a fetched message list starts with the already known messages."""
+        if len(fetched) < len(known):
+            return False
+        if not known:
+            return True
+        return self._message_key(known[-1]) == self._message_key(fetched[len(known) - 1])
+    
+    def _message_key(self, message: Dict[str, Any]) -> tuple:
+        """Identity of a message for cursor comparisons."""
+        return (message.get("sent_at"), message.get("sender"), message.get("message"))
+    
+    def _pair_messages(self, messages: List[Dict[str, Any]], state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Parse messages into question-answer pairs, continuing from a previous pairing state.
+        
+        Args:
+            messages: Messages to parse (in order)
+            state: Pairing state with responses and current_question (optional, starts empty)
+            
+        Returns:
+            The updated pairing state
+        """
+        if state is None:
+            state = {"responses": [], "current_question": None}
         
         for message in messages:
             sender = message.get("sender", "unknown")
             content = message.get("message", "").strip().replace('\\', '').replace('"', '')
             
             if sender == "ai" and content:
-                current_question = content
+                state["current_question"] = content
             elif sender == "user" and content:
-                responses.append({
-                    "question": current_question,
+                state["responses"].append({
+                    "question": state["current_question"],
                     "answer": content
                 })
-                current_question = None  # Reset for next Q&A pair
+                state["current_question"] = None  # Reset for next Q&A pair
+        
+        return state
+    
+    def _format_transcript(self, call_info: Dict[str, Any], messages: List[Dict[str, Any]], candidate_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Format the transcript into JSON structure."""
+        
+        # Parse messages into question-answer pairs
+        responses = self._pair_messages(messages)["responses"]
+        
+        return self._build_transcript(candidate_info, responses)
+    
+    def _build_transcript(self, candidate_info: Dict[str, Any], responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the transcript structure from already paired responses."""
         
         # Generate candidate ID from name and position
         candidate_id = self._generate_candidate_id(candidate_info["name"], candidate_info["position"])
@@ -326,7 +682,7 @@ class InterviewManager:
                 "id": candidate_id,
                 "name": candidate_info["name"],
                 "position": candidate_info["position"],
-                "responses": responses
+                "responses": list(responses)
             }
         }
         
@@ -355,114 +711,5 @@ class InterviewManager:
     
     def _generate_system_prompt(self, candidate_information: str) -> str:
         """Generate the system prompt for the AI interviewer."""
-
-        return f"""
-You are 'Maki AI Recruiter', an advanced, autonomous AI interview agent specializing in technical talent
-            assessment, focusing on soft skills and team compatibility.
-            Your goal is to conduct a professional, engaging, and in-depth video interview.
-
-            **Candidate Information:**
-            {candidate_information}
-            **Your Core Objectives:**
-            1.  **Personalized Greeting:** Start by warmly greeting the candidate by their name and acknowledging the role they've applied for.
-            2.  **Build Rapport:** Maintain a professional yet friendly and empathetic tone throughout the interview.
-            3.  **Adaptive Questioning:** Your primary task is to elicit responses that allow for a comprehensive 
-                psychological profile (specifically the Big Five personality traits) and soft skill assessment.
-                You have access to a `KNOWLEDGE_BANK_QUESTIONS` and should strategically choose questions based on the flow
-                of conversation and what you still need to learn about the candidate's personality and soft skills.
-            4.  **Deep Dive & Follow-ups:** Ask insightful follow-up questions to probe deeper into responses, focusing
-                on behavioral examples and specific situations (e.g., 'Tell me more about that experience,'
-                'How did you handle that specific challenge?').
-            5.  **Cover All Traits:** Ensure you gather sufficient information to infer all five Big Five traits:
-                Openness, Conscientiousness, Extraversion, Agreeableness, and Neuroticism (Emotional Stability).
-                Focus on examples that demonstrate these traits in a professional context.
-            6.  **Situational Judgment:** Incorporate situational judgment questions to assess problem-solving,
-                ethical reasoning, and teamwork in hypothetical scenarios.
-            7.  **Consistent Information Gathering:** While adaptive, ensure the interview covers enough ground across all
-                soft skill and personality dimensions to provide consistent data for the final output.
-                Aim for a balanced set of questions across different personality aspects.
-            8.  **Interview Conclusion:** Clearly signal the end of the interview and thank the candidate for their time.
-
-            **KNOWLEDGE_BANK_QUESTIONS:**
-            [
-                {{
-                    "trait": "Openness to Experience",
-                    "type": "behavioral",
-                    "questions": [
-                        "Tell me about a time you embraced a new technology or approach at work. What was the outcome?",
-                        "How do you stay current with new trends and ideas in your field?",
-                        "Describe a situation where you had to think outside the box to solve a problem.",
-                        "What's a new skill or hobby you've pursued recently, and what motivated you?"
-                    ]
-                }},
-                {{
-                    "trait": "Conscientiousness",
-                    "type": "behavioral",
-                    "questions": [
-                        "Describe a project where you had to manage multiple tasks or priorities. How did you ensure everything was completed on time and to a high standard?",
-                        "Walk me through your typical approach to planning and organizing your work.",
-                        "Tell me about a time you made a mistake at work. How did you handle it and what did you learn?",
-                        "How do you ensure accuracy and attention to detail in your work?"
-                    ]
-                }},
-                {{
-                    "trait": "Extraversion",
-                    "type": "behavioral",
-                    "questions": [
-                        "How do you typically contribute in team meetings or group discussions?",
-                        "Describe a situation where you had to persuade or influence others. What was your approach?",
-                        "How do you prefer to collaborate with colleagues on a project?",
-                        "Tell me about a time you took on a leadership role or initiated a group activity."
-                    ]
-                }},
-                {{
-                    "trait": "Agreeableness",
-                    "type": "behavioral",
-                    "questions": [
-                        "Describe a time you had a disagreement with a colleague. How did you resolve it?",
-                        "How do you typically approach working with others from different backgrounds or with different working styles?",
-                        "Tell me about a time you went out of your way to help a team member. What was the impact?",
-                        "How do you build and maintain positive relationships with your colleagues?"
-                    ]
-                }},
-                {{
-                    "trait": "Neuroticism (Emotional Stability)",
-                    "type": "behavioral",
-                    "questions": [
-                        "Tell me about a time you faced significant pressure or stress at work. How did you manage it?",
-                        "Describe a situation where a project didn't go as planned. How did you react and what did you do next?",
-                        "How do you typically handle constructive criticism or negative feedback?",
-                        "What strategies do you use to maintain a positive outlook, even when facing challenges?"
-                    ]
-                }},
-                {{
-                    "trait": "General Soft Skills",
-                    "type": "situational",
-                    "questions": [
-                        "Imagine you're leading a project, and half your team is unexpectedly pulled onto another critical task. How would you adjust your plan to ensure the project still meets its deadline?",
-                        "You discover a critical bug in a system right before launch, but fixing it will delay the release. What steps do you take, and who do you communicate with?",
-                        "A team member consistently misses deadlines, impacting your progress. You've spoken to them before, but the issue persists. How do you address this now?",
-                        "You receive conflicting instructions from two different managers on the same task. How do you proceed?"
-                    ]
-                }},
-                {{
-                    "trait": "Custom Culture Fit",
-                    "type": "custom",
-                    "questions": [
-                        "What aspects of a team environment help you perform your best?",
-                        "How do you prefer to receive feedback, and how do you give it?",
-                        "Describe your ideal team dynamic.",
-                        "What's one thing you appreciate most about your previous team experiences?"
-                    ]
-                }}
-            ]
-
-            **Interview State (for internal use by agent - do not directly reveal to candidate):**
-            - Questions asked so far: []
-            - Traits covered: []
-            - Remaining questions to cover: [All questions initially from KNOWLEDGE_BANK_QUESTIONS]
-
-            Remember to keep the conversation natural and human-like.
-            Your primary directive is to gather rich, detailed responses related to the candidate's professional behaviors
-            and decision-making, which will inform their personality profile."
-        """
\ No newline at end of file
+        template = PROMPT_TEMPLATES[(DEFAULT_TEMPLATE_ID, DEFAULT_TEMPLATE_VERSION)]
+        return template.format(candidate_information=candidate_information)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Mistral API Key Pool
+
+This module handles:
+- Spreading Mistral requests over several API keys, each with its own rate
+  limiter and health state
+- Routing each request to the least-loaded healthy key
+- Temporarily evicting keys that answer 429 (rate limited) or 401 (unauthorized)
+- Per-key usage statistics
+
+The pool behaves like a Mistral client: pool.chat.complete(...) and
+pool.embeddings.create(...) run on one of the keys' clients.
+"""
+
+import os
+import time
+import threading
+import logging
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+from rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def load_api_keys() -> List[str]:
+    """API keys from MISTRAL_API_KEYS (comma-separated), falling back to MISTRAL_API_KEY."""
+    keys = [key.strip() for key in os.getenv("MISTRAL_API_KEYS", "").split(",") if key.strip()]
+    if not keys and os.getenv("MISTRAL_API_KEY"):
+        keys = [os.getenv("MISTRAL_API_KEY").strip()]
+    # Keep order, drop duplicates
+    return list(dict.fromkeys(keys))
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """
+    HTTP status of an API error.
+    
+    Only the status code of the SDK error (or its HTTP response) counts; the
+    message is never parsed, so a token count of 401 is not a status.
+    """
+    for candidate in (error, getattr(error, "response", None), getattr(error, "raw_response", None)):
+        status = getattr(candidate, "status_code", None)
+        # The Mistral SDK uses -1 when no response was received
+        if isinstance(status, int) and 100 <= status < 600:
+            return status
+    return None
+
+
+def rotates_keys(client: Any) -> bool:
+    """
+    Whether a client moves a rejected request (429/401) to another key or provider.
+    
+    Such clients can be retried at once; a plain client has to back off instead.
+    """
+    return getattr(client, "rotates_keys", False) is True
+
+
+class NoHealthyKeyError(RuntimeError):
+    """Raised when every key in the pool is evicted for authentication errors."""
+
+
+class PooledKey:
+    """One API key with its client, limiter and usage counters."""
+    
+    def __init__(self, index: int, api_key: str, client, requests_per_second: float):
+        self.label = f"key-{index} (...{api_key[-4:]})"
+        self.client = client
+        self.limiter = RateLimiter(requests_per_second)
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.auth_failures = 0
+        self.total_latency = 0.0
+        self.evicted_until = 0.0
+        self.eviction_reason: Optional[str] = None
+        self.last_error: Optional[str] = None
+    
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.evicted_until
+    
+    def next_slot(self) -> float:
+        """Earliest time the key's limiter lets another request through."""
+        return self.limiter.last_request_time + self.limiter.min_interval
+    
+    def stats(self, now: float) -> Dict[str, Any]:
+        completed = self.requests - self.in_flight
+        return {
+            "key": self.label,
+            "healthy": self.is_healthy(now),
+            "evicted_for_seconds": round(max(0.0, self.evicted_until - now), 1),
+            "eviction_reason": self.eviction_reason if not self.is_healthy(now) else None,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+            "auth_failures": self.auth_failures,
+            "avg_latency_ms": round(self.total_latency / completed * 1000, 1) if completed else None,
+            "last_error": self.last_error
+        }
+
+
+class _Namespace:
+    """Proxy for a client namespace (e.g. chat) that dispatches calls through the pool."""
+    
+    def __init__(self, pool: "MistralKeyPool", path: Tuple[str, ...]):
+        self._pool = pool
+        self._path = path
+    
+    def __getattr__(self, name: str):
+        path = self._path + (name,)
+        if len(path) == 1:
+            return _Namespace(self._pool, path)
+        
+        def call(*args, **kwargs):
+            def invoke(client):
+                target = client
+                for part in path:
+                    target = getattr(target, part)
+                return target(*args, **kwargs)
+            return self._pool.execute(invoke)
+        return call
+
+
+class MistralKeyPool:
+    """
+    Load-balanced pool of Mistral API keys.
+    """
+    
+    # Keys that answer 429/401 are evicted, so a retry lands on another key
+    rotates_keys = True
+    
+    def __init__(self, api_keys: List[str], requests_per_second: Optional[float] = None,
+                 client_factory: Optional[Callable[[str], Any]] = None,
+                 rate_limit_cooldown: Optional[float] = None, auth_cooldown: Optional[float] = None):
+        """
+        Initialize the pool.
+        
+        Args:
+            api_keys: API keys (at least one)
+            requests_per_second: Limit per key (default: MISTRAL_REQUESTS_PER_SECOND or 1.0)
+            client_factory: Builds a client for a key (default: mistralai.Mistral)
+            rate_limit_cooldown: Seconds a key is evicted after a 429 (default: MISTRAL_KEY_COOLDOWN_SECONDS or 10)
+            auth_cooldown: Seconds a key is evicted after a 401 (default: MISTRAL_KEY_AUTH_COOLDOWN_SECONDS or 600)
+        
+        Raises:
+            ValueError: If no API key is given
+        """
+        if not api_keys:
+            raise ValueError("At least one Mistral API key is required")
+        if client_factory is None:
+            from mistralai import Mistral
+            client_factory = lambda api_key: Mistral(api_key=api_key)
+        
+        self.requests_per_second_per_key = (requests_per_second if requests_per_second is not None
+                                            else float(os.getenv("MISTRAL_REQUESTS_PER_SECOND", "1.0")))
+        self.rate_limit_cooldown = (rate_limit_cooldown if rate_limit_cooldown is not None
+                                    else float(os.getenv("MISTRAL_KEY_COOLDOWN_SECONDS", "10")))
+        self.auth_cooldown = (auth_cooldown if auth_cooldown is not None
+                              else float(os.getenv("MISTRAL_KEY_AUTH_COOLDOWN_SECONDS", "600")))
+        self.keys = [PooledKey(i, api_key, client_factory(api_key), self.requests_per_second_per_key)
+                     for i, api_key in enumerate(api_keys)]
+        self._lock = threading.Lock()
+        logger.info(f"🔑 Mistral key pool: {len(self.keys)} keys at {self.requests_per_second_per_key} requests/s each")
+    
+    # Client interface
+    
+    def __getattr__(self, name: str):
+        # pool.chat.complete(...), pool.embeddings.create(...), ...
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _Namespace(self, (name,))
+    
+    @property
+    def requests_per_second(self) -> float:
+        """Combined limit of all keys."""
+        return self.requests_per_second_per_key * len(self.keys)
+    
+    @property
+    def min_interval(self) -> float:
+        return 1.0 / self.requests_per_second
+    
+    def set_requests_per_second(self, requests_per_second: float) -> None:
+        """Change the per-key limit."""
+        self.requests_per_second_per_key = requests_per_second
+        for key in self.keys:
+            key.limiter.requests_per_second = requests_per_second
+            key.limiter.min_interval = 1.0 / requests_per_second
+    
+    def has_healthy_key(self) -> bool:
+        """Whether a key is in rotation (a request would not wait for a cooldown)."""
+        with self._lock:
+            now = time.time()
+            return any(key.is_healthy(now) for key in self.keys)
+    
+    # Scheduling
+    
+    def execute(self, func: Callable[[Any], Any]) -> Any:
+        """
+        Run func(client) on the least-loaded healthy key, respecting its rate limit.
+        
+        Raises:
+            NoHealthyKeyError: If every key is evicted for authentication errors
+            Exception: Whatever the API call raised (the key is evicted on 429/401)
+        """
+        key = self._acquire()
+        key.limiter.wait_if_needed()
+        start = time.time()
+        try:
+            result = func(key.client)
+        except Exception as e:
+            self._release(key, time.time() - start, e)
+            raise
+        self._release(key, time.time() - start)
+        return result
+    
+    def _acquire(self) -> PooledKey:
+        """Pick a key and count the request against it."""
+        while True:
+            with self._lock:
+                now = time.time()
+                healthy = [key for key in self.keys if key.is_healthy(now)]
+                if healthy:
+                    key = min(healthy, key=lambda k: (k.in_flight, k.next_slot(), k.requests))
+                    key.in_flight += 1
+                    key.requests += 1
+                    return key
+                
+                # Everything is cooling down: wait for the first rate-limited key to come back
+                waiting = [key for key in self.keys if key.eviction_reason == "rate_limited"]
+                if not waiting:
+                    raise NoHealthyKeyError("All Mistral API keys were rejected as unauthorized")
+                wait_time = min(key.evicted_until for key in waiting) - now
+            logger.warning(f"⏳ All Mistral API keys are rate limited, waiting {wait_time:.1f}s")
+            time.sleep(max(wait_time, 0.01))
+    
+    def _release(self, key: PooledKey, latency: float, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            key.in_flight -= 1
+            key.total_latency += latency
+            if error is None:
+                return
+            
+            key.failures += 1
+            key.last_error = str(error)[:200]
+            status = error_status(error)
+            if status == 429:
+                key.rate_limited += 1
+                self._evict(key, self.rate_limit_cooldown, "rate_limited")
+            elif status == 401:
+                key.auth_failures += 1
+                self._evict(key, self.auth_cooldown, "unauthorized")
+    
+    def _evict(self, key: PooledKey, cooldown: float, reason: str) -> None:
+        key.evicted_until = time.time() + cooldown
+        key.eviction_reason = reason
+        logger.warning(f"🚫 Evicting Mistral {key.label} for {cooldown:.0f}s ({reason})")
+    
+    # Stats
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool statistics (same top-level fields as RateLimiter.get_stats, plus per-key usage)."""
+        with self._lock:
+            now = time.time()
+            keys = [key.stats(now) for key in self.keys]
+        return {
+            "total_requests": sum(key["requests"] for key in keys),
+            "requests_per_second_limit": self.requests_per_second,
+            "total_wait_time": sum(key.limiter.get_stats()["total_wait_time"] for key in self.keys),
+            "healthy_keys": sum(1 for key in keys if key["healthy"]),
+            "keys": keys
+        }
+
+
+# Process-wide pools, one per key set, so all callers share each key's limit
+_shared_pools: Dict[Tuple[str, ...], MistralKeyPool] = {}
+_shared_pools_lock = threading.Lock()
+
+
+def get_shared_key_pool(requests_per_second: Optional[float] = None) -> Optional[MistralKeyPool]:
+    """
+    Process-wide key pool for the configured keys.
+    
+    Args:
+        requests_per_second: Per-key limit; updates the shared pool if given
+    
+    Returns:
+        The pool, or None if no API key is configured
+    """
+    api_keys = tuple(load_api_keys())
+    if not api_keys:
+        return None
+    with _shared_pools_lock:
+        pool = _shared_pools.get(api_keys)
+        if pool is None:
+            pool = MistralKeyPool(list(api_keys), requests_per_second)
+            _shared_pools[api_keys] = pool
+        elif requests_per_second is not None and requests_per_second != pool.requests_per_second_per_key:
+            pool.set_requests_per_second(requests_per_second)
+        return pool
@@ -0,0 +1,230 @@
+"""
+Lexical Candidate Index
+
+In-memory BM25 inverted index over candidate text (searchable_text, which
+combines name, position, summary, strengths and concerns), plus reciprocal
+rank fusion for combining lexical and vector results.
+
+Exact names, identifiers and explicit mention lookups ("who mentioned
+Kubernetes") are matched here without an embedding request.
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+
+from vector_store import STOPWORDS, SearchHit, matches_filters
+
+# Query words that say how to search rather than what to search for
+QUERY_STOPWORDS = STOPWORDS | {
+    "about", "called", "experience", "experienced", "know", "knows", "mention", "mentioned",
+    "mentions", "named", "said", "say", "says", "skill", "skills", "talk", "talked", "talks",
+    "worked", "working", "works", "using", "used", "uses", "do", "does", "did", "any", "someone",
+}
+
+# Fields indexed when an object has no searchable_text
+TEXT_FIELDS = ("name", "position", "summary", "strengths", "concerns")
+
+# Fields a query may match exactly to be answered by keyword search alone
+KEYWORD_FIELDS = ("name", "candidate_id", "position")
+
+# Query words asking for a literal mention rather than a similar profile
+LOOKUP_WORDS = {"called", "mention", "mentioned", "mentions", "named", "said", "say", "says"}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with a light plural folding (skills -> skill)."""
+    tokens = []
+    for token in re.findall(r"[a-z0-9][a-z0-9+#]*", text.lower()):
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def reciprocal_rank_fusion(result_lists: List[List[SearchHit]], limit: int, k: int = 60) -> List[SearchHit]:
+    """
+    Merge ranked result lists with reciprocal rank fusion.
+    
+    Args:
+        result_lists: Ranked hits from each retriever
+        limit: Number of fused hits to return
+        k: RRF damping constant (higher flattens rank differences)
+    
+    Returns:
+        Fused hits ordered by RRF score (the score replaces the retriever scores)
+    """
+    scores: Dict[str, float] = {}
+    properties: Dict[str, Dict[str, Any]] = {}
+    for hits in result_lists:
+        for rank, (uuid, props, _) in enumerate(hits, 1):
+            scores[uuid] = scores.get(uuid, 0.0) + 1.0 / (k + rank)
+            properties.setdefault(uuid, props)
+    
+    fused = sorted(scores, key=lambda uuid: (-scores[uuid], uuid))[:limit]
+    return [(uuid, properties[uuid], scores[uuid]) for uuid in fused]
+
+
+def _contains_phrase(tokens: List[str], phrase: List[str]) -> bool:
+    """Whether phrase occurs as a contiguous run of tokens."""
+    size = len(phrase)
+    return any(tokens[i:i + size] == phrase for i in range(len(tokens) - size + 1))
+
+
+class LexicalIndex:
+    """
+    BM25 inverted index over candidate objects keyed by UUID.
+    """
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize an empty index.
+        
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.is_built = False
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        # Content terms of each KEYWORD_FIELDS value -> number of objects with it
+        self._field_values: Counter = Counter()
+        self._total_length = 0
+    
+    def __len__(self) -> int:
+        return len(self._documents)
+    
+    def rebuild(self, objects: Dict[str, Dict[str, Any]]) -> None:
+        """Replace the index contents with the given objects."""
+        with self._lock:
+            self._postings, self._lengths, self._documents = {}, {}, {}
+            self._field_values = Counter()
+            self._total_length = 0
+            for uuid, props in objects.items():
+                self._add(uuid, props)
+            self.is_built = True
+    
+    def upsert(self, objects: Dict[str, Dict[str, Any]]) -> None:
+        """Add or replace objects."""
+        with self._lock:
+            for uuid, props in objects.items():
+                self._remove(uuid)
+                self._add(uuid, props)
+    
+    def remove(self, uuids: List[str]) -> None:
+        """Remove objects."""
+        with self._lock:
+            for uuid in uuids:
+                self._remove(uuid)
+    
+    def covers(self, query: str) -> bool:
+        """
+        Whether the query is a pure keyword query for this index.
+        
+        True when the query's content terms exactly match a name, identifier
+        or position, or when it asks who mentioned a phrase of at most three
+        terms and the phrase occurs verbatim in some candidate's text. Descriptive
+        queries ("calm under pressure") go through semantic retrieval even
+        when all of their words occur somewhere.
+        """
+        terms = self._query_terms(query)
+        if not terms:
+            return False
+        
+        with self._lock:
+            if tuple(terms) in self._field_values:
+                return True
+            if len(terms) > 3 or not LOOKUP_WORDS.intersection(tokenize(query)):
+                return False
+            if not all(term in self._postings for term in terms):
+                return False
+            return any(_contains_phrase(self._query_terms(self._document_text(self._documents[uuid])), terms)
+                       for uuid in self._postings[terms[0]])
+    
+    def search(self, query: str, limit: int, filters: Optional[List[Tuple[str, str, Any]]] = None,
+               offset: int = 0) -> List[SearchHit]:
+        """
+        Rank objects by BM25 score for the query.
+        
+        Args:
+            query: Search query
+            limit: Maximum number of hits
+            filters: Property conditions every hit must satisfy
+            offset: Number of best hits to skip (pagination)
+        
+        Returns:
+            Hits with a positive score, best first
+        """
+        terms = self._query_terms(query)
+        scores: Dict[str, float] = {}
+        
+        with self._lock:
+            count = len(self._documents)
+            if not terms or not count:
+                return []
+            average_length = self._total_length / count
+            
+            for term in set(terms):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for uuid, frequency in postings.items():
+                    if filters and not matches_filters(self._documents[uuid], filters):
+                        continue
+                    norm = 1 - self.b + self.b * self._lengths[uuid] / average_length
+                    scores[uuid] = scores.get(uuid, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+            
+            ranked = sorted(scores, key=lambda uuid: (-scores[uuid], uuid))[offset:offset + limit]
+            return [(uuid, self._documents[uuid], scores[uuid]) for uuid in ranked]
+    
+    def _query_terms(self, query: str) -> List[str]:
+        return [term for term in tokenize(query) if term not in QUERY_STOPWORDS]
+    
+    def _keyword_values(self, props: Dict[str, Any]) -> List[Tuple[str, ...]]:
+        values = [tuple(self._query_terms(str(props.get(field) or ""))) for field in KEYWORD_FIELDS]
+        return [value for value in values if value]
+    
+    def _document_text(self, props: Dict[str, Any]) -> str:
+        if props.get("searchable_text"):
+            return props["searchable_text"]
+        
+        parts = []
+        for field in TEXT_FIELDS:
+            value = props.get(field)
+            parts.extend(value if isinstance(value, list) else [value or ""])
+        return " ".join(parts)
+    
+    def _add(self, uuid: str, props: Dict[str, Any]) -> None:
+        """Index one object (caller holds the lock)."""
+        tokens = [t for t in tokenize(self._document_text(props)) if t not in STOPWORDS]
+        for term, frequency in Counter(tokens).items():
+            self._postings.setdefault(term, {})[uuid] = frequency
+        self._lengths[uuid] = len(tokens)
+        self._field_values.update(self._keyword_values(props))
+        self._documents[uuid] = props
+        self._total_length += len(tokens)
+    
+    def _remove(self, uuid: str) -> None:
+        """Drop one object from the index (caller holds the lock)."""
+        if uuid not in self._documents:
+            return
+        
+        for term in set(t for t in tokenize(self._document_text(self._documents[uuid])) if t not in STOPWORDS):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(uuid, None)
+                if not postings:
+                    del self._postings[term]
+        for value in self._keyword_values(self._documents[uuid]):
+            self._field_values[value] -= 1
+            if not self._field_values[value]:
+                del self._field_values[value]
+        self._total_length -= self._lengths.pop(uuid)
+        del self._documents[uuid]
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+LLM Providers
+
+This module handles:
+- A common interface over Mistral (through the API key pool) and any
+  OpenAI-compatible chat completions endpoint
+- Routing chat calls across providers by weight, latency or availability
+- Automatic failover: a provider that errors is taken out of rotation for a
+  cooldown and the call moves on to the next provider
+
+Providers are configured with LLM_PROVIDERS, a comma-separated list of
+name[:weight] entries tried by the router, e.g. "mistral:3,openai:1".
+"mistral" uses the Mistral key pool; any other name is an OpenAI-compatible
+endpoint configured through <NAME>_BASE_URL, <NAME>_API_KEY, <NAME>_MODEL and
+<NAME>_REQUESTS_PER_SECOND (so "openai" reads OPENAI_BASE_URL and friends).
+
+The router behaves like a Mistral client for chat: router.chat.complete(...)
+returns a response with choices[0].message.content from whichever provider
+served it. Embeddings stay on Mistral so vectors share one space.
+"""
+
+import os
+import time
+import random
+import threading
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional, Tuple
+
+from rate_limiter import RateLimiter
+from key_pool import MistralKeyPool, get_shared_key_pool, load_api_keys, error_status
+
+logger = logging.getLogger(__name__)
+
+ROUTING_STRATEGIES = ("weighted", "latency", "availability")
+
+# Weight of the newest sample in the latency moving average
+LATENCY_SMOOTHING = 0.3
+
+
+def is_availability_error(error: Exception) -> bool:
+    """Whether an error says the provider is unavailable (rather than the request being invalid)."""
+    status = error_status(error)
+    return status is None or status in (401, 403, 408, 429) or status >= 500
+
+
+class LLMProvider(ABC):
+    """
+    Base class of a chat completion provider with health and latency tracking.
+    """
+    
+    def __init__(self, name: str, weight: float = 1.0):
+        if weight <= 0:
+            raise ValueError(f"Provider {name} needs a positive weight, got {weight}")
+        self.name = name
+        self.weight = weight
+        self.requests = 0
+        self.failures = 0
+        self.latency: Optional[float] = None
+        self.down_until = 0.0
+        self.last_error: Optional[str] = None
+    
+    @abstractmethod
+    def complete(self, **kwargs) -> Any:
+        """Run a chat completion (Mistral chat.complete arguments)."""
+    
+    @property
+    @abstractmethod
+    def requests_per_second(self) -> float:
+        """Combined request rate limit of the provider."""
+    
+    def total_wait_time(self) -> float:
+        """Seconds spent waiting for the provider's rate limits."""
+        return 0.0
+    
+    def is_available(self, now: float) -> bool:
+        return now >= self.down_until
+    
+    def record_success(self, latency: float) -> None:
+        self.latency = latency if self.latency is None else (
+            LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * self.latency)
+    
+    def stats(self, now: float) -> Dict[str, Any]:
+        return {
+            "provider": self.name,
+            "weight": self.weight,
+            "available": self.is_available(now),
+            "down_for_seconds": round(max(0.0, self.down_until - now), 1),
+            "requests": self.requests,
+            "failures": self.failures,
+            "avg_latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "requests_per_second_limit": self.requests_per_second,
+            "last_error": self.last_error
+        }
+
+
+class MistralProvider(LLMProvider):
+    """Mistral through the API key pool (rate limits and key eviction are handled by the pool)."""
+    
+    def __init__(self, key_pool: MistralKeyPool, weight: float = 1.0, name: str = "mistral"):
+        super().__init__(name, weight)
+        self.key_pool = key_pool
+    
+    def complete(self, **kwargs) -> Any:
+        return self.key_pool.chat.complete(**kwargs)
+    
+    @property
+    def requests_per_second(self) -> float:
+        return self.key_pool.requests_per_second
+    
+    def total_wait_time(self) -> float:
+        return self.key_pool.get_stats()["total_wait_time"]
+    
+    def is_available(self, now: float) -> bool:
+        # With every key cooling down the pool would block, so route elsewhere first
+        return super().is_available(now) and self.key_pool.has_healthy_key()
+    
+    def stats(self, now: float) -> Dict[str, Any]:
+        stats = super().stats(now)
+        stats["keys"] = self.key_pool.get_stats()["keys"]
+        return stats
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Any endpoint speaking the OpenAI chat completions API (OpenAI, DeepSeek, vLLM, Ollama, ...)."""
+    
+    def __init__(self, name: str, model: str, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 weight: float = 1.0, requests_per_second: float = 1.0, timeout: Optional[float] = None,
+                 client=None):
+        """
+        Initialize the provider.
+        
+        Args:
+            name: Provider name (used in logs and stats)
+            model: Model served by the endpoint; replaces the caller's Mistral model name
+            base_url: Endpoint base URL (default: the OpenAI API)
+            api_key: API key (local servers usually accept any value)
+            weight: Routing weight
+            requests_per_second: Rate limit of the endpoint
+            timeout: Request timeout in seconds (default: LLM_PROVIDER_TIMEOUT_SECONDS or 60)
+            client: Preconfigured OpenAI client (optional)
+        """
+        super().__init__(name, weight)
+        self.model = model
+        self.base_url = base_url
+        if client is None:
+            from openai import OpenAI
+            # The router fails over instead of retrying, so the SDK's own retries are disabled
+            client = OpenAI(api_key=api_key or "not-needed", base_url=base_url, max_retries=0,
+                            timeout=timeout or float(os.getenv("LLM_PROVIDER_TIMEOUT_SECONDS", "60")))
+        self.client = client
+        self.rate_limiter = RateLimiter(requests_per_second)
+    
+    def complete(self, **kwargs) -> Any:
+        kwargs["model"] = self.model
+        self.rate_limiter.wait_if_needed()
+        return self.client.chat.completions.create(**kwargs)
+    
+    @property
+    def requests_per_second(self) -> float:
+        return self.rate_limiter.requests_per_second
+    
+    def total_wait_time(self) -> float:
+        return self.rate_limiter.get_stats()["total_wait_time"]
+    
+    def stats(self, now: float) -> Dict[str, Any]:
+        stats = super().stats(now)
+        stats.update({"model": self.model, "base_url": self.base_url})
+        return stats
+
+
+class _Chat:
+    """router.chat.complete(...), mirroring the Mistral client."""
+    
+    def __init__(self, router: "LLMRouter"):
+        self._router = router
+    
+    def complete(self, **kwargs) -> Any:
+        return self._router.complete(**kwargs)
+
+
+class LLMRouter:
+    """
+    Routes chat completions across providers with automatic failover.
+    """
+    
+    # Failing providers are skipped, so a retry lands on another provider
+    rotates_keys = True
+    
+    def __init__(self, providers: List[LLMProvider], strategy: Optional[str] = None,
+                 cooldown: Optional[float] = None):
+        """
+        Initialize the router.
+        
+        Args:
+            providers: Providers in priority order (at least one)
+            strategy: weighted, latency or availability (default: LLM_ROUTING_STRATEGY or weighted)
+            cooldown: Seconds a failing provider is skipped (default: LLM_PROVIDER_COOLDOWN_SECONDS or 30)
+        
+        Raises:
+            ValueError: If no provider is given or the strategy is unknown
+        """
+        if not providers:
+            raise ValueError("At least one LLM provider is required")
+        self.providers = providers
+        self.strategy = (strategy or os.getenv("LLM_ROUTING_STRATEGY", "weighted")).lower()
+        if self.strategy not in ROUTING_STRATEGIES:
+            raise ValueError(f"Unknown LLM routing strategy '{self.strategy}' (expected one of {', '.join(ROUTING_STRATEGIES)})")
+        self.cooldown = cooldown if cooldown is not None else float(os.getenv("LLM_PROVIDER_COOLDOWN_SECONDS", "30"))
+        self.failovers = 0
+        self.chat = _Chat(self)
+        self._lock = threading.Lock()
+        logger.info(f"🔀 LLM router ({self.strategy}): " + ", ".join(f"{p.name}:{p.weight:g}" for p in providers))
+    
+    @property
+    def requests_per_second(self) -> float:
+        """Combined rate limit of all providers."""
+        return sum(provider.requests_per_second for provider in self.providers)
+    
+    @property
+    def min_interval(self) -> float:
+        return 1.0 / self.requests_per_second
+    
+    def complete(self, **kwargs) -> Any:
+        """
+        Run a chat completion on the best provider, failing over to the others.
+        
+        Raises:
+            Exception: The last provider's error if every provider failed
+        """
+        last_error: Optional[Exception] = None
+        for attempt, provider in enumerate(self._route()):
+            if attempt:
+                with self._lock:
+                    self.failovers += 1
+                logger.warning(f"↪️ Failing over to LLM provider {provider.name}")
+            start = time.time()
+            try:
+                response = provider.complete(**dict(kwargs))
+            except Exception as e:
+                self._record_failure(provider, e)
+                last_error = e
+                continue
+            with self._lock:
+                provider.requests += 1
+                provider.record_success(time.time() - start)
+            return response
+        raise last_error
+    
+    def _route(self) -> List[LLMProvider]:
+        """Providers in the order to try: available ones by strategy, then the rest by recovery time."""
+        with self._lock:
+            now = time.time()
+            available = [p for p in self.providers if p.is_available(now)]
+            down = sorted((p for p in self.providers if not p.is_available(now)), key=lambda p: p.down_until)
+            if self.strategy == "weighted":
+                # Weighted shuffle: the first pick follows the weights, the rest are fallbacks
+                available.sort(key=lambda p: random.random() ** (1.0 / p.weight), reverse=True)
+            elif self.strategy == "latency":
+                # Unmeasured providers first, so every provider gets a latency sample
+                available.sort(key=lambda p: -1.0 if p.latency is None else p.latency)
+            return available + down
+    
+    def _record_failure(self, provider: LLMProvider, error: Exception) -> None:
+        with self._lock:
+            provider.requests += 1
+            provider.failures += 1
+            provider.last_error = str(error)[:200]
+            if is_availability_error(error):
+                provider.down_until = time.time() + self.cooldown
+        logger.warning(f"⚠️ LLM provider {provider.name} failed: {str(error)[:120]}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Router statistics (same top-level fields as RateLimiter.get_stats, plus per-provider usage)."""
+        with self._lock:
+            now = time.time()
+            providers = [provider.stats(now) for provider in self.providers]
+        return {
+            "total_requests": sum(p["requests"] for p in providers),
+            "requests_per_second_limit": self.requests_per_second,
+            "total_wait_time": sum(provider.total_wait_time() for provider in self.providers),
+            "strategy": self.strategy,
+            "failovers": self.failovers,
+            "providers": providers
+        }
+
+
+def parse_provider_spec(spec: str) -> List[Tuple[str, float]]:
+    """
+    Parse LLM_PROVIDERS ("name[:weight],...").
+    
+    Raises:
+        ValueError: If an entry is malformed
+    """
+    entries = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, weight = entry.partition(":")
+        try:
+            entries.append((name.strip().lower(), float(weight) if weight else 1.0))
+        except ValueError:
+            raise ValueError(f"Invalid LLM provider entry '{entry}': expected name[:weight]")
+    return entries
+
+
+def build_providers(spec: Optional[str] = None, requests_per_second: Optional[float] = None) -> List[LLMProvider]:
+    """
+    Providers configured in LLM_PROVIDERS (entries without credentials are skipped).
+    
+    Args:
+        spec: Provider list (default: LLM_PROVIDERS or "mistral")
+        requests_per_second: Per-key limit of the Mistral key pool
+    """
+    providers: List[LLMProvider] = []
+    for name, weight in parse_provider_spec(spec or os.getenv("LLM_PROVIDERS", "mistral")):
+        if name == "mistral":
+            key_pool = get_shared_key_pool(requests_per_second)
+            if key_pool is None:
+                logger.warning("⚠️ LLM provider mistral skipped: no Mistral API key configured")
+                continue
+            providers.append(MistralProvider(key_pool, weight))
+            continue
+        
+        prefix = name.upper().replace("-", "_")
+        base_url = os.getenv(f"{prefix}_BASE_URL")
+        api_key = os.getenv(f"{prefix}_API_KEY")
+        model = os.getenv(f"{prefix}_MODEL")
+        if not (base_url or api_key) or not model:
+            logger.warning(f"⚠️ LLM provider {name} skipped: set {prefix}_BASE_URL or {prefix}_API_KEY, and {prefix}_MODEL")
+            continue
+        providers.append(OpenAICompatibleProvider(
+            name, model, base_url=base_url, api_key=api_key, weight=weight,
+            requests_per_second=float(os.getenv(f"{prefix}_REQUESTS_PER_SECOND", "1.0"))
+        ))
+    return providers
+
+
+# Process-wide routers, one per configuration, so provider health and limits are shared
+_shared_routers: Dict[Tuple[Any, ...], LLMRouter] = {}
+_shared_routers_lock = threading.Lock()
+
+
+def get_llm_router(requests_per_second: Optional[float] = None) -> Optional[LLMRouter]:
+    """
+    Process-wide router for the configured providers.
+    
+    Args:
+        requests_per_second: Per-key limit of the Mistral key pool; updates it if given
+    
+    Returns:
+        The router, or None if no provider is configured
+    """
+    spec = os.getenv("LLM_PROVIDERS", "mistral")
+    config = (spec, os.getenv("LLM_ROUTING_STRATEGY", "weighted"), tuple(load_api_keys()),
+              tuple(os.getenv(f"{name.upper().replace('-', '_')}_{field}", "")
+                    for name, _ in parse_provider_spec(spec) if name != "mistral"
+                    for field in ("BASE_URL", "API_KEY", "MODEL")))
+    with _shared_routers_lock:
+        router = _shared_routers.get(config)
+        if router is None:
+            providers = build_providers(spec, requests_per_second)
+            if not providers:
+                return None
+            router = LLMRouter(providers)
+            _shared_routers[config] = router
+        elif requests_per_second is not None:
+            # Keeps the shared Mistral key pool's limit in step
+            get_shared_key_pool(requests_per_second)
+        return router
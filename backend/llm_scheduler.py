@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+LLM Request Scheduler
+
+This module handles:
+- One admission queue for every LLM call in the process (analysis, trait
+  extraction, assistant re-ranking, embeddings and chat)
+- Priority classes: interactive calls are served ahead of bulk work, with a
+  weighted share for bulk so a busy chat never stalls an analysis completely
+- Fair queuing between sources within a class (round robin, so one large
+  job cannot monopolize its class)
+- Pacing to the providers' combined rate limit and a concurrency cap, so
+  calls wait here, in priority order, rather than inside a key's rate limiter
+- Queue depth and per-class wait time statistics
+
+Callers get a client for their class: scheduler.client(INTERACTIVE, source="chat")
+behaves like the LLM router (chat.complete(...)), or like any other target
+passed in, e.g. the Mistral key pool for embeddings.
+"""
+
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict, deque
+from typing import Dict, Any, Optional, Callable, Tuple
+
+from llm_providers import LLMRouter, get_llm_router
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# Classes in priority order (ties in the weighted share go to the first)
+PRIORITY_CLASSES = (INTERACTIVE, BULK)
+
+# Stride of one bulk admission: a class that was idle may catch up by at most this
+# much, so arriving interactive calls go ahead of up to `weight` queued bulk calls
+ROUND = 1.0
+
+
+class _Ticket:
+    """A call waiting for its turn."""
+    
+    __slots__ = ("priority", "source", "enqueued_at")
+    
+    def __init__(self, priority: str, source: str):
+        self.priority = priority
+        self.source = source
+        self.enqueued_at = time.time()
+
+
+class _ClassStats:
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class ScheduledClient:
+    """Client proxy whose calls (e.g. chat.complete) are admitted by the scheduler."""
+    
+    def __init__(self, scheduler: "LLMScheduler", target: Any, priority: str, source: str,
+                 path: Tuple[str, ...] = ()):
+        self._scheduler = scheduler
+        self._target = target
+        self._priority = priority
+        self._source = source
+        self._path = path
+    
+    @property
+    def rotates_keys(self) -> bool:
+        """Whether the scheduled client moves rejected requests elsewhere."""
+        return getattr(self._target, "rotates_keys", False) is True
+    
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return ScheduledClient(self._scheduler, self._target, self._priority, self._source, self._path + (name,))
+    
+    def __call__(self, *args, **kwargs):
+        def invoke():
+            target = self._target
+            for part in self._path:
+                target = getattr(target, part)
+            return target(*args, **kwargs)
+        return self._scheduler.submit(self._priority, invoke, self._source)
+
+
+class LLMScheduler:
+    """
+    Priority-aware, fair admission queue in front of the LLM providers.
+    """
+    
+    def __init__(self, router: LLMRouter, max_concurrency: Optional[int] = None,
+                 interactive_weight: Optional[float] = None):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            router: LLM router the scheduled calls go to by default
+            max_concurrency: Calls in flight at once (default: LLM_SCHEDULER_MAX_CONCURRENCY or 4)
+            interactive_weight: Interactive calls admitted per bulk call while both
+                classes are waiting (default: LLM_SCHEDULER_INTERACTIVE_WEIGHT or 9)
+        """
+        self.router = router
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_SCHEDULER_MAX_CONCURRENCY", "4"))
+        weight = interactive_weight or float(os.getenv("LLM_SCHEDULER_INTERACTIVE_WEIGHT", "9"))
+        self._stats = {INTERACTIVE: _ClassStats(weight), BULK: _ClassStats(1.0)}
+        # Per class: source -> waiting tickets, in round-robin order
+        self._queues: Dict[str, "OrderedDict[str, deque]"] = {cls: OrderedDict() for cls in PRIORITY_CLASSES}
+        # Stride scheduling: each admission advances its class by 1/weight
+        self._pass = {cls: 0.0 for cls in PRIORITY_CLASSES}
+        self._in_flight = 0
+        self._next_slot = 0.0
+        self._cond = threading.Condition()
+        logger.info(f"🗂️ LLM scheduler: {self.max_concurrency} concurrent calls, interactive weight {weight:g}")
+    
+    def client(self, priority: str, source: str = "default", target: Any = None) -> ScheduledClient:
+        """
+        Client whose calls are scheduled in a priority class.
+        
+        Args:
+            priority: INTERACTIVE or BULK
+            source: Caller name; sources in a class are served round robin
+            target: Object the calls go to (default: the router)
+        
+        Raises:
+            ValueError: If the priority class is unknown
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class '{priority}' (expected one of {', '.join(PRIORITY_CLASSES)})")
+        return ScheduledClient(self, target if target is not None else self.router, priority, source)
+    
+    def submit(self, priority: str, func: Callable[[], Any], source: str = "default") -> Any:
+        """Run func once the scheduler admits it, and return its result."""
+        self._acquire(_Ticket(priority, source))
+        try:
+            result = func()
+        except Exception:
+            self._release(priority, failed=True)
+            raise
+        self._release(priority)
+        return result
+    
+    def _acquire(self, ticket: _Ticket) -> None:
+        with self._cond:
+            queue = self._queues[ticket.priority]
+            active = [self._pass[cls] for cls in PRIORITY_CLASSES if self._queues[cls]]
+            if not queue and active:
+                # A class that was idle does not bank more than one round of admissions
+                self._pass[ticket.priority] = max(self._pass[ticket.priority], min(active) - ROUND)
+            queue.setdefault(ticket.source, deque()).append(ticket)
+            self._stats[ticket.priority].submitted += 1
+            
+            try:
+                while True:
+                    timeout = None
+                    if self._head() is ticket and self._in_flight < self.max_concurrency:
+                        now = time.time()
+                        if now >= self._next_slot:
+                            self._admit(ticket, now)
+                            return
+                        timeout = self._next_slot - now
+                    self._cond.wait(timeout)
+            except BaseException:
+                # Interrupted while waiting: leave the queue so the calls behind it move on
+                tickets = queue.get(ticket.source)
+                if tickets and ticket in tickets:
+                    tickets.remove(ticket)
+                    if not tickets:
+                        del queue[ticket.source]
+                    self._stats[ticket.priority].submitted -= 1
+                    self._cond.notify_all()
+                raise
+    
+    def _head(self) -> Optional[_Ticket]:
+        """Next ticket to admit: the class with the lowest pass, then round robin over its sources."""
+        waiting = [cls for cls in PRIORITY_CLASSES if self._queues[cls]]
+        if not waiting:
+            return None
+        cls = min(waiting, key=lambda c: (self._pass[c], PRIORITY_CLASSES.index(c)))
+        return next(iter(self._queues[cls].values()))[0]
+    
+    def _admit(self, ticket: _Ticket, now: float) -> None:
+        queue = self._queues[ticket.priority]
+        tickets = queue.pop(ticket.source)
+        tickets.popleft()
+        if tickets:
+            # The source goes to the back of its class
+            queue[ticket.source] = tickets
+        
+        stats = self._stats[ticket.priority]
+        self._pass[ticket.priority] += 1.0 / stats.weight
+        self._in_flight += 1
+        self._next_slot = max(now, self._next_slot) + self.router.min_interval
+        stats.in_flight += 1
+        wait = now - ticket.enqueued_at
+        stats.total_wait += wait
+        stats.max_wait = max(stats.max_wait, wait)
+        self._cond.notify_all()
+    
+    def _release(self, priority: str, failed: bool = False) -> None:
+        with self._cond:
+            stats = self._stats[priority]
+            self._in_flight -= 1
+            stats.in_flight -= 1
+            if failed:
+                stats.failed += 1
+            else:
+                stats.completed += 1
+            self._cond.notify_all()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight calls and wait times per priority class."""
+        with self._cond:
+            now = time.time()
+            classes = {}
+            for cls in PRIORITY_CLASSES:
+                stats = self._stats[cls]
+                tickets = [t for source_queue in self._queues[cls].values() for t in source_queue]
+                admitted = stats.submitted - len(tickets)
+                classes[cls] = {
+                    "weight": stats.weight,
+                    "queue_depth": len(tickets),
+                    "queued_by_source": {source: len(q) for source, q in self._queues[cls].items()},
+                    "oldest_wait_ms": round(max((now - t.enqueued_at for t in tickets), default=0.0) * 1000, 1),
+                    "in_flight": stats.in_flight,
+                    "submitted": stats.submitted,
+                    "completed": stats.completed,
+                    "failed": stats.failed,
+                    "avg_wait_ms": round(stats.total_wait / admitted * 1000, 1) if admitted else None,
+                    "max_wait_ms": round(stats.max_wait * 1000, 1)
+                }
+            return {
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "queue_depth": sum(c["queue_depth"] for c in classes.values()),
+                "classes": classes
+            }
+
+
+# Process-wide schedulers, one per router, so every call site shares one queue
+_shared_schedulers: Dict[int, LLMScheduler] = {}
+_shared_schedulers_lock = threading.Lock()
+
+
+def get_llm_scheduler(requests_per_second: Optional[float] = None) -> Optional[LLMScheduler]:
+    """
+    Process-wide scheduler in front of the shared LLM router.
+    
+    Args:
+        requests_per_second: Per-key limit of the Mistral key pool (see get_llm_router)
+    
+    Returns:
+        The scheduler, or None if no LLM provider is configured
+    """
+    router = get_llm_router(requests_per_second)
+    if router is None:
+        return None
+    with _shared_schedulers_lock:
+        scheduler = _shared_schedulers.get(id(router))
+        if scheduler is None or scheduler.router is not router:
+            scheduler = LLMScheduler(router)
+            _shared_schedulers[id(router)] = scheduler
+        return scheduler
@@ -8,6 +8,7 @@ Run this file to start the analysis process.
 
 import os
 import sys
+import argparse
 import logging
 from pathlib import Path
 import json
@@ -15,6 +16,13 @@ import json
 from compatibility_analyzer import CompatibilityAnalyzer
 from utils import print_results_summary
 from interview_manager import InterviewManager
+from analysis_store import AnalysisStore
+from run_snapshots import RunSnapshotStore
+from candidate_loader import CandidateLoader
+from results_writer import ResultsWriter, FORMATS
+from checkpoint import RunCheckpoint
+from sharding import parse_shard, select_shard, merge_shards
+from serialization import dump_file
 
 from dotenv import load_dotenv
 
@@ -36,9 +44,101 @@ def load_json_file(file_path: str) -> dict:
         logger.error(f"Error loading file {file_path}: {e}")
         raise
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Analyze candidate compatibility with the team")
+    parser.add_argument("--output", default=None,
+                        help="Results file (default: data/compatibility_scores.json, "
+                             "or data/shards/shard-<i>-of-<N>.json with --shard)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write each candidate result as it completes instead of holding the run in memory")
+    parser.add_argument("--format", choices=FORMATS, default=None,
+                        help="Streaming output format (default: from the --output extension)")
+    parser.add_argument("--resume", metavar="RUN_ID", default=None,
+                        help="Continue an interrupted run from its checkpoint, skipping completed work")
+    parser.add_argument("--shard", metavar="I/N", default=None,
+                        help="Analyze only shard I of N (0-based); run one worker per shard, "
+                             "each with its own MISTRAL_API_KEY if needed")
+    parser.add_argument("--merge", metavar="SHARD_FILE", nargs="+", default=None,
+                        help="Merge shard result files into one run instead of analyzing")
+    parser.add_argument("--allow-missing-shards", action="store_true",
+                        help="With --merge, merge even if some shards are missing")
+    args = parser.parse_args(argv)
+    
+    try:
+        args.shard_spec = parse_shard(args.shard) if args.shard else None
+    except ValueError as e:
+        parser.error(str(e))
+    if args.output is None:
+        if args.shard_spec:
+            extension = "ndjson" if args.format == "ndjson" else "json"
+            args.output = f"data/shards/shard-{args.shard_spec[0]}-of-{args.shard_spec[1]}.{extension}"
+        else:
+            args.output = "data/compatibility_scores.json"
+    return args
+
+def open_checkpoint(args: argparse.Namespace) -> RunCheckpoint:
+    """Checkpoint of the resumed run, or a new one."""
+    checkpoint = RunCheckpoint.resume(args.resume) if args.resume else RunCheckpoint()
+    print(f"📍 Checkpointing run {checkpoint.run_id} (continue after a failure with --resume {checkpoint.run_id})")
+    return checkpoint
+
+def shard_metadata(args: argparse.Namespace) -> dict:
+    """analysis_metadata fields identifying a shard worker's output."""
+    index, total = args.shard_spec
+    return {"shard": {"index": index, "total": total}}
+
+def run_merge(args: argparse.Namespace) -> None:
+    """Merge shard results, then record and export the combined run."""
+    print(f"🧩 Merging {len(args.merge)} shard result files...")
+    results = merge_shards(args.merge, allow_missing=args.allow_missing_shards)
+    missing = results["analysis_metadata"]["sharding"]["missing"]
+    if missing:
+        print(f"⚠️  Shards {missing} are missing; their candidates are not in the merged results")
+    
+    print_results_summary(results)
+    
+    run_id = AnalysisStore().save_run(results)
+    RunSnapshotStore().write(results)
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    dump_file(results, args.output)
+    
+    print(f"\n🗄️ Analysis run {run_id} stored")
+    print(f"💾 Merged results saved to: {args.output}")
+    print("✅ Merge completed successfully!")
+
+def run_streaming(analyzer: CompatibilityAnalyzer, team_data: dict, candidates_dir: str, args: argparse.Namespace) -> None:
+    """Stream the analysis to disk, reading candidate files one at a time."""
+    candidate_files = sorted(Path(candidates_dir).glob("candidate_*.json"))
+    if not candidate_files:
+        print(f"❌ Error: No candidate files found in {candidates_dir}/. Please ensure candidate files (candidate_*.json) exist.")
+        sys.exit(1)
+    
+    print(f"📁 Streaming {len(candidate_files)} candidate files to {args.output}")
+    candidates = (load_json_file(str(path)) for path in candidate_files)
+    if args.shard_spec:
+        candidates = select_shard(candidates, *args.shard_spec)
+    
+    checkpoint = open_checkpoint(args)
+    metadata = shard_metadata(args) if args.shard_spec else None
+    with ResultsWriter(args.output, args.format, metadata) as writer:
+        summary = analyzer.stream_team_compatibility(team_data, candidates, writer, checkpoint)
+    checkpoint.delete()
+    
+    print_results_summary(summary)
+    print(f"\n💾 {summary['analysis_metadata']['candidates_count']} candidate results streamed to: {args.output}")
+    print("ℹ️  Streaming runs are not recorded in the analysis store or run snapshots")
+    print("✅ Analysis completed successfully!")
+
+def main(argv=None):
     """Main execution function."""
+    args = parse_args(argv)
     try:
+        if args.merge:
+            run_merge(args)
+            return
+        
         print("🚀 Initializing Team Compatibility Analyzer...")
         
         # Check for custom rate limit from environment
@@ -56,34 +156,54 @@ def main():
             print(f"❌ Error: {team_file} not found. Please ensure the team data file exists in the data/ directory.")
             sys.exit(1)
         
-        # Find all candidate files in the data directory
-        candidate_files = list(Path(candidates_dir).glob("candidate_*.json"))
-        if not candidate_files:
+        if args.stream:
+            run_streaming(analyzer, load_json_file(team_file), candidates_dir, args)
+            return
+        
+        # Load all candidate files (unchanged files come from the directory manifest)
+        loader = CandidateLoader(candidates_dir)
+        candidates_data_list = loader.load()
+        if not candidates_data_list:
             print(f"❌ Error: No candidate files found in {candidates_dir}/. Please ensure candidate files (candidate_*.json) exist.")
             sys.exit(1)
         
-        print(f"📁 Loading data files... Found {len(candidate_files)} candidate files")
+        print(f"📁 Loaded {len(candidates_data_list)} candidate files "
+              f"({loader.last_stats['reparsed']} new or changed, "
+              f"{loader.last_stats['files'] - loader.last_stats['reparsed']} unchanged since the last run)")
         
+        if args.shard_spec:
+            candidates_data_list = list(select_shard(candidates_data_list, *args.shard_spec))
+            print(f"🧩 Shard {args.shard}: {len(candidates_data_list)} candidates")
+
         # Load team data
         team_data = load_json_file(team_file)
         
-        # Load all candidate data
-        candidates_data_list = []
-        for candidate_file in candidate_files:
-            candidate_data = load_json_file(str(candidate_file))
-            candidates_data_list.append(candidate_data)
-        
-        # Perform analysis with JSON data instead of file paths
-        results = analyzer.analyze_team_compatibility(team_data, candidates_data_list)
+        # Perform analysis with JSON data instead of file paths (progress is checkpointed)
+        checkpoint = open_checkpoint(args)
+        results = analyzer.analyze_team_compatibility(team_data, candidates_data_list, checkpoint)
         
         # Print formatted results
         print_results_summary(results)
         
-        # Save detailed results
-        output_file = "data/compatibility_scores.json"
+        if args.shard_spec:
+            # Partial results are only recorded once merged
+            results["analysis_metadata"].update(shard_metadata(args))
+            if os.path.dirname(args.output):
+                os.makedirs(os.path.dirname(args.output), exist_ok=True)
+            analyzer.save_results(results, args.output)
+            checkpoint.delete()
+            print(f"\n💾 Shard results saved to: {args.output} (combine all shards with --merge)")
+            return
+        
+        # Record the run and export detailed results
+        run_id = AnalysisStore().save_run(results)
+        RunSnapshotStore().write(results)
+        output_file = args.output
         analyzer.save_results(results, output_file)
+        checkpoint.delete()
         
-        print(f"\n💾 Detailed results saved to: {output_file}")
+        print(f"\n🗄️ Analysis run {run_id} stored")
+        print(f"💾 Detailed results saved to: {output_file}")
         print("✅ Analysis completed successfully!")
         
     except ValueError as e:
@@ -5,7 +5,7 @@ Contains all request/response models for API validation.
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 
 # Interview Management Models
 
@@ -21,6 +21,47 @@ class InterviewResponse(BaseModel):
     role: str
     agent_details: Dict[str, Any]
 
+class InterviewHistoryItem(BaseModel):
+    agent_id: str
+    candidate_name: str
+    role: str
+    candidate_email: Optional[str] = None
+    interview_link: str
+    created_at: str
+    status: str
+    duration: str
+    duration_seconds: Optional[int] = None
+    has_transcript: bool
+    call_id: Optional[str] = None
+    updated_at: Optional[str] = None
+
+class InterviewHistoryResponse(BaseModel):
+    interviews: List[InterviewHistoryItem]
+    total_count: int
+    page: int
+    page_size: int
+
+class BatchCreateInterviewRequest(BaseModel):
+    interviews: List[CreateInterviewRequest] = Field(..., description="Interviews to create")
+    max_concurrency: Optional[int] = Field(None, ge=1, description="Maximum parallel agent creations (optional)")
+    requests_per_second: Optional[float] = Field(None, gt=0, description="Agent creation rate cap (optional)")
+
+class BatchInterviewItem(BaseModel):
+    index: int
+    success: bool
+    candidate_name: str
+    role: str
+    agent_id: Optional[str] = None
+    interview_link: Optional[str] = None
+    created_at: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchInterviewResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchInterviewItem]
+
 class TranscriptRequest(BaseModel):
     candidate_name: Optional[str] = None
     role: Optional[str] = None
@@ -33,6 +74,8 @@ class TranscriptResponse(BaseModel):
     messages: Optional[List[Dict[str, Any]]] = None
     formatted_transcript: Optional[Dict[str, Any]] = None
     message_count: Optional[int] = None
+    new_message_count: Optional[int] = None
+    cursor: Optional[int] = None
     error: Optional[str] = None
 
 # Team and Candidate Models
@@ -69,6 +112,7 @@ class CandidatesData(BaseModel):
 class CompatibilityAnalysisRequest(BaseModel):
     team_data: TeamData
     candidates_data: CandidatesData
+    resume_run_id: Optional[str] = Field(None, description="Run id of an interrupted analysis to continue from its checkpoint")
 
 class PersonalityExtractionRequest(BaseModel):
     candidate_data: Candidate
@@ -86,12 +130,25 @@ class StatusResponse(BaseModel):
     compatibility_analyzer_available: bool
     ai_assistant_available: bool
     rate_limit_info: Dict[str, Any]
+    transcript_ingestion: Optional[Dict[str, Any]] = None
+    ai_assistant_connection: Optional[Dict[str, Any]] = None
+    candidate_sync: Optional[Dict[str, Any]] = None
 
 # AI Assistant Models
 
+class CandidateFilters(BaseModel):
+    position: Optional[str] = Field(None, description="Exact position")
+    recommendation: Optional[Union[str, List[str]]] = Field(None, description="Recommendation status, or a list of accepted statuses")
+    min_compatibility_score: Optional[float] = Field(None, description="Minimum compatibility score (0-1)")
+    max_compatibility_score: Optional[float] = Field(None, description="Maximum compatibility score (0-1)")
+    min_traits: Optional[Dict[str, float]] = Field(None, description="Minimum score per personality trait")
+    max_traits: Optional[Dict[str, float]] = Field(None, description="Maximum score per personality trait")
+
 class CandidateQueryRequest(BaseModel):
-    query: str = Field(..., description="Natural language query about candidates")
-    limit: Optional[int] = Field(5, description="Maximum number of results to return")
+    query: str = Field(..., description="Natural language query about candidates (may be empty when filtering)")
+    limit: Optional[int] = Field(5, ge=1, le=20, description="Maximum number of results to return")
+    filters: Optional[CandidateFilters] = Field(None, description="Structured filters applied by the vector store")
+    cursor: Optional[str] = Field(None, description="next_cursor from the previous page")
 
 class PersonalityTraits(BaseModel):
     openness: Optional[float] = None
@@ -117,6 +174,9 @@ class CandidateQueryResponse(BaseModel):
     results_count: int
     candidates: List[CandidateResult]
     timestamp: str
+    strategy: Optional[str] = None
+    cached: bool = False
+    next_cursor: Optional[str] = None
     error: Optional[str] = None
 
 class SyncRequest(BaseModel):
@@ -126,6 +186,7 @@ class SyncResponse(BaseModel):
     success: bool
     message: str
     candidates_synced: Optional[int] = None
+    changes: Optional[Dict[str, Any]] = None
     timestamp: str
 
 class CandidateStatsResponse(BaseModel):
@@ -10,17 +10,19 @@ import time
 import random
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 #from mistralai import Mistral
 from rate_limiter import RateLimiter
+from key_pool import error_status, rotates_keys
 
 logger = logging.getLogger(__name__)
 
 class PersonalityTraitsExtractor:
     """Extracts personality traits from interview responses using AI."""
     
-    def __init__(self, client, rate_limiter: RateLimiter):
+    def __init__(self, client, rate_limiter: Optional[RateLimiter] = None):
+        # Pooled, routed and scheduled clients apply rate limits themselves, so no limiter is needed with one
         self.client = client
         self.rate_limiter = rate_limiter
     
@@ -50,7 +52,8 @@ class PersonalityTraitsExtractor:
         
         try:
             # Apply rate limiting before making request
-            self.rate_limiter.wait_if_needed()
+            if self.rate_limiter:
+                self.rate_limiter.wait_if_needed()
             system_prompt = """
             You are a personality assessment expert. Analyze interview responses and provide accurate Big Five personality trait scores.
             """
@@ -120,11 +123,14 @@ class PersonalityTraitsExtractor:
         for attempt in range(max_retries):
             try:
                 response = self.client.chat.complete(**kwargs)
-                # response = self.client.chat.completions.create(**kwargs)
                 return response
             except Exception as e:
-                error_str = str(e).lower()
-                if 'rate limit' in error_str or 'too many requests' in error_str:
+                status = error_status(e)
+                if rotates_keys(self.client) and status in (429, 401) and attempt < max_retries - 1:
+                    # The key or provider was taken out of rotation; the retry goes elsewhere
+                    logger.warning(f"API key rejected, retrying on another key (attempt {attempt + 1}/{max_retries})")
+                    continue
+                if status == 429:
                     if attempt < max_retries - 1:
                         wait_time = (2 ** attempt) + random.uniform(1, 3)  # Exponential backoff with jitter
                         logger.warning(f"Rate limit hit, retrying in {wait_time:.2f}s (attempt {attempt + 1}/{max_retries})")
@@ -0,0 +1,93 @@
+"""
+Query Result Cache
+
+In-memory LRU cache with TTL expiry for candidate query results. Keys include
+the collection version, so results computed before a sync changed the
+collection are never served afterwards.
+"""
+
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text so trivially different phrasings share a cache entry."""
+    return re.sub(r"\s+", " ", query.lower()).strip(" ?!.")
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache for query results.
+    """
+    
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached results (least recently used are evicted)
+            ttl_seconds: Seconds a result stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def make_key(self, query: str, limit: int, version: int, variant: Any = None) -> Tuple:
+        """Build the cache key for a query (variant distinguishes filters and pages; must be hashable)."""
+        return (normalize_query(query), limit, version, variant)
+    
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+        
+        Args:
+            key: Key from make_key
+        
+        Returns:
+            Copy of the cached result, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+    
+    def set(self, key: Tuple, result: Dict[str, Any]) -> None:
+        """Store a result, evicting the least recently used entries if full."""
+        if self.max_entries <= 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses
+            }
@@ -0,0 +1,307 @@
+"""
+Candidate Query Planner
+
+This module recognizes structured candidate questions:
+- Trait queries ("most outgoing candidates", "lowest neuroticism")
+- Score queries ("top candidates", "highest compatibility")
+- Recommendation queries ("highly recommended candidates")
+- Numeric thresholds ("extraversion above 0.7", "compatibility over 80%")
+- Result counts ("top 3 candidates", "5 most outgoing")
+- Explicit filters sent with a query (position, recommendation, score ranges)
+
+Such questions are answered with a filtered, sorted property query instead of
+vector search plus LLM re-ranking. Anything the planner cannot fully explain
+is treated as open-ended and left to the RAG path.
+"""
+
+import re
+from typing import Dict, List, Any, Optional, Tuple
+
+TRAITS = ["openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism"]
+
+# Phrase -> (trait, descending): descending means "more of the trait first"
+TRAIT_PHRASES = {
+    "extraversion": ("extraversion", True),
+    "extroversion": ("extraversion", True),
+    "extraverted": ("extraversion", True),
+    "extroverted": ("extraversion", True),
+    "extravert": ("extraversion", True),
+    "extrovert": ("extraversion", True),
+    "outgoing": ("extraversion", True),
+    "sociable": ("extraversion", True),
+    "social": ("extraversion", True),
+    "energetic": ("extraversion", True),
+    "introverted": ("extraversion", False),
+    "introvert": ("extraversion", False),
+    "reserved": ("extraversion", False),
+    "openness": ("openness", True),
+    "open minded": ("openness", True),
+    "creative": ("openness", True),
+    "innovative": ("openness", True),
+    "curious": ("openness", True),
+    "conscientiousness": ("conscientiousness", True),
+    "conscientious": ("conscientiousness", True),
+    "organized": ("conscientiousness", True),
+    "organised": ("conscientiousness", True),
+    "reliable": ("conscientiousness", True),
+    "detail oriented": ("conscientiousness", True),
+    "disciplined": ("conscientiousness", True),
+    "agreeableness": ("agreeableness", True),
+    "agreeable": ("agreeableness", True),
+    "team player": ("agreeableness", True),
+    "team players": ("agreeableness", True),
+    "collaborative": ("agreeableness", True),
+    "cooperative": ("agreeableness", True),
+    "friendly": ("agreeableness", True),
+    "neuroticism": ("neuroticism", True),
+    "neurotic": ("neuroticism", True),
+    "anxious": ("neuroticism", True),
+    "stressed": ("neuroticism", True),
+    "calm": ("neuroticism", False),
+    "calmest": ("neuroticism", False),
+    "emotionally stable": ("neuroticism", False),
+    "stable": ("neuroticism", False),
+    "stress resistant": ("neuroticism", False),
+    "handles pressure well": ("neuroticism", False),
+    "handles pressure": ("neuroticism", False),
+    "resilient": ("neuroticism", False),
+}
+
+# Phrase -> status, or statuses for phrases that cover several (matched with "in")
+RECOMMENDATION_PHRASES = {
+    "highly recommended": "HIGHLY RECOMMENDED",
+    "most recommended": ["HIGHLY RECOMMENDED", "RECOMMENDED"],
+    "top recommended": ["HIGHLY RECOMMENDED", "RECOMMENDED"],
+    "not recommended": "NOT RECOMMENDED",
+    "recommended": "RECOMMENDED",
+    "conditional": "CONDITIONAL",
+    "cautious": "CAUTIOUS",
+}
+
+SCORE_PHRASES = [
+    "compatibility score", "compatibility scores", "compatibility", "compatible",
+    "best fit", "best fits", "best match", "best matches", "score", "scores",
+    "best", "top", "strongest", "worst", "weakest", "ranked", "rank",
+]
+
+# Words that flip the natural sort direction
+INVERTING_WORDS = {"least", "lowest", "low", "less", "worst", "weakest", "bottom", "fewest"}
+
+# Words that carry no constraint of their own
+FILLER_WORDS = {
+    "a", "all", "an", "and", "any", "anyone", "applicant", "applicants", "are", "by", "candidate",
+    "candidates", "do", "does", "find", "for", "get", "give", "greatest", "has", "have", "high",
+    "highest", "i", "in", "is", "list", "me", "more", "most", "need", "of", "on", "one", "ones",
+    "our", "people", "person", "please", "rate", "rated", "see", "show", "someone", "sorted",
+    "that", "the", "their", "them", "very", "want", "we", "what", "which", "who", "whose",
+    "with", "you", "pool", "profile", "profiles", "level", "levels", "trait", "traits",
+    "personality", "first", "order", "ordered",
+}
+
+THRESHOLD_PATTERN = re.compile(
+    r"(at least|at most|greater than|more than|less than|higher than|lower than|above|over|below|under|>=|<=|>|<)"
+    r"\s*(\d+(?:\.\d+)?)\s*(%?)"
+)
+# A count next to a ranking word: "top 3", "best 5", "3 most outgoing", "10 highest"
+RANKING_WORDS = r"top|best|first|bottom|worst|most|least|highest|lowest"
+COUNT_PATTERN = re.compile(rf" (?:(?:{RANKING_WORDS}) (\d+)|(\d+) (?=(?:{RANKING_WORDS}) ))")
+
+THRESHOLD_OPERATORS = {
+    "at least": "gte", ">=": "gte",
+    "at most": "lte", "<=": "lte",
+    "greater than": "gt", "more than": "gt", "higher than": "gt", "above": "gt", "over": "gt", ">": "gt",
+    "less than": "lt", "lower than": "lt", "below": "lt", "under": "lt", "<": "lt",
+}
+
+# A property condition: (property, operator, value) with operator in eq/gt/gte/lt/lte/in
+Condition = Tuple[str, str, Any]
+
+
+class QueryPlan:
+    """
+    Structured execution plan for a candidate question.
+    """
+    
+    def __init__(self, intent: str, sort_by: str, descending: bool = True,
+                 filters: Optional[List[Condition]] = None, limit: Optional[int] = None):
+        """
+        Initialize a query plan.
+        
+        Args:
+            intent: "trait", "score" or "recommendation"
+            sort_by: Numeric property to order results by
+            descending: Whether higher values come first
+            filters: Property conditions every result must satisfy
+            limit: Number of results the question asks for ("top 3"), if any
+        """
+        self.intent = intent
+        self.sort_by = sort_by
+        self.descending = descending
+        self.filters = filters or []
+        self.limit = limit
+    
+    def describe(self) -> Dict[str, Any]:
+        """Serializable summary of the plan."""
+        return {
+            "intent": self.intent,
+            "sort_by": self.sort_by,
+            "order": "desc" if self.descending else "asc",
+            "filters": [{"property": p, "operator": op, "value": v} for p, op, v in self.filters],
+            "limit": self.limit
+        }
+    
+    def explain(self, candidate: Dict[str, Any]) -> str:
+        """Explain why a candidate appears in the results of this plan."""
+        order = "highest first" if self.descending else "lowest first"
+        if self.sort_by in TRAITS:
+            value = candidate["personality_traits"].get(self.sort_by) or 0
+            return f"{self.sort_by.capitalize()} score {value:.2f} (ranked by {self.sort_by}, {order})"
+        
+        reasoning = f"Compatibility score {candidate.get('compatibility_score') or 0:.2f} (ranked by compatibility, {order})"
+        if self.intent == "recommendation":
+            reasoning = f"Recommendation: {candidate.get('recommendation')}. {reasoning}"
+        return reasoning
+
+
+def plan_query(query: str) -> Optional[QueryPlan]:
+    """
+    Build a structured plan for a candidate question.
+    
+    Args:
+        query: Natural language query
+    
+    Returns:
+        QueryPlan, or None if the question is open-ended
+    """
+    text = re.sub(r"\.(?!\d)", " ", query.lower().replace("-", " "))
+    text = " " + re.sub(r"[^a-z0-9.%<>=]+", " ", text) + " "
+    
+    # Numeric thresholds bind to the closest preceding trait or score phrase
+    thresholds = []
+    
+    def take_threshold(match):
+        value = float(match.group(2))
+        if match.group(3) == "%" or value > 1:
+            value /= 100
+        thresholds.append((match.start(), THRESHOLD_OPERATORS[match.group(1)], value))
+        return " " * len(match.group(0))
+    
+    text = THRESHOLD_PATTERN.sub(take_threshold, text)
+    
+    # "top 3": the count limits the results, the ranking word stays for the phrases below
+    counts = []
+    
+    def take_count(match):
+        number = match.group(1) or match.group(2)
+        counts.append(int(number))
+        return match.group(0).replace(number, " " * len(number), 1)
+    
+    text = COUNT_PATTERN.sub(take_count, text)
+    if len(set(counts)) > 1:
+        return None
+    limit = counts[0] if counts and counts[0] > 0 else None
+    inverted = any(word in INVERTING_WORDS for word in text.split())
+    
+    traits: List[Tuple[int, str, bool]] = []
+    recommendation = None
+    mentions_score = False
+    positions: List[Tuple[int, str]] = []
+    
+    # Longest phrases first so "handles pressure well" wins over "handles pressure"
+    for phrase, (trait, descending) in sorted(TRAIT_PHRASES.items(), key=lambda item: -len(item[0])):
+        for match in re.finditer(rf" {re.escape(phrase)} ", text):
+            traits.append((match.start(), trait, descending))
+            positions.append((match.start(), trait))
+        text = re.sub(rf" {re.escape(phrase)} ", lambda m: " " * len(m.group(0)), text)
+    
+    # ...and "not recommended" wins over "recommended"
+    for phrase, status in sorted(RECOMMENDATION_PHRASES.items(), key=lambda item: -len(item[0])):
+        if f" {phrase} " in text:
+            # "least recommended" asks for the bottom of every tier, not for the RECOMMENDED tier
+            if re.search(rf" (?:{'|'.join(INVERTING_WORDS)}) {re.escape(phrase)} ", text):
+                return None
+            if recommendation and recommendation != status:
+                return None
+            recommendation = status
+            text = text.replace(f" {phrase} ", " " * (len(phrase) + 2))
+    
+    for phrase in sorted(SCORE_PHRASES, key=len, reverse=True):
+        for match in re.finditer(rf" {re.escape(phrase)} ", text):
+            mentions_score = True
+            positions.append((match.start(), "compatibility_score"))
+        text = re.sub(rf" {re.escape(phrase)} ", lambda m: " " * len(m.group(0)), text)
+    
+    leftover = [word for word in text.split() if word not in INVERTING_WORDS and word not in FILLER_WORDS]
+    
+    # Anything unexplained (skills, experience, free text) needs semantic search
+    if leftover:
+        return None
+    
+    # Ranking by several traits at once is a judgement call for the LLM
+    mentioned_traits = {trait for _, trait, _ in traits}
+    if len(mentioned_traits) > 1 and not thresholds:
+        return None
+    
+    filters: List[Condition] = []
+    for start, operator, value in thresholds:
+        preceding = [(pos, prop) for pos, prop in positions if pos < start]
+        if not preceding:
+            return None
+        filters.append((max(preceding)[1], operator, value))
+    
+    if isinstance(recommendation, list):
+        filters.append(("recommendation", "in", recommendation))
+    elif recommendation:
+        filters.append(("recommendation", "eq", recommendation))
+    
+    if traits:
+        _, trait, descending = min(traits)
+        return QueryPlan("trait", trait, descending != inverted, filters, limit)
+    
+    if recommendation:
+        return QueryPlan("recommendation", "compatibility_score", not inverted, filters, limit)
+    
+    if mentions_score or filters:
+        return QueryPlan("score", "compatibility_score", not inverted, filters, limit)
+    
+    return None
+
+
+def build_filters(spec: Optional[Dict[str, Any]]) -> List[Condition]:
+    """
+    Translate explicit query filters into property conditions.
+    
+    Args:
+        spec: Filter values keyed by position, recommendation (one status or
+            a list), min/max_compatibility_score, and min/max_traits (trait -> bound)
+    
+    Returns:
+        Property conditions for the vector store
+    
+    Raises:
+        ValueError: If a trait name is unknown
+    """
+    spec = spec or {}
+    filters: List[Condition] = []
+    
+    if spec.get("position"):
+        filters.append(("position", "eq", spec["position"]))
+    
+    recommendation = spec.get("recommendation")
+    if isinstance(recommendation, str):
+        filters.append(("recommendation", "eq", recommendation.upper()))
+    elif recommendation:
+        filters.append(("recommendation", "in", [status.upper() for status in recommendation]))
+    
+    if spec.get("min_compatibility_score") is not None:
+        filters.append(("compatibility_score", "gte", spec["min_compatibility_score"]))
+    if spec.get("max_compatibility_score") is not None:
+        filters.append(("compatibility_score", "lte", spec["max_compatibility_score"]))
+    
+    for key, operator in (("min_traits", "gte"), ("max_traits", "lte")):
+        for trait, value in (spec.get(key) or {}).items():
+            if trait not in TRAITS:
+                raise ValueError(f"Unknown trait '{trait}', expected one of: {', '.join(TRAITS)}")
+            filters.append((trait, operator, value))
+    
+    return filters
@@ -8,6 +8,7 @@ Handles rate limiting for API requests to respect service limits.
 import time
 import random
 import logging
+import threading
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
@@ -26,21 +27,24 @@ class RateLimiter:
         self.min_interval = 1.0 / requests_per_second
         self.last_request_time = 0
         self.request_count = 0
+        # Serializes callers so the limit also holds when shared between threads
+        self._lock = threading.Lock()
         
     def wait_if_needed(self):
         """Wait if necessary to respect rate limits."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_interval:
-            sleep_time = self.min_interval - time_since_last
-            # Add small random jitter to avoid thundering herd
-            sleep_time += random.uniform(0, 0.1)
-            logger.info(f"⏳ Rate limiting: waiting {sleep_time:.2f}s before next API request")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
-        self.request_count += 1
+        with self._lock:
+            current_time = time.time()
+            time_since_last = current_time - self.last_request_time
+            
+            if time_since_last < self.min_interval:
+                sleep_time = self.min_interval - time_since_last
+                # Add small random jitter to avoid thundering herd
+                sleep_time += random.uniform(0, 0.1)
+                logger.info(f"⏳ Rate limiting: waiting {sleep_time:.2f}s before next API request")
+                time.sleep(sleep_time)
+            
+            self.last_request_time = time.time()
+            self.request_count += 1
         
     def get_stats(self) -> Dict[str, Any]:
         """Get rate limiter statistics."""
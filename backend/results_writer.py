@@ -0,0 +1,255 @@
+"""
+Streaming Results Writer
+
+This module handles:
+- Writing candidate analyses to disk as each one completes, so memory does
+  not grow with the candidate pool and a crash keeps finished work
+- Two formats: NDJSON (one record per line) and JSON (an incrementally built
+  compatibility_scores.json)
+- Team insights from running statistics instead of the full result list
+
+NDJSON files are appended to and flushed per candidate; every complete line
+survives a crash. JSON files are built in <output>.partial and renamed into
+place when the run finishes, so readers only ever see complete files.
+"""
+
+import heapq
+import os
+import logging
+from typing import Dict, List, Any, Optional, Iterator
+
+from serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("json", "ndjson")
+
+# Candidates at or above this compatibility score count towards candidates_above_threshold
+COMPATIBILITY_THRESHOLD = 0.7
+TOP_CANDIDATES = 3
+
+
+class TeamInsightsAccumulator:
+    """
+    Running statistics over candidate analyses (constant memory).
+    """
+    
+    def __init__(self, top_n: int = TOP_CANDIDATES):
+        self.top_n = top_n
+        self.count = 0
+        self.total = 0.0
+        self.best: Optional[float] = None
+        self.worst: Optional[float] = None
+        self.above_threshold = 0
+        self._top: List[tuple] = []  # min-heap of (score, -sequence, entry)
+    
+    def add(self, candidate_result: Dict[str, Any]) -> None:
+        """Fold one candidate analysis into the statistics."""
+        score = candidate_result["ai_analysis"]["compatibility_score"]
+        self.count += 1
+        self.total += score
+        self.best = score if self.best is None else max(self.best, score)
+        self.worst = score if self.worst is None else min(self.worst, score)
+        if score >= COMPATIBILITY_THRESHOLD:
+            self.above_threshold += 1
+        
+        entry = {
+            "name": candidate_result["candidate_info"]["name"],
+            "compatibility": score,
+            "recommendation": candidate_result["overall_recommendation"]["status"]
+        }
+        # Earlier candidates win ties, like a stable sort over the full list
+        item = (score, -self.count, entry)
+        if len(self._top) < self.top_n:
+            heapq.heappush(self._top, item)
+        elif item[:2] > self._top[0][:2]:
+            heapq.heapreplace(self._top, item)
+    
+    def insights(self) -> Dict[str, Any]:
+        """team_insights section for the candidates seen so far."""
+        if not self.count:
+            return {}
+        return {
+            "candidate_pool_summary": {
+                "average_compatibility": round(self.total / self.count, 3),
+                "best_compatibility": round(self.best, 3),
+                "compatibility_range": round(self.best - self.worst, 3),
+                "candidates_above_threshold": self.above_threshold
+            },
+            "top_candidates": [entry for _, _, entry in sorted(self._top, key=lambda item: item[:2], reverse=True)]
+        }
+
+
+class ResultsWriter:
+    """
+    Writes one analysis run incrementally.
+    
+    Usage:
+        with ResultsWriter("data/compatibility_scores.json") as writer:
+            writer.begin(analysis_metadata, team_summary)
+            for result in results:
+                writer.write_candidate(result)
+            summary = writer.finish()
+    """
+    
+    def __init__(self, output_file: str, output_format: Optional[str] = None,
+                 metadata: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the writer.
+        
+        Args:
+            output_file: Destination file
+            output_format: "json" or "ndjson" (default: from the file extension)
+            metadata: Extra analysis_metadata fields for this output (e.g. the shard)
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        self.output_file = output_file
+        self.output_format = output_format or ("ndjson" if output_file.endswith((".ndjson", ".jsonl")) else "json")
+        if self.output_format not in FORMATS:
+            raise ValueError(f"Unsupported results format: {self.output_format} (expected one of {', '.join(FORMATS)})")
+        
+        self.partial_file = output_file + ".partial" if self.output_format == "json" else output_file
+        self.insights = TeamInsightsAccumulator()
+        self.extra_metadata = metadata or {}
+        self.analysis_metadata: Dict[str, Any] = {}
+        self.team_summary: Dict[str, Any] = {}
+        self._file = None
+        self._finished = False
+    
+    def __enter__(self) -> "ResultsWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self._finished:
+            self.close()
+    
+    @property
+    def candidates_written(self) -> int:
+        return self.insights.count
+    
+    def begin(self, analysis_metadata: Dict[str, Any], team_summary: Dict[str, Any]) -> None:
+        """Open the output and write the run header."""
+        self.analysis_metadata = {**analysis_metadata, **self.extra_metadata}
+        self.team_summary = team_summary
+        
+        output_dir = os.path.dirname(self.output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        self._file = open(self.partial_file, 'wb')
+        
+        if self.output_format == "ndjson":
+            self._write_record("analysis_metadata", self.analysis_metadata)
+            self._write_record("team_summary", team_summary)
+        else:
+            self._file.write(b'{"team_summary":' + dumps(team_summary, pretty=False) + b',"candidates_analysis":[')
+        self._file.flush()
+    
+    def write_candidate(self, candidate_result: Dict[str, Any]) -> None:
+        """Append one candidate analysis and update the running statistics."""
+        if self.output_format == "ndjson":
+            self._write_record("candidate", candidate_result)
+        else:
+            if self.insights.count:
+                self._file.write(b",")
+            self._file.write(dumps(candidate_result, pretty=False))
+        self._file.flush()
+        self.insights.add(candidate_result)
+    
+    def finish(self, metadata_updates: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Write team insights and the final metadata, and close the output.
+        
+        Args:
+            metadata_updates: Fields merged into analysis_metadata (timings, rate limiter stats)
+        
+        Returns:
+            The run summary: analysis_metadata, team_summary and team_insights (no candidate list)
+        """
+        self.analysis_metadata.update(metadata_updates or {})
+        self.analysis_metadata["candidates_count"] = self.insights.count
+        team_insights = self.insights.insights()
+        
+        if self.output_format == "ndjson":
+            self._write_record("team_insights", team_insights)
+            self._write_record("analysis_metadata", self.analysis_metadata)
+        else:
+            self._file.write(b'],"team_insights":' + dumps(team_insights, pretty=False)
+                             + b',"analysis_metadata":' + dumps(self.analysis_metadata, pretty=False) + b'}')
+        self.close()
+        
+        if self.output_format == "json":
+            os.replace(self.partial_file, self.output_file)
+        self._finished = True
+        logger.info(f"💾 Streamed {self.insights.count} candidate analyses to {self.output_file}")
+        
+        return {
+            "analysis_metadata": self.analysis_metadata,
+            "team_summary": self.team_summary,
+            "team_insights": team_insights
+        }
+    
+    def close(self) -> None:
+        """Close the output without finishing it (completed candidates stay on disk)."""
+        if self._file:
+            self._file.close()
+            self._file = None
+    
+    def _write_record(self, record_type: str, data: Any) -> None:
+        self._file.write(dumps({"type": record_type, "data": data}, pretty=False) + b"\n")
+
+
+def iter_ndjson_candidates(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the candidate analyses of an NDJSON results file one at a time.
+    
+    A truncated last line (the process died mid-write) is skipped.
+    """
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                record = loads(line)
+            except ValueError:
+                logger.warning(f"⚠️ Skipping incomplete line in {path}")
+                continue
+            if record.get("type") == "candidate":
+                yield record["data"]
+
+
+def read_results(path: str, output_format: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read a results file (JSON or NDJSON) into the compatibility_scores.json layout.
+    
+    Args:
+        path: Results file
+        output_format: "json" or "ndjson" (default: from the file extension)
+    
+    Returns:
+        Dict with analysis_metadata, team_summary, candidates_analysis and team_insights
+    """
+    output_format = output_format or ("ndjson" if path.endswith((".ndjson", ".jsonl")) else "json")
+    if output_format == "json":
+        with open(path, 'rb') as f:
+            return loads(f.read())
+    
+    results: Dict[str, Any] = {"analysis_metadata": {}, "team_summary": {}, "candidates_analysis": []}
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                record = loads(line)
+            except ValueError:
+                continue
+            if record.get("type") == "candidate":
+                results["candidates_analysis"].append(record["data"])
+            elif record.get("type") == "analysis_metadata":
+                results["analysis_metadata"].update(record["data"])
+            else:
+                results[record.get("type")] = record["data"]
+    if "team_insights" not in results:
+        # Unfinished run: recompute the insights from what was written
+        accumulator = TeamInsightsAccumulator()
+        for candidate_result in results["candidates_analysis"]:
+            accumulator.add(candidate_result)
+        results["team_insights"] = accumulator.insights()
+    return results
@@ -0,0 +1,178 @@
+"""
+Versioned Run Snapshots
+
+Every analysis run is written as an immutable JSON snapshot:
+- <directory>/<run_id>.json: the analyzer output of one run
+- <directory>/index.json: run id, timestamp and candidate count of every snapshot
+- <directory>/latest.json: pointer to the most recent snapshot
+
+All files are written to a temporary file and atomically renamed, so readers
+always see a complete snapshot and a consistent pointer without locking.
+Old snapshots are pruned by count and age.
+"""
+
+import os
+import re
+import threading
+import uuid
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+from serialization import dump_file, load_file
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+LATEST_FILE = "latest.json"
+
+# Run ids double as snapshot file names, so only path-safe characters are allowed
+RUN_ID_PATTERN = re.compile(r"^[\w.-]+$")
+
+
+def default_snapshot_directory() -> str:
+    """Snapshot location: RUN_SNAPSHOT_DIR, the Docker data volume, or data/runs locally."""
+    directory = os.getenv("RUN_SNAPSHOT_DIR")
+    if directory:
+        return directory
+    if os.path.exists("/app/data/"):  # Docker path
+        return "/app/data/runs"
+    return "data/runs"
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """Write JSON to a temporary file and rename it over the destination."""
+    dump_file(data, path)
+
+
+class RunSnapshotStore:
+    """
+    Append-only history of analysis runs with a latest pointer.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, keep_last: Optional[int] = None,
+                 max_age_days: Optional[float] = None):
+        """
+        Initialize the snapshot store.
+        
+        Args:
+            directory: Snapshot directory (default: see default_snapshot_directory)
+            keep_last: Snapshots kept at most (default: RUN_SNAPSHOT_KEEP_LAST or 50, 0 keeps all)
+            max_age_days: Snapshots older than this are pruned (default: RUN_SNAPSHOT_MAX_AGE_DAYS or 0, 0 keeps all)
+        """
+        self.directory = directory or default_snapshot_directory()
+        self.keep_last = keep_last if keep_last is not None else int(os.getenv("RUN_SNAPSHOT_KEEP_LAST", "50"))
+        self.max_age_days = (max_age_days if max_age_days is not None
+                             else float(os.getenv("RUN_SNAPSHOT_MAX_AGE_DAYS", "0")))
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+    
+    def write(self, results: Dict[str, Any], run_id: Optional[str] = None) -> str:
+        """
+        Write a run snapshot, move the latest pointer to it and apply retention.
+        
+        Args:
+            results: Analyzer output
+            run_id: Run identifier (default: analysis_metadata.run_id, else a new timestamp id)
+        
+        Returns:
+            The run id of the snapshot
+        """
+        created_at = datetime.now()
+        run_id = run_id or results.get("analysis_metadata", {}).get("run_id") \
+            or f"{created_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+        self._check_run_id(run_id)
+        
+        entry = {
+            "run_id": run_id,
+            "timestamp": created_at.isoformat(),
+            "file": f"{run_id}.json",
+            "candidates_count": len(results.get("candidates_analysis", []))
+        }
+        
+        with self._lock:
+            # Snapshot first, then index and pointer: readers never follow a pointer to a missing file
+            write_json_atomic(os.path.join(self.directory, entry["file"]), results)
+            
+            index = [item for item in self._read_index() if item["run_id"] != run_id]
+            index.append(entry)
+            index = self._apply_retention(index)
+            write_json_atomic(os.path.join(self.directory, INDEX_FILE), index)
+            write_json_atomic(os.path.join(self.directory, LATEST_FILE), entry)
+        
+        logger.info(f"📸 Saved run snapshot {run_id} ({len(index)} kept)")
+        return run_id
+    
+    def list_runs(self) -> List[Dict[str, Any]]:
+        """Snapshot index entries, newest first."""
+        return sorted(self._read_index(), key=lambda item: item["timestamp"], reverse=True)
+    
+    def latest_run_id(self) -> Optional[str]:
+        """Run id the latest pointer refers to, or None."""
+        pointer = self._read_json(os.path.join(self.directory, LATEST_FILE))
+        return pointer.get("run_id") if pointer else None
+    
+    def load(self, run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Read a snapshot.
+        
+        Args:
+            run_id: Run to read (default: the latest run)
+        
+        Returns:
+            Analyzer output of the run, or None if there is no such snapshot
+        """
+        run_id = run_id or self.latest_run_id()
+        if not run_id or not RUN_ID_PATTERN.match(run_id):
+            return None
+        return self._read_json(os.path.join(self.directory, f"{run_id}.json"))
+    
+    def _apply_retention(self, index: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop snapshots beyond the count and age limits (the newest is always kept)."""
+        index = sorted(index, key=lambda item: item["timestamp"])
+        keep = index
+        
+        if self.max_age_days > 0:
+            cutoff = (datetime.now() - timedelta(days=self.max_age_days)).isoformat()
+            keep = [item for item in keep if item["timestamp"] >= cutoff] or keep[-1:]
+        if self.keep_last > 0:
+            keep = keep[-self.keep_last:]
+        
+        kept_ids = {item["run_id"] for item in keep}
+        for item in index:
+            if item["run_id"] not in kept_ids:
+                try:
+                    os.remove(os.path.join(self.directory, item["file"]))
+                except FileNotFoundError:
+                    pass
+                logger.info(f"🧹 Pruned run snapshot {item['run_id']}")
+        return keep
+    
+    def _read_index(self) -> List[Dict[str, Any]]:
+        """Read the index, rebuilding it from the snapshot files if it is missing or unreadable."""
+        index = self._read_json(os.path.join(self.directory, INDEX_FILE))
+        if isinstance(index, list):
+            return index
+        
+        rebuilt = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".json") or name in (INDEX_FILE, LATEST_FILE):
+                continue
+            path = os.path.join(self.directory, name)
+            rebuilt.append({
+                "run_id": name[:-len(".json")],
+                "timestamp": datetime.fromtimestamp(os.path.getmtime(path)).isoformat(),
+                "file": name,
+                "candidates_count": None
+            })
+        return rebuilt
+    
+    def _read_json(self, path: str) -> Optional[Any]:
+        try:
+            return load_file(path)
+        except (FileNotFoundError, ValueError):
+            return None
+    
+    def _check_run_id(self, run_id: str) -> None:
+        if not RUN_ID_PATTERN.match(run_id) or run_id in (INDEX_FILE[:-5], LATEST_FILE[:-5]):
+            raise ValueError(f"Invalid run id: {run_id}")
@@ -0,0 +1,107 @@
+"""
+Fast JSON Serialization
+
+This module handles:
+- JSON encoding for result files and API responses (orjson when installed,
+  the standard library otherwise)
+- Compact output by default, pretty-printing on request or via JSON_PRETTY
+- A FastAPI response class that skips the default encoder for large payloads
+
+Both backends produce the same JSON for the analyzer's output (dicts, lists,
+strings, numbers, datetimes and NumPy values).
+"""
+
+import json
+import os
+import uuid
+from datetime import date, datetime
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+
+def _pretty_default() -> bool:
+    return os.getenv("JSON_PRETTY", "false").lower() == "true"
+
+
+def _default(value: Any) -> Any:
+    """Encode types the standard library does not handle (mirrors orjson's behaviour)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "tolist"):  # NumPy arrays and scalars
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data: Any, pretty: Optional[bool] = None) -> bytes:
+    """
+    Encode data as UTF-8 JSON.
+    
+    Args:
+        data: Value to encode
+        pretty: Indent by 2 spaces (default: JSON_PRETTY or compact)
+    
+    Returns:
+        Encoded JSON bytes
+    """
+    pretty = _pretty_default() if pretty is None else pretty
+    if orjson:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=option)
+    
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False, default=_default).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from bytes or str."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_file(data: Any, path: str, pretty: Optional[bool] = None) -> None:
+    """
+    Write JSON to a file atomically (temporary file, then rename).
+    
+    Args:
+        data: Value to encode
+        path: Destination file
+        pretty: Indent by 2 spaces (default: JSON_PRETTY or compact)
+    """
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(data, pretty))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_file(path: str) -> Any:
+    """Read a JSON file."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with the fast serializer.
+    
+    Return it directly from an endpoint to bypass FastAPI's jsonable_encoder
+    for large plain-dict payloads.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content, pretty=False)
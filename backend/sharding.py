@@ -0,0 +1,144 @@
+"""
+Sharded Analysis
+
+This module handles:
+- Deterministically partitioning candidates across N analyzer workers
+  (processes or machines, each with its own API key or quota)
+- Merging the workers' partial results into one compatibility_scores.json
+  with recomputed team insights
+
+Candidates are assigned by a hash of their identity (id, name and position),
+so every worker computes the same partition from the same candidate files
+without coordinating, and a candidate stays on its shard when its file is
+edited. Shards are numbered 0..N-1.
+"""
+
+import hashlib
+import re
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Iterator, Tuple
+
+from checkpoint import fingerprint
+from results_writer import TeamInsightsAccumulator, read_results
+
+logger = logging.getLogger(__name__)
+
+SHARD_PATTERN = re.compile(r"^(\d+)/(\d+)$")
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse a shard spec of the form "i/N".
+    
+    Returns:
+        (index, total) with 0 <= index < total
+    
+    Raises:
+        ValueError: If the spec is malformed or out of range
+    """
+    match = SHARD_PATTERN.match(spec.strip())
+    if not match:
+        raise ValueError(f"Invalid shard '{spec}': expected i/N, e.g. 0/4")
+    index, total = int(match.group(1)), int(match.group(2))
+    if total < 1 or index >= total:
+        raise ValueError(f"Invalid shard '{spec}': index must be between 0 and {total - 1}")
+    return index, total
+
+
+def shard_of(candidate_data: Dict[str, Any], total: int) -> int:
+    """Shard a candidate belongs to."""
+    candidate = candidate_data.get("candidate", candidate_data)
+    identity = f"{candidate.get('id', '')}|{candidate.get('name', '')}|{candidate.get('position', '')}"
+    digest = hashlib.sha256(identity.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % total
+
+
+def select_shard(candidates_data: Iterable[Dict[str, Any]], index: int, total: int) -> Iterator[Dict[str, Any]]:
+    """Candidates of one shard, in input order (lazy, so it also works for streamed input)."""
+    return (candidate_data for candidate_data in candidates_data if shard_of(candidate_data, total) == index)
+
+
+def merge_shards(shard_files: List[str], allow_missing: bool = False) -> Dict[str, Any]:
+    """
+    Merge the partial results of all shards into one run.
+    
+    Args:
+        shard_files: Results files written by the shard workers (JSON or NDJSON)
+        allow_missing: Merge even if some shards of the partition are absent
+    
+    Returns:
+        Results in the compatibility_scores.json layout, with team insights
+        recomputed over all candidates
+    
+    Raises:
+        ValueError: If shards disagree on the team or partition, a shard appears
+            twice, or shards are missing (unless allow_missing)
+    """
+    if not shard_files:
+        raise ValueError("No shard files to merge")
+    
+    shards = []
+    for path in shard_files:
+        results = read_results(path)
+        shard = results.get("analysis_metadata", {}).get("shard")
+        if not shard:
+            raise ValueError(f"{path} is not a shard result (analysis_metadata.shard is missing)")
+        shards.append((shard, path, results))
+    
+    totals = {shard["total"] for shard, _, _ in shards}
+    if len(totals) > 1:
+        raise ValueError(f"Shards come from different partitions: {sorted(totals)} workers")
+    total = totals.pop()
+    
+    teams = {fingerprint(results.get("team_summary", {})) for _, _, results in shards}
+    if len(teams) > 1:
+        raise ValueError("Shards were analyzed against different teams")
+    
+    indices = [shard["index"] for shard, _, _ in shards]
+    duplicates = sorted({index for index in indices if indices.count(index) > 1})
+    if duplicates:
+        raise ValueError(f"Shards given more than once: {duplicates}")
+    missing = sorted(set(range(total)) - set(indices))
+    if missing and not allow_missing:
+        raise ValueError(f"Missing shards {missing} of {total}")
+    
+    shards.sort(key=lambda item: item[0]["index"])
+    first = shards[0][2]
+    accumulator = TeamInsightsAccumulator()
+    candidates_analysis = []
+    shard_summaries = []
+    total_requests = 0
+    for shard, path, results in shards:
+        metadata = results.get("analysis_metadata", {})
+        for candidate_result in results.get("candidates_analysis", []):
+            candidates_analysis.append(candidate_result)
+            accumulator.add(candidate_result)
+        total_requests += metadata.get("rate_limiter_stats", {}).get("total_requests", 0)
+        shard_summaries.append({
+            "index": shard["index"],
+            "file": path,
+            "run_id": metadata.get("run_id"),
+            "candidates_count": len(results.get("candidates_analysis", [])),
+            "total_analysis_time": metadata.get("total_analysis_time")
+        })
+    
+    first_metadata = first.get("analysis_metadata", {})
+    merged = {
+        "analysis_metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "team_size": first_metadata.get("team_size"),
+            "candidates_count": len(candidates_analysis),
+            "analyzer_version": first_metadata.get("analyzer_version"),
+            "analysis_type": first_metadata.get("analysis_type"),
+            "rate_limiter_stats": {"total_requests": total_requests},
+            "total_analysis_time": max((s["total_analysis_time"] or 0) for s in shard_summaries),
+            "sharding": {"total": total, "merged": [s["index"] for s in shard_summaries],
+                         "missing": missing, "shards": shard_summaries}
+        },
+        "team_summary": first.get("team_summary", {}),
+        "candidates_analysis": candidates_analysis,
+        "team_insights": accumulator.insights()
+    }
+    logger.info(f"🧩 Merged {len(shards)}/{total} shards ({len(candidates_analysis)} candidates)")
+    return merged
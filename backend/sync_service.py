@@ -0,0 +1,200 @@
+"""
+Candidate Sync Service
+
+This module handles:
+- Watching the compatibility scores file for changes (mtime/size polling)
+- In-process change events (e.g. right after an analysis saves results)
+- Debounced, incremental vector store syncs in a background thread
+
+Bursts of changes collapse into one sync that runs once the file has been
+quiet for the debounce window, so requests never wait on a sync.
+"""
+
+import os
+import time
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CandidateSyncService:
+    """
+    Keeps the AI assistant's vector store in step with the scores file.
+    """
+    
+    def __init__(self, assistant, file_path: Optional[str] = None, debounce_seconds: Optional[float] = None,
+                 poll_interval: Optional[float] = None):
+        """
+        Initialize the sync service.
+        
+        Args:
+            assistant: AIAssistant whose sync_candidates_from_file() is called
+            file_path: Scores file to watch (default: the assistant's compatibility file)
+            debounce_seconds: Quiet period before a sync runs (default: SYNC_DEBOUNCE_SECONDS or 1)
+            poll_interval: Seconds between file checks (default: SYNC_POLL_INTERVAL_SECONDS or 5)
+        """
+        self.assistant = assistant
+        self.file_path = file_path or assistant.compatibility_file
+        self.debounce_seconds = (debounce_seconds if debounce_seconds is not None
+                                 else float(os.getenv("SYNC_DEBOUNCE_SECONDS", "1")))
+        self.poll_interval = poll_interval or float(os.getenv("SYNC_POLL_INTERVAL_SECONDS", "5"))
+        
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        self._file_signature: Optional[Tuple[float, int]] = None
+        self._pending_since: Optional[float] = None  # monotonic time of the first unsynced change
+        self._last_change: Optional[float] = None  # monotonic time of the latest change
+        
+        self.sync_count = 0
+        self.last_sync_at: Optional[str] = None
+        self.last_sync_success: Optional[bool] = None
+        self.last_sync_lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+    
+    # Lifecycle
+    
+    def start(self) -> None:
+        """Start watching; changes made while the service was down are synced first."""
+        if self._thread:
+            return
+        
+        self._stop_event.clear()
+        self._file_signature = self._read_signature()
+        self.notify("startup")
+        
+        self._thread = threading.Thread(target=self._run, name="candidate-sync", daemon=True)
+        self._thread.start()
+        logger.info(f"👀 Candidate sync watching {self.file_path} (debounce: {self.debounce_seconds}s)")
+    
+    def stop(self) -> None:
+        """Stop the background thread (a pending sync is dropped)."""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        logger.info("👀 Candidate sync stopped")
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get sync statistics; lag_seconds is how long the oldest unsynced change has waited."""
+        with self._lock:
+            pending_since = self._pending_since
+        return {
+            "running": bool(self._thread),
+            "file": self.file_path,
+            "pending": pending_since is not None,
+            "lag_seconds": round(time.monotonic() - pending_since, 3) if pending_since is not None else 0.0,
+            "last_sync_at": self.last_sync_at,
+            "last_sync_success": self.last_sync_success,
+            "last_sync_lag_seconds": self.last_sync_lag_seconds,
+            "last_sync_result": self.assistant.last_sync_result,
+            "sync_count": self.sync_count,
+            "last_error": self.last_error
+        }
+    
+    # Change detection
+    
+    def notify(self, reason: str = "event") -> None:
+        """
+        Report that the scores file changed (or is about to).
+        
+        Args:
+            reason: Short description for the logs
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._pending_since is None:
+                self._pending_since = now
+                logger.info(f"🔔 Candidate sync requested ({reason})")
+            self._last_change = now
+        self._wake_event.set()
+    
+    def check_file(self) -> bool:
+        """
+        Compare the file's mtime and size with the last seen values.
+        
+        Returns:
+            bool: Whether a change was detected (and a sync scheduled)
+        """
+        signature = self._read_signature()
+        if signature == self._file_signature:
+            return False
+        
+        self._file_signature = signature
+        if signature is not None:
+            self.notify("file changed")
+        return signature is not None
+    
+    def _read_signature(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = os.stat(self.file_path)
+            return (stat.st_mtime, stat.st_size)
+        except OSError:
+            return None
+    
+    # Sync
+    
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            with self._lock:
+                last_change = self._last_change
+            
+            if last_change is None:
+                timeout = self.poll_interval
+            else:
+                timeout = max(0.0, last_change + self.debounce_seconds - time.monotonic())
+            
+            if self._wake_event.wait(timeout):
+                self._wake_event.clear()
+                continue
+            if self._stop_event.is_set():
+                break
+            
+            try:
+                # A write still in progress shows up as another change and restarts the debounce window
+                if self.check_file():
+                    continue
+                
+                with self._lock:
+                    due = self._last_change is not None and \
+                        time.monotonic() - self._last_change >= self.debounce_seconds
+                if due:
+                    self.sync_now()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"❌ Candidate sync loop error: {e}")
+    
+    def sync_now(self) -> bool:
+        """
+        Run an incremental sync immediately and clear the pending state.
+        
+        Returns:
+            bool: Sync success status
+        """
+        with self._lock:
+            pending_since = self._pending_since
+            self._pending_since = None
+            self._last_change = None
+        
+        self._file_signature = self._read_signature()
+        success = self.assistant.sync_candidates_from_file(self.file_path)
+        
+        self.sync_count += 1
+        self.last_sync_at = datetime.now().isoformat()
+        self.last_sync_success = success
+        if pending_since is not None:
+            self.last_sync_lag_seconds = round(time.monotonic() - pending_since, 3)
+        
+        if success:
+            self.last_error = None
+            logger.info(f"✅ Candidate sync completed (lag: {self.last_sync_lag_seconds}s)")
+        else:
+            self.last_error = "Sync failed - check logs"
+            logger.warning("⚠️ Candidate sync failed, will retry on the next change")
+        return success
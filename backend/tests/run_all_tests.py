@@ -77,7 +77,30 @@ def main():
         'test_weaviate_connection.py',
         'test_mistral_api.py', 
         'test_ai_assistant.py',
-        'test_api.py'
+        'test_api.py',
+        'test_interview_records.py',
+        'test_transcript_ingestion.py',
+        'test_vector_store.py',
+        'test_query_planner.py',
+        'test_query_cache.py',
+        'test_lexical_index.py',
+        'test_embeddings.py',
+        'test_shared_assistant.py',
+        'test_sync_service.py',
+        'test_analysis_store.py',
+        'test_run_snapshots.py',
+        'test_serialization.py',
+        'test_candidate_loader.py',
+        'test_results_writer.py',
+        'test_checkpoint.py',
+        'test_sharding.py',
+        'test_key_pool.py',
+        'test_llm_providers.py',
+        'test_llm_scheduler.py',
+        'test_interview_index.py',
+        'test_interview_batch.py',
+        'test_transcript_cursor.py',
+        'test_incremental_sync.py'
     ]
     
     # Verify all test files exist
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite analysis store
+
+This script tests (offline):
+- Recording runs and rebuilding them as compatibility_scores.json
+- Indexed candidate queries and per-candidate history
+- Seeding from an existing JSON file
+- Saving a run id again (resumed runs)
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analysis_store import AnalysisStore
+
+DATA_FILE = Path(__file__).parent.parent.parent / "data" / "compatibility_scores.json"
+
+
+def _load_results():
+    with open(DATA_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_save_and_load_run():
+    """A stored run round-trips to the analyzer output format."""
+    print("🧪 Testing run storage...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = AnalysisStore(os.path.join(tmp_dir, "analysis.db"))
+        results = _load_results()
+        
+        run_id = store.save_run(results)
+        assert results["analysis_metadata"]["run_id"] == run_id
+        assert store.load_run() == results
+        assert store.latest_run_id() == run_id
+        
+        # The same team is stored once across runs
+        second = store.save_run(_load_results())
+        assert [run["run_id"] for run in store.list_runs()] == [second, run_id]
+        with sqlite3.connect(store.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM teams").fetchone()[0] == 1
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        
+        export_file = os.path.join(tmp_dir, "compatibility_scores.json")
+        assert store.export_json(export_file, run_id)
+        with open(export_file, 'r', encoding='utf-8') as f:
+            assert json.load(f) == results
+        
+        store.delete_run(second)
+        assert store.latest_run_id() == run_id
+        
+        # Saving a run again (a resumed run whose export failed) replaces it
+        results["candidates_analysis"] = results["candidates_analysis"][:1]
+        assert store.save_run(results) == run_id
+        assert store.load_run(run_id) == results
+        assert [run["run_id"] for run in store.list_runs()] == [run_id]
+    print("✅ Run storage works")
+
+
+def test_indexed_queries():
+    """Candidate analyses are filtered and ordered by the database."""
+    print("🧪 Testing indexed candidate queries...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = AnalysisStore(os.path.join(tmp_dir, "analysis.db"))
+        store.save_run(_load_results())
+        
+        analyses = store.query_analyses()
+        scores = [a["overall_recommendation"]["combined_score"] for a in analyses]
+        assert scores == sorted(scores, reverse=True) and len(scores) == 2
+        
+        conditional = store.query_analyses(recommendation="CONDITIONAL")
+        assert [a["overall_recommendation"]["status"] for a in conditional] == ["CONDITIONAL"]
+        assert store.query_analyses(min_score=0.9) == []
+        assert len(store.query_analyses(limit=1, offset=1)) == 1
+        
+        info = analyses[0]["candidate_info"]
+        candidate_id = f"{info['id']}|{info['name']}|{info['position']}"  # the sample data shares one id
+        store.save_run(_load_results())
+        assert len(store.candidate_history(candidate_id)) == 2
+    print("✅ Indexed candidate queries work")
+
+
+def test_import_json_if_empty():
+    """An empty store is seeded from the JSON file once."""
+    print("🧪 Testing JSON import...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = AnalysisStore(os.path.join(tmp_dir, "analysis.db"))
+        assert store.import_json_if_empty(os.path.join(tmp_dir, "missing.json")) is None
+        
+        run_id = store.import_json_if_empty(str(DATA_FILE))
+        assert run_id is not None
+        assert store.import_json_if_empty(str(DATA_FILE)) is None
+        assert len(store.list_runs()) == 1
+    print("✅ JSON import works")
+
+
+def main():
+    """Run all analysis store tests."""
+    print("🧪 Testing SQLite analysis store...\n")
+    test_save_and_load_run()
+    test_indexed_queries()
+    test_import_json_if_empty()
+    print("\n🎉 All analysis store tests passed!")
+
+
+if __name__ == "__main__":
+    main()
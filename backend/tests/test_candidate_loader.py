@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for the manifest-cached candidate loader
+
+This script tests (offline):
+- Loading candidate files in file-name order with summaries
+- Reusing unchanged files from the manifest
+- Reparsing changed files and dropping removed ones
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from candidate_loader import CandidateLoader, MANIFEST_FILE
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+
+def _copy_candidates(target_dir):
+    for path in sorted(DATA_DIR.glob("candidate_*.json")):
+        shutil.copy(path, target_dir)
+    return len(list(DATA_DIR.glob("candidate_*.json")))
+
+
+def test_load_and_manifest():
+    """A second load comes entirely from the manifest."""
+    print("🧪 Testing candidate loading...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        count = _copy_candidates(tmp_dir)
+        loader = CandidateLoader(tmp_dir, max_workers=4)
+        
+        candidates = loader.load()
+        assert len(candidates) == count
+        assert loader.last_stats["reparsed"] == count
+        assert os.path.exists(os.path.join(tmp_dir, MANIFEST_FILE))
+        
+        with open(os.path.join(tmp_dir, "candidate_elon_musk.json"), 'r', encoding='utf-8') as f:
+            assert json.load(f) in candidates
+        
+        summaries = loader.summaries()
+        assert [s["file"] for s in summaries] == sorted(s["file"] for s in summaries)
+        assert "Elon Musk" in [s["name"] for s in summaries]
+        
+        # The manifest holds no documents, only what change detection and summaries need
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        assert set(manifest["files"][0]) == {"file", "sha256", "summary", "mtime_ns", "size"}
+        
+        # Documents parsed once are reused by the same loader
+        assert loader.load() == candidates and loader.last_stats["read"] == 0
+        
+        # A fresh loader (new process) reuses the manifest and reads the documents once
+        again = CandidateLoader(tmp_dir)
+        assert again.load() == candidates
+        assert again.last_stats["reparsed"] == 0 and again.last_stats["cached"] == count
+        assert again.last_stats["read"] == count
+    print("✅ Candidate loading works")
+
+
+def test_changes_are_detected():
+    """Changed files are reparsed, touched files only rehashed, removed files dropped."""
+    print("🧪 Testing change detection...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        count = _copy_candidates(tmp_dir)
+        loader = CandidateLoader(tmp_dir)
+        loader.load()
+        
+        changed = os.path.join(tmp_dir, "candidate_elon_musk.json")
+        with open(changed, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data["candidate"]["position"] = "Rocket Engineer"
+        with open(changed, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        
+        touched = os.path.join(tmp_dir, "candidate_carol_davis.json")
+        os.utime(touched, ns=(0, 0))
+        os.remove(os.path.join(tmp_dir, "candidate_hamza_karzaz.json"))
+        
+        candidates = loader.load()
+        assert len(candidates) == count - 1
+        assert loader.last_stats == {"files": count - 1, "cached": count - 3, "checked": 2,
+                                     "reparsed": 1, "removed": 1, "read": 0}
+        assert "Rocket Engineer" in [c["candidate"]["position"] for c in candidates]
+        
+        # A corrupt manifest only costs a full reparse
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            f.write("{not json")
+        assert loader.load() == candidates
+        assert loader.last_stats["reparsed"] == count - 1
+    print("✅ Change detection works")
+
+
+def main():
+    """Run all candidate loader tests."""
+    print("🧪 Testing manifest-cached candidate loader...\n")
+    test_load_and_manifest()
+    test_changes_are_detected()
+    print("\n🎉 All candidate loader tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script for analysis run checkpoints
+
+This script tests (offline, Mistral calls mocked):
+- Recording and reloading traits and analyses
+- Resuming an interrupted analysis without repeating finished calls
+- Rejecting a checkpoint written for a different team
+- Pruning checkpoints of abandoned runs
+"""
+
+import os
+import sys
+import json
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from checkpoint import RunCheckpoint, candidate_key, list_checkpoints, prune_checkpoints
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+
+def _load(name):
+    with open(DATA_DIR / name, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _candidates(count):
+    # No personality traits, so each candidate needs a trait extraction and an analysis call
+    return [{"candidate": {"id": str(i), "name": f"Candidate {i}", "position": "Engineer",
+                           "responses": [{"question": "Q", "answer": f"Answer {i}", "trait": "Openness"}]}}
+            for i in range(count)]
+
+
+def test_checkpoint_persistence():
+    """Records survive reopening, including after a torn last line."""
+    print("🧪 Testing checkpoint persistence...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        checkpoint = RunCheckpoint("run-1", tmp_dir)
+        assert not checkpoint.exists()
+        checkpoint.start({"team": ["a"]})
+        checkpoint.save_traits("k1", {"openness": 0.5})
+        checkpoint.save_analysis("k1", {"candidate_info": {"name": "A"}})
+        
+        with open(checkpoint.path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "analysis", "key": "k2", "da')
+        
+        resumed = RunCheckpoint.resume("run-1", tmp_dir)
+        assert resumed.get_traits("k1") == {"openness": 0.5}
+        assert resumed.get_analysis("k1") == {"candidate_info": {"name": "A"}}
+        assert resumed.get_analysis("k2") is None
+        
+        # Only log offsets stay in memory; results are reread when reused
+        assert all(isinstance(offset, int) for offset in resumed._analysis_offsets.values())
+        
+        # Records appended after the torn line stay readable
+        resumed.save_analysis("k3", {"candidate_info": {"name": "C"}})
+        assert RunCheckpoint("run-1", tmp_dir).get_analysis("k3") == {"candidate_info": {"name": "C"}}
+        assert [c["run_id"] for c in list_checkpoints(tmp_dir)] == ["run-1"]
+        
+        try:
+            resumed.start({"team": ["b"]})
+            assert False, "a different team must be rejected"
+        except ValueError:
+            pass
+        
+        for bad in (lambda: RunCheckpoint.resume("missing", tmp_dir), lambda: RunCheckpoint("../x", tmp_dir)):
+            try:
+                bad()
+                assert False, "missing or unsafe run ids must be rejected"
+            except (FileNotFoundError, ValueError):
+                pass
+        
+        resumed.delete()
+        assert list_checkpoints(tmp_dir) == []
+        
+        # Runs abandoned for longer than the retention are pruned
+        for run_id in ("old-run", "new-run"):
+            RunCheckpoint(run_id, tmp_dir).start({"team": ["a"]})
+        week_ago = time.time() - 8 * 86400
+        os.utime(os.path.join(tmp_dir, "old-run.ndjson"), (week_ago, week_ago))
+        assert prune_checkpoints(tmp_dir, max_age_days=0) == 0
+        assert prune_checkpoints(tmp_dir, max_age_days=7) == 1
+        assert [c["run_id"] for c in list_checkpoints(tmp_dir)] == ["new-run"]
+    
+    # Keys follow the candidate content, with or without the file wrapper
+    candidate = _candidates(1)[0]
+    assert candidate_key(candidate) == candidate_key(candidate["candidate"])
+    print("✅ Checkpoint persistence works")
+
+
+def test_resume_analysis():
+    """A resumed run only pays for the candidates that were not finished."""
+    print("🧪 Testing resumed analysis...")
+    with mock.patch.dict(os.environ, {"MISTRAL_API_KEY": "test-key"}):
+        from compatibility_analyzer import CompatibilityAnalyzer
+        analyzer = CompatibilityAnalyzer(requests_per_second=1000)
+    
+    team_data = _load("team.json")
+    candidates = _candidates(4)
+    calls = {"traits": 0, "analysis": 0}
+    
+    def fake_traits(candidate):
+        calls["traits"] += 1
+        return {"openness": 0.5, "conscientiousness": 0.5}
+    
+    def fake_analysis(team, candidate):
+        calls["analysis"] += 1
+        if candidate["name"] == "Candidate 2" and calls["analysis"] == 3:
+            raise RuntimeError("process died")
+        return analyzer._validate_ai_analysis({"compatibility_score": 0.8, "confidence_level": 0.8})
+    
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            mock.patch.object(analyzer.traits_extractor, "extract_from_responses", side_effect=fake_traits), \
+            mock.patch.object(analyzer, "get_ai_compatibility_analysis", side_effect=fake_analysis):
+        checkpoint = RunCheckpoint("run-1", tmp_dir)
+        try:
+            analyzer.analyze_team_compatibility(team_data, candidates, checkpoint)
+            assert False, "the first attempt should fail"
+        except RuntimeError:
+            pass
+        assert calls == {"traits": 4, "analysis": 3}
+        
+        resumed = RunCheckpoint.resume("run-1", tmp_dir)
+        results = analyzer.analyze_team_compatibility(team_data, candidates, resumed)
+        
+        # Only the two unfinished analyses were repeated
+        assert calls == {"traits": 4, "analysis": 5}
+        assert results["analysis_metadata"]["run_id"] == "run-1"
+        assert [c["candidate_info"]["name"] for c in results["candidates_analysis"]] == [
+            f"Candidate {i}" for i in range(4)
+        ]
+        
+        try:
+            analyzer.analyze_team_compatibility({"team": team_data["team"][:1]}, candidates, resumed)
+            assert False, "a checkpoint for another team must be rejected"
+        except ValueError:
+            pass
+    print("✅ Resumed analysis works")
+
+
+def main():
+    """Run all checkpoint tests."""
+    print("🧪 Testing analysis run checkpoints...\n")
+    test_checkpoint_persistence()
+    test_resume_analysis()
+    print("\n🎉 All checkpoint tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for client-side embeddings
+
+This script tests (offline, with a fake embeddings API):
+- Batched embedding requests
+- Query embedding cache
+- Local index search using cached query embeddings
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from embeddings import Embedder, MistralEmbedder
+from vector_store import LocalVectorStore
+
+
+class FakeEmbeddingsAPI:
+    """Returns one-hot vectors per text and records request sizes."""
+    
+    def __init__(self, dimensions=8):
+        self.dimensions = dimensions
+        self.requests = []
+    
+    def create(self, model, inputs):
+        self.requests.append(len(inputs))
+        data = []
+        for index, text in enumerate(inputs):
+            vector = [0.0] * self.dimensions
+            vector[sum(map(ord, text)) % self.dimensions] = 2.0
+            data.append(SimpleNamespace(index=index, embedding=vector))
+        # The API may return items out of order
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+def _make_embedder(batch_size=32):
+    api = FakeEmbeddingsAPI()
+    embedder = MistralEmbedder(SimpleNamespace(embeddings=api), batch_size=batch_size, query_cache_size=2)
+    embedder.dimensions = api.dimensions
+    return embedder, api
+
+
+def test_batched_embedding():
+    """Texts are embedded in batches, in order, as unit vectors."""
+    print("🧪 Testing batched embeddings...")
+    embedder, api = _make_embedder(batch_size=32)
+    texts = [f"candidate {i}" for i in range(70)]
+    
+    vectors = embedder.embed(texts)
+    assert api.requests == [32, 32, 6]
+    assert vectors.shape == (70, 8)
+    assert abs(float((vectors[0] ** 2).sum()) - 1.0) < 1e-6
+    assert (vectors[5] == embedder.embed([texts[5]])[0]).all()
+    
+    try:
+        Embedder()
+        assert False, "embedders must implement embed()"
+    except TypeError:
+        pass
+    print("✅ Batched embeddings work")
+
+
+def test_query_cache():
+    """Repeated queries reuse the cached embedding (LRU bounded)."""
+    print("🧪 Testing query embedding cache...")
+    embedder, api = _make_embedder()
+    
+    vector = embedder.embed_query("Most creative candidate")
+    assert embedder.embed_query("most   creative candidate") is vector
+    assert api.requests == [1]
+    # Callers share the cached vector, so it cannot be modified in place
+    try:
+        vector[0] = 1.0
+        assert False, "cached query vectors must be read-only"
+    except ValueError:
+        pass
+    assert (embedder.cache_hits, embedder.cache_misses) == (1, 1)
+    
+    embedder.embed_query("second")
+    embedder.embed_query("third")
+    embedder.embed_query("most creative candidate")
+    assert len(api.requests) == 4  # evicted by the two newer queries
+    print("✅ Query embedding cache works")
+
+
+def test_local_store_with_client_embeddings():
+    """Sync embeds all objects in one request, queries hit the cache."""
+    print("🧪 Testing local index with client-side embeddings...")
+    embedder, api = _make_embedder()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = LocalVectorStore(tmp_dir, "Candidates", embedder)
+        store.ensure_collection()
+        store.upsert({f"uuid-{i}": {"name": f"C{i}", "searchable_text": f"text {i}"} for i in range(5)})
+        assert api.requests == [5]
+        
+        store.near_text("text 3", limit=1)
+        store.near_text("text 3", limit=1)
+        assert api.requests == [5, 1]
+    print("✅ Local index uses client-side embeddings")
+
+
+def main():
+    """Run all embedding tests."""
+    print("🧪 Testing client-side embeddings...\n")
+    test_batched_embedding()
+    test_query_cache()
+    test_local_store_with_client_embeddings()
+    print("\n🎉 All embedding tests passed!")
+
+
+if __name__ == "__main__":
+    main()
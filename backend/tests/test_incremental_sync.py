@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental candidate sync
+
+This script tests (offline, with the local index):
+- Deterministic UUIDv5 object ids, disambiguated when candidate ids repeat
+- Content-hash diffing: only new or changed candidates are upserted
+- Deleting candidates missing from the file, including an empty file
+- Rebuilding the keyword index when a schema change recreates the collection
+"""
+
+import os
+import sys
+import json
+import copy
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from weaviate.util import generate_uuid5
+
+DATA_FILE = Path(__file__).parent.parent.parent / "data" / "compatibility_scores.json"
+
+
+def _load_data():
+    with open(DATA_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def _assistant():
+    from ai_assistant import AIAssistant
+    assistant = AIAssistant()
+    assistant.mistral_client = None
+    return assistant
+
+
+def _env(tmp_dir):
+    return mock.patch.dict(os.environ, {
+        "WEAVIATE_URL": f"local://{tmp_dir}/index",
+        "COMPATIBILITY_SCORES_FILE": os.path.join(tmp_dir, "compatibility_scores.json"),
+        "MISTRAL_API_KEY": ""
+    })
+
+
+def test_deterministic_ids():
+    """Object ids derive from candidate_id and are stable across assistants."""
+    print("🧪 Testing deterministic object ids...")
+    data = _load_data()
+    with tempfile.TemporaryDirectory() as tmp_dir, _env(tmp_dir):
+        assistant = _assistant()
+        objects = assistant._build_candidate_objects(data)
+        assert objects == _assistant()._build_candidate_objects(copy.deepcopy(data))
+        
+        # The sample candidates share an id, so name and position tell them apart
+        expected = {generate_uuid5(f"{a['candidate_info']['id']}|{a['candidate_info']['name']}|"
+                                   f"{a['candidate_info']['position']}") for a in data["candidates_analysis"]}
+        assert set(objects) == expected
+        
+        # A unique candidate id is the seed on its own
+        unique = copy.deepcopy(data)
+        unique["candidates_analysis"] = unique["candidates_analysis"][:1]
+        candidate_id = unique["candidates_analysis"][0]["candidate_info"]["id"]
+        assert list(assistant._build_candidate_objects(unique)) == [generate_uuid5(candidate_id)]
+        assistant.close_connection()
+    print("✅ Deterministic object ids work")
+
+
+def test_content_hash_diffing():
+    """Only changed candidates are upserted; the analysis timestamp alone is no change."""
+    print("🧪 Testing content-hash diffing...")
+    data = _load_data()
+    with tempfile.TemporaryDirectory() as tmp_dir, _env(tmp_dir):
+        scores_file = os.environ["COMPATIBILITY_SCORES_FILE"]
+        _write(scores_file, data)
+        assistant = _assistant()
+        assert assistant.sync_candidates_from_file()
+        assert assistant.last_sync_result["inserted"] == 2
+        
+        data["analysis_metadata"]["timestamp"] = "2030-01-01T00:00:00"
+        data["candidates_analysis"][1]["ai_analysis"]["summary"] = "Rewritten summary"
+        _write(scores_file, data)
+        with mock.patch.object(assistant.vector_store, "upsert", wraps=assistant.vector_store.upsert) as upsert:
+            assert assistant.sync_candidates_from_file()
+        changed = upsert.call_args[0][0]
+        assert [obj["name"] for obj in changed.values()] == [data["candidates_analysis"][1]["candidate_info"]["name"]]
+        result = assistant.last_sync_result
+        assert (result["inserted"], result["updated"], result["deleted"], result["unchanged"]) == (0, 1, 0, 1)
+        assert assistant.vector_store.fetch_hashes()[next(iter(changed))] == next(iter(changed.values()))["content_hash"]
+        assistant.close_connection()
+    print("✅ Content-hash diffing works")
+
+
+def test_deletions_and_empty_file():
+    """Candidates missing from the file are deleted; an empty candidate list empties the collection."""
+    print("🧪 Testing deletions...")
+    data = _load_data()
+    for i, analysis in enumerate(data["candidates_analysis"]):
+        analysis["candidate_info"]["id"] = f"candidate-{i}"
+    with tempfile.TemporaryDirectory() as tmp_dir, _env(tmp_dir):
+        scores_file = os.environ["COMPATIBILITY_SCORES_FILE"]
+        _write(scores_file, data)
+        assistant = _assistant()
+        assert assistant.sync_candidates_from_file()
+        
+        data["candidates_analysis"] = data["candidates_analysis"][:1]
+        _write(scores_file, data)
+        assert assistant.sync_candidates_from_file()
+        assert assistant.last_sync_result["deleted"] == 1 and assistant.vector_store.count() == 1
+        
+        data["candidates_analysis"] = []
+        _write(scores_file, data)
+        assert assistant.sync_candidates_from_file()
+        assert assistant.last_sync_result["deleted"] == 1 and assistant.vector_store.count() == 0
+        assert assistant.get_candidate_stats()["total_candidates"] == 0
+        assert assistant.query_candidates("Hamza")["results_count"] == 0
+        
+        # A file without a candidate list is not mistaken for an empty one
+        _write(scores_file, {"analysis_metadata": {}})
+        assert not assistant.sync_candidates_from_file()
+        assistant.close_connection()
+    print("✅ Deletions work")
+
+
+def test_schema_migration_rebuilds_keyword_index():
+    """Candidates dropped during a collection rebuild do not linger in the keyword index."""
+    print("🧪 Testing keyword index after a schema migration...")
+    data = _load_data()
+    for i, analysis in enumerate(data["candidates_analysis"]):
+        analysis["candidate_info"]["id"] = f"candidate-{i}"
+    with tempfile.TemporaryDirectory() as tmp_dir, _env(tmp_dir):
+        scores_file = os.environ["COMPATIBILITY_SCORES_FILE"]
+        _write(scores_file, data)
+        assistant = _assistant()
+        assert assistant.sync_candidates_from_file()
+        assert len(assistant.lexical_index) == 2
+        
+        # An outdated schema makes the next sync recreate the collection from scratch
+        assistant.vector_store._metadata = {"properties": ["name"], "embedder": "old"}
+        data["candidates_analysis"] = data["candidates_analysis"][:1]
+        _write(scores_file, data)
+        assert assistant.sync_candidates_from_file()
+        assert assistant.vector_store.count() == 1
+        assert len(assistant.lexical_index) == 1
+        assistant.close_connection()
+    print("✅ Keyword index follows collection rebuilds")
+
+
+def main():
+    """Run all incremental sync tests."""
+    print("🧪 Testing incremental candidate sync...\n")
+    test_deterministic_ids()
+    test_content_hash_diffing()
+    test_deletions_and_empty_file()
+    test_schema_migration_rebuilds_keyword_index()
+    print("\n🎉 All incremental sync tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for batch interview creation
+
+This script tests (offline, agent creation faked):
+- Concurrent creation with results in input order and one tracking file write
+- Per-item failures when an agent cannot be created
+- Interviews reported as failed when the tracking file write fails
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from interview_manager import InterviewManager
+
+CANDIDATES = [
+    {"candidate_name": "Jane Doe", "role": "Data Scientist", "candidate_email": "jane@example.com"},
+    {"candidate_name": "John Roe", "role": "Engineer"},
+    {"candidate_name": "Ada Poe", "role": "Designer"},
+]
+
+
+def _fake_create_agent(candidate_name, role, candidate_email=""):
+    if candidate_name == "John Roe":
+        raise RuntimeError("API error (status 500)")
+    return {"id": f"agent-{candidate_name.split()[0].lower()}", "name": candidate_name}
+
+
+def _make_manager(tmp_dir):
+    manager = InterviewManager(api_key="test-key")
+    manager.interviews_file = os.path.join(tmp_dir, "data", "interviews.json")
+    return manager
+
+
+def test_batch_creation():
+    """Created interviews are saved together; failed ones are reported per item."""
+    print("🧪 Testing batch interview creation...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = _make_manager(tmp_dir)
+        with mock.patch.object(manager, "_create_agent", side_effect=_fake_create_agent):
+            result = manager.create_interviews_batch(CANDIDATES, max_concurrency=3, requests_per_second=1000)
+        
+        assert (result["total"], result["succeeded"], result["failed"]) == (3, 2, 1)
+        assert [item["index"] for item in result["results"]] == [0, 1, 2]
+        assert [item["success"] for item in result["results"]] == [True, False, True]
+        assert "500" in result["results"][1]["error"]
+        
+        with open(manager.interviews_file, encoding="utf-8") as f:
+            saved = json.load(f)
+        assert set(saved) == {"agent-jane", "agent-ada"}
+        assert saved["agent-jane"]["candidate_email"] == "jane@example.com"
+    print("✅ Batch interview creation works")
+
+
+def test_failed_write_is_reported():
+    """Interviews whose tracking file write fails are not reported as created."""
+    print("🧪 Testing batch creation with a failing tracking file...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = _make_manager(tmp_dir)
+        with mock.patch.object(manager, "_create_agent", side_effect=_fake_create_agent), \
+                mock.patch.object(manager, "_write_interviews", side_effect=OSError("disk full")):
+            result = manager.create_interviews_batch(CANDIDATES, requests_per_second=1000)
+        
+        assert (result["succeeded"], result["failed"]) == (0, 3)
+        jane = result["results"][0]
+        assert not jane["success"] and jane["agent_id"] == "agent-jane" and "disk full" in jane["error"]
+        assert not os.path.exists(manager.interviews_file)
+    print("✅ Failed writes are reported")
+
+
+def main():
+    """Run all batch interview tests."""
+    print("🧪 Testing batch interview creation...\n")
+    test_batch_creation()
+    test_failed_write_is_reported()
+    print("\n🎉 All batch interview tests passed!")
+
+
+if __name__ == "__main__":
+    main()
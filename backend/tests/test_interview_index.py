@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the interview status index
+
+This script tests (offline, calls API faked):
+- Status, duration and transcript fields derived from the latest call
+- Newest-first pagination and status filtering
+- Reconciling with interviews.json (new and deleted interviews) and persistence
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from interview_index import InterviewStatusIndex
+
+
+class FakeInterviewManager:
+    """Serves saved interviews and calls from memory."""
+    
+    def __init__(self, interviews_file):
+        self.interviews_file = interviews_file
+        self.interviews = {}
+        self.calls = []
+    
+    def add(self, agent_id, created_at):
+        self.interviews[agent_id] = {"agent_id": agent_id, "candidate_name": agent_id.title(),
+                                     "role": "Engineer", "created_at": created_at}
+    
+    def get_saved_interviews(self):
+        return dict(self.interviews)
+    
+    def _get_all_calls(self):
+        return list(self.calls)
+
+
+def _make_index(tmp_dir):
+    manager = FakeInterviewManager(os.path.join(tmp_dir, "interviews.json"))
+    manager.add("agent-a", "2025-05-01T10:00:00")
+    manager.add("agent-b", "2025-05-02T10:00:00")
+    manager.add("agent-c", "2025-05-03T10:00:00")
+    manager.calls = [
+        {"id": "call-1", "agent_id": "agent-a", "started_at": "2025-05-01T10:00:00Z",
+         "ended_at": "2025-05-01T10:25:00Z", "status": "ended"},
+        {"id": "call-2", "agent_id": "agent-b", "started_at": "2025-05-02T10:00:00Z", "status": "active"},
+        {"id": "call-3", "agent_id": "unknown-agent", "started_at": "2025-05-02T10:00:00Z", "status": "active"}
+    ]
+    return manager, InterviewStatusIndex(manager)
+
+
+def test_status_and_pagination():
+    """Entries reflect their latest call and page newest first."""
+    print("🧪 Testing interview status and pagination...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager, index = _make_index(tmp_dir)
+        assert index.refresh() > 0
+        
+        page = index.get_page(page=1, page_size=2)
+        assert page["total_count"] == 3
+        assert [i["agent_id"] for i in page["interviews"]] == ["agent-c", "agent-b"]
+        assert [i["agent_id"] for i in index.get_page(page=2, page_size=2)["interviews"]] == ["agent-a"]
+        
+        statuses = {i["agent_id"]: i for i in index.get_page(page_size=10)["interviews"]}
+        assert statuses["agent-a"]["status"] == "completed" and statuses["agent-a"]["duration"] == "25 minutes"
+        assert statuses["agent-a"]["has_transcript"] and "call_signature" not in statuses["agent-a"]
+        assert statuses["agent-b"]["status"] == "in-progress"
+        assert statuses["agent-c"]["status"] == "pending"
+        assert [i["agent_id"] for i in index.get_page(status="completed")["interviews"]] == ["agent-a"]
+        
+        # Nothing changed, nothing rewritten
+        assert index.refresh() == 0
+    print("✅ Interview status and pagination work")
+
+
+def test_reconcile_and_persistence():
+    """New interviews are added, deleted ones dropped, and the index survives a restart."""
+    print("🧪 Testing index reconciliation...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager, index = _make_index(tmp_dir)
+        index.refresh()
+        
+        del manager.interviews["agent-b"]
+        manager.add("agent-d", "2025-05-04T10:00:00")
+        assert index.refresh() == 2
+        page = index.get_page(page_size=10)
+        assert [i["agent_id"] for i in page["interviews"]] == ["agent-d", "agent-c", "agent-a"]
+        assert page["total_count"] == 3
+        
+        reloaded = InterviewStatusIndex(manager)
+        assert reloaded.get_page(page_size=10) == page
+        
+        # Interviews created through the API show up before the next refresh
+        reloaded.upsert_interviews([{"agent_id": "agent-e", "created_at": "2025-05-05T10:00:00"}])
+        assert reloaded.get_page(page_size=1)["interviews"][0]["agent_id"] == "agent-e"
+    print("✅ Index reconciliation works")
+
+
+def main():
+    """Run all interview index tests."""
+    print("🧪 Testing the interview status index...\n")
+    test_status_and_pagination()
+    test_reconcile_and_persistence()
+    print("\n🎉 All interview index tests passed!")
+
+
+if __name__ == "__main__":
+    main()
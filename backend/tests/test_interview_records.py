@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for interview record storage
+
+This script tests (offline, no API calls):
+- Prompt template rendering
+- Slim interview records with template references
+- Migration of legacy records with embedded system prompts
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from interview_manager import InterviewManager
+from interview_prompts import render_system_prompt, build_candidate_information
+
+
+def _make_manager(interviews_file: str) -> InterviewManager:
+    """Create an interview manager writing to a temporary tracking file."""
+    manager = InterviewManager(api_key="test-key")
+    manager.interviews_file = interviews_file
+    return manager
+
+
+def test_template_matches_legacy_prompt():
+    """Rendered templates must match the prompt built by the manager."""
+    print("🧪 Testing prompt template rendering...")
+    manager = InterviewManager(api_key="test-key")
+    params = {"candidate_name": "Jane Doe", "role": "Data Scientist", "candidate_email": "jane@example.com"}
+
+    expected = manager._generate_system_prompt(
+        build_candidate_information("Jane Doe", "Data Scientist", "jane@example.com")
+    )
+    assert render_system_prompt(params) == expected
+    print("✅ Template rendering matches")
+
+
+def test_slim_records_and_migration():
+    """Legacy records are compacted on write and rendered back on demand."""
+    print("🧪 Testing slim records and legacy migration...")
+    params = {"candidate_name": "Jane Doe", "role": "Data Scientist", "candidate_email": "jane@example.com"}
+    legacy_prompt = render_system_prompt(params)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        interviews_file = os.path.join(tmp_dir, "data", "interviews.json")
+        os.makedirs(os.path.dirname(interviews_file))
+        with open(interviews_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "legacy-agent": {
+                    "agent_id": "legacy-agent",
+                    "interview_link": "https://bey.chat/legacy-agent",
+                    "candidate_name": "Jane Doe",
+                    "role": "Data Scientist",
+                    "agent_details": {"id": "legacy-agent", "system_prompt": legacy_prompt},
+                    "created_at": "2025-05-25T07:12:45"
+                }
+            }, f)
+
+        manager = _make_manager(interviews_file)
+
+        # Slim listing never ships the prompt
+        slim = manager.get_saved_interviews()
+        assert "agent_details" not in slim["legacy-agent"]
+        assert slim["legacy-agent"]["candidate_email"] == "jane@example.com"
+
+        # Full listing renders it back
+        full = manager.get_saved_interviews(full=True)
+        assert full["legacy-agent"]["agent_details"]["system_prompt"] == legacy_prompt
+
+        # Writing a new interview migrates the legacy record on disk
+        record = manager._build_interview_record({
+            "agent_id": "new-agent",
+            "interview_link": "https://bey.chat/new-agent",
+            "candidate_name": "John Roe",
+            "role": "Product Manager",
+            "agent_details": {"id": "new-agent", "system_prompt": "rendered prompt"},
+            "created_at": "2025-05-26T10:00:00"
+        })
+        manager._save_interview_to_file("new-agent", record)
+
+        with open(interviews_file, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        assert "system_prompt" not in stored["legacy-agent"]["agent_details"]
+        assert "system_prompt" not in stored["new-agent"]["agent_details"]
+        assert manager.get_system_prompt("legacy-agent") == legacy_prompt
+        assert manager.get_system_prompt("missing-agent") is None
+
+    print("✅ Slim records and migration work")
+
+
+def main():
+    """Run all interview record tests."""
+    print("🧪 Testing interview record storage...\n")
+    test_template_matches_legacy_prompt()
+    test_slim_records_and_migration()
+    print("\n🎉 All interview record tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test script for the Mistral API key pool
+
+This script tests (offline, with fake clients):
+- Spreading requests over the least-loaded key
+- Evicting keys on 429 and 401 responses and routing around them
+- Per-key usage stats and the analyzer's retry on another key
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from key_pool import MistralKeyPool, NoHealthyKeyError, error_status, load_api_keys, get_shared_key_pool
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code, message="API error"):
+        super().__init__(f"{message} (status {status_code})")
+        self.status_code = status_code
+
+
+class FakeClient:
+    """Mistral-like client whose chat.complete answers from a script of outcomes."""
+    
+    def __init__(self, api_key, outcomes=None, delay=0.0):
+        self.api_key = api_key
+        self.outcomes = list(outcomes or [])
+        self.delay = delay
+        self.calls = 0
+        self.chat = SimpleNamespace(complete=self._complete)
+    
+    def _complete(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.outcomes:
+            outcome = self.outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+        return {"key": self.api_key, "model": kwargs.get("model")}
+
+
+def _pool(clients, **kwargs):
+    return MistralKeyPool(list(clients), requests_per_second=1000,
+                          client_factory=lambda api_key: clients[api_key], **kwargs)
+
+
+def test_load_balancing():
+    """Concurrent requests spread over all keys."""
+    print("🧪 Testing key load balancing...")
+    clients = {f"key-{i}-abcd": FakeClient(f"key-{i}-abcd", delay=0.02) for i in range(3)}
+    pool = _pool(clients)
+    
+    threads = [threading.Thread(target=lambda: pool.chat.complete(model="m")) for _ in range(9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    calls = [client.calls for client in clients.values()]
+    assert sum(calls) == 9 and max(calls) - min(calls) <= 1, calls
+    stats = pool.get_stats()
+    assert stats["total_requests"] == 9 and stats["healthy_keys"] == 3
+    assert stats["requests_per_second_limit"] == 3000
+    assert all(key["in_flight"] == 0 and key["avg_latency_ms"] >= 20 for key in stats["keys"])
+    # Keys are never reported in full
+    assert all("key-0-abcd" not in key["key"] for key in stats["keys"])
+    print("✅ Key load balancing works")
+
+
+def test_eviction():
+    """Rate-limited and unauthorized keys leave the rotation until their cooldown ends."""
+    print("🧪 Testing key eviction...")
+    clients = {
+        "limited-key": FakeClient("limited-key", [FakeAPIError(429)]),
+        "revoked-key": FakeClient("revoked-key", [FakeAPIError(401)]),
+        "good-key": FakeClient("good-key")
+    }
+    pool = _pool(clients, rate_limit_cooldown=0.2, auth_cooldown=60)
+    
+    for _ in range(3):
+        try:
+            pool.chat.complete(model="m")
+        except FakeAPIError:
+            pass
+    stats = {key["key"]: key for key in pool.get_stats()["keys"]}
+    assert stats["key-0 (...-key)"]["rate_limited"] == 1 and not stats["key-0 (...-key)"]["healthy"]
+    assert stats["key-1 (...-key)"]["auth_failures"] == 1
+    assert stats["key-1 (...-key)"]["eviction_reason"] == "unauthorized"
+    
+    # Only the healthy key is used while the others cool down
+    for _ in range(3):
+        assert pool.chat.complete(model="m")["key"] == "good-key"
+    
+    # The rate-limited key comes back after its cooldown, the revoked one does not
+    time.sleep(0.25)
+    used = {pool.chat.complete(model="m")["key"] for _ in range(4)}
+    assert used == {"limited-key", "good-key"}
+    print("✅ Key eviction works")
+
+
+def test_all_keys_evicted():
+    """With every key evicted the pool waits out rate limits but gives up on revoked keys."""
+    print("🧪 Testing fully evicted pool...")
+    pool = _pool({"only-key": FakeClient("only-key", [FakeAPIError(429)])}, rate_limit_cooldown=0.1)
+    try:
+        pool.chat.complete(model="m")
+        assert False, "the 429 should reach the caller"
+    except FakeAPIError:
+        pass
+    start = time.time()
+    assert pool.chat.complete(model="m")["key"] == "only-key"
+    assert time.time() - start >= 0.05
+    
+    revoked = _pool({"bad-key": FakeClient("bad-key", [FakeAPIError(401)])})
+    for expected in (FakeAPIError, NoHealthyKeyError):
+        try:
+            revoked.chat.complete(model="m")
+            assert False, "a revoked key must fail"
+        except expected:
+            pass
+    print("✅ Fully evicted pool works")
+
+
+def test_configuration():
+    """Keys come from MISTRAL_API_KEYS or MISTRAL_API_KEY; errors are classified by status."""
+    print("🧪 Testing key configuration...")
+    with mock.patch.dict(os.environ, {"MISTRAL_API_KEYS": " a, b,,a ", "MISTRAL_API_KEY": "c"}):
+        assert load_api_keys() == ["a", "b"]
+    with mock.patch.dict(os.environ, {"MISTRAL_API_KEYS": "", "MISTRAL_API_KEY": "c"}):
+        assert load_api_keys() == ["c"]
+    with mock.patch.dict(os.environ, {"MISTRAL_API_KEYS": "", "MISTRAL_API_KEY": ""}):
+        assert get_shared_key_pool() is None
+    
+    assert error_status(FakeAPIError(401)) == 401
+    response_error = Exception("API error")
+    response_error.response = FakeAPIError(429)
+    assert error_status(response_error) == 429
+    assert error_status(Exception("timeout")) is None
+    # Only structured status codes count, never numbers in the message
+    assert error_status(Exception("API error occurred: Status 429")) is None
+    assert error_status(Exception("prompt has 4290 tokens, max 401 per message")) is None
+    # The SDK reports -1 when no response arrived
+    assert error_status(FakeAPIError(-1)) is None
+    print("✅ Key configuration works")
+
+
+def test_analyzer_retries_on_another_key():
+    """The analyzer's retry lands on a healthy key without backing off."""
+    print("🧪 Testing analyzer retry across keys...")
+    with mock.patch.dict(os.environ, {"MISTRAL_API_KEY": "test-key"}):
+        from compatibility_analyzer import CompatibilityAnalyzer
+        analyzer = CompatibilityAnalyzer(requests_per_second=1000)
+    
+    clients = {"first-key": FakeClient("first-key", [FakeAPIError(429)]), "second-key": FakeClient("second-key")}
+    analyzer.client = _pool(clients)
+    start = time.time()
+    assert analyzer._make_api_request_with_retry(model="m")["key"] == "second-key"
+    assert time.time() - start < 1
+    
+    # A single plain client has nowhere else to go, so it backs off on 429 and gives up on 401
+    analyzer.client = FakeClient("only-key", [FakeAPIError(429)])
+    with mock.patch("compatibility_analyzer.time.sleep") as sleep:
+        assert analyzer._make_api_request_with_retry(model="m")["key"] == "only-key"
+    # (the fake client's own zero delay goes through time.sleep too)
+    assert [args[0] >= 1 for args, _ in sleep.call_args_list].count(True) == 1
+    
+    analyzer.client = FakeClient("only-key", [FakeAPIError(401)])
+    try:
+        analyzer._make_api_request_with_retry(model="m")
+        assert False, "an unauthorized plain client must not be retried"
+    except FakeAPIError:
+        assert analyzer.client.calls == 1
+    print("✅ Analyzer retry across keys works")
+
+
+def main():
+    """Run all key pool tests."""
+    print("🧪 Testing the Mistral API key pool...\n")
+    test_load_balancing()
+    test_eviction()
+    test_all_keys_evicted()
+    test_configuration()
+    test_analyzer_retries_on_another_key()
+    print("\n🎉 All key pool tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for the BM25 lexical index and hybrid retrieval
+
+This script tests (offline, no Weaviate or Mistral):
+- BM25 ranking, updates and removals
+- Reciprocal rank fusion
+- Keyword queries answered without an embedding request
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lexical_index import LexicalIndex, reciprocal_rank_fusion
+
+OBJECTS = {
+    "uuid-1": {"name": "Jane Doe", "searchable_text": "Name: Jane Doe Position: DevOps Engineer Strengths: Kubernetes Terraform"},
+    "uuid-2": {"name": "John Roe", "searchable_text": "Name: John Roe Position: Product Manager Strengths: roadmaps, stakeholder communication"},
+    "uuid-3": {"name": "Ada Poe", "searchable_text": "Name: Ada Poe Position: Backend Engineer Strengths: Python, Kubernetes operators, Kubernetes upgrades"},
+}
+
+
+def test_bm25_ranking():
+    """Keyword hits are ranked by BM25 and follow index updates."""
+    print("🧪 Testing BM25 ranking...")
+    index = LexicalIndex()
+    index.rebuild(OBJECTS)
+    
+    hits = index.search("who mentioned Kubernetes", limit=5)
+    assert [uuid for uuid, _, _ in hits] == ["uuid-3", "uuid-1"]
+    assert index.covers("who mentioned Kubernetes")
+    assert index.covers("John Roe")
+    assert index.covers("who mentioned stakeholder communication")
+    assert not index.covers("someone great at negotiation")
+    # Words that occur somewhere are not enough: no name match, lookup or exact phrase
+    assert not index.covers("Kubernetes")
+    assert not index.covers("who mentioned Python upgrades")
+    
+    index.remove(["uuid-3"])
+    index.upsert({"uuid-2": dict(OBJECTS["uuid-2"], searchable_text="Product Manager, Kubernetes curious")})
+    assert {uuid for uuid, _, _ in index.search("kubernetes", limit=5)} == {"uuid-1", "uuid-2"}
+    assert index.search("python", limit=5) == []
+    print("✅ BM25 ranking works")
+
+
+def test_reciprocal_rank_fusion():
+    """Objects ranked well by both retrievers come first."""
+    print("🧪 Testing reciprocal rank fusion...")
+    vector_hits = [("a", {}, 0.9), ("b", {}, 0.8), ("c", {}, 0.7)]
+    lexical_hits = [("b", {}, 4.0), ("d", {}, 3.0)]
+    fused = reciprocal_rank_fusion([vector_hits, lexical_hits], limit=3)
+    assert [uuid for uuid, _, _ in fused] == ["b", "a", "d"]
+    print("✅ Reciprocal rank fusion works")
+
+
+def test_keyword_query_skips_embeddings():
+    """The assistant answers keyword queries from the lexical index only."""
+    print("🧪 Testing keyword queries on the AI assistant...")
+    data_file = Path(__file__).parent.parent.parent / "data" / "compatibility_scores.json"
+    
+    with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.dict(os.environ, {
+        "WEAVIATE_URL": f"local://{tmp_dir}",
+        "COMPATIBILITY_SCORES_FILE": str(data_file)
+    }):
+        from ai_assistant import AIAssistant
+        assistant = AIAssistant()
+        assistant.mistral_client = None
+        assert assistant.sync_candidates_from_file()
+        
+        name = next(iter(assistant.vector_store.fetch_objects().values()))["name"]
+        with mock.patch.object(assistant.vector_store, "near_text", side_effect=AssertionError):
+            result = assistant.query_candidates(name)
+        assert result["strategy"] == "keyword"
+        assert result["candidates"][0]["name"] == name
+        
+        result = assistant.query_candidates("someone who thrives in ambiguity and mentors juniors")
+        assert result["strategy"] == "hybrid"
+        # Descriptive phrases go to semantic retrieval even when every word is indexed
+        assert assistant.lexical_index.search("strong sense", limit=1)
+        assert assistant.query_candidates("strong sense")["strategy"] == "hybrid"
+        assistant.close_connection()
+    
+    print("✅ Keyword queries skip embeddings")
+
+
+def main():
+    """Run all lexical index tests."""
+    print("🧪 Testing lexical index and hybrid retrieval...\n")
+    test_bm25_ranking()
+    test_reciprocal_rank_fusion()
+    test_keyword_query_skips_embeddings()
+    print("\n🎉 All lexical index tests passed!")
+
+
+if __name__ == "__main__":
+    main()
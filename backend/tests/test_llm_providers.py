@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Test script for LLM provider routing and failover
+
+This script tests (offline, against a local OpenAI-compatible stand-in server):
+- Chat completions through an OpenAI-compatible provider
+- Failing over from an unavailable provider and skipping it during its cooldown
+- Weighted, latency and availability routing
+- Building providers from LLM_PROVIDERS
+"""
+
+import os
+import sys
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llm_providers import (LLMProvider, LLMRouter, OpenAICompatibleProvider, MistralProvider,
+                           build_providers, parse_provider_spec)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI chat completions endpoint; answers 503 while server.failing is set."""
+    
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(body)
+        if self.server.failing:
+            self.send_response(503)
+            payload = {"error": {"message": "overloaded"}}
+        else:
+            self.send_response(200)
+            payload = {
+                "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": f"echo: {body['messages'][-1]['content']}"}}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+            }
+        data = json.dumps(payload).encode("utf-8")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.requests = []
+    server.failing = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+class FakeProvider(LLMProvider):
+    """Provider answering with its own name after an optional delay or error."""
+    
+    def __init__(self, name, weight=1.0, delay=0.0, error=None):
+        super().__init__(name, weight)
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+    
+    def complete(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.name))])
+    
+    @property
+    def requests_per_second(self):
+        return 1.0
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"API error (status {status_code})")
+        self.status_code = status_code
+
+
+def _content(router):
+    return router.chat.complete(model="mistral-small-latest", messages=[{"role": "user", "content": "hi"}]).choices[0].message.content
+
+
+def test_openai_compatible_failover():
+    """Calls fail over from a provider in an incident to a local OpenAI-compatible server and back."""
+    print("🧪 Testing OpenAI-compatible provider failover...")
+    server, base_url = _start_server()
+    try:
+        local = OpenAICompatibleProvider("local", "stand-in-model", base_url=base_url, requests_per_second=1000)
+        primary = FakeProvider("primary", error=FakeAPIError(503))
+        router = LLMRouter([primary, local], strategy="availability", cooldown=0.2)
+        
+        assert _content(router) == "echo: hi"
+        # The endpoint gets its own model name, not the caller's Mistral model
+        assert server.requests[-1]["model"] == "stand-in-model"
+        
+        # The failed provider is skipped during its cooldown
+        assert _content(router) == "echo: hi"
+        assert primary.calls == 1
+        
+        primary.error = None
+        time.sleep(0.25)
+        assert _content(router) == "primary"
+        
+        stats = router.get_stats()
+        assert stats["failovers"] == 1 and stats["total_requests"] == 4
+        assert [p["provider"] for p in stats["providers"]] == ["primary", "local"]
+        assert stats["providers"][0]["failures"] == 1 and stats["providers"][1]["model"] == "stand-in-model"
+        
+        # Every provider failing surfaces the last error
+        primary.error = FakeAPIError(503)
+        server.failing = True
+        try:
+            _content(router)
+            assert False, "all providers failing should raise"
+        except Exception as e:
+            assert "503" in str(e)
+    finally:
+        server.shutdown()
+    print("✅ OpenAI-compatible provider failover works")
+
+
+def test_invalid_requests_keep_provider_in_rotation():
+    """A request rejected as invalid fails over without taking the provider down."""
+    print("🧪 Testing invalid request handling...")
+    primary = FakeProvider("primary", error=FakeAPIError(400))
+    router = LLMRouter([primary, FakeProvider("backup")], strategy="availability")
+    assert _content(router) == "backup"
+    primary.error = None
+    assert _content(router) == "primary"
+    print("✅ Invalid request handling works")
+
+
+def test_routing_strategies():
+    """Weighted routing follows the weights, latency routing prefers the fastest provider."""
+    print("🧪 Testing routing strategies...")
+    heavy, light = FakeProvider("heavy", weight=3), FakeProvider("light", weight=1)
+    router = LLMRouter([heavy, light], strategy="weighted")
+    counts = Counter(_content(router) for _ in range(400))
+    assert 240 <= counts["heavy"] <= 360, counts
+    
+    slow, fast = FakeProvider("slow", delay=0.03), FakeProvider("fast", delay=0.0)
+    router = LLMRouter([slow, fast], strategy="latency")
+    # The first two calls measure both providers, then the fastest one is used
+    assert {_content(router) for _ in range(2)} == {"slow", "fast"}
+    assert [_content(router) for _ in range(5)] == ["fast"] * 5
+    
+    try:
+        LLMRouter([heavy], strategy="round-robin")
+        assert False, "unknown strategies must be rejected"
+    except ValueError:
+        pass
+    try:
+        LLMProvider("incomplete")
+        assert False, "providers must implement complete() and requests_per_second"
+    except TypeError:
+        pass
+    print("✅ Routing strategies work")
+
+
+def test_provider_configuration():
+    """LLM_PROVIDERS builds the configured providers and skips incomplete ones."""
+    print("🧪 Testing provider configuration...")
+    assert parse_provider_spec("mistral:3, local-llm ,") == [("mistral", 3.0), ("local-llm", 1.0)]
+    try:
+        parse_provider_spec("mistral:x")
+        assert False, "a malformed weight must be rejected"
+    except ValueError:
+        pass
+    
+    env = {"MISTRAL_API_KEY": "test-key", "LOCAL_LLM_BASE_URL": "http://127.0.0.1:9/v1", "LOCAL_LLM_MODEL": "m",
+           "LOCAL_LLM_REQUESTS_PER_SECOND": "5", "OTHER_MODEL": ""}
+    with mock.patch.dict(os.environ, env):
+        providers = build_providers("mistral:3,local-llm:1,other")
+    assert [type(p) for p in providers] == [MistralProvider, OpenAICompatibleProvider]
+    assert providers[0].weight == 3 and providers[1].requests_per_second == 5
+    print("✅ Provider configuration works")
+
+
+def main():
+    """Run all LLM provider tests."""
+    print("🧪 Testing LLM provider routing...\n")
+    test_openai_compatible_failover()
+    test_invalid_requests_keep_provider_in_rotation()
+    test_routing_strategies()
+    test_provider_configuration()
+    print("\n🎉 All LLM provider tests passed!")
+
+
+if __name__ == "__main__":
+    main()
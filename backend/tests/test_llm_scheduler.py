@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM request scheduler
+
+This script tests (offline, with fake providers):
+- Interactive calls overtaking queued bulk calls
+- Round-robin fairness between sources of a class
+- Pacing, concurrency limits and queue statistics
+- Analyzer calls going through the shared scheduler
+- Document embeddings scheduled as bulk work, query embeddings as interactive
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llm_scheduler import LLMScheduler, INTERACTIVE, BULK
+
+
+class FakeRouter:
+    def __init__(self, min_interval=0.0):
+        self.min_interval = min_interval
+        self.chat = SimpleNamespace(complete=lambda **kwargs: kwargs.get("tag"))
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out waiting for the scheduler"
+        time.sleep(0.005)
+
+
+class Scenario:
+    """Holds the single concurrency slot with a blocked call, then queues calls in a known order."""
+    
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.order = []
+        self.release = threading.Event()
+        self.threads = []
+        self._start(BULK, "blocker", lambda: self.release.wait(2))
+        _wait_for(lambda: scheduler.get_stats()["in_flight"] == 1)
+    
+    def _start(self, priority, source, func):
+        thread = threading.Thread(target=self.scheduler.submit, args=(priority, func, source))
+        thread.start()
+        self.threads.append(thread)
+    
+    def queue(self, priority, source, tag):
+        depth = self.scheduler.get_stats()["queue_depth"]
+        self._start(priority, source, lambda: self.order.append(tag))
+        _wait_for(lambda: self.scheduler.get_stats()["queue_depth"] == depth + 1)
+    
+    def run(self):
+        self.release.set()
+        for thread in self.threads:
+            thread.join()
+        return self.order
+
+
+def test_interactive_priority():
+    """Interactive calls queued behind bulk work are admitted first."""
+    print("🧪 Testing interactive priority...")
+    scheduler = LLMScheduler(FakeRouter(), max_concurrency=1)
+    scenario = Scenario(scheduler)
+    for i in range(3):
+        scenario.queue(BULK, "analysis", f"bulk-{i}")
+    scenario.queue(INTERACTIVE, "chat", "chat-0")
+    scenario.queue(INTERACTIVE, "chat", "chat-1")
+    
+    stats = scheduler.get_stats()
+    assert stats["classes"][BULK]["queue_depth"] == 3 and stats["classes"][INTERACTIVE]["queue_depth"] == 2
+    assert stats["classes"][BULK]["queued_by_source"] == {"analysis": 3}
+    
+    assert scenario.run() == ["chat-0", "chat-1", "bulk-0", "bulk-1", "bulk-2"]
+    stats = scheduler.get_stats()
+    assert stats["queue_depth"] == 0 and stats["in_flight"] == 0
+    assert stats["classes"][BULK]["completed"] == 4 and stats["classes"][INTERACTIVE]["completed"] == 2
+    assert stats["classes"][BULK]["max_wait_ms"] > 0
+    print("✅ Interactive priority works")
+
+
+def test_bulk_is_not_starved():
+    """Bulk work keeps a weighted share while interactive calls keep arriving."""
+    print("🧪 Testing bulk share...")
+    scheduler = LLMScheduler(FakeRouter(), max_concurrency=1, interactive_weight=2)
+    scenario = Scenario(scheduler)
+    scenario.queue(BULK, "analysis", "bulk-0")
+    for i in range(6):
+        scenario.queue(INTERACTIVE, "chat", f"chat-{i}")
+    order = scenario.run()
+    # One round of interactive credit, then two interactive calls per bulk call
+    assert order.index("bulk-0") <= 4, order
+    print("✅ Bulk share works")
+
+
+def test_fair_sources():
+    """Sources of one class take turns."""
+    print("🧪 Testing fair queuing between sources...")
+    scenario = Scenario(LLMScheduler(FakeRouter(), max_concurrency=1))
+    for i in range(3):
+        scenario.queue(BULK, "run-a", f"a-{i}")
+    scenario.queue(BULK, "run-b", "b-0")
+    assert scenario.run() == ["a-0", "b-0", "a-1", "a-2"]
+    print("✅ Fair queuing between sources works")
+
+
+def test_pacing_and_clients():
+    """Admissions follow the router's combined rate; clients proxy calls to their target."""
+    print("🧪 Testing pacing and scheduled clients...")
+    scheduler = LLMScheduler(FakeRouter(min_interval=0.05), max_concurrency=4)
+    client = scheduler.client(INTERACTIVE, source="chat")
+    start = time.time()
+    results = [client.chat.complete(tag=i) for i in range(4)]
+    assert results == [0, 1, 2, 3]
+    assert time.time() - start >= 0.14
+    
+    failing = scheduler.client(BULK, target=SimpleNamespace(embeddings=SimpleNamespace(create=lambda **kw: 1 / 0)))
+    try:
+        failing.embeddings.create(inputs=["x"])
+        assert False, "the target's error should reach the caller"
+    except ZeroDivisionError:
+        pass
+    stats = scheduler.get_stats()["classes"]
+    assert stats[INTERACTIVE]["completed"] == 4 and stats[BULK]["failed"] == 1
+    assert stats[INTERACTIVE]["avg_wait_ms"] >= 30
+    
+    try:
+        scheduler.client("urgent")
+        assert False, "unknown classes must be rejected"
+    except ValueError:
+        pass
+    print("✅ Pacing and scheduled clients work")
+
+
+def test_analyzer_uses_scheduler():
+    """Analysis calls are scheduled as bulk work on the shared scheduler."""
+    print("🧪 Testing analyzer scheduling...")
+    with mock.patch.dict(os.environ, {"MISTRAL_API_KEY": "test-key"}):
+        from compatibility_analyzer import CompatibilityAnalyzer
+        from llm_scheduler import get_llm_scheduler
+        analyzer = CompatibilityAnalyzer(requests_per_second=1000)
+        assert get_llm_scheduler() is analyzer.llm_scheduler
+    
+    before = analyzer.llm_scheduler.get_stats()["classes"][BULK]["submitted"]
+    with mock.patch.object(analyzer.llm_router, "complete", return_value="response"):
+        assert analyzer._make_api_request_with_retry(model="m", messages=[]) == "response"
+    assert analyzer.llm_scheduler.get_stats()["classes"][BULK]["submitted"] == before + 1
+    print("✅ Analyzer scheduling works")
+
+
+def test_embedding_priorities():
+    """Sync embeddings are bulk work; only search query embeddings are interactive."""
+    print("🧪 Testing embedding priorities...")
+    from embeddings import MistralEmbedder
+    scheduler = LLMScheduler(FakeRouter(), max_concurrency=2)
+    embeddings = SimpleNamespace(create=lambda model, inputs: SimpleNamespace(
+        data=[SimpleNamespace(index=i, embedding=[1.0, 0.0]) for i in range(len(inputs))]))
+    target = SimpleNamespace(embeddings=embeddings)
+    embedder = MistralEmbedder(scheduler.client(BULK, source="embeddings", target=target), batch_size=2,
+                               query_client=scheduler.client(INTERACTIVE, source="query-embeddings", target=target))
+    
+    embedder.embed(["a", "b", "c"])
+    embedder.embed_query("most creative")
+    stats = scheduler.get_stats()["classes"]
+    assert stats[BULK]["completed"] == 2 and stats[INTERACTIVE]["completed"] == 1
+    print("✅ Embedding priorities work")
+
+
+def main():
+    """Run all scheduler tests."""
+    print("🧪 Testing the LLM request scheduler...\n")
+    test_interactive_priority()
+    test_bulk_is_not_starved()
+    test_fair_sources()
+    test_pacing_and_clients()
+    test_analyzer_uses_scheduler()
+    test_embedding_priorities()
+    print("\n🎉 All scheduler tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the query result cache
+
+This script tests (offline, no Weaviate or Mistral):
+- LRU eviction and TTL expiry
+- Cached responses flagged on the AI assistant
+- Invalidation when a sync changes the collection
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from query_cache import QueryCache
+
+
+def test_lru_and_ttl():
+    """Least recently used entries are evicted and old entries expire."""
+    print("🧪 Testing LRU eviction and TTL...")
+    cache = QueryCache(max_entries=2, ttl_seconds=60)
+    first = cache.make_key("Top candidates?", 5, 0)
+    assert first == cache.make_key("  top   CANDIDATES ", 5, 0)
+    
+    cache.set(first, {"results_count": 1})
+    cache.set(cache.make_key("second", 5, 0), {"results_count": 2})
+    assert cache.get(first) == {"results_count": 1}
+    cache.set(cache.make_key("third", 5, 0), {"results_count": 3})
+    
+    # "second" was the least recently used entry
+    assert cache.get(cache.make_key("second", 5, 0)) is None
+    assert cache.get(first) is not None
+    
+    expiring = QueryCache(max_entries=2, ttl_seconds=0.01)
+    expiring.set(first, {"results_count": 1})
+    time.sleep(0.02)
+    assert expiring.get(first) is None
+    print("✅ LRU eviction and TTL work")
+
+
+def test_assistant_cache_invalidation():
+    """Repeated queries hit the cache until a sync changes the collection."""
+    print("🧪 Testing cache invalidation on sync...")
+    source = Path(__file__).parent.parent.parent / "data" / "compatibility_scores.json"
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.dict(os.environ, {
+        "WEAVIATE_URL": f"local://{tmp_dir}/index",
+        "COMPATIBILITY_SCORES_FILE": os.path.join(tmp_dir, "compatibility_scores.json")
+    }):
+        with open(os.environ["COMPATIBILITY_SCORES_FILE"], 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        
+        from ai_assistant import AIAssistant
+        assistant = AIAssistant()
+        assistant.mistral_client = None
+        assert assistant.sync_candidates_from_file()
+        
+        assert assistant.query_candidates("most outgoing candidates")["cached"] is False
+        assert assistant.query_candidates("Most outgoing candidates?")["cached"] is True
+        
+        # An unchanged sync keeps the cache, a changed one invalidates it
+        assert assistant.sync_candidates_from_file()
+        assert assistant.query_candidates("most outgoing candidates")["cached"] is True
+        
+        data["candidates_analysis"] = data["candidates_analysis"][:1]
+        with open(os.environ["COMPATIBILITY_SCORES_FILE"], 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        assert assistant.sync_candidates_from_file()
+        
+        result = assistant.query_candidates("most outgoing candidates")
+        assert result["cached"] is False
+        assert result["results_count"] == 1
+        
+        # A query answered while the collection is being reset is not served afterwards
+        store_setup = assistant.vector_store.setup_collection
+        def setup_with_query():
+            assistant.query_candidates("most creative candidates")
+            return store_setup()
+        with mock.patch.object(assistant.vector_store, "setup_collection", side_effect=setup_with_query):
+            assert assistant.setup_collection()
+        assert assistant.query_candidates("most creative candidates")["cached"] is False
+        assistant.close_connection()
+    
+    print("✅ Cache invalidation works")
+
+
+def main():
+    """Run all query cache tests."""
+    print("🧪 Testing query result cache...\n")
+    test_lru_and_ttl()
+    test_assistant_cache_invalidation()
+    print("\n🎉 All query cache tests passed!")
+
+
+if __name__ == "__main__":
+    main()
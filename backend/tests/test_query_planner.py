@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for the structured query planner
+
+This script tests (offline, no Weaviate or Mistral):
+- Recognition of trait, score and recommendation intents
+- Open-ended questions falling back to RAG
+- Structured queries answered from the local index
+- Explicit query filters
+- Exact-match tokenization of filtered text properties
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from weaviate.classes.config import Tokenization
+
+from query_planner import plan_query, build_filters
+from vector_store import HashingEmbedder, LocalVectorStore, candidate_properties
+
+CANDIDATES = {
+    "uuid-1": {"name": "Jane Doe", "recommendation": "RECOMMENDED", "compatibility_score": 0.75,
+               "extraversion": 0.4, "neuroticism": 0.2, "searchable_text": "Data scientist"},
+    "uuid-2": {"name": "John Roe", "recommendation": "CONDITIONAL", "compatibility_score": 0.65,
+               "extraversion": 0.9, "neuroticism": 0.6, "searchable_text": "Product manager"},
+    "uuid-3": {"name": "Ada Poe", "recommendation": "RECOMMENDED", "compatibility_score": 0.85,
+               "extraversion": 0.7, "neuroticism": 0.4, "searchable_text": "Engineer"},
+}
+
+
+def test_plan_recognition():
+    """Structured questions produce plans, open-ended ones do not."""
+    print("🧪 Testing query plan recognition...")
+    plan = plan_query("Who are the most outgoing candidates?")
+    assert (plan.intent, plan.sort_by, plan.descending) == ("trait", "extraversion", True)
+    
+    plan = plan_query("least anxious candidates")
+    assert (plan.sort_by, plan.descending) == ("neuroticism", False)
+    
+    plan = plan_query("top candidates")
+    assert (plan.intent, plan.sort_by, plan.descending) == ("score", "compatibility_score", True)
+    
+    plan = plan_query("Show me highly recommended candidates")
+    assert plan.intent == "recommendation"
+    assert plan.filters == [("recommendation", "eq", "HIGHLY RECOMMENDED")]
+    
+    plan = plan_query("Who are the most recommended candidates?")
+    assert plan.filters == [("recommendation", "in", ["HIGHLY RECOMMENDED", "RECOMMENDED"])]
+    
+    # An inverted recommendation is not a tier filter; a low score within a tier still is
+    assert plan_query("the least recommended candidates") is None
+    assert plan_query("lowest recommended candidates") is None
+    plan = plan_query("recommended candidates with the lowest score")
+    assert plan.filters == [("recommendation", "eq", "RECOMMENDED")] and not plan.descending
+    
+    plan = plan_query("top 3 candidates")
+    assert (plan.intent, plan.limit) == ("score", 3)
+    assert plan_query("5 most outgoing candidates").limit == 5
+    assert plan_query("top candidates").limit is None
+    
+    plan = plan_query("candidates with extraversion above 0.7 and openness over 60%")
+    assert plan.filters == [("extraversion", "gt", 0.7), ("openness", "gt", 0.6)]
+    
+    assert plan_query("candidates with Python experience") is None
+    assert plan_query("who would fit a startup culture") is None
+    assert plan_query("outgoing and organized candidates") is None
+    print("✅ Query plans recognized")
+
+
+def test_structured_query_on_local_index():
+    """Plans run as filtered, sorted property queries."""
+    print("🧪 Testing structured queries on the local index...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = LocalVectorStore(tmp_dir, "Candidates", HashingEmbedder(dimensions=64))
+        store.ensure_collection()
+        store.upsert(CANDIDATES)
+        
+        plan = plan_query("most outgoing candidates")
+        hits = store.query_properties(plan.filters, plan.sort_by, plan.descending, limit=2)
+        assert [props["name"] for _, props, _ in hits] == ["John Roe", "Ada Poe"]
+        
+        plan = plan_query("recommended candidates")
+        hits = store.query_properties(plan.filters, plan.sort_by, plan.descending, limit=5)
+        assert [props["name"] for _, props, _ in hits] == ["Ada Poe", "Jane Doe"]
+        
+        plan = plan_query("calm candidates with compatibility under 0.8")
+        hits = store.query_properties(plan.filters, plan.sort_by, plan.descending, limit=5)
+        assert [props["name"] for _, props, _ in hits] == ["Jane Doe", "John Roe"]
+    
+    print("✅ Structured queries work")
+
+
+def test_exact_match_properties():
+    """Recommendation and position match whole values, in Weaviate as in the local index."""
+    print("🧪 Testing exact-match properties...")
+    tokenization = {prop.name: prop.tokenization for prop in candidate_properties()}
+    assert tokenization["recommendation"] == Tokenization.FIELD
+    assert tokenization["position"] == Tokenization.FIELD
+    assert tokenization["searchable_text"] is None
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = LocalVectorStore(tmp_dir, "Candidates", HashingEmbedder(dimensions=64))
+        store.ensure_collection()
+        store.upsert(dict(CANDIDATES, **{"uuid-4": {"name": "Max Moe", "recommendation": "HIGHLY RECOMMENDED",
+                                                     "compatibility_score": 0.95, "searchable_text": "Designer"}}))
+        hits = store.query_properties([("recommendation", "eq", "RECOMMENDED")], "compatibility_score", True, limit=5)
+        assert [props["name"] for _, props, _ in hits] == ["Ada Poe", "Jane Doe"]
+        
+        plan = plan_query("most recommended candidates")
+        hits = store.query_properties(plan.filters, plan.sort_by, plan.descending, limit=5)
+        assert [props["name"] for _, props, _ in hits] == ["Max Moe", "Ada Poe", "Jane Doe"]
+    print("✅ Exact-match properties work")
+
+
+def test_build_filters():
+    """Explicit filters become property conditions."""
+    print("🧪 Testing explicit filters...")
+    filters = build_filters({
+        "position": "Data Scientist",
+        "recommendation": ["recommended", "highly recommended"],
+        "min_compatibility_score": 0.5,
+        "min_traits": {"openness": 0.6}
+    })
+    assert filters == [
+        ("position", "eq", "Data Scientist"),
+        ("recommendation", "in", ["RECOMMENDED", "HIGHLY RECOMMENDED"]),
+        ("compatibility_score", "gte", 0.5),
+        ("openness", "gte", 0.6),
+    ]
+    assert build_filters(None) == []
+    
+    try:
+        build_filters({"max_traits": {"charisma": 0.2}})
+        assert False, "unknown traits must be rejected"
+    except ValueError:
+        pass
+    print("✅ Explicit filters work")
+
+
+def main():
+    """Run all query planner tests."""
+    print("🧪 Testing structured query planner...\n")
+    test_plan_recognition()
+    test_structured_query_on_local_index()
+    test_exact_match_properties()
+    test_build_filters()
+    print("\n🎉 All query planner tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming results writer
+
+This script tests (offline, AI analysis mocked):
+- Running team insights matching insights over the full result list
+- JSON and NDJSON output round-trips
+- Completed candidates surviving an interrupted run
+- Streaming analysis through the CompatibilityAnalyzer
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from results_writer import ResultsWriter, TeamInsightsAccumulator, read_results, iter_ndjson_candidates
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+
+def _load(name):
+    with open(DATA_DIR / name, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _candidate(name, score):
+    return {
+        "candidate_info": {"id": name, "name": name, "position": "Engineer"},
+        "ai_analysis": {"compatibility_score": score, "confidence_level": 0.8},
+        "overall_recommendation": {"status": "RECOMMENDED" if score >= 0.7 else "CAUTIOUS"}
+    }
+
+
+def test_running_insights():
+    """Running statistics give the same insights as the stored sample run."""
+    print("🧪 Testing running team insights...")
+    results = _load("compatibility_scores.json")
+    accumulator = TeamInsightsAccumulator()
+    for candidate_result in results["candidates_analysis"]:
+        accumulator.add(candidate_result)
+    assert accumulator.insights() == results["team_insights"]
+    
+    # Top candidates keep the highest scores, earlier candidates winning ties
+    accumulator = TeamInsightsAccumulator(top_n=2)
+    for name, score in [("a", 0.5), ("b", 0.9), ("c", 0.7), ("d", 0.9), ("e", 0.1)]:
+        accumulator.add(_candidate(name, score))
+    insights = accumulator.insights()
+    assert [c["name"] for c in insights["top_candidates"]] == ["b", "d"]
+    assert insights["candidate_pool_summary"] == {
+        "average_compatibility": 0.62,
+        "best_compatibility": 0.9,
+        "compatibility_range": 0.8,
+        "candidates_above_threshold": 3
+    }
+    assert TeamInsightsAccumulator().insights() == {}
+    print("✅ Running team insights work")
+
+
+def test_round_trip():
+    """Both formats read back into the compatibility_scores.json layout."""
+    print("🧪 Testing JSON and NDJSON output...")
+    results = _load("compatibility_scores.json")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in ("scores.json", "scores.ndjson"):
+            path = os.path.join(tmp_dir, name)
+            with ResultsWriter(path) as writer:
+                writer.begin(results["analysis_metadata"], results["team_summary"])
+                for candidate_result in results["candidates_analysis"]:
+                    writer.write_candidate(candidate_result)
+                summary = writer.finish({"total_analysis_time": 1.5})
+            
+            assert "candidates_analysis" not in summary
+            assert summary["team_insights"] == results["team_insights"]
+            restored = read_results(path)
+            assert restored["candidates_analysis"] == results["candidates_analysis"]
+            assert restored["team_insights"] == results["team_insights"]
+            assert restored["analysis_metadata"]["total_analysis_time"] == 1.5
+        assert sorted(os.listdir(tmp_dir)) == ["scores.json", "scores.ndjson"]
+    print("✅ JSON and NDJSON output work")
+
+
+def test_interrupted_run():
+    """Candidates written before a crash stay readable."""
+    print("🧪 Testing interrupted runs...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "scores.ndjson")
+        try:
+            with ResultsWriter(path) as writer:
+                writer.begin({"team_size": 1}, {"members": []})
+                writer.write_candidate(_candidate("a", 0.8))
+                writer.write_candidate(_candidate("b", 0.4))
+                raise RuntimeError("process died")
+        except RuntimeError:
+            pass
+        
+        # Simulate a line cut off mid-write
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "candidate", "data": {"cand')
+        
+        assert [c["candidate_info"]["name"] for c in iter_ndjson_candidates(path)] == ["a", "b"]
+        restored = read_results(path)
+        assert restored["team_insights"]["candidate_pool_summary"]["best_compatibility"] == 0.8
+        
+        json_path = os.path.join(tmp_dir, "scores.json")
+        with ResultsWriter(json_path) as writer:
+            writer.begin({}, {})
+            writer.write_candidate(_candidate("a", 0.8))
+        # An unfinished JSON run never replaces the output file
+        assert not os.path.exists(json_path) and os.path.exists(json_path + ".partial")
+    print("✅ Interrupted runs keep completed candidates")
+
+
+def test_stream_analysis():
+    """The analyzer streams candidates from a generator into the writer."""
+    print("🧪 Testing streaming analysis...")
+    with mock.patch.dict(os.environ, {"MISTRAL_API_KEY": "test-key"}):
+        from compatibility_analyzer import CompatibilityAnalyzer
+        analyzer = CompatibilityAnalyzer(requests_per_second=1000)
+    
+    scores = iter([0.9, 0.3, 0.75])
+    fake_analysis = lambda team, candidate: analyzer._validate_ai_analysis(
+        {"compatibility_score": next(scores), "confidence_level": 0.8}
+    )
+    candidates = ({"candidate": {"id": str(i), "name": f"Candidate {i}", "position": "Engineer",
+                                 "personality_traits": {"openness": 0.5}}} for i in range(3))
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "scores.ndjson")
+        with mock.patch.object(analyzer, "get_ai_compatibility_analysis", side_effect=fake_analysis):
+            with ResultsWriter(path) as writer:
+                summary = analyzer.stream_team_compatibility(_load("team.json"), candidates, writer)
+        
+        assert summary["analysis_metadata"]["candidates_count"] == 3
+        assert summary["team_insights"]["candidate_pool_summary"]["candidates_above_threshold"] == 2
+        restored = read_results(path)
+        assert [c["overall_recommendation"]["status"] for c in restored["candidates_analysis"]] == [
+            "HIGHLY RECOMMENDED", "NOT RECOMMENDED", "RECOMMENDED"
+        ]
+        assert restored["team_insights"] == analyzer._generate_team_insights(restored["candidates_analysis"])
+    print("✅ Streaming analysis works")
+
+
+def main():
+    """Run all results writer tests."""
+    print("🧪 Testing streaming results writer...\n")
+    test_running_insights()
+    test_round_trip()
+    test_interrupted_run()
+    test_stream_analysis()
+    print("\n🎉 All results writer tests passed!")
+
+
+if __name__ == "__main__":
+    main()
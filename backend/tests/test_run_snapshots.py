@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for versioned run snapshots
+
+This script tests (offline):
+- Snapshot writes, the latest pointer and the run index
+- Retention by count and age
+- Rebuilding a lost index from the snapshot files
+"""
+
+import os
+import sys
+import json
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from run_snapshots import RunSnapshotStore, INDEX_FILE
+
+
+def _results(count):
+    return {"analysis_metadata": {"candidates_count": count}, "candidates_analysis": [{}] * count}
+
+
+def test_snapshots_and_latest_pointer():
+    """Each run gets its own snapshot and the pointer follows the newest."""
+    print("🧪 Testing run snapshots...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = RunSnapshotStore(tmp_dir, keep_last=0, max_age_days=0)
+        first = store.write(_results(1), run_id="run-1")
+        second = store.write(_results(2), run_id="run-2")
+        
+        assert store.latest_run_id() == second
+        assert store.load()["analysis_metadata"]["candidates_count"] == 2
+        assert store.load(first)["analysis_metadata"]["candidates_count"] == 1
+        assert [run["run_id"] for run in store.list_runs()] == ["run-2", "run-1"]
+        assert store.load("../etc/passwd") is None
+        
+        # No temporary files are left behind
+        assert not [name for name in os.listdir(tmp_dir) if name.endswith(".tmp")]
+        
+        try:
+            store.write(_results(1), run_id="../escape")
+            assert False, "unsafe run ids must be rejected"
+        except ValueError:
+            pass
+        
+        # The run id recorded by the analysis store is reused
+        assert store.write({"analysis_metadata": {"run_id": "run-3"}}) == "run-3"
+    print("✅ Run snapshots work")
+
+
+def test_retention():
+    """Old snapshots are pruned by count and age, never the newest."""
+    print("🧪 Testing snapshot retention...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = RunSnapshotStore(tmp_dir, keep_last=2, max_age_days=0)
+        for i in range(4):
+            store.write(_results(i), run_id=f"run-{i}")
+        assert [run["run_id"] for run in store.list_runs()] == ["run-3", "run-2"]
+        assert not os.path.exists(os.path.join(tmp_dir, "run-0.json"))
+        
+        # Age an entry in the index past the limit
+        index_path = os.path.join(tmp_dir, INDEX_FILE)
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        index[0]["timestamp"] = (datetime.now() - timedelta(days=10)).isoformat()
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        
+        aged = RunSnapshotStore(tmp_dir, keep_last=0, max_age_days=7)
+        aged.write(_results(5), run_id="run-5")
+        assert [run["run_id"] for run in aged.list_runs()] == ["run-5", "run-3"]
+    print("✅ Snapshot retention works")
+
+
+def test_index_rebuild():
+    """A missing index is rebuilt from the snapshot files."""
+    print("🧪 Testing index rebuild...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = RunSnapshotStore(tmp_dir, keep_last=0, max_age_days=0)
+        store.write(_results(1), run_id="run-a")
+        store.write(_results(1), run_id="run-b")
+        os.remove(os.path.join(tmp_dir, INDEX_FILE))
+        
+        assert {run["run_id"] for run in store.list_runs()} == {"run-a", "run-b"}
+    print("✅ Index rebuild works")
+
+
+def main():
+    """Run all run snapshot tests."""
+    print("🧪 Testing versioned run snapshots...\n")
+    test_snapshots_and_latest_pointer()
+    test_retention()
+    test_index_rebuild()
+    print("\n🎉 All run snapshot tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for fast JSON serialization
+
+This script tests (offline):
+- Round-trips of the analyzer output, compact and pretty
+- Encoding of datetimes and NumPy values
+- Atomic file writes and the FastAPI response class
+"""
+
+import os
+import sys
+import json
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from serialization import dumps, loads, dump_file, load_file, FastJSONResponse
+
+DATA_FILE = Path(__file__).parent.parent.parent / "data" / "compatibility_scores.json"
+
+
+def _load_results():
+    with open(DATA_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_round_trip():
+    """Compact and pretty output decode to the same results."""
+    print("🧪 Testing serialization round-trip...")
+    results = _load_results()
+    
+    compact = dumps(results, pretty=False)
+    pretty = dumps(results, pretty=True)
+    assert isinstance(compact, bytes)
+    assert b"\n" not in compact and b"\n  " in pretty
+    assert len(compact) < len(pretty)
+    assert loads(compact) == results == json.loads(pretty)
+    
+    # Pretty output is opt-in through the environment
+    with mock.patch.dict(os.environ, {"JSON_PRETTY": "true"}):
+        assert dumps(results) == pretty
+    with mock.patch.dict(os.environ, {"JSON_PRETTY": "false"}):
+        assert dumps(results) == compact
+    print("✅ Serialization round-trip works")
+
+
+def test_extra_types():
+    """Datetimes and NumPy values are encoded as plain JSON."""
+    print("🧪 Testing datetime and NumPy encoding...")
+    data = {
+        "timestamp": datetime(2026, 1, 2, 3, 4, 5),
+        "score": np.float64(0.5),
+        "count": np.int64(3),
+        "traits": np.array([0.1, 0.2])
+    }
+    assert loads(dumps(data)) == {
+        "timestamp": "2026-01-02T03:04:05",
+        "score": 0.5,
+        "count": 3,
+        "traits": [0.1, 0.2]
+    }
+    
+    try:
+        dumps({"value": object()})
+        assert False, "unsupported types must raise"
+    except TypeError:
+        pass
+    print("✅ Datetime and NumPy encoding works")
+
+
+def test_file_and_response():
+    """Files are written atomically and responses carry compact JSON."""
+    print("🧪 Testing file writes and responses...")
+    results = _load_results()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "compatibility_scores.json")
+        dump_file(results, path)
+        assert load_file(path) == results
+        assert os.listdir(tmp_dir) == ["compatibility_scores.json"]
+    
+    response = FastJSONResponse(results)
+    assert response.media_type == "application/json"
+    assert response.body == dumps(results, pretty=False)
+    assert int(response.headers["content-length"]) == len(response.body)
+    print("✅ File writes and responses work")
+
+
+def main():
+    """Run all serialization tests."""
+    print("🧪 Testing fast JSON serialization...\n")
+    test_round_trip()
+    test_extra_types()
+    test_file_and_response()
+    print("\n🎉 All serialization tests passed!")
+
+
+if __name__ == "__main__":
+    main()
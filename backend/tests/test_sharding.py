@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for sharded analysis
+
+This script tests (offline):
+- Shard spec parsing and the deterministic candidate partition
+- Merging shard results (JSON and NDJSON) with recomputed team insights
+- Rejecting incomplete or inconsistent shard sets
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sharding import parse_shard, shard_of, select_shard, merge_shards
+from results_writer import ResultsWriter, TeamInsightsAccumulator
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+
+def _candidate(i, score):
+    return {
+        "candidate_info": {"id": str(i), "name": f"Candidate {i}", "position": "Engineer"},
+        "ai_analysis": {"compatibility_score": score, "confidence_level": 0.8},
+        "overall_recommendation": {"status": "RECOMMENDED" if score >= 0.7 else "CAUTIOUS"}
+    }
+
+
+def _write_shard(path, index, total, candidates, team_summary=None):
+    with ResultsWriter(path, metadata={"shard": {"index": index, "total": total}}) as writer:
+        writer.begin({"team_size": 2, "analyzer_version": "3.0"}, team_summary or {"members": ["a", "b"]})
+        for candidate_result in candidates:
+            writer.write_candidate(candidate_result)
+        writer.finish({"rate_limiter_stats": {"total_requests": len(candidates)}, "total_analysis_time": index + 1.0})
+
+
+def test_partition():
+    """Every candidate lands on exactly one shard, the same one every time."""
+    print("🧪 Testing candidate partition...")
+    assert parse_shard("0/4") == (0, 4) and parse_shard(" 3/4 ") == (3, 4)
+    for bad in ("4/4", "1/0", "a/b", "1-4"):
+        try:
+            parse_shard(bad)
+            assert False, f"{bad} should be rejected"
+        except ValueError:
+            pass
+    
+    candidates = []
+    for path in sorted(DATA_DIR.glob("candidate_*.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            candidates.append(json.load(f))
+    candidates += [{"candidate": {"id": str(i), "name": f"Candidate {i}"}} for i in range(200)]
+    
+    shards = [list(select_shard(candidates, index, 4)) for index in range(4)]
+    assert sum(len(shard) for shard in shards) == len(candidates)
+    assert all(shards), "200 candidates should reach every shard"
+    assert [shard_of(c, 4) for c in candidates] == [shard_of(c, 4) for c in candidates]
+    
+    # Only identity fields matter, so an edited file keeps its shard
+    edited = {"candidate": {**candidates[0]["candidate"], "responses": []}}
+    assert shard_of(edited, 4) == shard_of(candidates[0], 4)
+    print("✅ Candidate partition works")
+
+
+def test_merge():
+    """Shards merge into one run with insights over all candidates."""
+    print("🧪 Testing shard merge...")
+    first = [_candidate(0, 0.9), _candidate(1, 0.4)]
+    second = [_candidate(2, 0.75)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        shard_0 = os.path.join(tmp_dir, "shard-0-of-2.json")
+        shard_1 = os.path.join(tmp_dir, "shard-1-of-2.ndjson")
+        _write_shard(shard_0, 0, 2, first)
+        _write_shard(shard_1, 1, 2, second)
+        
+        merged = merge_shards([shard_1, shard_0])
+        assert merged["candidates_analysis"] == first + second
+        expected = TeamInsightsAccumulator()
+        for candidate_result in first + second:
+            expected.add(candidate_result)
+        assert merged["team_insights"] == expected.insights()
+        
+        metadata = merged["analysis_metadata"]
+        assert metadata["candidates_count"] == 3
+        assert metadata["rate_limiter_stats"] == {"total_requests": 3}
+        assert metadata["total_analysis_time"] == 2.0
+        assert metadata["sharding"]["merged"] == [0, 1] and metadata["sharding"]["missing"] == []
+    print("✅ Shard merge works")
+
+
+def test_merge_validation():
+    """Incomplete, duplicated or mismatched shard sets are rejected."""
+    print("🧪 Testing shard merge validation...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        shard_0 = os.path.join(tmp_dir, "shard-0-of-3.json")
+        shard_1 = os.path.join(tmp_dir, "shard-1-of-3.json")
+        other_team = os.path.join(tmp_dir, "other-team.json")
+        other_partition = os.path.join(tmp_dir, "shard-0-of-2.json")
+        _write_shard(shard_0, 0, 3, [_candidate(0, 0.9)])
+        _write_shard(shard_1, 1, 3, [_candidate(1, 0.5)])
+        _write_shard(other_team, 2, 3, [], team_summary={"members": ["c"]})
+        _write_shard(other_partition, 0, 2, [])
+        plain = os.path.join(tmp_dir, "compatibility_scores.json")
+        with open(plain, 'w', encoding='utf-8') as f:
+            json.dump({"analysis_metadata": {}, "candidates_analysis": []}, f)
+        
+        for shard_files in ([shard_0, shard_1], [shard_0, shard_0], [shard_0, shard_1, other_team],
+                            [shard_0, other_partition], [plain], []):
+            try:
+                merge_shards(shard_files)
+                assert False, f"{shard_files} should be rejected"
+            except ValueError:
+                pass
+        
+        partial = merge_shards([shard_0, shard_1], allow_missing=True)
+        assert partial["analysis_metadata"]["sharding"]["missing"] == [2]
+        assert partial["analysis_metadata"]["candidates_count"] == 2
+    print("✅ Shard merge validation works")
+
+
+def main():
+    """Run all sharding tests."""
+    print("🧪 Testing sharded analysis...\n")
+    test_partition()
+    test_merge()
+    test_merge_validation()
+    print("\n🎉 All sharding tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared AI assistant connection
+
+This script tests (offline, with the local index):
+- One assistant shared by every caller
+- Reconnect after a failed health check
+- Background health monitor
+- Concurrent syncs being serialized while queries keep running
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import ai_assistant
+
+DATA_FILE = Path(__file__).parent.parent.parent / "data" / "compatibility_scores.json"
+
+
+def _local_env(tmp_dir):
+    return mock.patch.dict(os.environ, {
+        "WEAVIATE_URL": f"local://{tmp_dir}",
+        "COMPATIBILITY_SCORES_FILE": str(DATA_FILE),
+        "MISTRAL_API_KEY": ""
+    })
+
+
+def test_shared_assistant_is_reused():
+    """get_shared_assistant reuses one assistant instead of reconnecting."""
+    print("🧪 Testing shared assistant reuse...")
+    with tempfile.TemporaryDirectory() as tmp_dir, _local_env(tmp_dir):
+        with mock.patch.object(ai_assistant, "create_ai_assistant", wraps=ai_assistant.create_ai_assistant) as create:
+            assert ai_assistant.get_shared_assistant().sync_candidates_from_file()
+            assert ai_assistant.get_shared_assistant().sync_candidates_from_file()
+            assert create.call_count == 1
+        
+        shared = ai_assistant.get_shared_assistant()
+        assert shared.last_sync_result["unchanged"] == 2
+        ai_assistant.close_shared_assistant()
+        assert ai_assistant._shared_assistant is None
+    print("✅ Shared assistant is reused")
+
+
+def test_reconnect_after_failed_check():
+    """A failed health check reconnects the store before the next sync."""
+    print("🧪 Testing reconnect on failed health check...")
+    with tempfile.TemporaryDirectory() as tmp_dir, _local_env(tmp_dir):
+        assistant = ai_assistant.AIAssistant()
+        store = assistant.vector_store
+        
+        with mock.patch.object(store, "is_healthy", return_value=False), \
+             mock.patch.object(store, "reconnect", side_effect=ConnectionError("cluster unreachable")):
+            assert not assistant.check_connection()
+            assert not assistant.sync_candidates_from_file()
+        assert assistant.connection_status()["last_error"] == "cluster unreachable"
+        
+        with mock.patch.object(store, "reconnect") as reconnect:
+            assert assistant.sync_candidates_from_file()
+            assert reconnect.call_count == 1
+            assert assistant.sync_candidates_from_file()
+            assert reconnect.call_count == 1
+        
+        status = assistant.connection_status()
+        assert status["healthy"] and status["reconnects"] == 1 and status["last_error"] is None
+        assistant.close_connection()
+    print("✅ Reconnect after failed health check works")
+
+
+def test_health_monitor():
+    """The monitor thread runs health checks until stopped."""
+    print("🧪 Testing background health monitor...")
+    with tempfile.TemporaryDirectory() as tmp_dir, _local_env(tmp_dir):
+        assistant = ai_assistant.AIAssistant()
+        assistant.start_health_monitor(interval=0.01)
+        time.sleep(0.1)
+        
+        status = assistant.connection_status()
+        assert status["monitoring"] and status["last_health_check"] is not None
+        assistant.close_connection()
+        assert not assistant.connection_status()["monitoring"]
+    print("✅ Background health monitor works")
+
+
+def test_concurrent_syncs_are_serialized():
+    """Syncs from several threads never overlap, and queries run alongside them."""
+    print("🧪 Testing concurrent syncs...")
+    with tempfile.TemporaryDirectory() as tmp_dir, _local_env(tmp_dir):
+        assistant = ai_assistant.AIAssistant()
+        assert assistant.sync_candidates_from_file()
+        store = assistant.vector_store
+        fetch_hashes = store.fetch_hashes
+        active, overlaps = [0], []
+        
+        def slow_fetch_hashes():
+            active[0] += 1
+            overlaps.append(active[0] > 1)
+            time.sleep(0.02)
+            active[0] -= 1
+            return fetch_hashes()
+        
+        results = []
+        with mock.patch.object(store, "fetch_hashes", side_effect=slow_fetch_hashes):
+            threads = [threading.Thread(target=lambda: results.append(assistant.sync_candidates_from_file()))
+                       for _ in range(4)]
+            threads.append(threading.Thread(target=lambda: results.append(
+                "error" not in assistant.query_candidates("python developer", limit=2))))
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        assert results == [True] * 5 and len(overlaps) == 4 and not any(overlaps)
+        assistant.close_connection()
+    print("✅ Concurrent syncs are serialized")
+
+
+def main():
+    """Run all shared assistant tests."""
+    print("🧪 Testing shared AI assistant connection...\n")
+    test_shared_assistant_is_reused()
+    test_reconnect_after_failed_check()
+    test_health_monitor()
+    test_concurrent_syncs_are_serialized()
+    print("\n🎉 All shared assistant tests passed!")
+
+
+if __name__ == "__main__":
+    main()
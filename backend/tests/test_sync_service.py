@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the background candidate sync service
+
+This script tests (offline, with a fake assistant):
+- Debounced syncs for bursts of change events
+- File change detection
+- Sync status and lag reporting
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sync_service import CandidateSyncService
+
+
+class FakeAssistant:
+    """Records sync calls instead of talking to a vector store."""
+    
+    def __init__(self, compatibility_file):
+        self.compatibility_file = compatibility_file
+        self.last_sync_result = None
+        self.synced_files = []
+    
+    def sync_candidates_from_file(self, file_path=None):
+        self.synced_files.append(file_path)
+        self.last_sync_result = {"inserted": 0, "updated": len(self.synced_files)}
+        return True
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_debounced_events():
+    """A burst of events produces one sync after the quiet period."""
+    print("🧪 Testing debounced sync events...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scores_file = os.path.join(tmp_dir, "compatibility_scores.json")
+        assistant = FakeAssistant(scores_file)
+        service = CandidateSyncService(assistant, debounce_seconds=0.1, poll_interval=0.05)
+        service.start()
+        assert _wait_for(lambda: service.sync_count == 1)  # startup sync
+        
+        for _ in range(5):
+            service.notify("test")
+            time.sleep(0.02)
+        status = service.get_status()
+        assert status["pending"] and status["lag_seconds"] > 0
+        
+        assert _wait_for(lambda: service.sync_count == 2)
+        time.sleep(0.2)
+        assert service.sync_count == 2
+        
+        status = service.get_status()
+        assert not status["pending"] and status["lag_seconds"] == 0.0
+        assert status["last_sync_success"] and status["last_sync_lag_seconds"] >= 0.1
+        service.stop()
+        assert not service.get_status()["running"]
+    print("✅ Debounced sync events work")
+
+
+def test_file_watch():
+    """Writing the scores file triggers a sync without an event."""
+    print("🧪 Testing scores file watching...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scores_file = os.path.join(tmp_dir, "compatibility_scores.json")
+        assistant = FakeAssistant(scores_file)
+        service = CandidateSyncService(assistant, debounce_seconds=0.05, poll_interval=0.02)
+        service.start()
+        assert _wait_for(lambda: service.sync_count == 1)
+        
+        with open(scores_file, 'w', encoding='utf-8') as f:
+            f.write('{"candidates_analysis": []}')
+        assert _wait_for(lambda: service.sync_count == 2)
+        assert assistant.synced_files[-1] == scores_file
+        service.stop()
+    print("✅ Scores file watching works")
+
+
+def main():
+    """Run all sync service tests."""
+    print("🧪 Testing candidate sync service...\n")
+    test_debounced_events()
+    test_file_watch()
+    print("\n🎉 All sync service tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental transcript retrieval
+
+This script tests (offline, Beyond Presence API faked):
+- Q&A pairing continued across message batches
+- Detecting whether a fetched history extends the cached one
+- Call cursors: incremental merges, rebuilds and LRU eviction
+- The client's `since` cursor in get_transcript
+"""
+
+import sys
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from interview_manager import InterviewManager
+
+
+def _message(sender, text, second):
+    return {"sender": sender, "message": text, "sent_at": f"2025-05-01T10:00:{second:02d}Z"}
+
+
+MESSAGES = [
+    _message("ai", "Tell me about yourself", 1),
+    _message("user", "I build rockets", 2),
+    _message("ai", "Why this role?", 3),
+    _message("user", "I like teams", 4),
+]
+
+
+def test_pair_messages():
+    """Pairing a conversation in batches matches pairing it at once."""
+    print("🧪 Testing incremental Q&A pairing...")
+    manager = InterviewManager(api_key="test-key")
+    whole = manager._pair_messages(MESSAGES)
+    
+    state = manager._pair_messages(MESSAGES[:1])
+    assert state["responses"] == [] and state["current_question"] == "Tell me about yourself"
+    manager._pair_messages(MESSAGES[1:], state)
+    assert state["responses"] == whole["responses"]
+    assert whole["responses"][1] == {"question": "Why this role?", "answer": "I like teams"}
+    print("✅ Incremental Q&A pairing works")
+
+
+def test_extends_history():
+    """Only a fetched list starting with the known messages extends the history."""
+    print("🧪 Testing history extension checks...")
+    manager = InterviewManager(api_key="test-key")
+    assert manager._extends_history([], MESSAGES)
+    assert manager._extends_history(MESSAGES[:2], MESSAGES)
+    assert not manager._extends_history(MESSAGES, MESSAGES[:2])
+    assert not manager._extends_history(MESSAGES[:2], [MESSAGES[0], _message("user", "edited", 2)] + MESSAGES[2:])
+    print("✅ History extension checks work")
+
+
+def test_sync_call_messages():
+    """Cursors merge new messages, rebuild on a changed history and evict old calls."""
+    print("🧪 Testing call cursors...")
+    with mock.patch.dict("os.environ", {"TRANSCRIPT_CURSOR_CACHE_SIZE": "2"}):
+        manager = InterviewManager(api_key="test-key")
+    server = {"call-1": MESSAGES[:2]}
+    
+    with mock.patch.object(manager, "_get_call_messages", side_effect=lambda call_id: list(server[call_id])):
+        state, added = manager._sync_call_messages("call-1")
+        assert added == 2 and len(state["responses"]) == 1
+        
+        server["call-1"] = MESSAGES
+        state, added = manager._sync_call_messages("call-1")
+        assert added == 2 and len(state["responses"]) == 2
+        assert manager._sync_call_messages("call-1")[1] == 0
+        
+        # A rewritten history is paired again from scratch
+        server["call-1"] = [MESSAGES[0], _message("user", "I fly planes", 2)]
+        state, added = manager._sync_call_messages("call-1")
+        assert added == 2 and state["responses"][0]["answer"] == "I fly planes"
+        
+        # Least recently used calls are evicted beyond the cache size
+        server["call-2"] = server["call-3"] = MESSAGES[:1]
+        manager._sync_call_messages("call-2")
+        manager._sync_call_messages("call-3")
+        assert list(manager._call_cursors) == ["call-2", "call-3"]
+    print("✅ Call cursors work")
+
+
+def test_since_cursor():
+    """`since` limits the returned and counted messages to those the client has not seen."""
+    print("🧪 Testing the client message cursor...")
+    manager = InterviewManager(api_key="test-key")
+    call = {"id": "call-1", "agent_id": "agent-1", "started_at": "2025-05-01T10:00:00Z"}
+    with mock.patch.object(manager, "_get_calls_for_agent", return_value=[call]), \
+            mock.patch.object(manager, "_get_call_messages", return_value=MESSAGES):
+        first = manager.get_transcript("agent-1")
+        assert first["new_message_count"] == 4 and first["cursor"] == 4
+        
+        # The server-side cursor is already up to date; the client still gets what it missed
+        later = manager.get_transcript("agent-1", since=1)
+        assert later["new_message_count"] == 3 and later["messages"] == MESSAGES[1:]
+        assert manager.get_transcript("agent-1", since=4)["new_message_count"] == 0
+        
+        rejected = manager.get_transcript("agent-1", since=-1)
+        assert not rejected["success"]
+    print("✅ Client message cursor works")
+
+
+def main():
+    """Run all transcript cursor tests."""
+    print("🧪 Testing incremental transcript retrieval...\n")
+    test_pair_messages()
+    test_extends_history()
+    test_sync_call_messages()
+    test_since_cursor()
+    print("\n🎉 All transcript cursor tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Test script for the transcript ingestion pipeline
+
+This script tests (offline, against a local stub of the calls API):
+- Detection of completed calls via polling
+- Webhook ingestion
+- Idempotency and trait precomputation
+- Concurrent webhook and poller ingestion of one call
+- Webhook shared-secret check
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from interview_manager import InterviewManager
+from transcript_ingestion import TranscriptIngestionService
+
+STUB_CALLS = [
+    {"id": "1a2b3c4d-0001", "agent_id": "agent-1", "started_at": "2025-05-25T10:00:00", "ended_at": "2025-05-25T10:20:00"},
+    {"id": "5e6f7a8b-0002", "agent_id": "agent-2", "started_at": "2025-05-25T11:00:00"},
+    {"id": "9c0d1e2f-0003", "agent_id": "agent-unknown", "started_at": "2025-05-25T09:00:00", "ended_at": "2025-05-25T09:10:00"},
+]
+
+STUB_MESSAGES = [
+    {"sender": "ai", "message": "How do you handle pressure?"},
+    {"sender": "user", "message": "I plan ahead and stay calm."},
+]
+
+
+class StubCallsHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for the Beyond Presence calls API."""
+    
+    requests_seen = []
+    
+    def do_GET(self):
+        StubCallsHandler.requests_seen.append(self.path)
+        if self.path == "/calls":
+            body = STUB_CALLS
+        elif self.path.startswith("/calls/") and self.path.endswith("/messages"):
+            body = STUB_MESSAGES
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeTraitsExtractor:
+    """Returns fixed traits instead of calling the LLM."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def extract_from_responses(self, candidate_data):
+        self.calls += 1
+        return {"openness": 0.6, "conscientiousness": 0.8, "extraversion": 0.5, "agreeableness": 0.7, "neuroticism": 0.2}
+
+
+def _make_manager(server, tmp_dir):
+    manager = InterviewManager(api_key="test-key")
+    manager.base_url = f"http://127.0.0.1:{server.server_port}"
+    manager.interviews_file = os.path.join(tmp_dir, "interviews.json")
+    with open(manager.interviews_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            "agent-1": {"agent_id": "agent-1", "candidate_name": "Jane Doe", "role": "Data Scientist"},
+            "agent-2": {"agent_id": "agent-2", "candidate_name": "John Roe", "role": "Product Manager"},
+        }, f)
+    return manager
+
+
+def test_ingestion_pipeline():
+    """Completed calls are ingested once and their traits precomputed."""
+    print("🧪 Testing transcript ingestion against a local stub...")
+    server = HTTPServer(("127.0.0.1", 0), StubCallsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            manager = _make_manager(server, tmp_dir)
+            
+            extractor = FakeTraitsExtractor()
+            service = TranscriptIngestionService(manager, traits_extractor=extractor, poll_interval=0.1)
+            
+            # Only the completed call of a known interview produces a candidate file
+            written = service.poll_once()
+            assert len(written) == 1, written
+            assert os.path.basename(written[0]) == "candidate_jane_doe_1a2b3c4d.json"
+            
+            with open(written[0], 'r', encoding='utf-8') as f:
+                candidate = json.load(f)["candidate"]
+            assert candidate["responses"] == [{"question": "How do you handle pressure?", "answer": "I plan ahead and stay calm."}]
+            assert candidate["interview"]["call_id"] == "1a2b3c4d-0001"
+            
+            # Polling again (or a duplicate webhook) does not refetch messages
+            message_requests = len([p for p in StubCallsHandler.requests_seen if p.endswith("/messages")])
+            assert service.poll_once() == []
+            assert service.handle_webhook({"call_id": "1a2b3c4d-0001"}) == written[0]
+            assert len([p for p in StubCallsHandler.requests_seen if p.endswith("/messages")]) == message_requests
+            
+            # A webhook that arrives before the call has ended leaves it for a later poll
+            assert service.handle_webhook({"call_id": "5e6f7a8b-0002"}) is None
+            assert not service._is_processed("5e6f7a8b-0002")
+            
+            # Queued extraction precomputes traits and clears the pending list
+            assert service.get_status()["pending_extractions"] == 1
+            assert service.extract_traits(written[0])
+            with open(written[0], 'r', encoding='utf-8') as f:
+                assert json.load(f)["candidate"]["personality_traits"]["conscientiousness"] == 0.8
+            assert service.get_status()["pending_extractions"] == 0
+            
+            # State survives a restart
+            restarted = TranscriptIngestionService(manager, traits_extractor=extractor)
+            assert restarted.get_status()["processed_calls"] == 2
+    finally:
+        server.shutdown()
+    
+    print("✅ Transcript ingestion works")
+
+
+def test_concurrent_ingestion():
+    """A webhook racing the poller ingests the call once."""
+    print("🧪 Testing concurrent ingestion of one call...")
+    server = HTTPServer(("127.0.0.1", 0), StubCallsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            manager = _make_manager(server, tmp_dir)
+            service = TranscriptIngestionService(manager, traits_extractor=FakeTraitsExtractor())
+            get_messages = manager._get_call_messages
+            barrier = threading.Barrier(4)
+            
+            def slow_messages(call_id):
+                threading.Event().wait(0.05)
+                return get_messages(call_id)
+            
+            def ingest():
+                barrier.wait()
+                results.append(service.ingest_call(STUB_CALLS[0]))
+            
+            results = []
+            with mock.patch.object(manager, "_get_call_messages", side_effect=slow_messages) as fetch:
+                threads = [threading.Thread(target=ingest) for _ in range(4)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            
+            assert fetch.call_count == 1
+            assert len(set(results)) == 1 and results[0].endswith("candidate_jane_doe_1a2b3c4d.json")
+            assert service._extraction_queue.qsize() == 1
+    finally:
+        server.shutdown()
+    
+    print("✅ Concurrent ingestion works")
+
+
+def test_webhook_secret():
+    """The call-ended webhook needs the shared secret."""
+    print("🧪 Testing webhook authentication...")
+    from fastapi.testclient import TestClient
+    import api
+    
+    ingestion = mock.Mock()
+    ingestion.handle_webhook.return_value = "candidate_jane_doe_1a2b3c4d.json"
+    client = TestClient(api.app)
+    url = "/webhooks/interviews/call-ended"
+    payload = {"call_id": "1a2b3c4d-0001"}
+    
+    with mock.patch.object(api, "transcript_ingestion", ingestion):
+        with mock.patch.dict(os.environ, {"INTERVIEW_WEBHOOK_SECRET": ""}):
+            assert client.post(url, json=payload, headers={"X-Webhook-Secret": ""}).status_code == 503
+        with mock.patch.dict(os.environ, {"INTERVIEW_WEBHOOK_SECRET": "s3cret"}):
+            assert client.post(url, json=payload).status_code == 401
+            assert client.post(url, json=payload, headers={"X-Webhook-Secret": "wrong"}).status_code == 401
+            assert not ingestion.handle_webhook.called
+            
+            response = client.post(url, json=payload, headers={"X-Webhook-Secret": "s3cret"})
+            assert response.status_code == 200
+            assert response.json()["candidate_file"] == "candidate_jane_doe_1a2b3c4d.json"
+    
+    print("✅ Webhook authentication works")
+
+
+def main():
+    """Run all transcript ingestion tests."""
+    print("🧪 Testing transcript ingestion pipeline...\n")
+    test_ingestion_pipeline()
+    test_concurrent_ingestion()
+    test_webhook_secret()
+    print("\n🎉 All transcript ingestion tests passed!")
+
+
+if __name__ == "__main__":
+    main()
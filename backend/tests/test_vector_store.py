@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Test script for the local vector store backend
+
+This script tests (offline, no Weaviate or Mistral):
+- Deterministic local embeddings
+- Upsert, delete, search and aggregation on the embedded index
+- Persistence of the memory-mapped index
+- Filtered search and pagination
+- RAG pages that neither repeat nor skip candidates the LLM passed over
+- AI assistant sync and querying with WEAVIATE_URL=local://
+"""
+
+import os
+import sys
+import copy
+import json
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vector_store import HashingEmbedder, LocalVectorStore, VectorStore
+
+CANDIDATES = {
+    "uuid-1": {"name": "Jane Doe", "recommendation": "Strong Match", "content_hash": "h1",
+               "searchable_text": "Data scientist, analytical, handles pressure well, emotionally stable"},
+    "uuid-2": {"name": "John Roe", "recommendation": "Weak Match", "content_hash": "h2",
+               "searchable_text": "Product manager, outgoing, social, great communicator"},
+    "uuid-3": {"name": "Ada Poe", "recommendation": "Strong Match", "content_hash": "h3",
+               "searchable_text": "Engineer, creative, innovative, open to new experiences"},
+}
+
+
+def test_embedder_is_deterministic():
+    """The same text always embeds to the same unit vector."""
+    print("🧪 Testing local embeddings...")
+    embedder = HashingEmbedder(dimensions=128)
+    first = embedder.embed(["creative engineer"])
+    second = HashingEmbedder(dimensions=128).embed(["creative engineer"])
+    
+    assert first.shape == (1, 128)
+    assert (first == second).all()
+    assert abs(float((first ** 2).sum()) - 1.0) < 1e-5
+    print("✅ Local embeddings are deterministic")
+
+
+def test_local_store_search_and_aggregation():
+    """Objects can be searched, counted, grouped, deleted and reloaded."""
+    print("🧪 Testing local vector store...")
+    try:
+        VectorStore("Candidates")
+        assert False, "the interface cannot be instantiated"
+    except TypeError:
+        pass
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = LocalVectorStore(tmp_dir, "Candidates", HashingEmbedder(dimensions=256))
+        assert store.ensure_collection()
+        store.upsert(CANDIDATES)
+        
+        hits = store.near_text("who is a great communicator", limit=2)
+        assert len(hits) == 2
+        assert hits[0][1]["name"] == "John Roe"
+        assert hits[0][2] >= hits[1][2]
+        
+        assert store.count() == 3
+        assert store.group_counts("recommendation") == {"Strong Match": 2, "Weak Match": 1}
+        
+        # Writes swap in new containers, so a reader's snapshot is never mutated
+        snapshot_uuids, snapshot_objects = store._uuids, store._objects
+        store.upsert({"uuid-4": dict(CANDIDATES["uuid-3"], name="Late Joiner")})
+        assert len(snapshot_uuids) == 3 and "uuid-4" not in snapshot_objects
+        store.delete(["uuid-4"])
+        
+        # Updates replace in place, deletes drop the row
+        store.upsert({"uuid-1": dict(CANDIDATES["uuid-1"], content_hash="h1b")})
+        store.delete(["uuid-2"])
+        assert store.fetch_hashes() == {"uuid-1": "h1b", "uuid-3": "h3"}
+        store.close()
+        
+        # Reopening memory-maps the persisted index without re-embedding
+        reopened = LocalVectorStore(tmp_dir, "Candidates", HashingEmbedder(dimensions=256))
+        assert reopened.ensure_collection()
+        assert reopened.count() == 2
+        assert reopened.near_text("creative and innovative", limit=1)[0][1]["name"] == "Ada Poe"
+        
+        # A different embedder invalidates the stored vectors
+        resized = LocalVectorStore(tmp_dir, "Candidates", HashingEmbedder(dimensions=64))
+        assert resized.ensure_collection()
+        assert resized.count() == 0
+    
+    print("✅ Local vector store works")
+
+
+def test_filters_and_pagination():
+    """Filters are applied before ranking and pages do not overlap."""
+    print("🧪 Testing filtered search and pagination...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = LocalVectorStore(tmp_dir, "Candidates", HashingEmbedder(dimensions=256))
+        store.ensure_collection()
+        store.upsert(CANDIDATES)
+        
+        strong = [("recommendation", "eq", "Strong Match")]
+        hits = store.near_text("great communicator", limit=5, filters=strong)
+        assert {hit[1]["name"] for hit in hits} == {"Jane Doe", "Ada Poe"}
+        
+        first = store.near_text("great communicator", limit=2)
+        second = store.near_text("great communicator", limit=2, offset=2)
+        assert [hit[0] for hit in first + second] == [hit[0] for hit in store.near_text("great communicator", limit=3)]
+        
+        pages = [store.query_properties([], "name", False, 1, offset) for offset in range(3)]
+        assert [page[0][1]["name"] for page in pages] == ["Ada Poe", "Jane Doe", "John Roe"]
+        assert store.query_properties([("recommendation", "in", ["Weak Match"])], "name", False, 5)[0][0] == "uuid-2"
+    
+    print("🧪 Testing cursor pagination on the AI assistant...")
+    data_file = Path(__file__).parent.parent.parent / "data" / "compatibility_scores.json"
+    with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.dict(os.environ, {
+        "WEAVIATE_URL": f"local://{tmp_dir}",
+        "COMPATIBILITY_SCORES_FILE": str(data_file)
+    }):
+        from ai_assistant import AIAssistant
+        assistant = AIAssistant()
+        assistant.mistral_client = None
+        assert assistant.sync_candidates_from_file()
+        
+        first = assistant.query_candidates("", limit=1)
+        assert first["results_count"] == 1 and first["next_cursor"]
+        second = assistant.query_candidates("", limit=1, cursor=first["next_cursor"])
+        assert second["next_cursor"] is None
+        assert first["candidates"][0]["compatibility_score"] >= second["candidates"][0]["compatibility_score"]
+        
+        # Open-ended pages step by the page size through a capped re-ranking pool
+        assistant.max_retrieval = 2
+        pools = []
+        rank = assistant._llm_analyze_and_rank
+        with mock.patch.object(assistant, "_llm_analyze_and_rank",
+                               side_effect=lambda q, pool, n: pools.append(len(pool)) or rank(q, pool, n)):
+            page, seen = assistant.query_candidates("thrives in ambiguity", limit=1), []
+            while True:
+                assert page["strategy"] == "hybrid" and page["results_count"] == 1
+                seen.append((page["candidates"][0]["name"], page["candidates"][0]["position"]))
+                if not page["next_cursor"]:
+                    break
+                page = assistant.query_candidates("thrives in ambiguity", limit=1, cursor=page["next_cursor"])
+        assert len(seen) == len(set(seen)) == assistant.get_candidate_stats()["total_candidates"]
+        assert max(pools) == 2
+        
+        filtered = assistant.query_candidates("", filters={"recommendation": ["conditional"], "min_compatibility_score": 0.5})
+        assert [c["recommendation"] for c in filtered["candidates"]] == ["CONDITIONAL"]
+        
+        try:
+            assistant.query_candidates("most outgoing", limit=1, cursor=first["next_cursor"])
+            assert False, "cursor from another query must be rejected"
+        except ValueError:
+            pass
+        assistant.close_connection()
+    
+    print("✅ Filtered search and pagination work")
+
+
+def _page_through(assistant, query):
+    """Follow next_cursor to the end and return the (name, position) of every result."""
+    page, seen = assistant.query_candidates(query, limit=2), []
+    while True:
+        seen.extend((c["name"], c["position"]) for c in page["candidates"])
+        if not page["next_cursor"]:
+            return seen
+        page = assistant.query_candidates(query, limit=2, cursor=page["next_cursor"])
+
+
+def test_rag_pages_with_llm_picks():
+    """Candidates the LLM picks from deep in the pool are not repeated, the ones it skips still come."""
+    print("🧪 Testing RAG pagination with LLM re-ranking...")
+    data_file = Path(__file__).parent.parent.parent / "data" / "compatibility_scores.json"
+    with open(data_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    template = data["candidates_analysis"][0]
+    data["candidates_analysis"] = []
+    for i in range(7):
+        analysis = copy.deepcopy(template)
+        analysis["candidate_info"].update(id=f"candidate-{i}", name=f"Candidate {i}")
+        data["candidates_analysis"].append(analysis)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.dict(os.environ, {
+        "WEAVIATE_URL": f"local://{tmp_dir}/index",
+        "COMPATIBILITY_SCORES_FILE": os.path.join(tmp_dir, "compatibility_scores.json"),
+        "MISTRAL_API_KEY": ""
+    }):
+        with open(os.environ["COMPATIBILITY_SCORES_FILE"], 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        from ai_assistant import AIAssistant
+        assistant = AIAssistant()
+        assistant.max_retrieval = 4
+        assert assistant.sync_candidates_from_file()
+        total = len(data["candidates_analysis"])
+        
+        # A ranker that always prefers the last candidates of its pool
+        def pick_last(query, pool, limit):
+            return [dict(candidate, relevance_reasoning="stub") for candidate in pool[-limit:]]
+        with mock.patch.object(assistant, "_llm_analyze_and_rank", side_effect=pick_last):
+            seen = _page_through(assistant, "thrives in ambiguity")
+        assert len(seen) == len(set(seen)) == total, seen
+        
+        # A failing LLM falls back to name order within the pool
+        assistant.query_cache.clear()
+        assistant.llm_client = SimpleNamespace(chat=SimpleNamespace(complete=mock.Mock(side_effect=RuntimeError("down"))))
+        seen = _page_through(assistant, "thrives in ambiguity")
+        assert len(seen) == len(set(seen)) == total, seen
+        assert all("_position" not in c for c in assistant.query_candidates("thrives in ambiguity", limit=2)["candidates"])
+        assistant.close_connection()
+    
+    print("✅ RAG pagination with LLM re-ranking works")
+
+
+def test_assistant_with_local_backend():
+    """The assistant syncs and answers queries offline."""
+    print("🧪 Testing AI assistant on the local backend...")
+    data_file = Path(__file__).parent.parent.parent / "data" / "compatibility_scores.json"
+    
+    with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.dict(os.environ, {
+        "WEAVIATE_URL": f"local://{tmp_dir}",
+        "COMPATIBILITY_SCORES_FILE": str(data_file)
+    }):
+        from ai_assistant import AIAssistant
+        assistant = AIAssistant()
+        assistant.mistral_client = None
+        
+        assert assistant.sync_candidates_from_file()
+        total = assistant.last_sync_result["inserted"]
+        assert total > 0
+        
+        # Stats were materialized by the sync, no aggregation needed
+        with mock.patch.object(assistant.vector_store, "count", side_effect=AssertionError):
+            stats = assistant.get_candidate_stats()
+        assert stats["total_candidates"] == total
+        assert sum(stats["recommendations_distribution"].values()) == total
+        assert stats["recommendations_distribution"] == assistant.vector_store.group_counts("recommendation")
+        
+        result = assistant.query_candidates("calm under pressure", limit=2)
+        assert 0 < result["results_count"] <= 2
+        assert result["candidates"][0]["vector_relevance_score"] is not None
+        
+        # A second sync finds nothing to change
+        assert assistant.sync_candidates_from_file()
+        assert assistant.last_sync_result["unchanged"] == total
+        assistant.close_connection()
+    
+    print("✅ AI assistant works on the local backend")
+
+
+def main():
+    """Run all vector store tests."""
+    print("🧪 Testing local vector store backend...\n")
+    test_embedder_is_deterministic()
+    test_local_store_search_and_aggregation()
+    test_filters_and_pagination()
+    test_rag_pages_with_llm_picks()
+    test_assistant_with_local_backend()
+    print("\n🎉 All vector store tests passed!")
+
+
+if __name__ == "__main__":
+    main()
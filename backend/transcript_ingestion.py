@@ -0,0 +1,327 @@
+"""
+Transcript Ingestion Pipeline
+
+This module handles:
+- Detecting completed interview calls (background polling or webhook events)
+- Formatting transcripts into candidate_*.json records
+- Queueing personality trait extraction so results are precomputed
+
+Processing is idempotent (each call is ingested once, tracked in a state file)
+and resumable (pending trait extractions survive restarts).
+"""
+
+import json
+import os
+import re
+import queue
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from interview_manager import is_call_completed
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptIngestionService:
+    """
+    Turns completed interviews into candidate records without manual steps.
+    """
+    
+    def __init__(self, interview_manager, traits_extractor=None, data_dir: Optional[str] = None,
+                 poll_interval: Optional[float] = None):
+        """
+        Initialize the ingestion service.
+        
+        Args:
+            interview_manager: InterviewManager used to talk to the calls API
+            traits_extractor: PersonalityTraitsExtractor for precomputing traits (optional)
+            data_dir: Directory for candidate files and state (default: next to interviews.json)
+            poll_interval: Seconds between polls (default: TRANSCRIPT_POLL_INTERVAL_SECONDS or 60)
+        """
+        self.interview_manager = interview_manager
+        self.traits_extractor = traits_extractor
+        self.data_dir = data_dir or os.path.dirname(interview_manager.interviews_file) or "."
+        self.poll_interval = poll_interval or float(os.getenv("TRANSCRIPT_POLL_INTERVAL_SECONDS", "60"))
+        self.state_file = os.path.join(self.data_dir, "ingestion_state.json")
+        
+        self._state_lock = threading.Lock()
+        # Held from the processed check to the mark, so the poller and a webhook
+        # never ingest the same call twice
+        self._ingest_lock = threading.Lock()
+        self._state = self._load_state()
+        self._extraction_queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.last_poll_at: Optional[str] = None
+        self.last_error: Optional[str] = None
+    
+    # Lifecycle
+    
+    def start(self) -> None:
+        """Start the poller and the trait extraction worker in background threads."""
+        if self._threads:
+            return
+        
+        self._stop_event.clear()
+        
+        # Resume extractions that were queued before the last shutdown
+        for candidate_file in self._state["pending_extractions"]:
+            self._extraction_queue.put(candidate_file)
+        
+        self._threads = [
+            threading.Thread(target=self._poll_loop, name="transcript-poller", daemon=True),
+            threading.Thread(target=self._extraction_loop, name="trait-extractor", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        
+        logger.info(f"📥 Transcript ingestion started (poll interval: {self.poll_interval}s)")
+    
+    def stop(self) -> None:
+        """Stop the background threads."""
+        self._stop_event.set()
+        self._extraction_queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        logger.info("📥 Transcript ingestion stopped")
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get ingestion statistics."""
+        with self._state_lock:
+            return {
+                "running": bool(self._threads),
+                "poll_interval": self.poll_interval,
+                "last_poll_at": self.last_poll_at,
+                "processed_calls": len(self._state["processed_calls"]),
+                "pending_extractions": len(self._state["pending_extractions"]),
+                "last_error": self.last_error
+            }
+    
+    # Detection
+    
+    def poll_once(self) -> List[str]:
+        """
+        Check the calls API once and ingest every newly completed call.
+        
+        Returns:
+            List of candidate files written during this poll
+        """
+        calls = self.interview_manager._get_all_calls()
+        self.last_poll_at = datetime.now().isoformat()
+        
+        written = []
+        for call in calls:
+            if is_call_completed(call) and not self._is_processed(call["id"]):
+                candidate_file = self.ingest_call(call)
+                if candidate_file:
+                    written.append(candidate_file)
+        
+        return written
+    
+    def handle_webhook(self, payload: Dict[str, Any]) -> Optional[str]:
+        """
+        Ingest a call reported by a call-ended webhook.
+        
+        A call that has not finished yet is left for the poller, which
+        ingests it once the calls API reports it completed.
+        
+        Args:
+            payload: Webhook body containing at least call_id (or id)
+        
+        Returns:
+            Path of the candidate file, or None if nothing was ingested
+        """
+        call_id = payload.get("call_id") or payload.get("id")
+        if not call_id:
+            raise ValueError("Webhook payload must contain call_id")
+        
+        if self._is_processed(call_id):
+            return self._state["processed_calls"][call_id].get("candidate_file")
+        
+        call = next((c for c in self.interview_manager._get_all_calls() if c.get("id") == call_id), None)
+        if call is None:
+            raise ValueError(f"Unknown call: {call_id}")
+        
+        return self.ingest_call(call)
+    
+    # Ingestion
+    
+    def ingest_call(self, call: Dict[str, Any]) -> Optional[str]:
+        """
+        Fetch, format and store the transcript of a completed call.
+        
+        Args:
+            call: Call information from the calls API
+        
+        Returns:
+            Path of the written candidate file, or None if the call was skipped
+            or is still in progress
+        """
+        with self._ingest_lock:
+            return self._ingest_call(call)
+    
+    def _ingest_call(self, call: Dict[str, Any]) -> Optional[str]:
+        """Ingest one call (caller holds the ingest lock)."""
+        call_id = call["id"]
+        if self._is_processed(call_id):
+            return self._state["processed_calls"][call_id].get("candidate_file")
+        
+        if not is_call_completed(call):
+            # Not marked processed, so it is ingested once the call has ended
+            logger.info(f"⏳ Call {call_id} is still in progress, ingesting it once it ends")
+            return None
+        
+        agent_id = call.get("agent_id")
+        record = self.interview_manager._load_interviews_from_file().get(agent_id)
+        if not record:
+            # Not one of our interviews - remember it so we don't refetch it every poll
+            self._mark_processed(call_id, agent_id, None)
+            return None
+        
+        candidate_info = {
+            "name": record.get("candidate_name", "Unknown Candidate"),
+            "position": record.get("role", "Unknown Position"),
+            "email": record.get("candidate_email", "")
+        }
+        
+        messages = self.interview_manager._get_call_messages(call_id)
+        transcript = self.interview_manager._format_transcript(call, messages, candidate_info)
+        
+        if not transcript["candidate"]["responses"]:
+            logger.warning(f"⚠️ Call {call_id} has no candidate responses, skipping")
+            self._mark_processed(call_id, agent_id, None)
+            return None
+        
+        transcript["candidate"]["interview"] = {
+            "agent_id": agent_id,
+            "call_id": call_id,
+            "started_at": call.get("started_at"),
+            "ended_at": call.get("ended_at"),
+            "ingested_at": datetime.now().isoformat()
+        }
+        
+        candidate_file = os.path.join(self.data_dir, self._candidate_filename(candidate_info["name"], call_id))
+        self._write_json(candidate_file, transcript)
+        
+        self._mark_processed(call_id, agent_id, candidate_file)
+        self._enqueue_extraction(candidate_file)
+        
+        logger.info(f"📥 Ingested transcript for {candidate_info['name']} ({call_id}) -> {candidate_file}")
+        return candidate_file
+    
+    def extract_traits(self, candidate_file: str) -> bool:
+        """
+        Precompute personality traits for an ingested candidate file.
+        
+        Args:
+            candidate_file: Path of the candidate_*.json file
+        
+        Returns:
+            bool: Success status
+        """
+        if not self.traits_extractor:
+            return False
+        
+        try:
+            with open(candidate_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            candidate = data.get("candidate", data)
+            if not candidate.get("personality_traits"):
+                candidate["personality_traits"] = self.traits_extractor.extract_from_responses(candidate)
+                self._write_json(candidate_file, data)
+                logger.info(f"🧠 Precomputed personality traits for {candidate.get('name')}")
+            
+            self._complete_extraction(candidate_file)
+            return True
+        
+        except FileNotFoundError:
+            # File was removed since it was queued - nothing left to do
+            self._complete_extraction(candidate_file)
+            return False
+        except Exception as e:
+            logger.error(f"❌ Trait extraction failed for {candidate_file}: {e}")
+            self.last_error = str(e)
+            return False
+    
+    # Background loops
+    
+    def _poll_loop(self) -> None:
+        """Poll the calls API until stopped."""
+        while not self._stop_event.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"❌ Transcript poll failed: {e}")
+                self.last_error = str(e)
+            self._stop_event.wait(self.poll_interval)
+    
+    def _extraction_loop(self) -> None:
+        """Process queued trait extractions until stopped."""
+        while not self._stop_event.is_set():
+            candidate_file = self._extraction_queue.get()
+            if candidate_file is None:
+                break
+            # Failures stay in pending_extractions and are retried on the next start
+            self.extract_traits(candidate_file)
+    
+    # State handling
+    
+    def _is_processed(self, call_id: str) -> bool:
+        with self._state_lock:
+            return call_id in self._state["processed_calls"]
+    
+    def _mark_processed(self, call_id: str, agent_id: Optional[str], candidate_file: Optional[str]) -> None:
+        with self._state_lock:
+            self._state["processed_calls"][call_id] = {
+                "agent_id": agent_id,
+                "candidate_file": candidate_file,
+                "processed_at": datetime.now().isoformat()
+            }
+            self._save_state()
+    
+    def _enqueue_extraction(self, candidate_file: str) -> None:
+        if not self.traits_extractor:
+            return
+        with self._state_lock:
+            if candidate_file not in self._state["pending_extractions"]:
+                self._state["pending_extractions"].append(candidate_file)
+                self._save_state()
+        self._extraction_queue.put(candidate_file)
+    
+    def _complete_extraction(self, candidate_file: str) -> None:
+        with self._state_lock:
+            if candidate_file in self._state["pending_extractions"]:
+                self._state["pending_extractions"].remove(candidate_file)
+                self._save_state()
+    
+    def _load_state(self) -> Dict[str, Any]:
+        """Load ingestion state from disk."""
+        state = {"processed_calls": {}, "pending_extractions": []}
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    state.update(json.load(f))
+        except Exception as e:
+            logger.error(f"❌ Error loading ingestion state: {e}")
+        return state
+    
+    def _save_state(self) -> None:
+        """Persist ingestion state (caller holds the state lock)."""
+        self._write_json(self.state_file, self._state)
+    
+    def _write_json(self, path: str, data: Dict[str, Any]) -> None:
+        """Write JSON atomically so a crash never leaves a partial file."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    
+    def _candidate_filename(self, candidate_name: str, call_id: str) -> str:
+        """Build a deterministic candidate file name for a call."""
+        slug = re.sub(r'[^a-z0-9]+', '_', candidate_name.lower()).strip('_') or "candidate"
+        return f"candidate_{slug}_{call_id[:8]}.json"
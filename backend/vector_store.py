@@ -0,0 +1,721 @@
+"""
+Vector Store Backends
+
+This module provides the candidate index used by the AI assistant:
+- WeaviateVectorStore: Weaviate Cloud with Mistral embeddings
+- LocalVectorStore: in-process NumPy index with memory-mapped vectors
+- HashingEmbedder: deterministic local embedding function (no network)
+
+The backend is selected from WEAVIATE_URL: ``local://<directory>`` keeps the
+index on disk in <directory>, anything else connects to Weaviate Cloud.
+"""
+
+import json
+import os
+import re
+import hashlib
+import operator
+import threading
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import weaviate
+import weaviate.classes as wvc
+from weaviate.classes.config import Configure, Property, DataType, Tokenization
+from weaviate.classes.query import Filter, Sort
+
+from embeddings import Embedder, MistralEmbedder
+
+logger = logging.getLogger(__name__)
+
+LOCAL_SCHEME = "local://"
+DEFAULT_LOCAL_DIRECTORY = "data/vector_index"
+
+# Schema of the Candidates collection: (property name, data type)
+CANDIDATE_SCHEMA = [
+    ("name", DataType.TEXT),
+    ("position", DataType.TEXT),
+    ("candidate_id", DataType.TEXT),
+    ("compatibility_score", DataType.NUMBER),
+    ("recommendation", DataType.TEXT),
+    ("summary", DataType.TEXT),
+    ("strengths", DataType.TEXT_ARRAY),
+    ("concerns", DataType.TEXT_ARRAY),
+    ("openness", DataType.NUMBER),
+    ("conscientiousness", DataType.NUMBER),
+    ("extraversion", DataType.NUMBER),
+    ("agreeableness", DataType.NUMBER),
+    ("neuroticism", DataType.NUMBER),
+    ("searchable_text", DataType.TEXT),  # Combined text for vector search
+    ("content_hash", DataType.TEXT),  # Change detection for incremental sync
+    ("created_at", DataType.DATE),
+]
+
+# Properties filtered by exact value: word tokenization would let "RECOMMENDED" match
+# "HIGHLY RECOMMENDED" and "Engineer" match "Data Engineer", unlike the local index
+EXACT_MATCH_PROPERTIES = {"position", "recommendation"}
+
+# Words carrying no meaning for candidate search
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "me", "of", "on", "or", "show", "that", "the", "to", "who", "with", "find", "give",
+    "which", "what", "candidate", "candidates", "name", "position", "summary",
+}
+
+# A search hit: object UUID, candidate properties and relevance score (higher is better)
+SearchHit = Tuple[str, Dict[str, Any], Optional[float]]
+
+# Comparison operators for property conditions (property, operator, value)
+OPERATORS = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "in": lambda value, options: value in options,
+}
+
+
+def matches_filters(properties: Dict[str, Any], filters: List[Tuple[str, str, Any]]) -> bool:
+    """Whether an object satisfies every property condition (missing values never match)."""
+    return all(
+        properties.get(prop) is not None and OPERATORS[op](properties.get(prop), value)
+        for prop, op, value in filters
+    )
+
+
+def candidate_properties() -> List[Property]:
+    """Schema of the Candidates collection as Weaviate properties."""
+    return [
+        Property(name=name, data_type=data_type, tokenization=property_tokenization(name))
+        for name, data_type in CANDIDATE_SCHEMA
+    ]
+
+
+def property_tokenization(name: str) -> Optional[Tokenization]:
+    """Tokenization of a property (None: Weaviate's default word tokenization)."""
+    return Tokenization.FIELD if name in EXACT_MATCH_PROPERTIES else None
+
+
+def create_vector_store(url: Optional[str], api_key: Optional[str], collection_name: str,
+                        mistral_client=None, mistral_query_client=None) -> "VectorStore":
+    """
+    Create the vector store backend configured by WEAVIATE_URL.
+    
+    EMBEDDING_PROVIDER chooses where vectors are computed: "mistral" (batched
+    client-side Mistral embeddings, the default with a Mistral client),
+    "hashing" (local deterministic embedder, the default for local://) or
+    "weaviate" (Weaviate's text2vec-mistral module, Weaviate backend only).
+    
+    Args:
+        url: Weaviate cluster URL, or local://<directory> for the embedded index
+        api_key: Weaviate API key (ignored by the local backend)
+        collection_name: Name of the candidates collection
+        mistral_client: Mistral client for client-side embeddings (optional)
+        mistral_query_client: Mistral client for query embeddings (default: mistral_client)
+    
+    Returns:
+        Connected vector store
+    """
+    is_local = bool(url) and url.startswith(LOCAL_SCHEME)
+    default_provider = "hashing" if is_local or mistral_client is None else "mistral"
+    provider = os.getenv("EMBEDDING_PROVIDER", default_provider).lower()
+    
+    if provider == "mistral" and mistral_client is not None:
+        embedder = MistralEmbedder(mistral_client, query_client=mistral_query_client)
+    elif provider == "weaviate" and not is_local:
+        embedder = None
+    else:
+        embedder = HashingEmbedder(int(os.getenv("LOCAL_EMBEDDING_DIMENSIONS", "512")))
+    
+    if is_local:
+        directory = url[len(LOCAL_SCHEME):] or DEFAULT_LOCAL_DIRECTORY
+        return LocalVectorStore(directory, collection_name, embedder)
+    
+    if not url or not api_key:
+        raise ValueError("Weaviate URL and API key are required. Check your .env file.")
+    
+    return WeaviateVectorStore(url, api_key, collection_name, embedder)
+
+
+class VectorStore(ABC):
+    """
+    Interface shared by the vector store backends.
+    
+    Objects are candidate property dictionaries keyed by a deterministic UUID.
+    """
+    
+    backend = "base"
+    
+    def __init__(self, collection_name: str):
+        self.collection_name = collection_name
+    
+    @abstractmethod
+    def setup_collection(self) -> bool:
+        """Create or recreate the collection (drops all objects)."""
+    
+    @abstractmethod
+    def ensure_collection(self) -> bool:
+        """Create the collection if missing, recreate it if its schema changed."""
+    
+    @abstractmethod
+    def fetch_hashes(self) -> Dict[str, Optional[str]]:
+        """Map UUID to content hash for every object in the collection."""
+    
+    @abstractmethod
+    def fetch_objects(self) -> Dict[str, Dict[str, Any]]:
+        """Map UUID to properties for every object in the collection."""
+    
+    @abstractmethod
+    def upsert(self, objects: Dict[str, Dict[str, Any]]) -> None:
+        """Insert or replace objects keyed by UUID (raises on failure)."""
+    
+    @abstractmethod
+    def delete(self, uuids: List[str]) -> None:
+        """Delete objects by UUID."""
+    
+    @abstractmethod
+    def near_text(self, query: str, limit: int, filters: Optional[List[Tuple[str, str, Any]]] = None,
+                  offset: int = 0) -> List[SearchHit]:
+        """
+        Semantic search: the objects closest to the query text.
+        
+        Args:
+            query: Search text
+            limit: Number of hits to return
+            filters: Property conditions applied before ranking (pushed down to the backend)
+            offset: Number of best hits to skip (pagination)
+        """
+    
+    @abstractmethod
+    def query_properties(self, filters: List[Tuple[str, str, Any]], sort_by: str,
+                         descending: bool, limit: int, offset: int = 0) -> List[SearchHit]:
+        """Objects matching all property conditions, ordered by a property (no vector search)."""
+    
+    @abstractmethod
+    def count(self) -> int:
+        """Total number of objects in the collection."""
+    
+    @abstractmethod
+    def group_counts(self, property_name: str) -> Dict[str, int]:
+        """Number of objects per value of a text property."""
+    
+    def is_healthy(self) -> bool:
+        """Whether the backend can currently serve requests."""
+        return True
+    
+    def reconnect(self) -> None:
+        """Re-establish the backend connection (raises on failure)."""
+    
+    def close(self) -> None:
+        """Release connections and file handles."""
+
+
+class WeaviateVectorStore(VectorStore):
+    """
+    Candidates collection in Weaviate Cloud.
+    
+    With an embedder, vectors are computed client-side (batched during sync,
+    cached for queries) and supplied directly; without one, Weaviate's
+    text2vec-mistral module vectorizes objects and queries.
+    """
+    
+    backend = "weaviate"
+    
+    def __init__(self, url: str, api_key: str, collection_name: str, embedder: Optional[Embedder] = None):
+        super().__init__(collection_name)
+        self.url = url
+        self.api_key = api_key
+        self.embedder = embedder
+        self.client = None
+        self._connect()
+    
+    def _connect(self):
+        """Connect to Weaviate cloud instance."""
+        try:
+            # Connect to Weaviate Cloud with Mistral API key for embeddings
+            self.client = weaviate.connect_to_weaviate_cloud(
+                cluster_url=self.url,
+                auth_credentials=weaviate.auth.AuthApiKey(self.api_key),
+                headers={
+                    "X-Mistral-Api-Key": os.getenv("MISTRAL_API_KEY", "")
+                }
+            )
+            
+            # Test connection
+            if self.client.is_ready():
+                logger.info("✅ Successfully connected to Weaviate Cloud")
+            else:
+                raise Exception("Weaviate client is not ready")
+        
+        except Exception as e:
+            logger.error(f"❌ Failed to connect to Weaviate: {e}")
+            raise
+    
+    def setup_collection(self) -> bool:
+        try:
+            # Delete existing collection if it exists
+            if self.client.collections.exists(self.collection_name):
+                self.client.collections.delete(self.collection_name)
+                logger.info(f"🗑️ Deleted existing collection: {self.collection_name}")
+            
+            # Create new collection with schema (client-side vectors or Mistral vectorizer module)
+            self.client.collections.create(
+                name=self.collection_name,
+                description=self._collection_description(),
+                vectorizer_config=self._vectorizer_config(),
+                properties=candidate_properties()
+            )
+            
+            logger.info(f"✅ Created collection: {self.collection_name}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ Failed to setup collection: {e}")
+            return False
+    
+    def ensure_collection(self) -> bool:
+        try:
+            if not self.client.collections.exists(self.collection_name):
+                return self.setup_collection()
+            
+            collection = self.client.collections.get(self.collection_name)
+            config = collection.config.get()
+            existing = {prop.name for prop in config.properties}
+            expected = {name for name, _ in CANDIDATE_SCHEMA}
+            retokenized = sorted(
+                prop.name for prop in config.properties
+                if prop.name in EXACT_MATCH_PROPERTIES and prop.tokenization != Tokenization.FIELD
+            )
+            
+            if existing != expected:
+                logger.info(f"🔀 Schema changed for {self.collection_name} "
+                            f"(added: {sorted(expected - existing)}, removed: {sorted(existing - expected)}), migrating")
+                return self.setup_collection()
+            
+            if retokenized:
+                logger.info(f"🔀 Tokenization changed for {self.collection_name} ({retokenized}), migrating")
+                return self.setup_collection()
+            
+            # Vectors from another embedder (or the vectorizer module) are not comparable
+            if config.description != self._collection_description():
+                logger.info(f"🔀 Embeddings changed for {self.collection_name}, migrating")
+                return self.setup_collection()
+            
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ Failed to verify collection schema: {e}")
+            return False
+    
+    def fetch_hashes(self) -> Dict[str, Optional[str]]:
+        collection = self.client.collections.get(self.collection_name)
+        return {
+            str(obj.uuid): obj.properties.get("content_hash")
+            for obj in collection.iterator(return_properties=["content_hash"])
+        }
+    
+    def fetch_objects(self) -> Dict[str, Dict[str, Any]]:
+        collection = self.client.collections.get(self.collection_name)
+        return {str(obj.uuid): obj.properties for obj in collection.iterator()}
+    
+    def upsert(self, objects: Dict[str, Dict[str, Any]]) -> None:
+        if not objects:
+            return
+        
+        # One batched embeddings pass instead of per-object vectorization
+        vectors = None
+        if self.embedder:
+            vectors = self.embedder.embed([props.get("searchable_text", "") for props in objects.values()])
+        
+        collection = self.client.collections.get(self.collection_name)
+        with collection.batch.dynamic() as batch:
+            for row, (uuid, properties) in enumerate(objects.items()):
+                vector = vectors[row].tolist() if vectors is not None else None
+                batch.add_object(properties=properties, uuid=uuid, vector=vector)
+        
+        failed = collection.batch.failed_objects
+        if failed:
+            raise RuntimeError(f"{len(failed)} objects failed to sync: {failed[0].message}")
+    
+    def delete(self, uuids: List[str]) -> None:
+        if uuids:
+            collection = self.client.collections.get(self.collection_name)
+            collection.data.delete_many(where=Filter.by_id().contains_any(uuids))
+    
+    def near_text(self, query: str, limit: int, filters: Optional[List[Tuple[str, str, Any]]] = None,
+                  offset: int = 0) -> List[SearchHit]:
+        collection = self.client.collections.get(self.collection_name)
+        where = self._where(filters or [])
+        
+        if self.embedder:
+            # Cached client-side query embedding, cosine distance -> similarity
+            results = collection.query.near_vector(
+                near_vector=self.embedder.embed_query(query).tolist(),
+                limit=limit,
+                offset=offset or None,
+                filters=where,
+                return_metadata=wvc.query.MetadataQuery(distance=True)
+            )
+            return [
+                (str(result.uuid), result.properties,
+                 1 - result.metadata.distance if result.metadata and result.metadata.distance is not None else None)
+                for result in results.objects
+            ]
+        
+        # Perform vector search using Mistral embeddings
+        results = collection.query.near_text(
+            query=query,
+            limit=limit,
+            offset=offset or None,
+            filters=where,
+            return_metadata=wvc.query.MetadataQuery(score=True)
+        )
+        
+        return [
+            (str(result.uuid), result.properties, result.metadata.score if result.metadata else None)
+            for result in results.objects
+        ]
+    
+    def query_properties(self, filters: List[Tuple[str, str, Any]], sort_by: str,
+                         descending: bool, limit: int, offset: int = 0) -> List[SearchHit]:
+        collection = self.client.collections.get(self.collection_name)
+        
+        # Name breaks ties so pages do not overlap
+        results = collection.query.fetch_objects(
+            filters=self._where(filters),
+            sort=Sort.by_property(sort_by, ascending=not descending).by_property("name"),
+            limit=limit,
+            offset=offset or None
+        )
+        return [(str(result.uuid), result.properties, None) for result in results.objects]
+    
+    def _collection_description(self) -> str:
+        """Collection description, recording which embedder produced the vectors."""
+        description = "Candidate profiles for AI-powered querying"
+        if self.embedder:
+            description += f" (vectors: {self.embedder.name})"
+        return description
+    
+    def _vectorizer_config(self):
+        """Vectorizer of the collection: none for client-side vectors."""
+        if self.embedder:
+            return Configure.Vectorizer.none()
+        return Configure.Vectorizer.text2vec_mistral()
+    
+    def _where(self, filters: List[Tuple[str, str, Any]]):
+        """Combine property conditions into one Weaviate filter (None without conditions)."""
+        conditions = [self._property_filter(prop, op, value) for prop, op, value in filters]
+        if len(conditions) == 1:
+            return conditions[0]
+        if conditions:
+            return Filter.all_of(conditions)
+        return None
+    
+    def _property_filter(self, prop: str, op: str, value: Any):
+        """Translate a property condition into a Weaviate filter."""
+        by_property = Filter.by_property(prop)
+        if op == "in":
+            return Filter.any_of([by_property.equal(option) for option in value])
+        return {
+            "eq": by_property.equal,
+            "gt": by_property.greater_than,
+            "gte": by_property.greater_or_equal,
+            "lt": by_property.less_than,
+            "lte": by_property.less_or_equal,
+        }[op](value)
+    
+    def count(self) -> int:
+        collection = self.client.collections.get(self.collection_name)
+        return collection.aggregate.over_all(total_count=True).total_count
+    
+    def group_counts(self, property_name: str) -> Dict[str, int]:
+        collection = self.client.collections.get(self.collection_name)
+        groups = collection.aggregate.over_all(group_by=property_name)
+        
+        counts = {}
+        if hasattr(groups, 'groups') and groups.groups:
+            for group in groups.groups:
+                if hasattr(group, 'grouped_by') and hasattr(group, 'total_count'):
+                    # grouped_by is an object with properties, not a dict
+                    key = getattr(group.grouped_by, 'value', None) or getattr(group.grouped_by, property_name, 'Unknown')
+                    counts[key] = group.total_count
+        return counts
+    
+    def is_healthy(self) -> bool:
+        try:
+            return self.client is not None and self.client.is_ready()
+        except Exception as e:
+            logger.warning(f"⚠️ Weaviate health check failed: {e}")
+            return False
+    
+    def reconnect(self) -> None:
+        old_client = self.client
+        self._connect()
+        if old_client:
+            try:
+                old_client.close()
+            except Exception:
+                pass
+        logger.info("🔁 Reconnected to Weaviate Cloud")
+    
+    def close(self) -> None:
+        if self.client:
+            self.client.close()
+            logger.info("🔌 Weaviate connection closed")
+
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic bag-of-words embedder based on feature hashing.
+    
+    Words, word bigrams and character trigrams are hashed into a fixed number
+    of signed buckets and the result is L2-normalized, so cosine similarity
+    reflects lexical overlap. Needs no model download and no network.
+    """
+    
+    def __init__(self, dimensions: int = 512, query_cache_size: Optional[int] = None):
+        super().__init__(query_cache_size)
+        self.dimensions = dimensions
+        self.name = f"hashing-v1-{dimensions}"
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts into unit vectors.
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            float32 array of shape (len(texts), dimensions)
+        """
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+                sign = 1.0 if digest[4] & 1 else -1.0
+                vectors[row, bucket] += sign * weight
+        
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+    
+    def _features(self, text: str) -> List[Tuple[str, float]]:
+        """Weighted features of a text: words, bigrams and character trigrams."""
+        words = [w for w in re.findall(r"[a-z0-9]+", text.lower()) if w not in STOPWORDS]
+        
+        features = [(f"w:{word}", 1.0) for word in words]
+        features += [(f"b:{a} {b}", 0.5) for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features += [(f"c:{padded[i:i + 3]}", 0.2) for i in range(len(padded) - 2)]
+        return features
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Embedded candidate index: brute-force cosine search with NumPy.
+    
+    Vectors live in <directory>/<collection>.npy and are memory-mapped for
+    reads; properties and the row order live in <directory>/<collection>.json.
+    Writes rewrite both files atomically, which is cheap at candidate-pool
+    sizes and keeps readers consistent.
+    """
+    
+    backend = "local"
+    
+    def __init__(self, directory: str, collection_name: str, embedder: Optional[Embedder] = None):
+        super().__init__(collection_name)
+        self.directory = directory
+        self.embedder = embedder or HashingEmbedder()
+        self.metadata_file = os.path.join(directory, f"{collection_name}.json")
+        self.vectors_file = os.path.join(directory, f"{collection_name}.npy")
+        
+        self._lock = threading.Lock()
+        self._uuids: List[str] = []
+        self._objects: Dict[str, Dict[str, Any]] = {}
+        self._vectors = np.zeros((0, self.embedder.dimensions), dtype=np.float32)
+        self._metadata: Dict[str, Any] = {}
+        self._load()
+        
+        logger.info(f"✅ Using local vector index at {self.directory} ({len(self._uuids)} objects)")
+    
+    def setup_collection(self) -> bool:
+        try:
+            with self._lock:
+                self._uuids, self._objects = [], {}
+                self._vectors = np.zeros((0, self.embedder.dimensions), dtype=np.float32)
+                self._metadata = self._current_metadata()
+                self._save(self._vectors)
+            logger.info(f"✅ Created local collection: {self.collection_name}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to setup collection: {e}")
+            return False
+    
+    def ensure_collection(self) -> bool:
+        expected = self._current_metadata()
+        if self._metadata == expected:
+            return True
+        
+        if self._metadata:
+            logger.info(f"🔀 Schema or embedder changed for {self.collection_name}, rebuilding local index")
+        return self.setup_collection()
+    
+    def fetch_hashes(self) -> Dict[str, Optional[str]]:
+        with self._lock:
+            return {uuid: self._objects[uuid].get("content_hash") for uuid in self._uuids}
+    
+    def fetch_objects(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {uuid: self._objects[uuid] for uuid in self._uuids}
+    
+    def upsert(self, objects: Dict[str, Dict[str, Any]]) -> None:
+        if not objects:
+            return
+        
+        uuids = list(objects)
+        new_vectors = self.embedder.embed([objects[uuid].get("searchable_text", "") for uuid in uuids])
+        
+        with self._lock:
+            # Build fresh containers so readers holding the old ones never see a partial update
+            vectors = np.array(self._vectors)
+            all_uuids, all_objects = list(self._uuids), dict(self._objects)
+            rows = {uuid: row for row, uuid in enumerate(all_uuids)}
+            appended = []
+            for uuid, vector in zip(uuids, new_vectors):
+                if uuid in rows:
+                    vectors[rows[uuid]] = vector
+                else:
+                    all_uuids.append(uuid)
+                    appended.append(vector)
+                all_objects[uuid] = self._serializable(objects[uuid])
+            
+            if appended:
+                vectors = np.vstack([vectors, np.array(appended, dtype=np.float32)])
+            self._uuids, self._objects = all_uuids, all_objects
+            self._save(vectors)
+    
+    def delete(self, uuids: List[str]) -> None:
+        removed = set(uuids)
+        with self._lock:
+            keep = [row for row, uuid in enumerate(self._uuids) if uuid not in removed]
+            if len(keep) == len(self._uuids):
+                return
+            
+            vectors = np.array(self._vectors[keep])
+            self._uuids = [self._uuids[row] for row in keep]
+            self._objects = {uuid: self._objects[uuid] for uuid in self._uuids}
+            self._save(vectors)
+    
+    def near_text(self, query: str, limit: int, filters: Optional[List[Tuple[str, str, Any]]] = None,
+                  offset: int = 0) -> List[SearchHit]:
+        with self._lock:
+            vectors, uuids, objects = self._vectors, self._uuids, self._objects
+        
+        if not uuids or limit <= 0:
+            return []
+        
+        # Filter first so only matching rows are scored
+        rows = np.arange(len(uuids))
+        if filters:
+            rows = rows[[matches_filters(objects[uuid], filters) for uuid in uuids]]
+        
+        scores = vectors[rows] @ self.embedder.embed_query(query)
+        
+        # Partial selection first, then a stable sort of the top rows only
+        wanted = offset + limit
+        if wanted < len(rows):
+            top = np.argpartition(-scores, wanted - 1)[:wanted]
+            top = top[np.lexsort((top, -scores[top]))]
+        else:
+            top = np.argsort(-scores, kind="stable")
+        
+        return [(uuids[rows[i]], objects[uuids[rows[i]]], float(scores[i])) for i in top[offset:]]
+    
+    def query_properties(self, filters: List[Tuple[str, str, Any]], sort_by: str,
+                         descending: bool, limit: int, offset: int = 0) -> List[SearchHit]:
+        with self._lock:
+            objects = [(uuid, self._objects[uuid]) for uuid in self._uuids]
+        
+        matches = [(uuid, obj) for uuid, obj in objects if matches_filters(obj, filters)]
+        
+        # Name first, then the (stable) sort key, so ties are ordered deterministically
+        matches.sort(key=lambda match: match[1].get("name") or "")
+        matches.sort(key=lambda match: match[1].get(sort_by) or 0, reverse=descending)
+        return [(uuid, obj, None) for uuid, obj in matches[offset:offset + limit]]
+    
+    def count(self) -> int:
+        with self._lock:
+            return len(self._uuids)
+    
+    def group_counts(self, property_name: str) -> Dict[str, int]:
+        counts = {}
+        with self._lock:
+            for obj in self._objects.values():
+                key = obj.get(property_name) or "Unknown"
+                counts[key] = counts.get(key, 0) + 1
+        return counts
+    
+    def close(self) -> None:
+        with self._lock:
+            # Drop the memory map so the file handle is released
+            self._vectors = np.array(self._vectors)
+    
+    def _current_metadata(self) -> Dict[str, Any]:
+        """Schema and embedder the stored vectors must match."""
+        return {
+            "properties": [name for name, _ in CANDIDATE_SCHEMA],
+            "embedder": self.embedder.name
+        }
+    
+    def _serializable(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert property values to JSON-compatible types."""
+        return {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in properties.items()
+        }
+    
+    def _load(self) -> None:
+        """Load properties and memory-map the vectors of an existing index."""
+        if not (os.path.exists(self.metadata_file) and os.path.exists(self.vectors_file)):
+            return
+        
+        try:
+            with open(self.metadata_file, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            vectors = np.load(self.vectors_file, mmap_mode="r")
+            
+            if len(stored["uuids"]) != len(vectors):
+                raise ValueError("vector and object counts differ")
+            
+            self._metadata = stored["metadata"]
+            self._uuids = stored["uuids"]
+            self._objects = stored["objects"]
+            self._vectors = vectors
+        except Exception as e:
+            logger.error(f"❌ Error loading local vector index, it will be rebuilt: {e}")
+    
+    def _save(self, vectors: np.ndarray) -> None:
+        """Persist the index atomically and re-map the vectors (caller holds the lock)."""
+        os.makedirs(self.directory, exist_ok=True)
+        
+        tmp_vectors = f"{self.vectors_file}.tmp"
+        with open(tmp_vectors, 'wb') as f:
+            np.save(f, np.ascontiguousarray(vectors, dtype=np.float32))
+        os.replace(tmp_vectors, self.vectors_file)
+        
+        tmp_metadata = f"{self.metadata_file}.tmp"
+        with open(tmp_metadata, 'w', encoding='utf-8') as f:
+            json.dump({
+                "metadata": self._metadata,
+                "uuids": self._uuids,
+                "objects": self._objects
+            }, f, ensure_ascii=False)
+        os.replace(tmp_metadata, self.metadata_file)
+        
+        self._vectors = np.load(self.vectors_file, mmap_mode="r")
@@ -3,6 +3,7 @@ import json
 import os
 import requests
 import glob
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 app = Flask(__name__)
@@ -10,6 +11,38 @@ app = Flask(__name__)
 # Configuration
 API_BASE_URL = os.getenv('API_BASE_URL', 'http://localhost:8000')
 
+CANDIDATE_MANIFEST_FILE = '.candidate_manifest.json'
+
+def _read_candidate_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_candidate_files(data_dir):
+    """Load candidate_*.json files, reusing documents from the backend's manifest when unchanged"""
+    manifest = {}
+    try:
+        with open(os.path.join(data_dir, CANDIDATE_MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = {entry['file']: entry for entry in json.load(f).get('files', [])}
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass  # The backend writes the manifest; without it every file is parsed
+    
+    documents = {}
+    to_parse = []
+    for candidate_file in sorted(glob.glob(os.path.join(data_dir, 'candidate_*.json'))):
+        stat = os.stat(candidate_file)
+        entry = manifest.get(os.path.basename(candidate_file))
+        if entry and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+            documents[candidate_file] = entry['data']
+        else:
+            to_parse.append(candidate_file)
+    
+    if to_parse:
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as pool:
+            documents.update(zip(to_parse, pool.map(_read_candidate_file, to_parse)))
+    
+    print(f"Loaded {len(documents)} candidate files ({len(to_parse)} parsed)")
+    return [documents[path] for path in sorted(documents)]
+
 def load_dashboard_data_api():
     """Load dashboard data by calling the API endpoint"""
     try:
@@ -49,20 +82,15 @@ def load_dashboard_data_api():
         # for production, we will use INTERVIEW API CALLS to get the candidates data
         data_dir = os.path.dirname(team_data_path)
         candidates_data = []
-        candidate_files_pattern = os.path.join(data_dir, 'candidate_*.json')
-        candidate_files = glob.glob(candidate_files_pattern)
-        
-        for candidate_file in candidate_files:
-            with open(candidate_file, 'r', encoding='utf-8') as f:
-                candidate_data = json.load(f)
-                candidate_name = candidate_data['candidate']['name']
-                print(f"Checking candidate: {candidate_name}")
-                
-                if candidate_name in chosen_candidate_names:
-                    print(f"✅ Found chosen candidate: {candidate_name}")
-                    candidates_data.append(candidate_data['candidate'])
-                else:
-                    print(f"❌ Candidate not chosen: {candidate_name}")
+        for candidate_data in load_candidate_files(data_dir):
+            candidate_name = candidate_data['candidate']['name']
+            print(f"Checking candidate: {candidate_name}")
+            
+            if candidate_name in chosen_candidate_names:
+                print(f"✅ Found chosen candidate: {candidate_name}")
+                candidates_data.append(candidate_data['candidate'])
+            else:
+                print(f"❌ Candidate not chosen: {candidate_name}")
             
         # Format the request payload according to API requirements
         payload = {
@@ -79,11 +107,7 @@ def load_dashboard_data_api():
         response = requests.post(api_url, json=payload, headers=headers, timeout=300)
         response.raise_for_status()  # Raise an exception for bad status codes
         
-        # Save API response to compatibility_scores.json
-        output_path = os.path.join(data_dir, 'compatibility_scores.json')
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(response.json(), f, indent=2)
+        # The backend records the run in the analysis store and exports compatibility_scores.json
         return response.json()
         
     except requests.exceptions.ConnectionError:
@@ -103,19 +127,90 @@ def load_dashboard_data_api():
         return None
 
 
+def load_latest_run_store():
+    """Latest run from the backend's analysis store, with its created_at (None if unavailable)"""
+    try:
+        response = requests.get(f"{API_BASE_URL}/analysis/results/latest", timeout=30)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        run = response.json()
+        return dict(run['results'], created_at=run['created_at'])
+    except requests.exceptions.RequestException as e:
+        print(f"Analysis store not available: {e}")
+        return None
+
+def query_candidates_store(recommendation=None, min_score=None, limit=None, offset=0):
+    """Candidate analyses of the latest stored run, best compatibility first (None if unavailable)"""
+    params = {'recommendation': recommendation, 'min_score': min_score, 'limit': limit, 'offset': offset}
+    try:
+        response = requests.get(f"{API_BASE_URL}/analysis/results/latest/candidates",
+                                params={key: value for key, value in params.items() if value is not None}, timeout=30)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        print(f"Analysis store not available: {e}")
+        return None
+
+def load_latest_snapshot():
+    """Follow runs/latest.json to the newest run snapshot (None if there is none)"""
+    for runs_dir in ['data/runs', '../data/runs']:
+        pointer_path = os.path.join(runs_dir, 'latest.json')
+        if not os.path.exists(pointer_path):
+            continue
+        try:
+            with open(pointer_path, 'r', encoding='utf-8') as f:
+                pointer = json.load(f)
+            with open(os.path.join(runs_dir, pointer['file']), 'r', encoding='utf-8') as f:
+                return {'timestamp': pointer['timestamp'], 'results': json.load(f)}
+        except Exception as e:
+            print(f"Error loading run snapshot: {e}")
+    return None
+
+def load_selection_timestamp():
+    """When candidates were last chosen for analysis on the dashboard (None if never)"""
+    selection_path = 'data/c_data_for_analyzer/candidates_analysis_latest.json'
+    if not os.path.exists(selection_path):
+        return None
+    try:
+        with open(selection_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('timestamp')
+    except Exception:
+        return None
+
+def is_current_run(created_at):
+    """Whether a run was analyzed after the last candidate selection (older runs need a fresh analysis)"""
+    selected_at = load_selection_timestamp()
+    return selected_at is None or created_at >= selected_at
+
 def load_dashboard_data():
-    """Load the dashboard data from JSON file or API"""
+    """Load the dashboard data from the analysis store, JSON file or API"""
     try:
+        data = load_latest_run_store()
+        if data:
+            if is_current_run(data.pop('created_at')):
+                return data
+            print("No analysis run for the current candidate selection, trying API...")
+            return load_dashboard_data_api()
+        
+        # Latest versioned run snapshot (written atomically, the pointer is swapped last)
+        snapshot = load_latest_snapshot()
+        if snapshot and is_current_run(snapshot['timestamp']):
+            return snapshot['results']
+        
         # Try different paths for compatibility_scores.json
         possible_paths = [
             'data/compatibility_scores.json',  # Docker mounted volume
             '../data/compatibility_scores.json',  # Local development
             'compatibility_scores.json'  # Current directory
         ]
-
- 
+        
         for data_path in possible_paths:
             if os.path.exists(data_path):
+                if not is_current_run(datetime.fromtimestamp(os.path.getmtime(data_path)).isoformat()):
+                    break
                 with open(data_path, 'r', encoding='utf-8') as f:
                     return json.load(f)
         
@@ -179,13 +274,9 @@ def dashboard():
             print(f"✅ Saved candidate data for analysis: {filepath} and {filepath_latest}")
             
             if len(candidates_data) != 0:
+                # The selection is newer than the stored run, so the dashboard requests a fresh analysis
                 print("Candidates chosen, continuing compatibility analysis")
-                # Rename existing compatibility_scores.json to compatibility_scores.json.old if it exists
-                compatibility_scores_path = os.path.join("data", 'compatibility_scores.json')
-                if os.path.exists(compatibility_scores_path):
-                    old_path = compatibility_scores_path + '.old'
-                    os.replace(compatibility_scores_path, old_path)
-                    
+        
         except json.JSONDecodeError as e:
             print(f"❌ Error parsing analyze_interviews JSON: {e}")
         except Exception as e:
@@ -212,7 +303,16 @@ def get_team_summary():
 
 @app.route('/api/candidates')
 def get_candidates():
-    """API endpoint to get candidates analysis"""
+    """API endpoint to get candidates analysis (filterable by recommendation and min_score)"""
+    recommendation = request.args.get('recommendation')
+    min_score = request.args.get('min_score', type=float)
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', 0, type=int)
+    
+    stored = query_candidates_store(recommendation, min_score, limit, offset)
+    if stored and is_current_run(stored['created_at']):
+        return jsonify(stored['candidates'])
+    
     data = load_dashboard_data()
     if data is None:
         return jsonify({'error': 'Data file not found'}), 404
@@ -280,134 +380,69 @@ def create_interview_proxy():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/interview-history')
-def get_interview_history():
-    """Get interview history from interviews.json file"""
+@app.route('/api/create-interviews-batch', methods=['POST'])
+def create_interviews_batch_proxy():
+    """Proxy endpoint to create many interviews at once via API"""
     try:
-        # Try different paths for interviews.json
-        possible_paths = [
-            'data/interviews.json',  # Docker mounted volume
-            '../data/interviews.json',  # Local development from ui folder
-            'interviews.json'  # Current directory
-        ]
-        
-        interviews_data = None
-        for interviews_path in possible_paths:
-            if os.path.exists(interviews_path):
-                with open(interviews_path, 'r', encoding='utf-8') as f:
-                    interviews_data = json.load(f)
-                break
+        data = request.get_json()
         
-        if interviews_data is None:
-            # Fallback to sample data if file not found
-            return get_sample_interview_history()
-        
-        # Transform the interviews data to match frontend expectations
-        interviews_list = []
-        for agent_id, interview_data in interviews_data.items():
-            # Extract email from system prompt if available
-            candidate_email = None
-            agent_details = interview_data.get('agent_details', {})
-            system_prompt = agent_details.get('system_prompt', '')
-            
-            # Try to extract email from system prompt
-            import re
-            email_match = re.search(r'Email:\s*([^\s\n]+)', system_prompt)
-            if email_match:
-                candidate_email = email_match.group(1)
-            
-            # Determine status based on creation time and other factors
-            created_at = interview_data.get('created_at')
-            status = 'completed'  # Default to completed for existing interviews
-            duration = '25 minutes'  # Default duration
-            has_transcript = True  # Assume transcripts are available for completed interviews
-            
-            # If the interview was created very recently (within last hour), mark as in-progress
-            if created_at:
-                try:
-                    from datetime import datetime, timezone
-                    created_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    now = datetime.now(timezone.utc)
-                    time_diff = now - created_time
-                    
-                    if time_diff.total_seconds() < 3600:  # Less than 1 hour ago
-                        status = 'in-progress'
-                        duration = 'In progress'
-                        has_transcript = False
-                except:
-                    pass  # Keep default values if parsing fails
-            
-            formatted_interview = {
-                'agent_id': interview_data.get('agent_id', agent_id),
-                'candidate_name': interview_data.get('candidate_name', 'Unknown'),
-                'role': interview_data.get('role', 'Unknown Role'),
-                'candidate_email': candidate_email,
-                'status': status,
-                'created_at': created_at or datetime.now().isoformat() + 'Z',
-                'duration': duration,
-                'has_transcript': has_transcript,
-                'interview_link': interview_data.get('interview_link', f'https://bey.chat/{agent_id}')
-            }
-            
-            interviews_list.append(formatted_interview)
+        # Validate required fields
+        interviews = data.get('interviews') if data else None
+        if not interviews:
+            return jsonify({'error': 'Missing interviews'}), 400
         
-        # Sort by creation time (newest first)
-        interviews_list.sort(key=lambda x: x['created_at'], reverse=True)
+        # Make request to actual API
+        api_url = f"{API_BASE_URL}/interviews/batch"
+        headers = {"Content-Type": "application/json"}
         
-        return jsonify({
-            'success': True,
-            'interviews': interviews_list,
-            'total_count': len(interviews_list)
-        })
+        response = requests.post(api_url, json=data, headers=headers, timeout=300)
         
+        if response.status_code == 200:
+            return jsonify(response.json())
+        else:
+            error_data = response.json() if response.headers.get('content-type') == 'application/json' else {'detail': response.text}
+            return jsonify(error_data), response.status_code
+            
+    except requests.exceptions.ConnectionError:
+        return jsonify({'error': 'API server is not accessible'}), 503
+    except requests.exceptions.Timeout:
+        return jsonify({'error': 'Request timeout'}), 504
     except Exception as e:
-        print(f"Error loading interviews from file: {e}")
-        # Fallback to sample data on any error
-        return get_sample_interview_history()
-
-def get_sample_interview_history():
-    """Fallback function to return sample interview data"""
-    sample_interviews = [
-        {
-            'agent_id': 'agent_001',
-            'candidate_name': 'John Smith',
-            'role': 'Software Engineer',
-            'candidate_email': 'john.smith@email.com',
-            'status': 'completed',
-            'created_at': '2024-01-15T10:30:00Z',
-            'duration': '25 minutes',
-            'has_transcript': True,
-            'interview_link': 'https://agent.ai-interviewer.com/agent_001'
-        },
-        {
-            'agent_id': 'agent_002',
-            'candidate_name': 'Sarah Johnson',
-            'role': 'Frontend Developer',
-            'candidate_email': 'sarah.johnson@email.com',
-            'status': 'completed',
-            'created_at': '2024-01-14T14:15:00Z',
-            'duration': '30 minutes',
-            'has_transcript': True,
-            'interview_link': 'https://agent.ai-interviewer.com/agent_002'
-        },
-        {
-            'agent_id': 'agent_003',
-            'candidate_name': 'Mike Davis',
-            'role': 'Backend Developer',
-            'candidate_email': 'mike.davis@email.com',
-            'status': 'in-progress',
-            'created_at': '2024-01-16T09:00:00Z',
-            'duration': 'In progress',
-            'has_transcript': False,
-            'interview_link': 'https://agent.ai-interviewer.com/agent_003'
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/interview-history')
+def get_interview_history():
+    """Proxy one page of interview history from the backend's interview status index"""
+    try:
+        params = {
+            'page': request.args.get('page', 1, type=int),
+            'page_size': request.args.get('page_size', 50, type=int)
         }
-    ]
-    
-    return jsonify({
-        'success': True,
-        'interviews': sample_interviews,
-        'total_count': len(sample_interviews)
-    })
+        status = request.args.get('status')
+        if status and status != 'all':
+            params['status'] = status
+        
+        response = requests.get(f"{API_BASE_URL}/interviews/history", params=params, timeout=30)
+        
+        if response.status_code == 200:
+            history = response.json()
+            return jsonify({
+                'success': True,
+                'interviews': history['interviews'],
+                'total_count': history['total_count'],
+                'page': history['page'],
+                'page_size': history['page_size']
+            })
+        else:
+            error_data = response.json() if response.headers.get('content-type') == 'application/json' else {'detail': response.text}
+            return jsonify(error_data), response.status_code
+            
+    except requests.exceptions.ConnectionError:
+        return jsonify({'error': 'API server is not accessible'}), 503
+    except requests.exceptions.Timeout:
+        return jsonify({'error': 'Request timeout'}), 504
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/interview-transcript/<agent_id>')
 def get_interview_transcript_proxy(agent_id):
@@ -415,6 +450,7 @@ def get_interview_transcript_proxy(agent_id):
     try:
         candidate_name = request.args.get('candidate_name')
         role = request.args.get('role')
+        since = request.args.get('since')
         
         # Build query parameters
         params = {}
@@ -422,6 +458,8 @@ def get_interview_transcript_proxy(agent_id):
             params['candidate_name'] = candidate_name
         if role:
             params['role'] = role
+        if since:
+            params['since'] = since
         
         # Make request to actual API
         api_url = f"{API_BASE_URL}/interviews/{agent_id}/transcript"
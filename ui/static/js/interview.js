@@ -5,7 +5,11 @@ class InterviewManager {
         this.currentAgentId = null;
         this.currentTranscript = null;
         this.interviewHistory = [];
-        this.selectedInterviews = new Set();
+        this.historyPage = 1;
+        this.historyPageSize = 50;
+        this.historyTotal = 0;
+        // agent_id -> {candidate_name, role}, so selections survive paging
+        this.selectedInterviews = new Map();
         this.apiBaseUrl = ''; // Use relative URLs to Flask app
         this.init();
     }
@@ -49,6 +53,14 @@ class InterviewManager {
             this.loadInterviewHistory();
         });
 
+        document.getElementById('history-prev-btn').addEventListener('click', () => {
+            this.loadInterviewHistory(this.historyPage - 1);
+        });
+
+        document.getElementById('history-next-btn').addEventListener('click', () => {
+            this.loadInterviewHistory(this.historyPage + 1);
+        });
+
         document.getElementById('select-all-btn').addEventListener('click', () => {
             this.selectAllInterviews();
         });
@@ -66,8 +78,9 @@ class InterviewManager {
             this.filterHistory();
         });
 
+        // Status is filtered by the server, so a change starts again from the first page
         document.getElementById('status-filter').addEventListener('change', (e) => {
-            this.filterHistory();
+            this.loadInterviewHistory(1);
         });
 
         // Error modal close
@@ -76,31 +89,52 @@ class InterviewManager {
         });
     }
 
-    async loadInterviewHistory() {
+    async loadInterviewHistory(page = this.historyPage) {
         this.showLoading('Loading interview history...');
         
         try {
-            const response = await fetch('/api/interview-history');
+            // Fetch only the page being shown; the status filter is applied by the server
+            const params = new URLSearchParams({
+                page: Math.max(1, page),
+                page_size: this.historyPageSize,
+                status: document.getElementById('status-filter').value
+            });
+            const response = await fetch(`/api/interview-history?${params.toString()}`);
             
             if (response.ok) {
                 const data = await response.json();
                 this.interviewHistory = data.interviews || [];
+                this.historyPage = data.page || Math.max(1, page);
+                this.historyTotal = data.total_count || this.interviewHistory.length;
                 this.renderInterviewHistory();
             } else {
                 // If endpoint doesn't exist yet, show sample data
-                this.interviewHistory = this.generateSampleHistory();
-                this.renderInterviewHistory();
+                this.showSampleHistory();
             }
         } catch (error) {
             console.error('Error loading interview history:', error);
             // Show sample data on error
-            this.interviewHistory = this.generateSampleHistory();
-            this.renderInterviewHistory();
+            this.showSampleHistory();
         } finally {
             this.hideLoading();
         }
     }
 
+    showSampleHistory() {
+        this.interviewHistory = this.generateSampleHistory();
+        this.historyPage = 1;
+        this.historyTotal = this.interviewHistory.length;
+        this.renderInterviewHistory();
+    }
+
+    renderHistoryPager() {
+        const pageCount = Math.max(1, Math.ceil(this.historyTotal / this.historyPageSize));
+        document.getElementById('history-pager').style.display = pageCount > 1 ? 'flex' : 'none';
+        document.getElementById('history-page-info').textContent = `Page ${this.historyPage} of ${pageCount}`;
+        document.getElementById('history-prev-btn').disabled = this.historyPage <= 1;
+        document.getElementById('history-next-btn').disabled = this.historyPage >= pageCount;
+    }
+
     generateSampleHistory() {
         // Sample data for demonstration
         return [
@@ -138,6 +172,8 @@ class InterviewManager {
         const historyGrid = document.getElementById('history-grid');
         const historyEmpty = document.getElementById('history-empty');
         
+        this.renderHistoryPager();
+        
         if (this.interviewHistory.length === 0) {
             historyGrid.style.display = 'none';
             historyEmpty.style.display = 'block';
@@ -210,14 +246,24 @@ class InterviewManager {
             });
         });
         
+        // Keep the search box applied to the newly loaded page
+        this.filterHistory();
         this.updateSelectionCounter();
     }
 
+    rememberSelection(agentId) {
+        const interview = this.interviewHistory.find(i => i.agent_id === agentId);
+        this.selectedInterviews.set(agentId, {
+            candidate_name: interview.candidate_name,
+            role: interview.role
+        });
+    }
+
     toggleInterviewSelection(agentId) {
         if (this.selectedInterviews.has(agentId)) {
             this.selectedInterviews.delete(agentId);
         } else {
-            this.selectedInterviews.add(agentId);
+            this.rememberSelection(agentId);
         }
         
         // Update UI
@@ -243,7 +289,7 @@ class InterviewManager {
         visibleInterviews.forEach(item => {
             const agentId = item.dataset.agentId;
             if (!this.selectedInterviews.has(agentId)) {
-                this.selectedInterviews.add(agentId);
+                this.rememberSelection(agentId);
                 
                 const checkbox = item.querySelector('.history-checkbox');
                 checkbox.classList.add('checked');
@@ -342,8 +388,8 @@ class InterviewManager {
         this.showLoading('Analyzing selected candidates...');
         
         try {
-            const selectedCandidates = Array.from(this.selectedInterviews).map(agentId => {
-                const interview = this.interviewHistory.find(i => i.agent_id === agentId);
+            // Selections may come from other pages, so use what was remembered when selecting
+            const selectedCandidates = Array.from(this.selectedInterviews).map(([agentId, interview]) => {
                 return {
                     agent_id: agentId,
                     candidate_name: interview.candidate_name,